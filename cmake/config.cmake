@@ -36,6 +36,10 @@ set(RAF_CUDA_ARCH 70)
 # RAF_USE_CUBLAS. Option: [ON/OFF]
 set(RAF_USE_CUBLAS OFF)
 
+# RAF_USE_CPU_BLAS. Option: [ON/OFF/Path-To-BLAS-Library]. The cpublas dialect calls the CBLAS
+# interface of the library, e.g., OpenBLAS, instead of the built-in GEMM kernel if enabled.
+set(RAF_USE_CPU_BLAS OFF)
+
 # RAF_USE_CUDNN. Option: [ON/OFF/Path-To-CUDNN]. You may use environment variables, like $ENV{CUDNN_HOME}
 set(RAF_USE_CUDNN OFF)
 
@@ -0,0 +1,25 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+##############################################################################
+# Provide:
+#  - RAF_CPU_BLAS_INCLUDE
+#  - RAF_CPU_BLAS_LIBRARY
+
+if (${RAF_USE_CPU_BLAS} STREQUAL "OFF")
+  message(STATUS "Build without CPU BLAS, the cpublas dialect uses the built-in GEMM kernel")
+  set(RAF_CPU_BLAS_INCLUDE "")
+  set(RAF_CPU_BLAS_LIBRARY "")
+else()
+  if (${RAF_USE_CPU_BLAS} STREQUAL "ON")
+    find_library(RAF_CPU_BLAS_LIBRARY NAMES openblas blis cblas)
+  else()
+    set(RAF_CPU_BLAS_LIBRARY ${RAF_USE_CPU_BLAS})
+  endif()
+  find_path(RAF_CPU_BLAS_INCLUDE cblas.h PATH_SUFFIXES openblas blis)
+  if (NOT RAF_CPU_BLAS_LIBRARY OR NOT RAF_CPU_BLAS_INCLUDE)
+    message(FATAL_ERROR "Cannot find the CPU BLAS library or cblas.h")
+  endif()
+  message(STATUS "Found RAF_CPU_BLAS_INCLUDE = ${RAF_CPU_BLAS_INCLUDE}")
+  message(STATUS "Found RAF_CPU_BLAS_LIBRARY = ${RAF_CPU_BLAS_LIBRARY}")
+endif()
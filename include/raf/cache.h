@@ -10,6 +10,10 @@
 #pragma once
 
 #include <chrono>
+#include <functional>
+#include <list>
+#include <memory>
+#include <mutex>
 #include <dmlc/memory_io.h>
 #include <sys/stat.h>
 #include "./file.h"
@@ -205,75 +209,208 @@ class MetaCacheMetric {
   virtual std::unordered_map<std::string, size_t> GetMetric() = 0;
 };
 
+/*! \brief The budget and the storage layout of a persistent cache. */
+struct PersistCacheConfig {
+  /*! \brief The maximum number of entries in memory. 0 means no limit. */
+  size_t max_entries = 0;
+  /*! \brief Whether to persist the entries on disk. */
+  bool persist = false;
+  /*! \brief The root directory of all persistent caches. */
+  std::string root_path;
+  /*! \brief The maximum number of entries on disk. 0 means no limit. */
+  size_t max_persist_entries = 0;
+  /*! \brief The maximum number of bytes on disk. 0 means no limit. */
+  size_t max_persist_bytes = 0;
+  /*! \brief Whether to pack all entries of a cache into a single indexed file. */
+  bool packed = false;
+
+  /*!
+   * \brief Read the config from the environment variables:
+   * RAF_CACHE_MAX_ENTRIES, RAF_PERSIST_CACHE, RAF_PERSIST_CACHE_PATH,
+   * RAF_PERSIST_CACHE_MAX_ENTRIES, RAF_PERSIST_CACHE_MAX_BYTES and RAF_PERSIST_CACHE_PACKED.
+   */
+  static PersistCacheConfig FromEnv();
+};
+
+/*!
+ * \brief The files of a persisted entry to be loaded. Files are read on demand, so a packed store
+ * serves them from its memory map without unpacking the whole entry.
+ */
+class PersistEntry {
+ public:
+  virtual ~PersistEntry() = default;
+
+  /*!
+   * \brief Read the content of a file of the entry.
+   * \param name The file name.
+   * \param data The content.
+   * \return False if the file does not exist.
+   */
+  virtual bool ReadFile(const std::string& name, std::string* data) = 0;
+
+  /*!
+   * \brief Get a path of a file of the entry on the file system, for the loaders that only accept
+   * a path, such as dlopen. The path is valid until the entry is destroyed.
+   * \param name The file name.
+   * \return The file path.
+   */
+  virtual std::string FilePath(const std::string& name) = 0;
+};
+
+/*!
+ * \brief The on-disk storage of a persistent cache. An entry is saved to a directory by the cache
+ * value itself and loaded from a PersistEntry, and the store decides where the data lives. The
+ * store keeps the full key of each entry, so a hash collision never loads the entry of another key.
+ * Entries are evicted in the LRU order when the store exceeds its budget. The store is not
+ * thread-safe.
+ */
+class PersistStore {
+ public:
+  /*! \brief The function to load a value from the files of an entry. */
+  using FLoad = std::function<void(PersistEntry*)>;
+  /*! \brief The function to save an entry to the given directory. Returns false on failure. */
+  using FSave = std::function<bool(const std::string&)>;
+
+  PersistStore(const std::string& path, size_t max_entries, size_t max_bytes)
+      : path_(path), max_entries_(max_entries), max_bytes_(max_bytes) {
+  }
+
+  virtual ~PersistStore() = default;
+
+  /*!
+   * \brief Create the store of a cache.
+   * \param path The directory of the cache.
+   * \param config The cache config.
+   * \return The store, which is a single packed file if config.packed is set, or one directory
+   * per entry otherwise.
+   */
+  static std::unique_ptr<PersistStore> Create(const std::string& path,
+                                              const PersistCacheConfig& config);
+
+  /*!
+   * \brief Load the entry of a key.
+   * \param key The full key.
+   * \param f_load The function to load the value from the entry.
+   * \return False if the key is not stored.
+   */
+  virtual bool Load(const std::string& key, const FLoad& f_load) = 0;
+
+  /*!
+   * \brief Save the entry of a key, which overwrites the existing one.
+   * \param key The full key.
+   * \param f_save The function to save the entry to a directory.
+   * \return False if f_save failed.
+   */
+  virtual bool Save(const std::string& key, const FSave& f_save) = 0;
+
+  /*! \brief Get the store metrics. */
+  std::unordered_map<std::string, size_t> GetMetric();
+
+ protected:
+  /*! \brief Remove the stored data of an entry. The index is updated by the caller. */
+  virtual void Remove(const std::string& id) = 0;
+
+  /*! \brief Mark an entry as the most recently used. */
+  void Touch(const std::string& id);
+
+  /*! \brief Add an entry to the index as the most recently used. */
+  void Insert(const std::string& id, size_t nbytes);
+
+  /*! \brief Remove an entry from the index. */
+  void Erase(const std::string& id);
+
+  /*!
+   * \brief Evict the least recently used entries until the store fits in the budget. The most
+   * recently used entry is always kept, even if it alone exceeds the byte budget.
+   */
+  void Evict();
+
+  /*! \brief The directory of the cache. */
+  std::string path_;
+  /*! \brief The maximum number of entries. 0 means no limit. */
+  size_t max_entries_;
+  /*! \brief The maximum number of bytes. 0 means no limit. */
+  size_t max_bytes_;
+  /*! \brief Whether the entries are indexed. The index is required to enforce the budget. */
+  bool indexed_ = true;
+  /*! \brief The entry IDs from the most to the least recently used. */
+  std::list<std::string> lru_;
+  /*! \brief Map from the entry ID to its size in bytes and its position in lru_. */
+  std::unordered_map<std::string, std::pair<size_t, std::list<std::string>::iterator>> index_;
+  /*! \brief The total size of the indexed entries in bytes. */
+  size_t total_bytes_ = 0;
+  /*! \brief The store metrics. */
+  std::unordered_map<std::string, size_t> metrics_;
+};
+
+/*!
+ * \brief A cache that keeps at most max_entries values in memory and optionally persists them
+ * on disk. Both levels evict in the LRU order. Values must implement
+ * `static T Load(PersistEntry* entry)` and `bool Save(const std::string& dir)`.
+ */
 template <typename T>
-class MetaPersistCache : public MetaCache<T>, public MetaCacheMetric {
+class MetaPersistCache : public MetaCacheMetric {
  public:
-  MetaPersistCache(const std::string persist_name) : persist_name_(persist_name) {
+  explicit MetaPersistCache(const std::string persist_name,
+                            const PersistCacheConfig& config = PersistCacheConfig::FromEnv())
+      : persist_name_(persist_name), max_entries_(config.max_entries) {
     // Enable persistent by users.
-    const char* enable_persist = getenv("RAF_PERSIST_CACHE");
-    if (enable_persist != nullptr && strcmp(enable_persist, "1") == 0) {
-      DLOG(INFO) << "Persistent for cache " << persist_name_ << " is enabled";
-      persist_ = true;
-    } else {
+    if (!config.persist) {
       return;
     }
+    DLOG(INFO) << "Persistent for cache " << persist_name_ << " is enabled";
 
-    // Determine and create the directory for the cache root.
-    const char* temp = getenv("RAF_PERSIST_CACHE_PATH");
-    std::string cache_path;
-    if (temp == nullptr) {
-      const char* home = getenv("HOME");
-      CHECK(home != nullptr) << "HOME environment variable is not set";
-      cache_path = std::string(home) + "/.raf_cache";
-    } else {
-      cache_path = std::string(temp);
-    }
-    CreateDir(cache_path);
-    path_ = cache_path + "/" + persist_name_;
-
-    // Create the directory for this cache.
+    // Create the directory for the cache root and this cache.
+    CreateDir(config.root_path);
+    path_ = config.root_path + "/" + persist_name_;
     CreateDir(path_);
+    store_ = PersistStore::Create(path_, config);
   }
 
-  const T* Get(const std::vector<uint8_t>& key) {
+  std::shared_ptr<const T> Get(const std::vector<uint8_t>& key) {
     const std::string key_str(key.begin(), key.end());
     return Get(key_str);
   }
 
-  const T* Get(const std::string& key) {
+  std::shared_ptr<const T> Get(const std::string& key) {
     AddMetric("CacheGet", 1);
 
     // Cache hit.
-    if (auto val = MetaCache<T>::Get(key)) {
-      AddMetric("CacheHit", 1);
-      return val;
+    {
+      std::lock_guard<std::mutex> lock(mu_);
+      auto iter = cached_.find(key);
+      if (iter != cached_.end()) {
+        lru_.splice(lru_.begin(), lru_, iter->second.second);
+        AddMetric("CacheHit", 1);
+        return iter->second.first;
+      }
     }
     AddMetric("CacheMiss", 1);
-    if (!persist_) {
+    if (store_ == nullptr) {
       return nullptr;
     }
 
     // Cache miss, try to load from the persistent cache.
-    std::lock_guard<std::mutex> lock(mu_);
-
-    auto persist_path = GetPersistPath(key);
-
-    // Persistent cache miss.
-    if (!DirExists(persist_path)) {
-      AddMetric("PersistCacheMiss", 1);
-      return nullptr;
-    }
-    AddMetric("PersistCacheHit", 1);
-
+    std::lock_guard<std::mutex> lock(persist_mu_);
+    std::shared_ptr<T> val;
     try {
-      MetaCache<T>::Set(key, T::Load(persist_path));
-      return MetaCache<T>::Get(key);
+      bool found = store_->Load(key, [&](PersistEntry* entry) {
+        AddMetric("PersistCacheHit", 1);
+        val = std::make_shared<T>(T::Load(entry));
+      });
+      // Persistent cache miss.
+      if (!found) {
+        AddMetric("PersistCacheMiss", 1);
+        return nullptr;
+      }
     } catch (dmlc::Error& e) {
       AddMetric("PersistCacheLoadFailure", 1);
       LOG(WARNING) << "Failed to load persist entry " << path_ << ": " << e.what();
       return nullptr;
     }
-    return nullptr;
+
+    std::lock_guard<std::mutex> mem_lock(mu_);
+    return Insert(key, val);
   }
 
   void Set(const std::vector<uint8_t>& key, T val) {
@@ -283,44 +420,118 @@ class MetaPersistCache : public MetaCache<T>, public MetaCacheMetric {
 
   void Set(const std::string& key, T val) {
     AddMetric("CacheSet", 1);
-    MetaCache<T>::Set(key, val);
-    if (!persist_) {
+    {
+      std::lock_guard<std::mutex> lock(mu_);
+      if (cached_.count(key)) {
+        LOG(FATAL) << "KeyError: The key is already cached!";
+        throw;
+      }
+      Insert(key, std::make_shared<T>(val));
+    }
+    if (store_ == nullptr) {
       return;
     }
 
-    std::lock_guard<std::mutex> lock(mu_);
-
-    auto persist_path = GetPersistPath(key);
-    CreateDir(persist_path);
-
     // Persist the cache value.
+    std::lock_guard<std::mutex> lock(persist_mu_);
     try {
-      if (!val.Save(persist_path)) {
-        throw;
+      if (!store_->Save(key, [&](const std::string& entry_path) { return val.Save(entry_path); })) {
+        AddMetric("PersistCacheSaveFailure", 1);
       }
     } catch (dmlc::Error& e) {
       AddMetric("PersistCacheSaveFailure", 1);
       LOG(WARNING) << "Failed to persist cache entry to " << path_ << ": " << e.what();
-      return;
     }
+  }
 
-    std::ofstream metadata_file(persist_path + "/timestamp");
-    metadata_file << std::chrono::system_clock::to_time_t(std::chrono::system_clock::now())
-                  << std::endl;
-    metadata_file.close();
+  /*!
+   * \brief Get the value of a key, or create and cache it if the key is missing. Concurrent calls
+   * with the same key are serialized, so the value is only created once.
+   * \param key The key.
+   * \param f_create The function to create the value.
+   * \return The cached or created value.
+   */
+  T GetOrCreate(const std::vector<uint8_t>& key, std::function<T()> f_create) {
+    const std::string key_str(key.begin(), key.end());
+    // Fast path without the per-key lock.
+    if (auto val = Get(key_str)) {
+      return *val;
+    }
+    std::shared_ptr<std::mutex> key_mu;
+    {
+      std::lock_guard<std::mutex> lock(creating_mu_);
+      auto& mu = creating_[key_str];
+      if (mu == nullptr) {
+        mu = std::make_shared<std::mutex>();
+      }
+      key_mu = mu;
+    }
+    // Remove the per-key lock when leaving, unless it has been replaced by a later creator.
+    std::shared_ptr<void> erase_guard(nullptr, [&](void*) {
+      std::lock_guard<std::mutex> lock(creating_mu_);
+      auto iter = creating_.find(key_str);
+      if (iter != creating_.end() && iter->second == key_mu) {
+        creating_.erase(iter);
+      }
+    });
+    std::lock_guard<std::mutex> key_lock(*key_mu);
+    // Another creator of the key may have finished while waiting for the lock. Its value is in
+    // memory, so the re-check neither counts as another lookup nor reads the persistent store.
+    {
+      std::lock_guard<std::mutex> lock(mu_);
+      auto iter = cached_.find(key_str);
+      if (iter != cached_.end()) {
+        lru_.splice(lru_.begin(), lru_, iter->second.second);
+        return *iter->second.first;
+      }
+    }
+    T val = f_create();
+    Set(key_str, val);
+    return val;
   }
 
   std::unordered_map<std::string, size_t> GetMetric() override {
-    return metrics_;
+    std::unordered_map<std::string, size_t> ret;
+    {
+      std::lock_guard<std::mutex> lock(metric_mu_);
+      ret = metrics_;
+    }
+    {
+      std::lock_guard<std::mutex> lock(mu_);
+      ret["CacheEntries"] = cached_.size();
+    }
+    if (store_ != nullptr) {
+      std::lock_guard<std::mutex> lock(persist_mu_);
+      for (const auto& kv : store_->GetMetric()) {
+        ret[kv.first] = kv.second;
+      }
+    }
+    return ret;
   }
 
  private:
-  inline std::string GetPersistPath(const std::string& key) {
-    const size_t hashed_key = std::hash<std::string>{}(key);
-    return path_ + "/" + std::to_string(hashed_key);
+  /*!
+   * \brief Insert a value as the most recently used one and evict the least recently used values
+   * if the cache is full. If the key is already cached, the cached value is kept. Must be called
+   * with mu_ held.
+   */
+  std::shared_ptr<const T> Insert(const std::string& key, std::shared_ptr<T> val) {
+    auto iter = cached_.find(key);
+    if (iter != cached_.end()) {
+      return iter->second.first;
+    }
+    lru_.push_front(key);
+    cached_.emplace(key, std::make_pair(val, lru_.begin()));
+    while (max_entries_ > 0 && cached_.size() > max_entries_) {
+      cached_.erase(lru_.back());
+      lru_.pop_back();
+      AddMetric("CacheEvict", 1);
+    }
+    return val;
   }
 
   inline void AddMetric(const std::string name, size_t val) {
+    std::lock_guard<std::mutex> lock(metric_mu_);
     metrics_[name] += val;
   }
 
@@ -330,10 +541,26 @@ class MetaPersistCache : public MetaCache<T>, public MetaCacheMetric {
   std::string persist_name_;
   /*! \brief Persist directory path. */
   std::string path_;
-  /*! \brief Whether to presist values. */
-  bool persist_ = false;
-  /*! \brief The thread-safe lock. */
+  /*! \brief The maximum number of values in memory. 0 means no limit. */
+  size_t max_entries_ = 0;
+  /*! \brief The keys from the most to the least recently used. */
+  std::list<std::string> lru_;
+  /*! \brief Map from the key to its value and its position in lru_. */
+  std::unordered_map<std::string,
+                     std::pair<std::shared_ptr<const T>, std::list<std::string>::iterator>>
+      cached_;
+  /*! \brief The persistent store. nullptr if persistent is disabled. */
+  std::unique_ptr<PersistStore> store_;
+  /*! \brief The lock for the values in memory. */
   std::mutex mu_;
+  /*! \brief The lock for the persistent store. */
+  std::mutex persist_mu_;
+  /*! \brief The lock for metrics. */
+  std::mutex metric_mu_;
+  /*! \brief The per-key locks of the values being created by GetOrCreate. */
+  std::unordered_map<std::string, std::shared_ptr<std::mutex>> creating_;
+  /*! \brief The lock for creating_. */
+  std::mutex creating_mu_;
 };
 
 PackedMetricMap DumpMetric(const std::string& cache_name);
@@ -8,6 +8,7 @@
  * \brief Definition of device related data structure.
  */
 #pragma once
+#include <cstdlib>
 #include <string>
 #include "dlpack/dlpack.h"
 #include "tvm/runtime/c_runtime_api.h"
@@ -97,8 +98,12 @@ class Device : public ObjectRef {
   tvm::Target tvm_target() const {
     auto dl_device_type = tvm::runtime::String(self()->device_type.c_str());
     if (dl_device_type == "cpu") {
-      // Device type in DLDevice does not recognize "cpu" but only "llvm".
-      dl_device_type = tvm::runtime::String("llvm");
+      // Device type in DLDevice does not recognize "cpu" but only "llvm". RAF_CPU_TARGET
+      // overrides the LLVM target, e.g., with the -mcpu of the host that the schedules are
+      // tuned for.
+      const char* cpu_target = getenv("RAF_CPU_TARGET");
+      dl_device_type = tvm::runtime::String(
+          cpu_target != nullptr && cpu_target[0] != '\0' ? cpu_target : "llvm");
     }
     return tvm::Target(dl_device_type);
   }
@@ -8,6 +8,7 @@
  * \brief Unified low-level API for heterogeneous devices
  */
 #pragma once
+#include <functional>
 #include <memory>
 #include "./device.h"
 
@@ -168,6 +169,17 @@ class DeviceAPI {
    */
   virtual void WaitEvent(void* event) = 0;
 
+  /*!
+   * \brief Launch a host function on given stream. The function runs after all workloads issued
+   * to the stream before it, and the workloads issued after it wait for it to finish.
+   * \param stream The stream to launch the function on.
+   * \param func The function.
+   */
+  virtual void LaunchHostFunc(void* stream, std::function<void()> func) {
+    LOG(FATAL) << "NotImplementedError: LaunchHostFunc is not supported on this device";
+    throw;
+  }
+
   /*!
    * \brief The the device api of given device type
    * \param device_type The device type.
@@ -36,6 +36,7 @@ class Executor {
 namespace interpreter {
 value::Value Interpret(ir::Expr expr, ir::Optional<ir::IRModule> mod = {});
 value::Value InvokePrimitive(const op::CallValues& call);
+value::Value InvokePrimitive(const op::CallValues& call, const ir::Array<value::Value>& args);
 value::Value InvokeClosure(const op::CallValues& call);
 }  // namespace interpreter
 }  // namespace executor
@@ -9,10 +9,14 @@
  */
 #pragma once
 
+#include <dirent.h>
 #include <sys/stat.h>
+#include <unistd.h>
 #include <fstream>
 #include <cerrno>
 #include <cstring>
+#include <string>
+#include <vector>
 #include "dmlc/logging.h"
 
 namespace raf {
@@ -31,4 +35,44 @@ inline bool DirExists(const std::string& path) {
   ifs.close();
   return ret;
 }
+
+/*!
+ * \brief List the names of the entries in a directory, excluding "." and "..".
+ * \param path The directory path.
+ * \return The entry names. Empty if the directory does not exist.
+ */
+inline std::vector<std::string> ListDir(const std::string& path) {
+  std::vector<std::string> ret;
+  DIR* dir = opendir(path.c_str());
+  if (dir == nullptr) {
+    return ret;
+  }
+  while (struct dirent* entry = readdir(dir)) {
+    std::string name(entry->d_name);
+    if (name != "." && name != "..") {
+      ret.push_back(name);
+    }
+  }
+  closedir(dir);
+  return ret;
+}
+
+/*!
+ * \brief Remove a file or a directory with all its contents.
+ * \param path The path to be removed.
+ */
+inline void RemoveDir(const std::string& path) {
+  struct stat st;
+  if (lstat(path.c_str(), &st) != 0) {
+    return;
+  }
+  if (S_ISDIR(st.st_mode)) {
+    for (const auto& name : ListDir(path)) {
+      RemoveDir(path + "/" + name);
+    }
+    rmdir(path.c_str());
+  } else {
+    unlink(path.c_str());
+  }
+}
 }  // namespace raf
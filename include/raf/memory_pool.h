@@ -10,6 +10,7 @@
 #pragma once
 #include <memory>
 #include <string>
+#include <unordered_map>
 #include <vector>
 #include "./device.h"
 
@@ -45,6 +46,8 @@ class Memory {
 
   static std::pair<float, float> GetPoolSize(const Device& dev);
 
+  static std::unordered_map<std::string, float> GetPoolStats(const Device& dev);
+
   // means "no longer considered as allocator when asking for new memory."
   static void RemovePool(const Device& dev);
 
@@ -124,6 +127,17 @@ class MemoryPool {
    * \return A pair of the total size of (used chunks, pool).
    */
   virtual std::pair<float, float> GetPoolSize() = 0;
+
+  /*!
+   * \brief Get the detailed statistics of the pool, such as the peak usage and fragmentation.
+   * Pools that do not track anything beyond the pool size only report "used" and "pool".
+   *
+   * \return A map from the statistic name to its value. Sizes are in MBs.
+   */
+  virtual std::unordered_map<std::string, float> GetPoolStats() {
+    auto pool_size = GetPoolSize();
+    return {{"used", pool_size.first}, {"pool", pool_size.second}};
+  }
 };
 
 }  // namespace memory_pool
@@ -13,6 +13,8 @@
 #include "raf/cache.h"
 #include "op.h"
 #include "op_utils.h"
+#include <functional>
+#include <mutex>
 #include <unordered_map>
 
 #ifdef RAF_USE_CUDA
@@ -31,6 +33,91 @@ using LatencyAndWorkspaceMapT =
     std::unordered_map<std::string, std::pair<std::vector<float>, int64_t>>;
 using OpEnvMapT = std::unordered_map<std::string, OpEnvPtr>;
 
+/*! \brief A profiled latency record. */
+struct LatencyRecord {
+  /*! \brief The latency of each repeat in microseconds. */
+  std::vector<float> latency;
+  /*! \brief The workspace size in bytes. */
+  int64_t workspace_size = 0;
+};
+
+/*!
+ * \brief A database of profiled op latencies that outlives the process. Keys are built from the
+ * device, the op (or the structural hash of a fused function) with its constant arguments, the
+ * argument and return types, and the stream assignment, so that records are reusable by other
+ * processes and by other machines with the same device. A database is a text file with one
+ * record per line. New records are appended to the file as they are profiled, so concurrent
+ * processes can share one file. Records from several machines are merged with Import.
+ */
+class OpLatencyDB {
+ public:
+  /*!
+   * \brief Create a database.
+   * \param path The file to load the records from and append new records to. Empty to keep the
+   * records in memory only.
+   */
+  explicit OpLatencyDB(const std::string& path = "");
+
+  /*!
+   * \brief The database shared by all op profilers. It is persisted to RAF_OP_LATENCY_DB if
+   * set, or to op_latency.db under the persistent cache directory if RAF_PERSIST_CACHE is set.
+   */
+  static OpLatencyDB* Global();
+
+  /*!
+   * \brief Look up a record.
+   * \param key The record key.
+   * \param record The record to be filled.
+   * \return Whether the record is found.
+   */
+  bool Lookup(const std::string& key, LatencyRecord* record);
+
+  /*!
+   * \brief Add a record and append it to the database file, if any.
+   * \param key The record key.
+   * \param record The record.
+   * \param overwrite Whether to overwrite the existing record of the same key.
+   * \return Whether the record is added.
+   */
+  bool Add(const std::string& key, const LatencyRecord& record, bool overwrite = false);
+
+  /*!
+   * \brief Merge the records of a database file into this database.
+   * \param path The database file.
+   * \param overwrite Whether to overwrite the existing records with the imported ones.
+   * \return The number of added records.
+   */
+  int64_t Import(const std::string& path, bool overwrite = false);
+
+  /*!
+   * \brief Write all records to a database file.
+   * \param path The database file, which is replaced atomically.
+   * \return The number of written records.
+   */
+  int64_t Export(const std::string& path);
+
+  /*! \brief Remove all records in memory. The database file is left untouched. */
+  void Clear();
+
+  /*! \brief Get the number of records, lookups and misses. */
+  std::unordered_map<std::string, int64_t> GetMetric();
+
+ private:
+  /*! \brief Parse the records of a file and add them. Must be called with mu_ held. */
+  int64_t LoadFile(const std::string& path, bool overwrite, bool persist);
+  /*! \brief Append a record to the database file. Must be called with mu_ held. */
+  void Append(const std::string& key, const LatencyRecord& record);
+
+  /*! \brief The database file, or empty if the database is in memory only. */
+  std::string path_;
+  /*! \brief Map from the key to the record. */
+  std::unordered_map<std::string, LatencyRecord> records_;
+  /*! \brief The metrics. */
+  std::unordered_map<std::string, int64_t> metrics_;
+  /*! \brief The lock of the records. */
+  std::mutex mu_;
+};
+
 /*! \brief A class to JIT op, create dummy input data, and allocate memory buffers for profiling. */
 class OpWithData {
  public:
@@ -103,6 +190,16 @@ class OpProfiler {
    */
   OpEnvPtr GetOpEnv(const Expr& op);
 
+  /*!
+   * \brief Set whether to skip profiling. In this mode, the latency of ops missing in the
+   * latency database is estimated from their GFLOPS instead of being measured on the device.
+   * The default is read from RAF_OP_PROFILER_NO_PROFILE.
+   */
+  static void SetNoProfile(bool no_profile);
+
+  /*! \brief Whether profiling is skipped. */
+  static bool IsNoProfile();
+
   /*!
    * \brief Get the current size of latency cache.
    */
@@ -130,35 +227,44 @@ class OpProfiler {
   /*! \brief A cache to store built OpEnv. */
   OpEnvMapT op_env_cache_;
 
+  /*!
+   * \brief The peak throughput of the device in GFLOPS, which is used to estimate the latency
+   * in the no-profile mode. It can be overridden by RAF_OP_PROFILER_PEAK_GFLOPS.
+   */
+  virtual float PeakGFLOPS() const = 0;
+
  private:
+  /*!
+   * \brief Look up the latency database, or profile the ops with f_profile and add the result to
+   * the database. In the no-profile mode, a missing latency is estimated instead.
+   * \param db_key The key of the ops in the latency database.
+   * \param ops The ops.
+   * \param repeat The number of repeat iterations.
+   * \param f_profile The function to profile the ops.
+   * \return The latency and workspace size.
+   */
+  std::pair<std::vector<float>, int64_t> LookupOrProfile(
+      const std::string& db_key, const std::vector<Expr>& ops, int32_t repeat,
+      const std::function<std::pair<std::vector<float>, int64_t>()>& f_profile);
+
+  /*!
+   * \brief Estimate the latency of a group of ops in microseconds from their GFLOPS. The ops are
+   * assumed to run back to back.
+   */
+  float EstimateLatency(const std::vector<Expr>& ops);
+
+  /*! \brief The device description in the latency database keys, e.g. "cuda:Tesla V100". */
+  std::string DeviceTag() const;
+
   /*!
    * \brief Generate a byte string hash for the given call node using its op as well as
-   * argument and return types.
+   * argument and return types. Constants are hashed by their types and contents, so the key is
+   * stable across processes for the latency database.
    *
    * \param call The call node to be hashed.
    * \return The hashed key.
    */
-  HashKey HashCall(const Call& call) {
-    HashKey key;
-
-    // Hash op name. Note that we directly use the object address as the key
-    // because all fused op closures have the same name at this stage.
-    if (auto op_node = call->op.as<OpNode>()) {
-      key << op_node->name;
-    } else if (auto fn_node = call->op.as<FunctionNode>()) {
-      key << uint64_t(ObjectPtrHash()(GetRef<Function>(fn_node)));
-    } else {
-      LOG(FATAL) << "OpProfiler does not deal with " << call->op->GetTypeKey();
-      throw;
-    }
-
-    // Hash argument and return types.
-    for (auto arg : call->args) {
-      key << raf::ir::AsText(arg->checked_type(), false);
-    }
-    key << raf::ir::AsText(call->checked_type(), false);
-    return key;
-  }
+  HashKey HashCall(const Call& call);
 
   /*!
    * \brief Generate a byte string hash for the given group node using their op, arguments,
@@ -231,6 +337,11 @@ class CPUOpProfiler : public OpProfiler {
   virtual ~CPUOpProfiler() {
   }
 
+ protected:
+  float PeakGFLOPS() const override {
+    return 100;
+  }
+
  private:
   /*!
    * \brief The function that actually executes the op on the device.
@@ -279,6 +390,11 @@ class CUDAOpProfiler : public OpProfiler {
     }
   }
 
+ protected:
+  float PeakGFLOPS() const override {
+    return 10000;
+  }
+
  private:
   /*!
    * \brief The function that actually executes the op on the device.
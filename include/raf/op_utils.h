@@ -131,6 +131,17 @@ inline bool IsNonDeterministicOp(const Op& op) {
   return IsInOpSet(op, non_deterministic_ops);
 }
 
+/*!
+ * \brief Whether the type function of the op reads the data of its tensor arguments, which may
+ * live on devices. The other type functions only read the data of the shape-like tensors on host.
+ */
+inline bool IsValueDependentTypeOp(const Expr& op) {
+  static OpSet value_dependent_ops = {
+      Op::Get("raf.op.arange"),
+  };
+  return IsInOpSet(op, value_dependent_ops);
+}
+
 inline bool IsMemcpyOp(const Expr& op) {
   static OpSet memcpy_ops = {
       Op::Get("raf.op.fuse_tensor"),
@@ -9,14 +9,17 @@
  */
 #pragma once
 #include <dmlc/concurrentqueue.h>
+#include <atomic>
 #include <cstdint>
 #include <array>
+#include <map>
 #include <utility>
 #include <vector>
 #include <string>
 #include <mutex>
 #include <memory>
 #include <thread>
+#include <unordered_map>
 #include <iostream>
 #include <fstream>
 #include <sstream>
@@ -48,6 +51,17 @@
 #define WITH_BASE_PROFILER(DEVICE, NAME, CAT, ARGS, CODE_SNIPPET) \
   WITH_BASE_PROFILER_LEVEL(1, DEVICE, NAME, CAT, ARGS, CODE_SNIPPET)
 
+#define WITH_LIGHT_PROFILER(DEVICE, NAME, CAT, CODE_SNIPPET)                          \
+  {                                                                                   \
+    auto* _light_prof = raf::profiler::Profiler::Get();                               \
+    if (_light_prof->IsLightProfiling()) {                                            \
+      raf::profiler::LightProfilerScope _light_scope(_light_prof, DEVICE, NAME, CAT); \
+      CODE_SNIPPET                                                                    \
+    } else {                                                                          \
+      CODE_SNIPPET                                                                    \
+    }                                                                                 \
+  }
+
 namespace raf {
 namespace profiler {
 
@@ -151,6 +165,80 @@ class DeviceStats {
   ~DeviceStats();
 };
 
+/*! \brief A fixed-size event recorded by the light-weight profiler. */
+struct LightEvent {
+  /*! \brief The interned name of the event */
+  uint32_t name;
+  /*! \brief The interned category of the event */
+  uint32_t category;
+  /*! \brief The start time in microseconds */
+  uint64_t start_time;
+  /*! \brief The end time in microseconds */
+  uint64_t end_time;
+};
+
+/*!
+ * \brief A ring buffer of light events owned by a single thread. Only the owner thread pushes
+ * events, so pushing is lock-free. When the buffer is full, the oldest events are overwritten.
+ */
+class LightEventRing {
+ public:
+  explicit LightEventRing(size_t capacity) : events_(capacity) {
+  }
+
+  inline void Push(const LightEvent& event) {
+    uint64_t head = head_.load(std::memory_order_relaxed);
+    events_[head % events_.size()] = event;
+    head_.store(head + 1, std::memory_order_release);
+  }
+
+  /*! \brief Copy the retained events. Events pushed concurrently may be missed. */
+  std::vector<LightEvent> Snapshot() const;
+
+  /*! \brief Drop all events pushed so far. */
+  void Clear();
+
+  /*! \brief The number of events overwritten before they are read. */
+  uint64_t NumDropped() const;
+
+ private:
+  /*! \brief The event slots */
+  std::vector<LightEvent> events_;
+  /*! \brief The total number of pushed events */
+  std::atomic<uint64_t> head_{0};
+  /*! \brief The number of pushed events when the ring was cleared */
+  std::atomic<uint64_t> begin_{0};
+};
+
+/*!
+ * \brief A light event on a device other than the host, whose duration is measured by a pair of
+ * device events and resolved when the light events are read.
+ */
+struct LightDeviceEvent {
+  /*! \brief The interned name of the event */
+  uint32_t name;
+  /*! \brief The interned category of the event */
+  uint32_t category;
+  /*! \brief The host time in microseconds when the start event was recorded */
+  uint64_t start_time;
+  /*! \brief The device on which the events are recorded */
+  Device device;
+  /*! \brief The device event recorded before the scope */
+  void* start_event;
+  /*! \brief The device event recorded after the scope */
+  void* end_event;
+};
+
+/*! \brief The statistics of the light events with the same name, in microseconds. */
+struct LightEventSummary {
+  std::string name;
+  int64_t count;
+  double total;
+  double mean;
+  double p50;
+  double p99;
+};
+
 class ProfilerHelper {
  public:
   ProfilerHelper(int dev_id, raf::DevType dev_type, std::string name, std::string categories,
@@ -220,9 +308,58 @@ class Profiler {
     return helpers_;
   }
 
+  inline bool IsLightProfiling() const {
+    return light_profiling_.load(std::memory_order_relaxed);
+  }
+
+  inline void set_light_profiling(bool enable) {
+    light_profiling_.store(enable, std::memory_order_relaxed);
+  }
+
+  /*!
+   * \brief Intern a string to an integer id. The ids are cached per thread, so only the first
+   * lookup of a string in each thread takes the lock.
+   */
+  uint32_t Intern(const std::string& str);
+
+  /*! \brief Record a light event to the ring buffer of the calling thread. */
+  inline void AddLightEvent(uint32_t name, uint32_t category, uint64_t start_time,
+                            uint64_t end_time) {
+    GetLightEventRing()->Push({name, category, start_time, end_time});
+  }
+
+  /*!
+   * \brief Aggregate the light events of all threads by name.
+   * \param category Only the events of this category are aggregated. Empty matches all.
+   * \param num_dropped The number of events overwritten in the ring buffers.
+   */
+  std::vector<LightEventSummary> GetLightEventSummary(const std::string& category,
+                                                      uint64_t* num_dropped = nullptr);
+
+  /*! \brief Drop the light events of all threads. */
+  void ClearLightEvents();
+
+  /*! \brief Get an unused device event of the given device, which is created if none is free. */
+  void* AcquireLightDeviceEvent(const Device& device);
+
+  /*!
+   * \brief Record a light event measured by a pair of device events. Its duration is resolved
+   * when the light events are read, so the device is not synchronized here.
+   */
+  void AddLightDeviceEvent(const LightDeviceEvent& event);
+
  private:
   Profiler();
 
+  /*! \brief Get the ring buffer of the calling thread, which is created on first use. */
+  LightEventRing* GetLightEventRing();
+
+  /*!
+   * \brief Wait for the pending device events, record their durations as light events and
+   * recycle the device events.
+   */
+  void ResolveLightDeviceEvents();
+
   /*! \brief Profile statistics. */
   DeviceStats profile_stats_;
   /*! \brief Profiling level. */
@@ -231,6 +368,73 @@ class Profiler {
   std::recursive_mutex m_;
   /*! \brief The helper pool. */
   std::vector<ProfilerHelper> helpers_;
+  /*! \brief Whether the light-weight profiler is enabled. */
+  std::atomic<bool> light_profiling_{false};
+  /*! \brief The number of events each per-thread ring buffer can hold. */
+  size_t light_ring_capacity_;
+  /*! \brief The per-thread ring buffers. They are kept after their threads exit. */
+  std::vector<std::shared_ptr<LightEventRing>> light_rings_;
+  /*! \brief The interned strings, indexed by their ids. */
+  std::vector<std::string> interned_;
+  /*! \brief Map from the interned strings to their ids. */
+  std::unordered_map<std::string, uint32_t> intern_ids_;
+  /*! \brief Mutex for the ring buffer list and the intern table. */
+  std::mutex light_mu_;
+  /*! \brief The device events whose durations are not resolved yet. */
+  std::vector<LightDeviceEvent> pending_device_events_;
+  /*! \brief The recycled device events, keyed by the (type, id) of the device they belong to. */
+  std::map<std::pair<int, int>, std::vector<void*>> free_device_events_;
+  /*! \brief Mutex for the pending and recycled device events. */
+  std::mutex light_device_mu_;
+};
+
+/*!
+ * \brief Record the duration of a scope as a light event. If the device is not the host, the
+ * duration is measured by device events recorded on the current stream, so the event covers the
+ * asynchronous kernels without synchronizing the device.
+ */
+class LightProfilerScope {
+ public:
+  LightProfilerScope(Profiler* prof, const Device& device, const std::string& name,
+                     const std::string& categories)
+      : prof_(prof),
+        device_(device),
+        name_(prof->Intern(name)),
+        categories_(prof->Intern(categories)) {
+    if (device_.device_type() != DevType::kCPU() && device_.device_type() != DevType::kUnknown()) {
+      dev_api_ = device_api::DeviceAPI::Get(device_.device_type());
+      start_event_ = prof_->AcquireLightDeviceEvent(device_);
+      dev_api_->EventRecordOnStream(start_event_, dev_api_->GetStream());
+    }
+    start_time_ = ProfileStat::NowInMicrosec();
+  }
+
+  ~LightProfilerScope() {
+    if (dev_api_) {
+      void* end_event = prof_->AcquireLightDeviceEvent(device_);
+      dev_api_->EventRecordOnStream(end_event, dev_api_->GetStream());
+      prof_->AddLightDeviceEvent(
+          {name_, categories_, start_time_, device_, start_event_, end_event});
+      return;
+    }
+    prof_->AddLightEvent(name_, categories_, start_time_, ProfileStat::NowInMicrosec());
+  }
+
+ private:
+  /*! \brief The profiler to record to */
+  Profiler* prof_;
+  /*! \brief the device on which profiled code runs */
+  Device device_;
+  /*! \brief The interned name */
+  uint32_t name_;
+  /*! \brief The interned category */
+  uint32_t categories_;
+  /*! \brief The start time */
+  uint64_t start_time_;
+  /*! \brief the api of the device on which profiled code runs, if it is not the host */
+  std::shared_ptr<device_api::DeviceAPI> dev_api_;
+  /*! \brief The device event recorded at the start, if the device is not the host */
+  void* start_event_{nullptr};
 };
 
 inline void ProfilerHelper::start() {
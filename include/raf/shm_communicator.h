@@ -0,0 +1,88 @@
+/*
+ * Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ * SPDX-License-Identifier: Apache-2.0
+ */
+
+/*!
+ * \file shm_communicator.h
+ * \brief Shared-memory communicator for the ranks on a single host.
+ */
+#pragma once
+#include <string>
+#include <vector>
+#include "raf/communicator.h"
+#include "raf/op_utils.h"
+#include "raf/value.h"
+
+namespace raf {
+namespace distributed {
+namespace communicator {
+
+/*! \brief The reduction applied by the shared-memory collectives. */
+enum class ShmReduceOp : int {
+  kSum = 0,
+  kProd = 1,
+  kMin = 2,
+  kMax = 3,
+  kAvg = 4,
+};
+
+/*! \brief Parse the "computation" argument of the collective ops. */
+ShmReduceOp ShmReduceOpFromString(const std::string& computation);
+
+/*!
+ * \brief A communicator backed by a POSIX shared-memory segment that is mapped by every rank
+ * of the group. Each rank owns one staging slot in the segment; collectives copy their inputs
+ * into the slots, synchronize with a barrier in the segment header and let every rank reduce
+ * (or gather) a disjoint partition, so the work is evenly split as in a ring reduce-scatter.
+ * Large messages are processed in chunks of the slot size. All ranks of the group must be on
+ * the same host.
+ */
+class ShmCommunicatorObj final : public CommunicatorObj {
+ public:
+  /*! \brief The global ranks of this group, in group rank order. */
+  std::vector<int64_t> group_ranks;
+  /*! \brief The base address of the mapped segment. */
+  void* segment = nullptr;
+  /*! \brief The size of the mapped segment in bytes. */
+  size_t segment_bytes = 0;
+  /*! \brief The size of a per-rank staging slot in bytes. */
+  size_t slot_bytes = 0;
+  /*! \brief The name of the segment, used to unlink it. */
+  std::string segment_name;
+  /*! \brief Whether the segment name is still linked in /dev/shm. */
+  bool linked = false;
+  Communicator parent_comm;  // Prevent the global communicator from releasing in advance
+
+  /*! \brief Block until all ranks of the group reach the barrier. */
+  void Barrier();
+  /*!
+   * \brief Reduce count elements of send_buf over the group and write the result to recv_buf.
+   * send_buf and recv_buf may alias.
+   */
+  void AllReduce(const void* send_buf, void* recv_buf, int64_t count, DType dtype,
+                 ShmReduceOp op);
+  /*! \brief Gather bytes bytes of send_buf from every rank into recv_buf in group rank order. */
+  void AllGather(const void* send_buf, void* recv_buf, int64_t bytes);
+  /*!
+   * \brief Reduce size * count elements of send_buf over the group and write the count elements
+   * of the rank-th partition to recv_buf.
+   */
+  void ReduceScatter(const void* send_buf, void* recv_buf, int64_t count, DType dtype,
+                     ShmReduceOp op);
+
+  ~ShmCommunicatorObj();
+
+  static constexpr const char* _type_key = "raf.distributed.ShmCommunicator";
+  RAF_FINAL_OBJECT(ShmCommunicatorObj, CommunicatorObj);
+};
+
+class ShmCommunicator final : public Communicator {
+ public:
+  static ShmCommunicator make(Value rank_list);
+  RAF_OBJECT_REF(ShmCommunicator, Communicator, ShmCommunicatorObj);
+};
+
+}  // namespace communicator
+}  // namespace distributed
+}  // namespace raf
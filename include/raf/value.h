@@ -505,6 +505,16 @@ T GetScalarValueData(const Value& value) {
  */
 Value CopyTo(Value src, const Device& dev);
 
+/*!
+ * \brief Copy a tensor value to a freshly allocated buffer on the specified device. Unlike
+ * CopyTo(Value, Device), the copy is always performed (even on the same device type) and goes
+ * through DeviceAPI::CopyDataFromTo without staging through the host.
+ * \param src The tensor value to be copied.
+ * \param dev The target device.
+ * \return The copied tensor value, which owns its memory.
+ */
+TensorValue CopyTensorTo(TensorValue src, const Device& dev);
+
 /*!
  * \brief Copy a value to another value.
  * \param src Value to be copyed.
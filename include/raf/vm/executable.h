@@ -68,6 +68,27 @@ class Executable : public tvm::runtime::ModuleNode {
    */
   static tvm::runtime::Module Load(const std::string& code, const tvm::runtime::Module lib);
 
+  /*!
+   * \brief Save the executable, including its constants and runtime library, into a single
+   * artifact file. The file consists of a fixed size header, the constant index, the bytecode,
+   * the embedded library, and a page-aligned section with the raw data of tensor constants.
+   *
+   * \param path The path of the artifact file.
+   */
+  void SaveArtifact(const std::string& path);
+
+  /*!
+   * \brief Load the executable from an artifact file. The file is memory-mapped, and tensor
+   * constants are CPU tensors referring to the mapped data without copying, so they are only
+   * read from the disk when accessed. Constants used on other devices are uploaded by the VM on
+   * their first LoadConst.
+   *
+   * \param path The path of the artifact file.
+   *
+   * \return exe The constructed executable.
+   */
+  static tvm::runtime::Module LoadArtifact(const std::string& path);
+
   /*!
    * \brief Get the serialized form of the `functions`. This is
    * essentially bytecode serialization.
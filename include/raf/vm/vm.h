@@ -9,9 +9,14 @@
  */
 #pragma once
 
+#include <dmlc/common.h>
+
+#include <atomic>
+#include <list>
 #include <memory>
 #include <string>
 #include <unordered_map>
+#include <unordered_set>
 #include <utility>
 #include <vector>
 #include "bytecode.h"
@@ -110,6 +115,62 @@ struct VMFrame {
   }
 };
 
+/*!
+ * \brief A compact binary signature of the shapes and dtypes of the inputs and outputs of an
+ * InvokeJit instruction. The hash is accumulated incrementally while the signature is built.
+ */
+struct OpEnvSignature {
+  /*! \brief The packed dtype, rank and shape words. */
+  std::vector<int64_t> data;
+  /*! \brief The hash of data. */
+  size_t hash{0};
+
+  inline void Clear() {
+    data.clear();
+    hash = 0;
+  }
+
+  inline void Append(int64_t word) {
+    data.push_back(word);
+    hash = dmlc::HashCombine(hash, word);
+  }
+
+  inline bool operator==(const OpEnvSignature& other) const {
+    return hash == other.hash && data == other.data;
+  }
+};
+
+/*! \brief The hasher for OpEnvSignature, which simply returns the precomputed hash. */
+struct OpEnvSignatureHash {
+  size_t operator()(const OpEnvSignature& sig) const {
+    return sig.hash;
+  }
+};
+
+/*! \brief An OpEnv to be created ahead of time when warming up the VM. */
+struct WarmupTask {
+  /*! \brief The index of the VM function that contains the InvokeJit instruction. */
+  Index func_index;
+  /*! \brief The program counter of the InvokeJit instruction. */
+  Index pc;
+  /*! \brief The signature of the inputs and outputs. */
+  OpEnvSignature sig;
+  /*! \brief The call values to create the OpEnv. */
+  CallValues call_values;
+};
+
+/*! \brief An op launched to a CPU stream. */
+struct AsyncOpTask {
+  /*! \brief The OpEnv to execute. */
+  std::shared_ptr<OpEnv> op_env;
+  /*! \brief The inputs. */
+  std::vector<Value> inputs;
+  /*! \brief The output. */
+  Value output;
+  /*! \brief The workspace memory of the op. */
+  std::vector<std::shared_ptr<memory_pool::Memory>> workspace;
+};
+
 /*!
  * \brief VMContextObj holds the runtime data for an execution in the VM.
  */
@@ -137,12 +198,28 @@ class VMContextObj : public ValueObj {
   std::vector<std::shared_ptr<Event>> barrier_events;
   /*! \brief The streams used in runtime. */
   std::vector<std::vector<std::shared_ptr<Stream>>> streams;
+  /*! \brief Whether any CPU stream has been created, so the default stream has to wait. */
+  bool has_cpu_streams{false};
   /*! \brief The index of the barrier event to use for next stream barrier. */
   Index current_barrier_event_index{0};
   /*! \brief The index of current device id to launch kernels. */
   Index current_device_id{0};
   /*! \brief The index of current working stream into cuda_streams. 0 indicates default stream. */
   Index current_stream_id{0};
+  /*!
+   * \brief Whether the context is used to warm up the VM. In this case, the op execution is
+   * skipped, and the OpEnvs that are not cached yet are collected to warmup_tasks.
+   */
+  bool warmup{false};
+  /*! \brief The OpEnvs to be created by the warmup. */
+  std::vector<WarmupTask> warmup_tasks;
+  /*! \brief The signatures of warmup_tasks extended with the function index and the pc. */
+  std::unordered_set<OpEnvSignature, OpEnvSignatureHash> warmup_queued;
+  /*!
+   * \brief The ops launched to the CPU streams. They hold the inputs, outputs and workspaces of
+   * the ops, so that the memory is released by the VM thread after the streams are synchronized.
+   */
+  std::vector<std::shared_ptr<AsyncOpTask>> async_op_tasks;
 
   void VisitAttrs(tvm::AttrVisitor* v) {
     v->Visit("func_index", &func_index);
@@ -210,17 +287,59 @@ class VMContext : public Value {
   RAF_MUTABLE_OBJECT_REF(VMContext, Value, VMContextObj);
 };
 
-using OpEnvCache = MetaCache<OpEnvPtr>;
+/*!
+ * \brief The OpEnv cache for a single InvokeJit instruction. It remembers the last seen signature
+ * and OpEnv as a fast path, and only queries the signature map when the signature changes.
+ */
+class InstrOpEnvCache {
+ public:
+  /*!
+   * \brief Lookup the OpEnv for a given signature.
+   * \param sig The signature of the inputs and outputs.
+   * \param fast_path Set to true if the signature matches the last seen one.
+   * \return The cached OpEnv, or nullptr if the signature is not cached.
+   */
+  OpEnvPtr Get(const OpEnvSignature& sig, bool* fast_path);
+
+  /*!
+   * \brief Add an OpEnv to the cache and make it the last seen one.
+   * \param sig The signature of the inputs and outputs.
+   * \param op_env The OpEnv.
+   */
+  void Set(const OpEnvSignature& sig, OpEnvPtr op_env);
+
+  /*!
+   * \brief Clear the cache.
+   */
+  void Clear();
+
+ private:
+  /*! \brief The last seen signature. */
+  OpEnvSignature last_sig_;
+  /*! \brief The OpEnv of the last seen signature. */
+  OpEnvPtr last_op_env_;
+  /*! \brief Map from signature to OpEnv. */
+  std::unordered_map<OpEnvSignature, OpEnvPtr, OpEnvSignatureHash> cached_;
+  /*! \brief The mutex for the cache. */
+  std::mutex mu_;
+};
 
 /*! \brief The OpEnv cache for a VM function. */
 class VMFuncOpEnvCache {
  public:
+  /*!
+   * \brief Create the OpEnv cache for a VM function. A cache slot is reserved for each InvokeJit
+   * instruction, so that the lookup does not need to lock.
+   * \param func The VM function.
+   */
+  explicit VMFuncOpEnvCache(const VMFunction& func);
+
   /*!
    * \brief Get the OpEnv cache for a given instruction.
    * \param pc The program counter
    * \return The OpEnv cache.
    */
-  std::shared_ptr<OpEnvCache> Get(Index pc);
+  InstrOpEnvCache* Get(Index pc);
 
   /*!
    * \brief Clear the OpEnv cache.
@@ -228,9 +347,58 @@ class VMFuncOpEnvCache {
   void Clear();
 
  private:
-  /*! \brief Cache map from instruction index to OpEnv cache. */
-  std::unordered_map<Index, std::shared_ptr<OpEnvCache>> cache_map_;
-  /*! \brief The mutex for the cache_map_. */
+  /*! \brief The OpEnv caches indexed by the instruction index. */
+  std::vector<std::unique_ptr<InstrOpEnvCache>> cache_;
+};
+
+/*!
+ * \brief The memo table of InferType instructions. It maps the instruction, the callee and the
+ * argument signature to the inferred (closure, shape, storage size) tuple, and evicts the least
+ * recently used entries when it is full.
+ */
+class InferTypeCache {
+ public:
+  /*!
+   * \brief Lookup the inferred result of a signature and mark it as the most recently used.
+   * \param sig The signature.
+   * \return The cached result, or an undefined value if the signature is not cached.
+   */
+  Value Get(const OpEnvSignature& sig);
+
+  /*!
+   * \brief Add an inferred result to the cache.
+   * \param sig The signature.
+   * \param value The inferred result.
+   */
+  void Set(const OpEnvSignature& sig, Value value);
+
+  /*! \brief Set the capacity of the cache. Zero disables the cache. */
+  void SetCapacity(size_t capacity);
+
+  /*! \brief Clear the cache. */
+  void Clear();
+
+  size_t capacity() const {
+    return capacity_;
+  }
+
+  /*! \brief Get the number of cached entries and the number of evicted entries. */
+  std::pair<int64_t, int64_t> GetSizeAndEvictions();
+
+ private:
+  void EvictIfFull();
+
+  /*! \brief The maximum number of entries. */
+  std::atomic<size_t> capacity_{1024};
+  /*! \brief The entries from the most recently used to the least recently used. */
+  std::list<std::pair<OpEnvSignature, Value>> lru_;
+  /*! \brief Map from the signature to the entry. */
+  std::unordered_map<OpEnvSignature, std::list<std::pair<OpEnvSignature, Value>>::iterator,
+                     OpEnvSignatureHash>
+      cached_;
+  /*! \brief The number of evicted entries. */
+  int64_t evictions_{0};
+  /*! \brief The mutex for the cache. */
   std::mutex mu_;
 };
 
@@ -258,6 +426,9 @@ class VirtualMachine : public tvm::runtime::ModuleNode {
     if (enable_cuda_graph_) {
       LOG(WARNING) << "Concurrent execution is not supported for VM in CUDA graph mode.";
     }
+    if (const char* capacity = getenv("RAF_VM_INFER_TYPE_CACHE_SIZE")) {
+      infer_type_cache_.SetCapacity(std::stoul(capacity));
+    }
   }
 
   const char* type_key() const final {
@@ -334,10 +505,42 @@ class VirtualMachine : public tvm::runtime::ModuleNode {
    * \return A list of latency numbers in milliseconds (length of the list equals 'repeat').
    */
   Array<FloatValue> Profile(VMContext ctx, int warmup, int number, int repeat);
+  /*!
+   * \brief Warm up the virtual machine by creating the OpEnvs of all InvokeJit instructions that
+   * are reached with the given inputs. The bytecode is first walked without executing ops to
+   * collect the call values of each InvokeJit, then the distinct OpEnvs (and their kernels) are
+   * created concurrently and cached.
+   * \param func_name The entry function name.
+   * \param inputs The example inputs to the function.
+   * \param num_workers The number of worker threads. Use all cores if not positive.
+   * \return The number of created OpEnvs and the elapsed time in milliseconds.
+   */
+  Map<String, ObjectRef> Warmup(const std::string& func_name, const std::vector<Value>& inputs,
+                                int num_workers);
+  /*!
+   * \brief Get the runtime statistics of the virtual machine.
+   * \return A map from the statistic name to its value.
+   */
+  Map<String, Integer> GetStats() const;
 
  protected:
   /*! \brief Get device for params. */
   Device GetParamsDevice() const;
+  /*!
+   * \brief Create a VM context and copy the inputs to the device.
+   * \param func_index The entry function index.
+   * \param inputs The inputs to the function.
+   * \return The VM context.
+   */
+  VMContext CreateVMContext(Index func_index, const std::vector<Value>& inputs);
+  /*! \brief Make the call values of an InvokeJit instruction. */
+  CallValues MakeCallValues(const VMContext& ctx, const Instruction& instr,
+                            const Array<Value>& args, const Value& output);
+  /*! \brief Fulfill the distributed and stream requests of a newly created OpEnv. */
+  void PrepareRequests(const VMContext& ctx, const OpEnvPtr& op_env);
+  /*! \brief Launch an op to the current CPU stream instead of executing it on the VM thread. */
+  void LaunchOnCPUStream(VMContext& ctx, const OpEnvPtr& op_env, std::vector<Value> inputs,
+                         Value output, const std::string& readable_sig);
   /*!
    * \brief Allocate memory on given device. For cuda device, it would allocate asynchronously on
    * current stream.
@@ -352,7 +555,11 @@ class VirtualMachine : public tvm::runtime::ModuleNode {
                                        bool alloc_async = true) const;
   /*! \brief Run VM dispatch loop. */
   virtual void RunLoop(VMContext& ctx);
-  /*! \brief Prepare an OpEnv with its inputs and output */
+  /*!
+   * \brief Prepare an OpEnv with its inputs and output.
+   * \return The OpEnv, its inputs, its output, and a readable signature of the inputs and output.
+   * The readable signature is only generated when the profiler is enabled, otherwise it is empty.
+   */
   virtual std::tuple<OpEnvPtr, std::vector<Value>, Value, std::string> PrepareOpEnv(
       const VMContext& ctx, const Instruction& instr);
   /*! \brief Handle Move instruction*/
@@ -417,10 +624,26 @@ class VirtualMachine : public tvm::runtime::ModuleNode {
    * corresponding VM function. It's a map from pc to the OpEnv cache.
    */
   std::vector<std::shared_ptr<VMFuncOpEnvCache>> op_env_cache_;
+  /*! \brief The number of OpEnv lookups that hit the per-instruction fast path. */
+  std::atomic<int64_t> op_env_fast_path_hits_{0};
+  /*! \brief The number of OpEnv lookups that missed the fast path but hit the cache map. */
+  std::atomic<int64_t> op_env_cache_hits_{0};
+  /*! \brief The number of OpEnv lookups that created a new OpEnv. */
+  std::atomic<int64_t> op_env_cache_misses_{0};
+  /*! \brief The memo table of InferType instructions. */
+  mutable InferTypeCache infer_type_cache_;
+  /*! \brief The number of InferType instructions that hit the memo table. */
+  std::atomic<int64_t> infer_type_cache_hits_{0};
+  /*! \brief The number of InferType instructions that ran type inference. */
+  std::atomic<int64_t> infer_type_cache_misses_{0};
   /*! \brief Indicates whether to dryrun (skip op execution). */
   bool dryrun_ = false;
   /*! \brief Indicates whether CUDA is used. */
   bool use_cuda_ = false;
+  /*! \brief The device type of the streams and events, which are CPU streams without CUDA. */
+  DevType StreamDeviceType() const {
+    return use_cuda_ ? DevType::kCUDA() : DevType::kCPU();
+  }
   /*! \brief Indicates whether CUDA Graph is enabled when VM is initialized. */
   bool enable_cuda_graph_ = false;
 
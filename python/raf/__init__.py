@@ -12,7 +12,7 @@ except:  # pylint: disable=bare-except
     __full_version__ = "dev"
     __gitrev__ = "unknown"
 
-from ._core.ndarray import array, ndarray
+from ._core.ndarray import array, from_dlpack, ndarray
 from ._op.imp import *  # pylint: disable=redefined-builtin
 from . import frontend
 from . import amp
@@ -22,6 +22,7 @@ from . import ir
 from . import model
 from . import _tvm_op
 from . import optim
+from . import serving
 from . import utils
 from . import _core
 from ._core.device import device, cpu, cuda, Device
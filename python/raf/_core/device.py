@@ -93,3 +93,27 @@ def cpu(device_id=0):
 def cuda(device_id=0):
     """Create a CPU device object."""
     return Device(f"cuda({device_id})")
+
+
+def configure_cpu_stream_workers(num_threads=0, cores=None):
+    """Restart the worker threads that run the ops on CPU streams. The CPU streams are used when
+    a model is compiled for CPU with a multi-stream schedule policy (e.g., wavefront). It must be
+    called when no CPU stream is running. The default configuration can be set by the
+    environment variables RAF_CPU_STREAM_THREADS and RAF_CPU_STREAM_CORES.
+
+    Parameters
+    ----------
+    num_threads : int
+        The number of worker threads. 0 means the number of cores.
+    cores : Optional[Union[str, List[int]]]
+        The cores to pin the workers to in a round-robin way, such as [0, 1] or "0-3,8".
+        None means no pinning.
+    """
+    # pylint: disable=import-outside-toplevel
+    from .._ffi.device_api.cpu import ConfigureStreamWorkers
+
+    if cores is None:
+        cores = ""
+    elif not isinstance(cores, str):
+        cores = ",".join(str(core) for core in cores)
+    ConfigureStreamWorkers(num_threads, cores)
@@ -31,6 +31,37 @@ def interpret(expr, module=None):
     return _ffi.executor.Interpret(expr, module)
 
 
+def clear_op_env_cache():
+    """Clear the OpEnvs cached by the imperative op calls (e.g., raf.add), and reset the
+    statistics of the cache."""
+    _ffi.executor.ClearOpEnvCache()
+
+
+def set_op_env_cache_capacity(capacity):
+    """Set the maximum number of OpEnvs cached by the imperative op calls. The least recently
+    used OpEnvs are evicted when the cache is full. The default capacity can be set by the
+    environment variable RAF_OP_ENV_CACHE_SIZE.
+
+    Parameters
+    ----------
+    capacity : int
+        The capacity. 0 disables the cache.
+    """
+    _ffi.executor.SetOpEnvCacheCapacity(capacity)
+
+
+def get_op_env_cache_stats():
+    """Get the statistics of the OpEnv cache of the imperative op calls.
+
+    Returns
+    -------
+    ret: Dict[str, int]
+        The number of cached OpEnvs ("Size"), the capacity ("Capacity"), and the number of
+        hits ("Hit"), misses ("Miss") and evictions ("Evict").
+    """
+    return {key: value.value for key, value in _ffi.executor.GetOpEnvCacheStats().items()}
+
+
 class MetaFallbackContext(ApplyHistoryBest):
     """
     The RAF fallback dispatch context, which queries the builtin schedules and outputs
@@ -46,14 +77,16 @@ class MetaFallbackContext(ApplyHistoryBest):
     """
 
     def __init__(self, verbose=2):
-        # Load the builtin schedules
+        # Load the builtin schedules. RAF_SCH_FILE may list several files separated by
+        # os.pathsep, e.g., the bundles for CUDA and CPU.
         fallback_sch_log = None
-        if "RAF_SCH_FILE" in os.environ and os.path.exists(os.environ["RAF_SCH_FILE"]):
-            fallback_sch_log = os.environ["RAF_SCH_FILE"]
+        if "RAF_SCH_FILE" in os.environ:
+            sch_files = os.environ["RAF_SCH_FILE"].split(os.pathsep)
+            fallback_sch_log = [path for path in sch_files if os.path.exists(path)] or None
 
         if verbose > 0:
             if fallback_sch_log is not None:
-                print(f"RAF schedule file is pointed to {fallback_sch_log}")
+                print(f"RAF schedule file is pointed to {', '.join(fallback_sch_log)}")
             else:
                 print('No pretuned schedules because "RAF_SCH_FILE" is not set or does not exist')
 
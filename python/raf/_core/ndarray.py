@@ -17,8 +17,8 @@ from raf._ffi.binding import (
     LookupGrad,
 )
 from raf._ffi.tensor import MarkNumpy
-from raf._ffi.value import ToTVM
-from raf._lib import _register_func, relay, tvm_ndarray
+from raf._ffi.value import CopyTensorTo, ToTVM
+from raf._lib import _register_func, relay, tvm_ndarray, tvm_from_dlpack
 from raf._lib import TensorContainer as _DLManagedTensor
 
 
@@ -173,15 +173,44 @@ class ndarray:  # pylint: disable=invalid-name,too-many-instance-attributes
         self.__byte_offset = byte_offset
 
     def to(self, *, device=None, dtype=None):  # pylint: disable=invalid-name
-        npa = self.numpy()
-        if dtype is not None:
-            npa = npa.astype(dtype)
         if device is None:
             device = self.device
-        ret = ndarray(BindNDArray(_np_to_tensor_value(npa, device=device), None, ""))
+        if dtype is not None and not isinstance(dtype, str):
+            import numpy as np  # pylint: disable=import-outside-toplevel
+
+            dtype = np.dtype(dtype).name
+        if (dtype is None or dtype == self.dtype) and _is_compact(self.shape, self.strides):
+            # Copy the buffer with the device API directly without staging through numpy
+            value = CopyTensorTo(self.__value, str2dev(device))
+        else:
+            npa = self.numpy()
+            if dtype is not None:
+                npa = npa.astype(dtype)
+            value = _np_to_tensor_value(npa, device=device)
+        ret = ndarray(BindNDArray(value, None, ""))
         ret.requires_grad = self.requires_grad
         return ret
 
+    def __dlpack__(self, stream=None):  # pylint: disable=unused-argument
+        """Export the array as a DLPack capsule that shares the underlying buffer.
+
+        Parameters
+        ----------
+        stream : Optional[int]
+            The stream the consumer uses. RAF ops are synchronized when they return,
+            so it is ignored.
+
+        Returns
+        -------
+        capsule : PyCapsule
+            The DLPack capsule.
+        """
+        return ToTVM(self.__value).to_dlpack()
+
+    def __dlpack_device__(self):
+        dltensor = self.__value._tensor.handle.contents  # pylint: disable=protected-access
+        return (int(dltensor.device.device_type), int(dltensor.device.device_id))
+
     def backward(self, gradient=None):
         if gradient is not None:
             assert isinstance(gradient, ndarray)
@@ -369,9 +398,46 @@ def array(
     import numpy as np  # pylint: disable=import-outside-toplevel
 
     npa = np.array(object, dtype=dtype, copy=copy, order=order, subok=subok, ndmin=ndmin)
+    if not copy and device == "cpu" and npa.flags["C_CONTIGUOUS"]:
+        # Share the buffer with the numpy array, which is kept alive by the tensor
+        device = None
     return ndarray(BindNDArray(_np_to_tensor_value(npa, device=device), None, name))
 
 
+@set_module("raf")
+def from_dlpack(obj, name=""):
+    """Create an array from a DLPack tensor without copying the data.
+
+    Parameters
+    ----------
+    obj : object
+        An object implementing ``__dlpack__`` (e.g., a numpy array or a PyTorch tensor),
+        or a DLPack capsule.
+
+    name : str
+        The name of the array.
+
+    Returns
+    -------
+    ret : ndarray
+        The array sharing memory with obj.
+    """
+    if isinstance(obj, ndarray):
+        return obj
+    capsule = obj.__dlpack__() if hasattr(obj, "__dlpack__") else obj
+    value = TensorValue.from_tvm(tvm_from_dlpack(capsule))
+    return ndarray(BindNDArray(value, None, name))
+
+
+def _is_compact(shape, strides):
+    expected = 1
+    for dim, stride in reversed(list(zip(shape, strides))):
+        if dim != 1 and stride != expected:
+            return False
+        expected *= dim
+    return True
+
+
 _DL_MANAGED_TENSOR_PTR = ctypes.POINTER(_DLManagedTensor)
 
 
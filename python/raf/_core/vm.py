@@ -22,6 +22,7 @@ class Executable:
         self.mod = mod
         self._function_params = {}
         self._save = self.mod["save"]
+        self._save_artifact = self.mod["save_artifact"]
         self._get_lib = self.mod["get_lib"]
         self._get_bytecode = self.mod["get_bytecode"]
         self._get_stats = self.mod["get_stats"]
@@ -126,6 +127,43 @@ class Executable:
 
         return Executable(_ffi.vm.Load_Executable(bytecode, lib))
 
+    def save_artifact(self, path):
+        """Save the RAF VM Executable, including its constants and library, into a single
+        artifact file, which can be loaded by :py:meth:`load_artifact`.
+
+        Parameters
+        ----------
+        path : str
+            The path of the artifact file.
+
+        Notes
+        -----
+        The artifact file consists of a fixed size header, the constant index, the bytecode,
+        the embedded library, and a page-aligned section with the raw data of tensor constants.
+        Only libraries that support binary serialization can be embedded.
+        """
+        self._save_artifact(path)
+
+    @staticmethod
+    def load_artifact(path):
+        """Load an executable from an artifact file saved by :py:meth:`save_artifact`.
+
+        The file is memory-mapped, so tensor constants (e.g., model weights) are neither read
+        nor copied until used. Constants used on devices other than CPU are uploaded by the
+        virtual machine when they are loaded for the first time.
+
+        Parameters
+        ----------
+        path : str
+            The path of the artifact file.
+
+        Returns
+        -------
+        exec: Executable
+            The loaded executable.
+        """
+        return Executable(_ffi.vm.LoadExecutableArtifact(path))
+
     @property
     def lib(self):
         """Get the library that contains hardware dependent code.
@@ -216,6 +254,39 @@ class Executable:
         """Return the runtime module contained in a virtual machine executable."""
         return self.mod
 
+    def precompile(self, device, *args, func_name="main", num_workers=None, **kwargs):
+        """Build the kernels of the executable ahead of time with the given example arguments.
+        The kernels are kept in the global kernel caches, so virtual machines created from
+        this executable later on do not compile them again.
+
+        Parameters
+        ----------
+        device : Union[str, Device]
+            The device to compile the kernels for.
+
+        args : list[raf.ndarray] or list[np.ndarray]
+            The example arguments to the function. Only their shapes and dtypes matter.
+
+        func_name : str
+            The name of function to precompile.
+
+        num_workers : Optional[int]
+            The number of worker threads to build kernels. Use all CPU cores if None.
+
+        kwargs: dict of str to raf.ndarray or np.ndarray
+            Named example arguments to the function.
+
+        Returns
+        -------
+        result : Dict[str, Union[int, float]]
+            The number of created OpEnvs, one per op instance and signature, which may be
+            more than the distinct kernels they share ("num_op_envs"), and the elapsed time in
+            milliseconds ("elapsed_ms").
+        """
+        device = Device(device) if isinstance(device, str) else device
+        vm = VirtualMachine(self, device)
+        return vm.warmup(*args, func_name=func_name, num_workers=num_workers, **kwargs)
+
     def get_function_params(self, func_name):
         """Get VM Function parameters
 
@@ -449,8 +520,27 @@ class VirtualMachine:
         self._prepare_context = self.module["prepare_context"]
         self._run = self.module["run"]
         self._profile = self.module["profile"]
+        self._get_stats = self.module["get_stats"]
+        self._warmup = self.module["warmup"]
         self._set_devices(device)
 
+    @property
+    def stats(self):
+        """Get the runtime statistics of the virtual machine.
+
+        Returns
+        -------
+        ret : Dict[str, int]
+            The statistics, including the number of OpEnv lookups that hit the
+            per-instruction fast path (OpEnvFastPathHit), hit the OpEnv cache map
+            (OpEnvCacheHit), or created a new OpEnv (OpEnvCacheMiss), and the number of
+            InferType instructions that hit (InferTypeCacheHit) or missed (InferTypeCacheMiss)
+            the memo table, with its size (InferTypeCacheSize) and evictions
+            (InferTypeCacheEvict). The memo table size can be set by
+            RAF_VM_INFER_TYPE_CACHE_SIZE, where 0 disables it.
+        """
+        return {key: val.value for key, val in self._get_stats().items()}
+
     def prepare_context(self, func_name, *args, **kwargs):
         """Create and initiliaze a VM Context given the name of function to invoke and arguments.
 
@@ -470,6 +560,11 @@ class VirtualMachine:
         result : VMContext
             The initialized VM context.
         """
+        cargs = self._pack_args(func_name, args, kwargs)
+        return self._prepare_context(func_name, *cargs)
+
+    def _pack_args(self, func_name, args, kwargs):
+        """Merge the positional and named arguments and convert them to values."""
         if kwargs:
             func_params = self._exec.get_function_params(func_name)
             new_args = [None] * len(func_params)
@@ -483,8 +578,38 @@ class VirtualMachine:
                     new_args[i] = args[idx]
                     idx += 1
             args = new_args
-        cargs = _convert_args(args)
-        return self._prepare_context(func_name, *cargs)
+        return _convert_args(args)
+
+    def warmup(self, *args, func_name="main", num_workers=None, **kwargs):
+        """Create the kernels of all ops ahead of time, so that the first run does not pay the
+        JIT compilation cost on its critical path. The bytecode is walked with the example
+        arguments without executing ops to derive the call values of each op, then the distinct
+        kernels are built concurrently and cached in the virtual machine.
+
+        Parameters
+        ----------
+        args : list[raf.ndarray] or list[np.ndarray]
+            The example arguments to the function. Only their shapes and dtypes matter.
+
+        func_name : str
+            The name of function to warm up.
+
+        num_workers : Optional[int]
+            The number of worker threads to build kernels. Use all CPU cores if None.
+
+        kwargs: dict of str to raf.ndarray or np.ndarray
+            Named example arguments to the function.
+
+        Returns
+        -------
+        result : Dict[str, Union[int, float]]
+            The number of created OpEnvs, one per op instance and signature, which may be
+            more than the distinct kernels they share ("num_op_envs"), and the elapsed time in
+            milliseconds ("elapsed_ms").
+        """
+        cargs = self._pack_args(func_name, args, kwargs)
+        ret = self._warmup(func_name, num_workers or 0, *cargs)
+        return {"num_op_envs": ret["num_op_envs"].value, "elapsed_ms": ret["elapsed_ms"].value}
 
     def run(self, *args, func_name="main", **kwargs):
         """Run the virtual machine.
@@ -37,6 +37,7 @@ from tvm.ir.container import Array
 from tvm.ir import IRModule
 from tvm.ir.transform import PassContext
 from tvm.runtime.ndarray import array as tvm_ndarray
+from tvm.runtime.ndarray import from_dlpack as tvm_from_dlpack
 from tvm.relay import op as _op
 from tvm.relay.op import OpPattern, register_compute, register_pattern, strategy
 from tvm.relay.op.op import (
@@ -113,6 +113,11 @@ def _cutlass_conv2d_fusion():
     return with_act | with_bias
 
 
+def _call_float_gemm(ops):
+    # The GEMM kernels of cpublas only support float32 and float64.
+    return call_binary_ops(ops, "float32") | call_binary_ops(ops, "float64")
+
+
 def _call_pool2d_dx():
     pool_ops = ["raf.op.max_pool2d_dx", "raf.op.avg_pool2d_dx"]
     return is_ops(pool_ops)(*n_wildcards(9))
@@ -135,8 +140,10 @@ register_pattern(_call_conv2d(), "cudnn", 29, "conv2d")
 register_pattern(_cutlass_matmul_fusion(BATCH_MATMUL_OPS), "cutlass", 20, "batch_matmul_fusion")
 register_pattern(call_binary_ops(BATCH_MATMUL_OPS), "cublas", 19, "batch_matmul")
 register_pattern(call_binary_ops(BATCH_MATMUL_OPS), "cutlass", 18, "batch_matmul")
+register_pattern(_call_float_gemm(BATCH_MATMUL_OPS), "cpublas", 17, "batch_matmul")
 
 # matmul / dense
 register_pattern(_cutlass_matmul_fusion(MATMUL_OPS), "cutlass", 10, "matmul_fusion")
 register_pattern(call_binary_ops(MATMUL_OPS), "cublas", 9, "matmul")
 register_pattern(call_binary_ops(MATMUL_OPS), "cutlass", 8, "matmul")
+register_pattern(_call_float_gemm(MATMUL_OPS), "cpublas", 7, "matmul")
@@ -0,0 +1,126 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+# pylint: disable=too-many-locals, invalid-name, no-member
+"""Schedule for the matmul family on CPU.
+
+The output is split into cache tiles of TILE_M x TILE_N, which are computed in parallel. In each
+tile, the reduction axis is split into TILE_K blocks, and the blocks of both inputs are packed into
+contiguous buffers, so that the inner loops read unit-stride data regardless of the transposes.
+The tile is accumulated in register tiles of REG_M rows and a SIMD vector of columns, where the
+rows are unrolled and the columns are vectorized. Elementwise epilogues fused after the matmul
+are computed on the tile while it is still in the cache.
+"""
+import tvm
+from tvm import te
+from tvm.topi.utils import traverse_inline
+from tvm.topi.x86.injective import schedule_injective_from_existing
+
+GEMM_TAGS = ("matmul", "batch_matmul")
+
+TILE_M = 32
+TILE_N = 64
+TILE_K = 256
+REG_M = 4
+# The vector width in bits, which is the register width of AVX-512. LLVM splits the vectors for
+# narrower targets, so it also serves as the 2x unrolling of AVX2.
+VECTOR_BITS = 512
+
+
+def _tile(extent, factor):
+    """Shrink the tile factor to the extent if it is static and smaller than the factor."""
+    if isinstance(extent, tvm.tir.IntImm):
+        extent = extent.value
+    if isinstance(extent, int) and extent < factor:
+        return max(1, extent)
+    return factor
+
+
+def _vector_lanes(dtype):
+    return max(1, VECTOR_BITS // tvm.DataType(dtype).bits)
+
+
+def _schedule_reduction(sch, gemm, i, j, tile_i, tile_j):
+    """Schedule the reduction of a cache tile, whose spatial axes i and j have at most tile_i and
+    tile_j iterations, with packing, register tiling and SIMD."""
+    data, weight = gemm.op.input_tensors
+    (k,) = sch[gemm].op.reduce_axis
+    vec = _tile(tile_j, _vector_lanes(gemm.dtype))
+    ko, ki = sch[gemm].split(k, factor=TILE_K)
+    ic, ir = sch[gemm].split(i, factor=_tile(tile_i, REG_M))
+    jc, jr = sch[gemm].split(j, factor=vec)
+    sch[gemm].reorder(ko, ic, jc, ki, ir, jr)
+    sch[gemm].unroll(ir)
+    sch[gemm].vectorize(jr)
+
+    # Pack the blocks of the inputs for the current reduction block.
+    for tensor in (data, weight):
+        packed = sch.cache_read(tensor, "global", [gemm])
+        sch[packed].compute_at(sch[gemm], ko)
+        _, inner = sch[packed].split(sch[packed].op.axis[-1], factor=vec)
+        sch[packed].vectorize(inner)
+
+
+def _schedule_gemm(sch, op, outs):
+    """Schedule a matmul op and return the output stage whose loops are tiled."""
+    gemm = op.output(0)
+    out = outs[0]
+    if op in sch.outputs:
+        # Accumulate in a cache tile and copy it to the output.
+        accum = sch.cache_write(gemm, "global")
+        out = gemm
+    elif len(out.shape) == len(gemm.shape):
+        # Compute the tile of the matmul in the loops of the fused epilogue.
+        accum = gemm
+    else:
+        # The epilogue broadcasts the output to more dimensions, so it cannot share the tiles.
+        accum = out = gemm
+
+    stage = sch[out]
+    axes = stage.op.axis
+    tile_m = _tile(axes[-2].dom.extent, TILE_M)
+    tile_n = _tile(axes[-1].dom.extent, TILE_N)
+    io, ii = stage.split(axes[-2], factor=tile_m)
+    jo, ji = stage.split(axes[-1], factor=tile_n)
+    stage.reorder(*axes[:-2], io, jo, ii, ji)
+    outer = stage.fuse(*axes[:-2], io, jo)
+    stage.parallel(outer)
+    if accum == out:
+        _schedule_reduction(sch, accum, ii, ji, tile_m, tile_n)
+    else:
+        _, jv = stage.split(ji, factor=_tile(tile_n, _vector_lanes(out.dtype)))
+        stage.vectorize(jv)
+        sch[accum].compute_at(stage, outer)
+        i, j = sch[accum].op.axis[-2:]
+        _schedule_reduction(sch, accum, i, j, tile_m, tile_n)
+    return out.op
+
+
+def schedule_gemm(outs):
+    """Schedule the matmul family and the fused elementwise epilogues on CPU.
+
+    Parameters
+    ----------
+    outs : List[te.Tensor]
+        The outputs of the fused function, which contains an op tagged with one of GEMM_TAGS.
+
+    Returns
+    -------
+    sch : te.Schedule
+        The schedule.
+    """
+    outs = [outs] if isinstance(outs, te.tensor.Tensor) else outs
+    sch = te.create_schedule([out.op for out in outs])
+    tiled = []
+
+    def _callback(op):
+        if op.tag in GEMM_TAGS and not tiled:
+            tiled.append(_schedule_gemm(sch, op, outs))
+
+    traverse_inline(sch, outs[0].op, _callback)
+    # The outputs that do not share the tiles, e.g., the epilogue when the output of the matmul
+    # is also an output of the fused function.
+    for out in outs:
+        if out.op not in tiled:
+            schedule_injective_from_existing(sch, out)
+    return sch
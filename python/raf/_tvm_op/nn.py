@@ -6,7 +6,7 @@
 from functools import reduce
 import operator
 
-from . import cuda
+from . import cuda, cpu
 from .._lib import register_compute
 from .._lib import generic_func
 from .._lib import tvm as _tvm
@@ -50,10 +50,22 @@ def compute_matmul_tt(attr, inputs, output_type):
     return compute_matmul_general(attr, inputs, output_type, transpose_a=True, transpose_b=True)
 
 
-_reg.register_injective_schedule("raf.op.tvm.matmul")
-_reg.register_injective_schedule("raf.op.tvm.matmul_tn")
-_reg.register_injective_schedule("raf.op.tvm.matmul_nt")
-_reg.register_injective_schedule("raf.op.tvm.matmul_tt")
+@generic_func
+def schedule_matmul(attrs, outs, target):
+    with target:
+        return _topi.generic.schedule_injective(outs)
+
+
+@schedule_matmul.register("cpu")
+def schedule_matmul_cpu(attrs, outs, target):
+    with target:
+        return cpu.gemm.schedule_gemm(outs)
+
+
+_reg.register_schedule("raf.op.tvm.matmul", schedule_matmul)
+_reg.register_schedule("raf.op.tvm.matmul_tn", schedule_matmul)
+_reg.register_schedule("raf.op.tvm.matmul_nt", schedule_matmul)
+_reg.register_schedule("raf.op.tvm.matmul_tt", schedule_matmul)
 
 
 def compute_batch_matmul_general(attr, inputs, output_type, transpose_a=False, transpose_b=False):
@@ -61,12 +73,24 @@ def compute_batch_matmul_general(attr, inputs, output_type, transpose_a=False, t
     data, weight = inputs[0], inputs[1]
     assert len(data.shape) == 3 and len(weight.shape) == 3, "only support 3-dim batch matmul"
 
-    # Topi batch matmul currently support NT mode. So, add transposes when it is not NT
-    if transpose_a:
-        data = _topi.transpose(data, (0, 2, 1))
-    if not transpose_b:
-        weight = _topi.transpose(weight, (0, 2, 1))
-    return [_topi.nn.batch_matmul(data, weight)]
+    # Index the transposed inputs directly instead of adding transposes, so that the schedules
+    # see a single reduction stage.
+    batch_a, batch_b = data.shape[0], weight.shape[0]
+    bcast_a = isinstance(batch_a, _tvm.tir.IntImm) and batch_a.value == 1
+    bcast_b = isinstance(batch_b, _tvm.tir.IntImm) and batch_b.value == 1
+    batch = batch_b if bcast_a else batch_a
+    m = data.shape[2] if transpose_a else data.shape[1]
+    n = weight.shape[1] if transpose_b else weight.shape[2]
+    k = _tvm.te.reduce_axis((0, data.shape[1] if transpose_a else data.shape[2]), name="k")
+
+    def fcompute(b, i, j):
+        b_a = 0 if bcast_a else b
+        b_b = 0 if bcast_b else b
+        a = data[b_a, k, i] if transpose_a else data[b_a, i, k]
+        w = weight[b_b, j, k] if transpose_b else weight[b_b, k, j]
+        return _tvm.te.sum(a * w, axis=k)
+
+    return [_tvm.te.compute((batch, m, n), fcompute, name="T_batch_matmul", tag="batch_matmul")]
 
 
 @register_compute("raf.op.tvm.batch_matmul")
@@ -90,9 +114,9 @@ def compute_batch_matmul_tt(attr, inputs, output_type):
     )
 
 
-_reg.register_injective_schedule("raf.op.tvm.batch_matmul")
-_reg.register_injective_schedule("raf.op.tvm.batch_matmul_tn")
-_reg.register_injective_schedule("raf.op.tvm.batch_matmul_tt")
+_reg.register_schedule("raf.op.tvm.batch_matmul", schedule_matmul)
+_reg.register_schedule("raf.op.tvm.batch_matmul_tn", schedule_matmul)
+_reg.register_schedule("raf.op.tvm.batch_matmul_tt", schedule_matmul)
 
 _reg.register_strategy("raf.op.tvm.batch_matmul_nt", strategy.batch_matmul_strategy)
 
@@ -126,6 +126,7 @@ register_op_cast_rule("raf.op.reciprocal", generic_cast(False, 1))
 register_op_cast_rule("raf.op.softmax", generic_cast(False, 1))
 register_op_cast_rule("raf.op.softmax_dx", generic_cast(False, 2))
 register_op_cast_rule("raf.op.lans", generic_cast(False, 2))
+register_op_cast_rule("raf.op.multi_tensor_sgd", generic_cast(False, 1))
 register_op_cast_rule("raf.op.log_softmax", generic_cast(False, 1))
 register_op_cast_rule("raf.op.log_softmax_dx", generic_cast(False, 2))
 register_op_cast_rule("raf.op.erf", generic_cast(False, 1))
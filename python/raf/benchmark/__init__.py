@@ -0,0 +1,7 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""End-to-end benchmark suite. Run `python3 -m raf.benchmark --help` for the usage."""
+from .models import MODELS, register_model, get_model
+from .runner import BenchConfig, config_key, make_matrix, run_config, run_matrix
+from .regression import DEFAULT_THRESHOLDS, compare, save_results, load_results
@@ -0,0 +1,131 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Run the benchmark matrix and compare the results with a baseline.
+
+    python3 -m raf.benchmark run --models mlp,resnet_cifar10 --batch-sizes 1,32 \\
+        --executors vm,interpreter --fusion on,off --modes infer,train --output results.json
+    python3 -m raf.benchmark compare results.json --baseline baseline.json \\
+        --threshold latency_p50_ms=0.2
+"""
+import argparse
+import sys
+
+from .models import MODELS
+from .runner import make_matrix, run_matrix
+from .regression import compare, save_results, load_results
+
+
+def _split(value, conv=str):
+    return [conv(item) for item in value.split(",") if item]
+
+
+def _on_off(value):
+    if value not in ("on", "off"):
+        raise argparse.ArgumentTypeError("Expected on or off, but got %s" % value)
+    return value == "on"
+
+
+def _threshold(value):
+    metric, _, threshold = value.partition("=")
+    try:
+        return metric, float(threshold)
+    except ValueError:
+        raise argparse.ArgumentTypeError("Expected metric=value, but got %s" % value)
+
+
+def _print_result(result):
+    if "error" in result:
+        print("%-60s FAILED\n%s" % (result["key"], result["error"]))
+        return
+    metrics = result["metrics"]
+    hit_rate = metrics["kernel_cache_hit_rate"]
+    print(
+        "%-60s p50 %9.2f ms  p99 %9.2f ms  compile %9.1f ms  peak %8.1f MB  hit %s"
+        % (
+            result["key"],
+            metrics["latency_p50_ms"],
+            metrics["latency_p99_ms"],
+            metrics["compile_ms"],
+            metrics["peak_used_mb"],
+            "-" if hit_rate is None else "%.2f" % hit_rate,
+        )
+    )
+
+
+def _report(regressions):
+    for reg in regressions:
+        print(
+            "REGRESSION %s %s: %s -> %s"
+            % (reg["key"], reg["metric"], reg["baseline"], reg["current"])
+        )
+    return 1 if regressions else 0
+
+
+def _run(args):
+    configs = make_matrix(
+        _split(args.models),
+        _split(args.batch_sizes, int),
+        _split(args.executors),
+        _split(args.fusion, _on_off),
+        _split(args.pools),
+        _split(args.modes),
+        args.device,
+    )
+    results = run_matrix(configs, args.warmup, args.repeat, callback=_print_result)
+    if args.output:
+        save_results(results, args.output)
+    if args.baseline:
+        return _report(compare(results, load_results(args.baseline), dict(args.threshold)))
+    return 0
+
+
+def _compare(args):
+    results = load_results(args.results)
+    return _report(compare(results, load_results(args.baseline), dict(args.threshold)))
+
+
+def main(argv=None):
+    """Main entry. Return 1 if any regression is found."""
+    parser = argparse.ArgumentParser(
+        prog="python3 -m raf.benchmark", description=__doc__.split("\n")[0]
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmark matrix")
+    run_parser.add_argument(
+        "--models", default="mlp", help="Comma-separated models in %s" % ", ".join(MODELS)
+    )
+    run_parser.add_argument("--batch-sizes", default="1,32")
+    run_parser.add_argument("--executors", default="vm,interpreter")
+    run_parser.add_argument("--fusion", default="on,off", help="Comma-separated on or off")
+    run_parser.add_argument("--pools", default="page_unit_pool")
+    run_parser.add_argument("--modes", default="infer,train")
+    run_parser.add_argument("--device", default="cpu")
+    run_parser.add_argument("--warmup", type=int, default=3)
+    run_parser.add_argument("--repeat", type=int, default=20)
+    run_parser.add_argument("--output", default=None, help="The JSON file to dump the results")
+    run_parser.add_argument("--baseline", default=None, help="The JSON file of the baseline")
+    run_parser.set_defaults(func=_run)
+
+    compare_parser = subparsers.add_parser("compare", help="Compare the results with a baseline")
+    compare_parser.add_argument("results", help="The JSON file of the results")
+    compare_parser.add_argument("--baseline", required=True, help="The JSON file of the baseline")
+    compare_parser.set_defaults(func=_compare)
+
+    for sub in (run_parser, compare_parser):
+        sub.add_argument(
+            "--threshold",
+            type=_threshold,
+            action="append",
+            default=[],
+            help="Override the threshold of a metric, e.g. latency_p50_ms=0.2",
+        )
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
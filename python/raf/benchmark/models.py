@@ -0,0 +1,117 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""The models to benchmark, which are built on top of raf.testing."""
+# pylint: disable=import-outside-toplevel
+import numpy as np
+
+from raf._core.ndarray import array
+
+MODELS = {}
+
+
+def register_model(name):
+    """Register a model builder.
+
+    The builder takes (batch_size, device, train) and returns the model and the list of its
+    inputs. The model is in the training mode and the inputs contain the labels if train is True.
+
+    Parameters
+    ----------
+    name : str
+        The model name.
+    """
+
+    def _register(builder):
+        MODELS[name] = builder
+        return builder
+
+    return _register
+
+
+def _to_device(model, inputs, device, train):
+    """Move the model to the device, and switch the mode."""
+    model.to(device=device)
+    if train:
+        model.train_mode()
+    else:
+        model.infer_mode()
+    return model, list(inputs)
+
+
+@register_model("mlp")
+def _mlp(batch_size, device, train):
+    from raf.testing import mlp
+
+    config = (784, 10, 256, 256)
+    model, _ = mlp.get_model(config, train)
+    inputs, _ = mlp.get_input(config, batch_size, device, train)
+    return _to_device(model, inputs, device, train)
+
+
+def _image_inputs(batch_size, image_size, num_classes, device, train):
+    from raf.testing import randn_torch, one_hot_torch
+
+    m_x, _ = randn_torch([batch_size, 3, image_size, image_size], device=device)
+    if not train:
+        return [m_x]
+    m_y, _ = one_hot_torch(batch_size, num_classes=num_classes, device=device)
+    return [m_x, m_y]
+
+
+@register_model("resnet50")
+def _resnet50(batch_size, device, train):
+    from raf.testing import resnet
+
+    model, _ = resnet.get_model([3, 4, 6, 3], train)
+    return _to_device(model, _image_inputs(batch_size, 224, 1000, device, train), device, train)
+
+
+@register_model("resnet_cifar10")
+def _resnet_cifar10(batch_size, device, train):
+    from raf.testing import resnet_cifar10
+
+    model, _ = resnet_cifar10.get_model([2, 2, 2, 2])
+    return _to_device(model, _image_inputs(batch_size, 32, 10, device, train), device, train)
+
+
+@register_model("inception_v3")
+def _inception_v3(batch_size, device, train):
+    from raf.testing import inception
+
+    model, _ = inception.get_model()
+    return _to_device(model, _image_inputs(batch_size, 299, 1000, device, train), device, train)
+
+
+def get_model(name, batch_size, device, train):
+    """Build a registered model and its inputs. In the training mode, the model is wrapped with
+    the SGD optimizer and the first input is the gradient of the loss.
+
+    Parameters
+    ----------
+    name : str
+        The model name.
+
+    batch_size : int
+        The batch size.
+
+    device : str
+        The device.
+
+    train : bool
+        Whether to benchmark a training step or an inference.
+
+    Returns
+    -------
+    ret : Tuple[raf.Model, List[raf.ndarray]]
+        The model and its inputs.
+    """
+    from raf.optim.sgd import with_sgd
+
+    if name not in MODELS:
+        raise ValueError("Unknown model %s. Available models: %s" % (name, ", ".join(MODELS)))
+    model, inputs = MODELS[name](batch_size, device, train)
+    if train:
+        model = with_sgd(learning_rate=0.1, momentum=0.01)(model)
+        inputs = [array(np.ones((), dtype="float32"), device=device)] + inputs
+    return model, inputs
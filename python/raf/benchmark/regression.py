@@ -0,0 +1,89 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Save, load and compare the benchmark results."""
+import json
+
+# The relative thresholds of the regression. All metrics are lower-is-better except the ones in
+# HIGHER_IS_BETTER, whose thresholds are absolute drops.
+DEFAULT_THRESHOLDS = {
+    "latency_p50_ms": 0.10,
+    "latency_p99_ms": 0.25,
+    "compile_ms": 0.25,
+    "peak_used_mb": 0.05,
+    "peak_allocated_mb": 0.05,
+    "kernel_cache_hit_rate": 0.05,
+}
+
+HIGHER_IS_BETTER = {"kernel_cache_hit_rate"}
+
+
+def save_results(results, path):
+    """Dump the results to a JSON file."""
+    with open(path, "w") as filep:
+        json.dump(results, filep, indent=2, sort_keys=True)
+
+
+def load_results(path):
+    """Load the results from a JSON file."""
+    with open(path, "r") as filep:
+        return json.load(filep)
+
+
+def compare(current, baseline, thresholds=None):
+    """Compare the results with the baseline.
+
+    Parameters
+    ----------
+    current : Dict[str, Any]
+        The results of raf.benchmark.run_matrix.
+
+    baseline : Dict[str, Any]
+        The baseline results.
+
+    thresholds : Optional[Dict[str, float]]
+        The thresholds that override DEFAULT_THRESHOLDS. A lower-is-better metric regresses if
+        it is greater than the baseline by more than the relative threshold, and a
+        higher-is-better metric regresses if it drops by more than the threshold.
+
+    Returns
+    -------
+    ret : List[Dict[str, Any]]
+        The regressions with the configuration key ("key"), the metric ("metric"), the baseline
+        ("baseline") and the current ("current") values. A configuration that succeeds in the
+        baseline but fails now is a regression with metric "error". Configurations that are
+        not in the baseline are ignored.
+    """
+    limits = dict(DEFAULT_THRESHOLDS)
+    limits.update(thresholds or {})
+    base_results = {result["key"]: result for result in baseline["results"]}
+
+    regressions = []
+    for result in current["results"]:
+        base = base_results.get(result["key"])
+        if base is None or "metrics" not in base:
+            continue
+        if "metrics" not in result:
+            regressions.append(
+                {"key": result["key"], "metric": "error", "baseline": None, "current": None}
+            )
+            continue
+        for metric, threshold in limits.items():
+            base_value = base["metrics"].get(metric)
+            value = result["metrics"].get(metric)
+            if base_value is None or value is None:
+                continue
+            if metric in HIGHER_IS_BETTER:
+                regressed = value < base_value - threshold
+            else:
+                regressed = value > base_value * (1 + threshold)
+            if regressed:
+                regressions.append(
+                    {
+                        "key": result["key"],
+                        "metric": metric,
+                        "baseline": base_value,
+                        "current": value,
+                    }
+                )
+    return regressions
@@ -0,0 +1,294 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Run a benchmark configuration and collect the metrics."""
+# pylint: disable=protected-access,too-many-locals
+import itertools
+import time
+import traceback
+from collections import namedtuple
+
+import numpy as np
+import tvm
+
+from raf import distributed as dist
+from raf._core.device import Device
+from raf._core.executor import VMExecutor, get_op_env_cache_stats
+from raf._ffi.memory_pool import GetPoolName, InitPool, RemovePool
+from raf._lib import PassContext
+from raf.model.trace import _get_func_inputs, get_run_model_cache_stats, set_run_model_options
+from raf.utils import memory_profiler
+from .models import get_model
+
+BenchConfig = namedtuple(
+    "BenchConfig", ["model", "batch_size", "executor", "fusion", "pool", "mode", "device"]
+)
+BenchConfig.__doc__ = """The configuration of a benchmark.
+
+Parameters
+----------
+model : str
+    The model name in raf.benchmark.models.MODELS.
+
+batch_size : int
+    The batch size.
+
+executor : str
+    "vm" or "interpreter".
+
+fusion : bool
+    Whether to enable the fusion passes. It only applies to the VM.
+
+pool : str
+    The memory pool, such as "page_unit_pool", "no_pool" or "arena_pool".
+
+mode : str
+    "infer" or "train". A training step includes the backward and the SGD update.
+
+device : str
+    The device.
+"""
+
+
+def config_key(config):
+    """The unique string of a configuration, which is used to match the baseline."""
+    fusion = ("fusion" if config.fusion else "nofusion") if config.executor == "vm" else "-"
+    return "/".join(
+        [
+            config.model,
+            "bs%d" % config.batch_size,
+            config.executor,
+            fusion,
+            config.pool,
+            config.mode,
+            config.device,
+        ]
+    )
+
+
+def make_matrix(models, batch_sizes, executors, fusions, pools, modes, device):
+    """Expand the axes to the list of configurations. The fusion axis is collapsed for the
+    interpreter, which does not run the fusion passes.
+
+    Returns
+    -------
+    ret : List[BenchConfig]
+        The configurations.
+    """
+    configs, keys = [], set()
+    for model, batch_size, executor, fusion, pool, mode in itertools.product(
+        models, batch_sizes, executors, fusions, pools, modes
+    ):
+        config = BenchConfig(
+            model, batch_size, executor, fusion if executor == "vm" else False, pool, mode, device
+        )
+        if config_key(config) not in keys:
+            keys.add(config_key(config))
+            configs.append(config)
+    return configs
+
+
+def _percentiles(latencies):
+    latencies = np.array(latencies)
+    return {
+        "latency_mean_ms": float(latencies.mean()),
+        "latency_p50_ms": float(np.percentile(latencies, 50)),
+        "latency_p90_ms": float(np.percentile(latencies, 90)),
+        "latency_p99_ms": float(np.percentile(latencies, 99)),
+    }
+
+
+def _hit_rate(hits, misses):
+    total = hits + misses
+    return float(hits) / total if total > 0 else None
+
+
+def _vm_kernel_cache(stats_before, stats_after):
+    """The OpEnv cache hit rate of the VM in the measured runs."""
+
+    def diff(key):
+        return stats_after.get(key, 0) - stats_before.get(key, 0)
+
+    return _hit_rate(diff("OpEnvFastPathHit") + diff("OpEnvCacheHit"), diff("OpEnvCacheMiss"))
+
+
+def _interpreter_kernel_cache(stats_before, stats_after):
+    """The hit rate of the OpEnv cache of the imperative op calls in the measured runs."""
+    hits = stats_after["Hit"] - stats_before["Hit"]
+    misses = stats_after["Miss"] - stats_before["Miss"]
+    return _hit_rate(hits, misses)
+
+
+class _VMRunner:
+    """Compile the model with the VM and run it."""
+
+    def __init__(self, config, model, inputs):
+        record = model._internal(*inputs)
+        self.inputs = _get_func_inputs(record, inputs, {}, get_handle=False)
+        disabled_pass = [] if config.fusion else ["FuseDialect", "FuseTVM"]
+        with PassContext(opt_level=3, disabled_pass=disabled_pass):
+            self.executor = VMExecutor(record.mod, config.device)
+
+    def run(self):
+        return self.executor.vm.run(*self.inputs)
+
+    def kernel_stats(self):
+        return self.executor.vm.stats
+
+    @staticmethod
+    def hit_rate(before, after):
+        return _vm_kernel_cache(before, after)
+
+
+class _InterpreterRunner:
+    """Run the model with the interpreter. The traced module is optimized in the first run."""
+
+    def __init__(self, config, model, inputs):
+        # pylint: disable=unused-argument
+        self.model = model
+        self.inputs = inputs
+
+    def run(self):
+        return self.model(*self.inputs)
+
+    @staticmethod
+    def kernel_stats():
+        return get_op_env_cache_stats()
+
+    @staticmethod
+    def hit_rate(before, after):
+        return _interpreter_kernel_cache(before, after)
+
+
+def run_config(config, warmup=3, repeat=20):
+    """Run a benchmark configuration.
+
+    Parameters
+    ----------
+    config : BenchConfig
+        The configuration.
+
+    warmup : int
+        The number of runs before the measurement.
+
+    repeat : int
+        The number of measured runs.
+
+    Returns
+    -------
+    ret : Dict[str, Any]
+        The result with the configuration ("config"), its key ("key"), and the metrics
+        ("metrics") or the error message ("error") if the configuration fails. The metrics
+        include the compile time and the first run time in milliseconds, the latency mean and
+        percentiles of the measured runs, the peak used and allocated memory of a run in MBs,
+        the kernel (OpEnv) cache hit rate of the measured runs, which is None if no kernel is
+        looked up, and the statistics of the memory pool ("pool").
+    """
+    result = {"key": config_key(config), "config": config._asdict()}
+    device = Device(config.device)
+    tvm_device = tvm.nd.device(config.device)
+    use_vm = bool(get_run_model_cache_stats()["UseVM"])
+    prev_pool = GetPoolName(device)
+    try:
+        # Switch the pool before creating any tensor, so that all of them are managed by it.
+        # An existing pool is returned regardless of the name, so it is removed first.
+        RemovePool(device)
+        InitPool(device, config.pool)
+        model, inputs = get_model(
+            config.model, config.batch_size, config.device, config.mode == "train"
+        )
+        # Make sure the interpreter runs the traced model instead of the VM.
+        set_run_model_options(use_vm=False)
+
+        start = time.perf_counter()
+        runner_cls = _VMRunner if config.executor == "vm" else _InterpreterRunner
+        runner = runner_cls(config, model, inputs)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        # The first run includes the kernel compilation, and the optimization of the traced
+        # module for the interpreter.
+        start = time.perf_counter()
+        runner.run()
+        tvm_device.sync()
+        first_run_ms = (time.perf_counter() - start) * 1000
+
+        for _ in range(warmup):
+            runner.run()
+        tvm_device.sync()
+
+        stats_before = runner.kernel_stats()
+        latencies = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            runner.run()
+            tvm_device.sync()
+            latencies.append((time.perf_counter() - start) * 1000)
+        stats_after = runner.kernel_stats()
+
+        memory_profiler.reset()
+        memory_profiler.start()
+        runner.run()
+        tvm_device.sync()
+        memory_profiler.stop()
+        mem_info = memory_profiler.get_max_memory_info(device)
+
+        metrics = {"compile_ms": compile_ms, "first_run_ms": first_run_ms}
+        metrics.update(_percentiles(latencies))
+        metrics["peak_used_mb"] = float(mem_info["max_used"].value)
+        metrics["peak_allocated_mb"] = float(mem_info["max_allocated"].value)
+        metrics["kernel_cache_hit_rate"] = runner.hit_rate(stats_before, stats_after)
+        metrics["pool"] = memory_profiler.get_pool_stats(device)
+        result["metrics"] = metrics
+    except Exception:  # pylint: disable=broad-except
+        result["error"] = traceback.format_exc()
+    finally:
+        memory_profiler.stop()
+        set_run_model_options(use_vm=use_vm)
+        # The tensors of the benchmark keep their memory after the pool is switched back.
+        RemovePool(device)
+        InitPool(device, prev_pool)
+    return result
+
+
+def run_matrix(configs, warmup=3, repeat=20, callback=None):
+    """Run a list of configurations.
+
+    Parameters
+    ----------
+    configs : List[BenchConfig]
+        The configurations.
+
+    warmup : int
+        The number of runs before the measurement.
+
+    repeat : int
+        The number of measured runs.
+
+    callback : Optional[Callable[[Dict[str, Any]], None]]
+        The function called with the result of each configuration, e.g., to print the progress.
+
+    Returns
+    -------
+    ret : Dict[str, Any]
+        The results, which can be dumped to JSON, with the environment ("env") and the list of
+        results of the configurations ("results").
+    """
+    from raf import __version__, __gitrev__  # pylint: disable=import-outside-toplevel
+
+    results = []
+    for config in configs:
+        result = run_config(config, warmup, repeat)
+        results.append(result)
+        if callback is not None:
+            callback(result)
+    return {
+        "env": {
+            "version": __version__,
+            "gitrev": __gitrev__,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "num_workers": dist.get_communicator().size,
+            "warmup": warmup,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
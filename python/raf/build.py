@@ -22,6 +22,12 @@ def with_cublas():
     return build_info.use_cublas() != "OFF"
 
 
+def with_cpu_blas():
+    """Whether the cpublas dialect is built with a CPU BLAS library instead of the built-in GEMM
+    kernel."""
+    return build_info.use_cpu_blas() != "OFF"
+
+
 def with_cudnn():
     """Whether build with CUDNN. if true, return the CUDNN version, or None otherwise."""
     if build_info.use_cudnn() != "OFF":
@@ -68,11 +74,12 @@ def build_with(backend):  # pylint: disable=too-many-return-statements
     -------
     Whether the backend is built with RAF.
     """
-    assert backend in ["tvm", "cuda", "cudnn", "cutlass", "cublas", "nccl"], (
+    assert backend in ["tvm", "cuda", "cudnn", "cutlass", "cublas", "cpublas", "nccl"], (
         "Invalid backend: %s" % backend
     )
-    if backend == "tvm":
-        return True  # it seems like that we always build with TVM
+    if backend in ("tvm", "cpublas"):
+        # TVM and the built-in GEMM kernel of cpublas are always built.
+        return True
     if backend == "cuda":
         return with_cuda() is not None
     if backend == "cublas":
@@ -21,6 +21,11 @@ if with_mpi():
         pass
 
 
+@register_node("raf.distributed.ShmCommunicator")
+class ShmCommunicator(Communicator):
+    pass
+
+
 @register_node("raf.distributed.VoidCommunicator")
 class VoidCommunicator(Communicator):
     @property
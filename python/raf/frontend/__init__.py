@@ -3,5 +3,6 @@
 
 """Framework frontend module"""
 from .model import FrameworkModel
+from .cache import save_model, load_model
 from .mxnet import from_mxnet
 from .pytorch import from_pytorch
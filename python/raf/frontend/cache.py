@@ -0,0 +1,238 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Persist the models converted by the frontends, so that they can be loaded back without the
+frameworks and Relay.
+
+A saved model is a directory with the following files:
+
+- meta.json: the cache key and the RAF version that saved the model.
+- train.json, infer.json: the train and infer modules saved by raf.ir.serialization.save_json.
+- params.bin: the parameter tensors. The file starts with a magic, the length of a JSON header
+  and the header, which records the name, dtype, shape, offset and kind of each tensor. The raw
+  data of each tensor follows at an offset aligned to DATA_ALIGN bytes, so the file can be mapped
+  into memory and each parameter becomes a view of the mapping.
+"""
+import hashlib
+import json
+import os
+import shutil
+import struct
+import tempfile
+
+import numpy as np
+
+from .. import __full_version__
+from .. import build
+from .._core.ndarray import array
+from ..ir.serialization import save_json, load_json
+from .model import FrameworkModel
+
+PARAMS_MAGIC = b"RAFPARAM"
+PARAMS_FORMAT = 1
+DATA_ALIGN = 64
+FILES = ("meta.json", "train.json", "infer.json", "params.bin")
+
+
+def raf_version():
+    """The version of the RAF package and the git revision of the library that it loads."""
+    return "%s+%s" % (__full_version__, build.git_version())
+
+
+def model_cache_key(frontend, *parts):
+    """Make the cache key of a converted model.
+
+    Parameters
+    ----------
+    frontend : str
+        The name of the frontend.
+
+    parts : List[object]
+        The JSON serializable objects that determine the conversion, such as the model structure,
+        the input shapes and the parameter dtypes.
+
+    Returns
+    -------
+    key : str
+        The SHA-256 digest of the parts and the RAF version.
+    """
+    content = json.dumps([frontend, raf_version()] + list(parts), default=str)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _align(offset):
+    return (offset + DATA_ALIGN - 1) // DATA_ALIGN * DATA_ALIGN
+
+
+def save_params(path, arg_params, aux_params):
+    """Save the parameters to a single file. A tensor that is in both dictionaries is saved once.
+
+    Parameters
+    ----------
+    path : str
+        The file path.
+
+    arg_params : Dict[str, ndarray]
+        The model parameters.
+
+    aux_params : Dict[str, ndarray]
+        The auxiliary parameters.
+    """
+    names = list(arg_params) + [name for name in aux_params if name not in arg_params]
+    tensors, header, size = [], [], 0
+    for name in names:
+        value = arg_params[name] if name in arg_params else aux_params[name]
+        data = np.ascontiguousarray(value.numpy())
+        tensors.append((size, data))
+        header.append(
+            {
+                "name": name,
+                "dtype": str(data.dtype),
+                "shape": list(data.shape),
+                "offset": size,
+                "arg": name in arg_params,
+                "aux": name in aux_params,
+            }
+        )
+        size = _align(size + data.nbytes)
+    header = json.dumps({"format": PARAMS_FORMAT, "tensors": header}).encode("utf-8")
+    # The offsets in the header are relative to the data section.
+    data_start = _align(len(PARAMS_MAGIC) + 8 + len(header))
+    with open(path, "wb") as filep:
+        filep.write(PARAMS_MAGIC + struct.pack("<Q", len(header)) + header)
+        for offset, data in tensors:
+            filep.seek(data_start + offset)
+            filep.write(memoryview(data))
+        filep.truncate(data_start + size)
+
+
+def load_params(path, mmap=True):
+    """Load the parameters saved by save_params.
+
+    Parameters
+    ----------
+    path : str
+        The file path.
+
+    mmap : bool
+        Whether to map the file into memory instead of reading it. The pages of a parameter are
+        read when it is first accessed, and the updates are private to the process.
+
+    Returns
+    -------
+    ret : Tuple[Dict[str, ndarray], Dict[str, ndarray]]
+        The model parameters and the auxiliary parameters on CPU.
+    """
+    with open(path, "rb") as filep:
+        magic = filep.read(len(PARAMS_MAGIC))
+        if magic != PARAMS_MAGIC:
+            raise ValueError("%s is not a RAF parameter file" % path)
+        (header_len,) = struct.unpack("<Q", filep.read(8))
+        header = json.loads(filep.read(header_len).decode("utf-8"))
+    if header["format"] != PARAMS_FORMAT:
+        raise ValueError("Unsupported parameter file format %s" % header["format"])
+    data_start = _align(len(PARAMS_MAGIC) + 8 + header_len)
+    if mmap:
+        buffer = np.memmap(path, dtype="uint8", mode="c")
+    else:
+        buffer = np.fromfile(path, dtype="uint8")
+
+    arg_params, aux_params = {}, {}
+    for info in header["tensors"]:
+        data = np.ndarray(
+            info["shape"], dtype=info["dtype"], buffer=buffer, offset=data_start + info["offset"]
+        )
+        # The tensor shares the buffer, which keeps the mapping alive.
+        value = array(data, copy=False)
+        if info["arg"]:
+            arg_params[info["name"]] = value
+        if info["aux"]:
+            aux_params[info["name"]] = value
+    return arg_params, aux_params
+
+
+def save_model(model, path, key=""):
+    """Save a converted model to a directory.
+
+    Parameters
+    ----------
+    model : FrameworkModel
+        The converted model.
+
+    path : str
+        The directory, which is created if it does not exist.
+
+    key : str
+        The cache key of the model, which is checked by load_model.
+    """
+    # pylint: disable=protected-access
+    os.makedirs(path, exist_ok=True)
+    for name, mod in [
+        ("train.json", model._FrameworkModel__train_mod),
+        ("infer.json", model._FrameworkModel__infer_mod),
+    ]:
+        with open(os.path.join(path, name), "w") as filep:
+            filep.write(save_json(mod))
+    save_params(
+        os.path.join(path, "params.bin"),
+        model._FrameworkModel__arg_params,
+        model._FrameworkModel__aux_params,
+    )
+    # Write the meta file at last, so an interrupted save is not loaded.
+    with open(os.path.join(path, "meta.json"), "w") as filep:
+        json.dump({"key": key, "raf_version": raf_version()}, filep)
+
+
+def load_model(path, key=None, mmap=True):
+    """Load a model saved by save_model. It does not need the framework or Relay.
+
+    Parameters
+    ----------
+    path : str
+        The directory of the saved model.
+
+    key : Optional[str]
+        The expected cache key. If it is given and does not match, None is returned.
+
+    mmap : bool
+        Whether to map the parameter file into memory.
+
+    Returns
+    -------
+    model : Optional[FrameworkModel]
+        The model with the parameters on CPU, or None if the model is not found or stale.
+    """
+    if not all(os.path.exists(os.path.join(path, name)) for name in FILES):
+        return None
+    with open(os.path.join(path, "meta.json"), "r") as filep:
+        meta = json.load(filep)
+    if meta["raf_version"] != raf_version() or (key is not None and meta["key"] != key):
+        return None
+    mods = []
+    for name in ["train.json", "infer.json"]:
+        with open(os.path.join(path, name), "r") as filep:
+            mods.append(load_json(filep.read()))
+    arg_params, aux_params = load_params(os.path.join(path, "params.bin"), mmap)
+    return FrameworkModel(mods[0], mods[1], arg_params, aux_params)
+
+
+def lookup(cache_dir, key):
+    """Load the model of the key from the cache directory, or return None on a miss."""
+    return load_model(os.path.join(cache_dir, key), key)
+
+
+def store(cache_dir, key, model):
+    """Save the model to the cache directory. The model is saved to a temporary directory first
+    and then renamed, so concurrent processes never load a partially saved model."""
+    os.makedirs(cache_dir, exist_ok=True)
+    temp_dir = tempfile.mkdtemp(prefix=".%s." % key, dir=cache_dir)
+    path = os.path.join(cache_dir, key)
+    try:
+        save_model(model, temp_dir, key)
+        if os.path.exists(path) and load_model(path, key) is None:
+            # Remove the entry left by an interrupted save.
+            shutil.rmtree(path)
+        os.rename(temp_dir, path)
+    except OSError:
+        # Another process has saved the same model.
+        shutil.rmtree(temp_dir, ignore_errors=True)
@@ -14,6 +14,7 @@ from raf._ffi.pass_ import ExtractBinding
 from raf._lib import relay
 from raf._op import sym as op
 from raf.frontend.model import FrameworkModel
+from raf.frontend import cache
 
 _saved_reshape_inputs = dict()
 _extra_aux_params = dict()
@@ -462,9 +463,14 @@ def from_mxnet(
     inputs_name,
     arg_params=None,
     aux_params=None,
+    cache_dir=None,
 ):
     """
     Migrate from TVM.
+
+    If cache_dir is given, the converted model is cached in the directory with the key of the
+    symbol JSON, the input names, the shapes and dtypes of the parameters and the RAF version,
+    and later conversions of the same model are loaded from the cache.
     """
     try:
         import mxnet as mx  # pylint: disable=import-outside-toplevel
@@ -479,8 +485,7 @@ def from_mxnet(
             params[k] = v.asnumpy()
         for k, v in aux_params.items():
             params[k] = v.asnumpy()
-        train_func = _from_mxnet_impl(symbol, True)
-        infer_func = _from_mxnet_impl(symbol, False)
+        sym = symbol
     elif isinstance(symbol, mx.gluon.HybridBlock):
         if arg_params is not None or aux_params is not None:
             raise ValueError("arg_params and aux_params ae not used when importing HybridBlock")
@@ -493,13 +498,23 @@ def from_mxnet(
         sym = symbol(*inputs)
         if isinstance(sym, (list, tuple)):
             sym = mx.sym.Group(sym)
-        train_func = _from_mxnet_impl(sym, True)
-        infer_func = _from_mxnet_impl(sym, False)
     elif isinstance(symbol, mx.gluon.Block):
         raise NotImplementedError("Only Hybrid Blocks are supported now.")
     else:
         msg = "mxnet.Symbol or gluon.HybridBlock expected, got {}".format(type(symbol))
         raise ValueError(msg)
+    if cache_dir is not None:
+        key = cache.model_cache_key(
+            "mxnet",
+            sym.tojson(),
+            list(inputs_name),
+            sorted((k, list(v.shape), str(v.dtype)) for k, v in params.items()),
+        )
+        cached = cache.lookup(cache_dir, key)
+        if cached is not None:
+            return cached
+    train_func = _from_mxnet_impl(sym, True)
+    infer_func = _from_mxnet_impl(sym, False)
     meta_arg_params = dict()
     meta_aux_params = dict()
     for v in train_func.params:
@@ -514,4 +529,6 @@ def from_mxnet(
     train_mod = raf_module({relay.GlobalVar("main"): train_func})
     infer_mod = raf_module({relay.GlobalVar("main"): infer_func})
     front_model = FrameworkModel(train_mod, infer_mod, meta_arg_params, meta_aux_params)
+    if cache_dir is not None:
+        cache.store(cache_dir, key, front_model)
     return front_model
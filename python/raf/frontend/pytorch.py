@@ -6,13 +6,13 @@
 from collections import OrderedDict
 import os
 import hashlib
-import torch
 
 from raf import distributed as dist
 from .._core.ndarray import ndarray
 from .._lib import relay
 from .._ffi.pass_ import FromRelay, SwitchTrainOp, validate_relay_param_name
 from ..frontend.model import FrameworkModel
+from ..frontend import cache
 
 
 def trace_model(model, shape_dict):
@@ -33,6 +33,7 @@ def trace_model(model, shape_dict):
     model: ScriptedModel
         PyTorch scripted model.
     """
+    import torch  # pylint: disable=import-outside-toplevel
 
     class TraceWrapper(torch.nn.Module):
         """A wrapper to process the forward output. This is required for object detection
@@ -112,7 +113,35 @@ def trace_model(model, shape_dict):
     return scripted_model
 
 
-def from_pytorch(model, shape_dict, model_file=None, hash_file=None):
+def model_cache_key(model, shape_dict):
+    """Make the conversion cache key of a PyTorch model. It covers the model structure, the input
+    shapes and dtypes, and the names, shapes, dtypes and requires_grad of the parameters and
+    buffers, but not their values.
+
+    Parameters
+    ----------
+    model: torch.nn.Module
+        The PyTorch module to be converted.
+
+    shape_dict: Dict[str,
+                     Union[Tuple[Tuple[int, ...], str],
+                           Tuple[Tuple[int, ...], str, int]]
+        A map from input name to its shape, type, and maximal value (optional).
+
+    Returns
+    -------
+    key: str
+        The cache key.
+    """
+    params = [
+        (name, list(param.shape), str(param.dtype), param.requires_grad)
+        for name, param in model.named_parameters()
+    ]
+    buffers = [(name, list(buf.shape), str(buf.dtype)) for name, buf in model.named_buffers()]
+    return cache.model_cache_key("pytorch", str(model), list(shape_dict.items()), params, buffers)
+
+
+def from_pytorch(model, shape_dict, model_file=None, hash_file=None, cache_dir=None):
     """Load PyTorch model and convert into RAF via Relay.
 
     Parameters
@@ -130,12 +159,26 @@ def from_pytorch(model, shape_dict, model_file=None, hash_file=None):
 
     hash_file: str
         The file that stores the scripted model hash
+
+    cache_dir: Optional[str]
+        The directory that caches the converted models. If the model has been converted with the
+        same structure, input shapes and RAF version, it is loaded from the cache without tracing
+        and Relay, and its parameters are mapped from the cache file. Note that the parameter
+        values are not part of the cache key.
+
     Returns
     -------
     model: FrameworkModel
         The converted FrameworkModel.
     """
+    if cache_dir is not None:
+        key = model_cache_key(model, shape_dict)
+        cached = cache.lookup(cache_dir, key)
+        if cached is not None:
+            return cached
     if model_file is not None and hash_file is not None:
+        import torch  # pylint: disable=import-outside-toplevel
+
         model_hash = hashlib.md5(str(model).encode(encoding="UTF-8")).hexdigest()
         if os.path.exists(model_file) and os.path.exists(hash_file):
             try:
@@ -183,4 +226,7 @@ def from_pytorch(model, shape_dict, model_file=None, hash_file=None):
                 aux_params[valid_name] = array_value
     # relay_params may contain unused parameters, which are not present in meta_params
     assert len(meta_params) <= len(relay_params)
-    return FrameworkModel(SwitchTrainOp(True)(meta_mod), meta_mod, meta_params, aux_params)
+    front_model = FrameworkModel(SwitchTrainOp(True)(meta_mod), meta_mod, meta_params, aux_params)
+    if cache_dir is not None:
+        cache.store(cache_dir, key, front_model)
+    return front_model
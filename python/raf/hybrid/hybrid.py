@@ -4,16 +4,17 @@
 # pylint: disable=missing-module-docstring,missing-class-docstring,missing-function-docstring
 import ast
 import inspect
-from typing import Callable, Dict
+from typing import Callable, Dict, Tuple
 
 import numpy as np
 
 from raf._core.core_utils import get_func_name, set_module
-from raf._core.executor import interpret
+from raf._core.executor import interpret, VMExecutor
 from raf._core import module
-from raf._core.ndarray import ndarray as NDArray
-from raf._core.value import BoolValue, FloatValue, IntValue, Value
-from raf._lib import relay
+from raf._core.ndarray import array, ndarray as NDArray
+from raf._core.value import BoolValue, FloatValue, IntValue, TensorValue, TupleValue, Value
+from raf._ffi.ir.constant import ExtractValue
+from raf._lib import IRModule, relay
 
 from .cfg import ast2cfg
 from .ir_builder import build_ir
@@ -21,9 +22,11 @@ from .sanity_check import sanity_check
 from .to_builder import to_builder
 from .to_relay import cfg2relay
 
-FUNC_TAB: Dict[Callable, Callable] = {}
+FUNC_TAB: Dict[Tuple[Callable, str], Callable] = {}
 FUNC_VAR: Dict[Callable, relay.GlobalVar] = {}
 
+EXECUTORS = ("interpreter", "vm")
+
 
 def find_invoker_name(namespace) -> str:
     name = "__ir_builder_invoker"
@@ -77,7 +80,74 @@ def _unwrap(a):
     raise NotImplementedError
 
 
-def pyfunc2relay(pyfunc, entry: relay.GlobalVar):
+def _make_vm_argument(a):
+    # The VM computes on tensors, so scalars are passed as 0-d tensors of the same dtype as the
+    # constants made by Value.as_const_expr.
+    if isinstance(a, bool):
+        return np.array(a, dtype="bool")
+    if isinstance(a, int):
+        return np.array(a, dtype="int64")
+    if isinstance(a, float):
+        return np.array(a, dtype="float64")
+    if isinstance(a, (np.ndarray, NDArray)):
+        return a
+    raise TypeError("Unsupported argument type of a hybrid function with VM: %s" % type(a))
+
+
+def _unwrap_vm(a):
+    if isinstance(a, (TensorValue, NDArray)):
+        arr = a.numpy()
+        return arr.item() if arr.ndim == 0 else a
+    if isinstance(a, (list, tuple, TupleValue)):
+        return tuple(_unwrap_vm(item) for item in a)
+    raise TypeError("Unsupported output type of a hybrid function with VM: %s" % type(a))
+
+
+def _get_vm_device(args):
+    """Get the device of the tensor arguments. The scalars and numpy arrays are on CPU, and are
+    copied to the device of the tensors if there are any."""
+    devices = {arg.device for arg in args if isinstance(arg, NDArray)}
+    if len(devices) > 1:
+        raise ValueError("The tensor arguments are on different devices: %s" % sorted(devices))
+    return devices.pop() if devices else "cpu"
+
+
+class ScalarToTensor(relay.ExprMutator):
+    """Replace the scalar constants with 0-d tensor constants, which the VM can compute on."""
+
+    def visit_constant(self, const):
+        value = ExtractValue(const)
+        if isinstance(value, (BoolValue, IntValue, FloatValue)):
+            arr = np.array(value.value, dtype=str(value.dtype))
+            return Value.as_const_expr(TensorValue.from_numpy(arr))
+        return const
+
+
+def _make_vm_call(hybrid_module, entry: relay.GlobalVar):
+    funcs = {gvar: ScalarToTensor().visit(func) for gvar, func in hybrid_module.items()}
+    # The compiled executors, one per signature (device, dtypes and shapes) of the arguments.
+    executors = {}
+
+    def call(*args):
+        args = [_make_vm_argument(arg) for arg in args]
+        device = _get_vm_device(args)
+        args = [arg if isinstance(arg, NDArray) else array(arg, device=device) for arg in args]
+        types = tuple((str(arg.dtype), tuple(arg.shape)) for arg in args)
+        sig = (device, types)
+        if sig not in executors:
+            params = [
+                relay.var("arg%d" % i, shape=shape, dtype=dtype)
+                for i, (dtype, shape) in enumerate(types)
+            ]
+            main = relay.Function(params, relay.Call(entry, params))
+            mod = IRModule({**funcs, relay.GlobalVar("main"): main})
+            executors[sig] = VMExecutor(mod, device).make_executor()
+        return _unwrap_vm(executors[sig](*args))
+
+    return call
+
+
+def pyfunc2relay(pyfunc, entry: relay.GlobalVar, executor: str = "interpreter"):
     mem = dict(inspect.getmembers(pyfunc))
     # getting AST
     node = ast.parse(inspect.getsource(pyfunc))
@@ -101,6 +171,9 @@ def pyfunc2relay(pyfunc, entry: relay.GlobalVar):
     for global_var, func in hybrid_module.items():
         global_module[global_var] = func
 
+    if executor == "vm":
+        return _make_vm_call(hybrid_module, entry)
+
     def call(*args):
         code = relay.Call(op=entry, args=[_make_argument(arg) for arg in args])
         result = interpret(code)
@@ -110,22 +183,38 @@ def pyfunc2relay(pyfunc, entry: relay.GlobalVar):
 
 
 @set_module("raf")
-def hybrid(python=False):
+def hybrid(python=False, executor="interpreter"):
+    """Transpile a Python function to RAF IR with control flow.
+
+    Parameters
+    ----------
+    python : bool
+        Must be False.
+
+    executor : str
+        How to execute the function. "interpreter" walks the IR in every call. "vm" compiles
+        the function to a VM executable once per signature of the arguments and caches it,
+        which is much faster for loops, but the operands of each op must have the same dtype.
+        The VM runs on the device of the tensor arguments, or on CPU if there are none.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError("Unknown executor %s. Supported executors: %s" % (executor, EXECUTORS))
+
     def hybrid_no_python(pyfunc):
         func_name = get_func_name(pyfunc)
         sig = inspect.signature(pyfunc)
-        if pyfunc not in FUNC_TAB:
-            FUNC_TAB[pyfunc] = None
+        if pyfunc not in FUNC_VAR:
             FUNC_VAR[pyfunc] = relay.GlobalVar(func_name)
+        FUNC_TAB.setdefault((pyfunc, executor), None)
 
         def transformed(*args, **kwargs):
             bound = sig.bind(*args, **kwargs)
             bound.apply_defaults()
             pos_args = list(bound.arguments.values())
-            func = FUNC_TAB[pyfunc]
+            func = FUNC_TAB[(pyfunc, executor)]
             if func is None:
-                func = pyfunc2relay(pyfunc, FUNC_VAR[pyfunc])
-                FUNC_TAB[pyfunc] = func
+                func = pyfunc2relay(pyfunc, FUNC_VAR[pyfunc], executor)
+                FUNC_TAB[(pyfunc, executor)] = func
             return func(*pos_args)
 
         return transformed
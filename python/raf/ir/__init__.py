@@ -11,6 +11,6 @@ from . import dataflow_pattern
 from . import op
 from .serialization import save_json, load_json
 from .constant import to_value, const
-from .pass_manager import RAFSequential
+from .pass_manager import RAFSequential, PassProfiler, clear_pass_memo, get_pass_memo_stats
 from .scope_builder import ScopeBuilder
 from .anf_builder import ANFBuilder
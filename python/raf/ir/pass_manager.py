@@ -5,6 +5,7 @@
 # pylint: disable=missing-class-docstring, missing-function-docstring
 # pylint: disable=too-few-public-methods, too-many-arguments
 
+from tvm.ir.instrument import PassInstrument
 from tvm.ir.transform import Pass
 from raf._core.core_utils import register_node
 from raf._ffi import pass_
@@ -52,3 +53,108 @@ class RAFSequential(Pass):
 @register_node("raf.pass_.RAFFunctionPass")
 class RAFFunctionPass(Pass):
     """A pass that works on each tvm.relay.Function in a module."""
+
+
+@register_node("raf.pass_.PassProfiler")
+class PassProfiler(PassInstrument):
+    """A pass instrument that records every pass run in the pass context, including the nested
+    ones. Each record includes the wall time, the number of IR nodes before and after the pass,
+    and the peak increase of the resident memory during the pass (only available on Linux).
+    The peak is only known for the passes that raise the high water mark of the process, and
+    is 0 for the others. Set RAF_PASS_PROBE_RESET_HWM=1 to reset the mark before every pass and
+    measure all of them, which also resets the VmHWM reported for the whole process.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        prof = raf.ir.PassProfiler()
+        with raf.ir.PassContext(opt_level=3, instruments=[prof]):
+            executor = VMExecutor(mod, "cuda")
+        print(prof.render())
+
+    Parameters
+    ----------
+    name : str
+        The name of the instrument.
+    """
+
+    def __init__(self, name="PassProfiler"):
+        self.__init_handle_by_constructor__(pass_.PassProfiler, name)
+
+    def get_records(self):
+        """Get the records in the order of pass completion.
+
+        Returns
+        -------
+        ret : List[Dict[str, Union[str, int, float]]]
+            The records, each of which includes "name", "depth" (the nesting level), "time_ms",
+            "nodes_before", "nodes_after" and "peak_mem_mb".
+        """
+        return [
+            {key: val if isinstance(val, str) else val.value for key, val in record.items()}
+            for record in pass_.PassProfilerGetRecords(self)
+        ]
+
+    def clear(self):
+        """Drop all records."""
+        pass_.PassProfilerClear(self)
+
+    def render(self):
+        """Render the records as a table, where nested passes are indented.
+
+        Returns
+        -------
+        ret : str
+            The table.
+        """
+        lines = [
+            f"{'pass':<48} {'time(ms)':>10} {'nodes before':>13} {'nodes after':>12} "
+            f"{'peak(MB)':>9}"
+        ]
+        for record in _to_preorder(self.get_records()):
+            name = "  " * record["depth"] + record["name"]
+            lines.append(
+                f"{name:<48} {record['time_ms']:>10.2f} {record['nodes_before']:>13} "
+                f"{record['nodes_after']:>12} {record['peak_mem_mb']:>9.1f}"
+            )
+        return "\n".join(lines)
+
+
+def _to_preorder(records):
+    """Reorder the records from the completion order to the start order. A pass completes after
+    all its nested passes, which are the preceding records at deeper levels."""
+    trees = []
+    for record in records:
+        children = []
+        while trees and trees[-1][0]["depth"] > record["depth"]:
+            children.insert(0, trees.pop())
+        trees.append((record, children))
+
+    ret = []
+
+    def _visit(tree):
+        ret.append(tree[0])
+        for child in tree[1]:
+            _visit(child)
+
+    for tree in trees:
+        _visit(tree)
+    return ret
+
+
+def clear_pass_memo():
+    """Drop all memoized pass runs. The memo is enabled by setting "raf.pass_manager.memo" in
+    the pass context config."""
+    pass_.ClearPassMemo()
+
+
+def get_pass_memo_stats():
+    """Get the statistics of the pass memo.
+
+    Returns
+    -------
+    ret : Dict[str, int]
+        The number of memoized pass runs ("entries"), and the number of "hits" and "misses".
+    """
+    return {key: val.value for key, val in pass_.GetPassMemoStats().items()}
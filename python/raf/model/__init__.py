@@ -3,6 +3,7 @@
 
 """Model block definition."""
 from .model import Model
-from .trace import trace, trace_mutate_attr
+from .trace import trace, trace_mutate_attr, set_trace_cache_options, get_trace_cache_stats
+from .trace import set_run_model_options, clear_run_model_cache, get_run_model_cache_stats
 from .nn import BatchNorm, Conv2d, Linear
 from .structure import Sequential
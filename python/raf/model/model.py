@@ -299,4 +299,31 @@ def get_peak_memory(model, device, args, include_param=True):
     return max(trace, key=lambda x: x[1])[1]
 
 
+def get_memory_footprint(model, device, args, include_param=True):
+    """A utility function to estimate the peak memory consumption when the memory planner packs
+    intermediate tensors into arenas, compared to the one when every tensor group has its own
+    storage.
+
+    Returns
+    -------
+    ret : Dict[str, float]
+        The peak memory in MBs with ("peak") and without ("peak_without_arena") arenas.
+    """
+    # pylint: disable=import-outside-toplevel
+    import tvm
+    from raf._core.vm import VMCompiler
+    from raf._ffi.pass_ import EstimateMemoryFootprint, InferType
+
+    record = model._internal(*args)
+    mod = record.mod
+
+    compiler = VMCompiler()
+    config = {"raf.memory_plan.use_arena": True}
+    with tvm.transform.PassContext(opt_level=3, config=config):
+        mod, _ = compiler.optimize(mod, device)
+    mod = InferType()(mod)
+    footprint = EstimateMemoryFootprint(mod, Device(device), include_param)
+    return {key: val.value for key, val in footprint.items()}
+
+
 # pylint: enable=protected-access
@@ -2,8 +2,10 @@
 # SPDX-License-Identifier: Apache-2.0
 
 # pylint: disable=missing-module-docstring,missing-function-docstring, protected-access
+import bisect
 import functools
 import sys
+import weakref
 from collections import OrderedDict, namedtuple
 
 from raf._core import cacher
@@ -12,7 +14,8 @@ from raf._core.global_scope import SCOPE
 from raf._core.module import IRModule
 from raf._core.ndarray import Symbol, ndarray
 from raf._ffi.pass_ import ExtractBinding, RenameVars
-from raf._ffi.model import RunModel
+from raf._ffi.model import RunModel, ClearRunModelCache, SetRunModelOptions
+from raf._ffi.model import GetRunModelCacheStats
 from raf._lib import relay, Array
 
 _TraceRecord = namedtuple(
@@ -52,6 +55,7 @@ def trace(pyfunc):
             raise ValueError("Decorator trace should only be applied to a model")
         if _scope_last_name() == "trace":
             return pyfunc(*args, **kwargs)
+        args, kwargs = _pad_to_buckets(pyfunc, args, kwargs)
         record = _get_trace_record(pyfunc, args, kwargs)
         bound_args = get_bound_args(pyfunc, args, kwargs)
         return _run_trace_record(record, bound_args.args, bound_args.kwargs)
@@ -73,6 +77,43 @@ def _run_trace_record(record, args, kwargs):
     return _unflatten_from_struct(result, record.o_struct)
 
 
+def set_run_model_options(cache_size=None, use_vm=None):
+    """Set the options of running the traced models. The traced module is optimized (and
+    differentiated if any input requires gradient) when it runs for the first time, and the
+    optimized module is cached for the following runs.
+
+    Parameters
+    ----------
+    cache_size : Optional[int]
+        The maximum number of cached optimized modules. 0 disables the cache. The default value
+        can be set by the environment variable RAF_RUN_MODEL_CACHE_SIZE.
+    use_vm : Optional[bool]
+        Whether to run the models that do not require gradient with the VM instead of the
+        interpreter. The default value can be set by the environment variable
+        RAF_RUN_MODEL_USE_VM.
+    """
+    if use_vm is None:
+        use_vm = bool(get_run_model_cache_stats()["UseVM"])
+    SetRunModelOptions(-1 if cache_size is None else cache_size, use_vm)
+
+
+def clear_run_model_cache():
+    """Clear the cached optimized modules of the traced models."""
+    ClearRunModelCache()
+
+
+def get_run_model_cache_stats():
+    """Get the statistics of the cached optimized modules of the traced models.
+
+    Returns
+    -------
+    ret : Dict[str, int]
+        The number of cached modules ("Size"), the capacity ("Capacity"), the number of hits
+        ("Hit"), misses ("Miss") and evictions ("Evict"), and whether the VM is used ("UseVM").
+    """
+    return {key: value.value for key, value in GetRunModelCacheStats().items()}
+
+
 def _get_handle_or_origin(arg, get_handle=True):
     if isinstance(arg, ndarray):
         return arg._ndarray__handle if get_handle else arg
@@ -118,14 +159,155 @@ def _unwrap(result):
     return result
 
 
+# The default maximum number of trace records cached per model method
+DEFAULT_TRACE_CACHE_SIZE = 8
+
+
+class _TraceCacheState:
+    """The trace cache options and statistics of a model. Unlike the trace records, they are
+    kept when the model cache is invalidated."""
+
+    def __init__(self):
+        self.max_entries = DEFAULT_TRACE_CACHE_SIZE
+        self.buckets = {}
+        self.stats = {}
+
+    def get_stats(self, func_name):
+        if func_name not in self.stats:
+            self.stats[func_name] = {"hit": 0, "miss": 0, "evict": 0}
+        return self.stats[func_name]
+
+
+_TRACE_CACHE_STATES = weakref.WeakKeyDictionary()
+
+
+def _get_trace_cache_state(model):
+    if model not in _TRACE_CACHE_STATES:
+        _TRACE_CACHE_STATES[model] = _TraceCacheState()
+    return _TRACE_CACHE_STATES[model]
+
+
+def set_trace_cache_options(model, max_entries=None, buckets=None):
+    """Set the trace cache options of a model. The traced records of each traced method are
+    keyed on the input types (shapes, dtypes and tuple structures), and the least recently used
+    ones are evicted when there are more than max_entries records.
+
+    Parameters
+    ----------
+    model : raf.Model
+        The model.
+    max_entries : Optional[int]
+        The maximum number of trace records per traced method. 0 disables the trace cache.
+    buckets : Optional[Dict[str, Dict[int, List[int]]]]
+        The shape buckets, which map an input name to the bucket sizes of its axes, e.g.,
+        {"x": {1: [32, 64, 128]}}. The axis of an input is padded with zeros to the smallest
+        bucket size that is no less than it, so the inputs in a range of shapes share a trace
+        record. The axis is not padded if it is larger than all bucket sizes. Note that the
+        outputs are computed with the padded inputs. Set to {} to remove all buckets.
+    """
+    state = _get_trace_cache_state(model)
+    if max_entries is not None:
+        if max_entries < 0:
+            raise ValueError("max_entries must be non-negative, but got %d" % max_entries)
+        state.max_entries = max_entries
+        for func_name, stats in state.stats.items():
+            records = cacher.get_cache(model, "trace@" + func_name, None)
+            while records and len(records) > max_entries:
+                records.popitem(last=False)
+                stats["evict"] += 1
+    if buckets is not None:
+        state.buckets = {
+            name: {axis: sorted(sizes) for axis, sizes in axes.items()}
+            for name, axes in buckets.items()
+        }
+
+
+def get_trace_cache_stats(model):
+    """Get the trace cache statistics of a model.
+
+    Parameters
+    ----------
+    model : raf.Model
+        The model.
+
+    Returns
+    -------
+    ret : Dict[str, Dict[str, int]]
+        Map from the traced method name to the number of cached records ("entries"),
+        cache hits ("hit"), misses ("miss") and evictions ("evict").
+    """
+    state = _get_trace_cache_state(model)
+    ret = {}
+    for func_name, stats in state.stats.items():
+        entries = cacher.get_cache(model, "trace@" + func_name, None)
+        ret[func_name] = dict(stats, entries=len(entries) if entries is not None else 0)
+    return ret
+
+
+def _get_type_signature(value):
+    if isinstance(value, ndarray):
+        return ("tensor", tuple(value.shape), value.dtype)
+    if isinstance(value, (tuple, list)):
+        return ("tuple",) + tuple(_get_type_signature(x) for x in value)
+    if isinstance(value, Symbol):
+        return ("symbol", value._Symbol__handle)
+    raise NotImplementedError("Type is not supported: ", type(value))
+
+
+def _get_trace_key(pyfunc, args, kwargs):
+    bound_args = get_bound_args(pyfunc, args, kwargs)
+    return tuple(
+        (name, _get_type_signature(value))
+        for name, value in list(bound_args.arguments.items())[1:]
+    )
+
+
+def _pad_to_buckets(pyfunc, args, kwargs):
+    state = _get_trace_cache_state(args[0])
+    if not state.buckets:
+        return args, kwargs
+    imp = sys.modules["raf._op.imp"]
+    bound_args = get_bound_args(pyfunc, args, kwargs)
+    for name, axes in state.buckets.items():
+        value = bound_args.arguments.get(name, None)
+        if not isinstance(value, ndarray):
+            continue
+        pad_width = [0] * (2 * len(value.shape))
+        for axis, sizes in axes.items():
+            dim = value.shape[axis]
+            idx = bisect.bisect_left(sizes, dim)
+            if idx < len(sizes):
+                pad_width[2 * (axis % len(value.shape)) + 1] = sizes[idx] - dim
+        if any(pad_width):
+            padded = imp.pad(value, pad_width)
+            padded.requires_grad = value.requires_grad
+            bound_args.arguments[name] = padded
+    return bound_args.args, bound_args.kwargs
+
+
 def _get_trace_record(pyfunc, args, kwargs):
     model = args[0]
     func_name = get_func_name(pyfunc)
-    record = cacher.get_cache(model, "trace@" + func_name, None)
-    if record is not None:
-        return record
+    state = _get_trace_cache_state(model)
+    stats = state.get_stats(func_name)
+    if state.max_entries == 0:
+        stats["miss"] += 1
+        return _do_tracing(pyfunc, args, kwargs)
+    key = _get_trace_key(pyfunc, args, kwargs)
+    records = cacher.get_cache(model, "trace@" + func_name, None)
+    if records is None:
+        records = OrderedDict()
+        cacher.set_cache(model, "trace@" + func_name, records)
+    if key in records:
+        stats["hit"] += 1
+        records.move_to_end(key)
+        return records[key]
+    stats["miss"] += 1
     record = _do_tracing(pyfunc, args, kwargs)
-    cacher.set_cache(model, "trace@" + func_name, record)
+    records[key] = record
+    while len(records) > state.max_entries:
+        records.popitem(last=False)
+        stats["evict"] += 1
     return record
 
 
@@ -85,7 +85,9 @@ class LANS:
             x_list.append(x)
             m_list.append(m)
             v_list.append(v)
-        step = array(self._step, dtype="float32", device="cuda", name="step")
+        if not x_list:
+            return
+        step = array(self._step, dtype="float32", device=x_list[0].device, name="step")
         tensor_list = g_list + x_list + m_list + v_list
         imp.lans(
             tensor_list,
@@ -3,6 +3,8 @@
 
 """SGD optimizer."""
 # pylint: disable=too-many-statements,too-many-instance-attributes
+from collections import OrderedDict
+
 import numpy as np
 
 from raf._core.core_utils import get_chained_attr
@@ -10,7 +12,7 @@ from raf._core.ndarray import ndarray, array
 from raf.model import trace, Model, trace_mutate_attr
 from raf.model.trace import _get_func_inputs
 from raf._op import imp
-from raf._op.sym import multiply, add, subtract, strided_slice, cast
+from raf._op.sym import add, strided_slice, cast, multi_tensor_sgd
 from .. import distributed as dist
 from .data_parallel import with_data_parallel
 from ..distributed.op import allgather
@@ -49,13 +51,23 @@ class SGD:
             self.params.append((x, v_i))
 
     def step(self):
-        """Update the parameters with gradients."""
+        """Update the parameters with gradients. The FP32 parameters on the same device are
+        updated in place by a single multi_tensor_sgd call."""
+        groups = OrderedDict()
         for x0, v0 in self.params:
             if x0.grad is None:
                 continue
-            v1, x1 = imp.sgd(x0, x0.grad, v0, self._lr, self._momentum)
-            x0.update(x1)
-            v0.update(v1)
+            if x0.dtype != "float32":
+                v1, x1 = imp.sgd(x0, x0.grad, v0, self._lr, self._momentum)
+                x0.update(x1)
+                v0.update(v1)
+                continue
+            groups.setdefault(x0.device, []).append((x0, v0))
+        for params in groups.values():
+            dx_list = [x0.grad for x0, _ in params]
+            x_list = [x0 for x0, _ in params]
+            v_list = [v0 for _, v0 in params]
+            imp.multi_tensor_sgd(dx_list + x_list + v_list, self._lr, self._momentum)
 
 
 def with_sgd(learning_rate=0.1, momentum=0.01):
@@ -103,8 +115,8 @@ def with_sgd(learning_rate=0.1, momentum=0.01):
             def build(self, model):
                 self.model = model
                 self.ad_model = with_data_parallel(with_autodiff(model))
-                self.learning_rate = array(learning_rate, dtype="float32")
-                self.momentum = array(momentum, dtype="float32")
+                self.learning_rate = learning_rate
+                self.momentum = momentum
 
                 # Determine the parameter dtype by referring to the first floating type parameter.
                 self.dtype = get_model_dtype(self.model)
@@ -183,6 +195,7 @@ def with_sgd(learning_rate=0.1, momentum=0.01):
                 inputs = inputs[1:]  # remove dy
                 dcfg = dist.get_config()
                 comm = dist.get_communicator()
+                updates = []
                 for i, param in enumerate(inputs):
                     dxi = dxs[i] if len(inputs) > 1 else dxs
                     if param in self.params and has_grad(dxi):
@@ -192,33 +205,45 @@ def with_sgd(learning_rate=0.1, momentum=0.01):
                         # Cast gradient to float32 if necessary.
                         if self.dtype != "float32":
                             dxi = cast(dxi, "float32")
-
-                        # Inplace update the local SGD variant and weight (float32).
-                        new_sgd_v = add(multiply(self.momentum, sgd_v), dxi, out=sgd_v)
-                        new_sgd_w = subtract(
-                            sgd_w, multiply(self.learning_rate, new_sgd_v), out=sgd_w
-                        )
-
-                        # Cast the updated SGD weight to the model parameter dtype.
-                        if self.dtype != "float32":
-                            new_sgd_w = cast(new_sgd_w, self.dtype)
-
-                        # If the SGD status is partitioned, use all-gather to sync
-                        # the updated weights.
-                        if dcfg.zero_opt_level > 0:
-                            new_sgd_w = allgather(new_sgd_w, axis=0)
-                            # Slice to remove the zero-padding if needed.
-                            if sgd_w.shape[0] * comm.size > weight.shape[0]:
-                                new_sgd_w = strided_slice(new_sgd_w, [0], [weight.shape[0]], [1])
-
-                        # Update the model parameter.
-                        new_weight = (
-                            add(new_sgd_w, self.zero, out=weight) if self.has_sgd_w else new_sgd_w
-                        )
-
-                        # Put the updated weight to the model output to avoid being dead code.
-                        param_model = get_chained_attr(self.model, name.split(".")[:-1])
-                        trace_mutate_attr(param_model, name.split(".")[-1], new_weight)
+                        updates.append((name, weight, sgd_w, sgd_v, dxi))
+                if not updates:
+                    return y
+
+                # Inplace update the local SGD variants and weights (float32) of all parameters
+                # with a single op.
+                ntensor = len(updates)
+                dx_list = [update[4] for update in updates]
+                w_list = [update[2] for update in updates]
+                v_list = [update[3] for update in updates]
+                output_list = multi_tensor_sgd(
+                    dx_list + w_list + v_list, self.learning_rate, self.momentum
+                )
+
+                for i, (name, weight, sgd_w, _, _) in enumerate(updates):
+                    new_sgd_w = output_list[ntensor + i]
+                    new_sgd_v = output_list[2 * ntensor + i]
+
+                    # Cast the updated SGD weight to the model parameter dtype.
+                    if self.dtype != "float32":
+                        new_sgd_w = cast(new_sgd_w, self.dtype)
+
+                    # If the SGD status is partitioned, use all-gather to sync
+                    # the updated weights.
+                    if dcfg.zero_opt_level > 0:
+                        new_sgd_w = allgather(new_sgd_w, axis=0)
+                        # Slice to remove the zero-padding if needed.
+                        if sgd_w.shape[0] * comm.size > weight.shape[0]:
+                            new_sgd_w = strided_slice(new_sgd_w, [0], [weight.shape[0]], [1])
+
+                    # Update the model parameter.
+                    new_weight = (
+                        add(new_sgd_w, self.zero, out=weight) if self.has_sgd_w else new_sgd_w
+                    )
+
+                    # Put the updated weight to the model output to avoid being dead code.
+                    param_model = get_chained_attr(self.model, name.split(".")[:-1])
+                    trace_mutate_attr(param_model, name.split(".")[-1], new_weight)
+                    trace_mutate_attr(self, f"{name}.sgd_v", new_sgd_v)
                 return y
 
         return SGDWrapper(model)
@@ -4,3 +4,5 @@
 """Random number generators."""
 from .np import normal, uniform
 from . import nn
+from . import threefry
+from .threefry import init_model
@@ -2,12 +2,18 @@
 # SPDX-License-Identifier: Apache-2.0
 
 # pylint: disable=missing-function-docstring,too-many-arguments
-"""NN-specific random initializers."""
+"""NN-specific random initializers.
+
+The samples are drawn by numpy on the host by default. With rng="threefry", they are generated
+on the target device instead; see raf.random.threefry.
+"""
 import math
 
 import numpy as np
 
+from . import threefry
 from .np import normal, uniform
+from .threefry import Normal, Uniform
 
 
 def _calc_fan_in_out(shape):
@@ -38,16 +44,91 @@ def _calc_gain(nonlinearity, param=None):
     raise NotImplementedError("gain for nonlinearity: " + str(nonlinearity))
 
 
-def xavier_uniform(shape, gain=1.0, name="", dtype="float32", device="cpu"):
+def _xavier_uniform(shape, gain=1.0):
     fan_in, fan_out = _calc_fan_in_out(shape)
     a = gain * np.sqrt(6.0 / (fan_in + fan_out))
-    return uniform(low=-a, high=a, shape=shape, name=name, dtype=dtype, device=device)
+    return Uniform(low=-a, high=a)
 
 
-def xavier_normal(shape, gain=1.0, name="", dtype="float32", device="cpu"):
+def _xavier_normal(shape, gain=1.0):
     fan_in, fan_out = _calc_fan_in_out(shape)
     std = gain * math.sqrt(2.0 / (fan_in + fan_out))
-    return normal(mean=0.0, std=std, shape=shape, name=name, dtype=dtype, device=device)
+    return Normal(mean=0.0, std=std)
+
+
+def _kaiming_std(shape, a, mode, nonlinearity):
+    fan_in, fan_out = _calc_fan_in_out(shape)
+    if mode == "fan_in":
+        fan = fan_in
+    elif mode == "fan_out":
+        fan = fan_out
+    else:
+        raise ValueError("Cannot recognize mode in kaiming_uniform", mode)
+    gain = _calc_gain(nonlinearity, a)
+    return gain / math.sqrt(fan)
+
+
+def _kaiming_uniform(shape, a=0, mode="fan_in", nonlinearity="leaky_relu"):
+    bound = math.sqrt(3.0) * _kaiming_std(shape, a, mode, nonlinearity)
+    return Uniform(low=-bound, high=bound)
+
+
+def _kaiming_normal(shape, a=0, mode="fan_in", nonlinearity="leaky_relu"):
+    return Normal(mean=0.0, std=_kaiming_std(shape, a, mode, nonlinearity))
+
+
+_DIST_MAP = {
+    "xavier_uniform": _xavier_uniform,
+    "xavier_normal": _xavier_normal,
+    "kaiming_uniform": _kaiming_uniform,
+    "kaiming_normal": _kaiming_normal,
+}
+
+
+def distribution(method, shape, **kwargs):
+    """Get the distribution of an initialization method, which can be sampled on the device by
+    raf.random.threefry, e.g., as the return value of the initializer of init_model.
+
+    Parameters
+    ----------
+    method : str
+        The initialization method, which is one of xavier_uniform, xavier_normal,
+        kaiming_uniform and kaiming_normal.
+
+    shape : List[int]
+        The shape of the tensor to be initialized.
+
+    kwargs : Dict[str, Any]
+        The arguments of the initialization method, such as gain.
+
+    Returns
+    -------
+    ret : Union[Uniform, Normal]
+        The distribution.
+    """
+    if method not in _DIST_MAP:
+        raise ValueError("Unknown initialization method: %s" % method)
+    return _DIST_MAP[method](shape, **kwargs)
+
+
+def _sample(dist, shape, name, dtype, device, rng, seed):
+    if rng == "numpy":
+        if isinstance(dist, Uniform):
+            return uniform(dist.low, dist.high, shape=shape, name=name, dtype=dtype, device=device)
+        return normal(dist.mean, dist.std, shape=shape, name=name, dtype=dtype, device=device)
+    if rng == "threefry":
+        return threefry.sample({name: (dist, shape, dtype)}, device, seed)[name]
+    raise ValueError("Unknown random number generator: %s" % rng)
+
+
+def xavier_uniform(shape, gain=1.0, name="", dtype="float32", device="cpu", rng="numpy", seed=None):
+    dist = _xavier_uniform(shape, gain)
+    return _sample(dist, shape, name, dtype, device, rng, seed)
+
+
+def xavier_normal(shape, gain=1.0, name="", dtype="float32", device="cpu", rng="numpy", seed=None):
+    dist = _xavier_normal(shape, gain)
+    return _sample(dist, shape, name, dtype, device, rng, seed)
 
 
 def kaiming_uniform(
@@ -58,18 +139,11 @@ def kaiming_uniform(
     name="",  # pylint: disable=too-many-arguments
     dtype="float32",
     device="cpu",
+    rng="numpy",
+    seed=None,
 ):
-    fan_in, fan_out = _calc_fan_in_out(shape)
-    if mode == "fan_in":
-        fan = fan_in
-    elif mode == "fan_out":
-        fan = fan_out
-    else:
-        raise ValueError("Cannot recognize mode in kaiming_uniform", mode)
-    gain = _calc_gain(nonlinearity, a)
-    std = gain / math.sqrt(fan)
-    bound = math.sqrt(3.0) * std
-    return uniform(low=-bound, high=bound, shape=shape, name=name, dtype=dtype, device=device)
+    dist = _kaiming_uniform(shape, a, mode, nonlinearity)
+    return _sample(dist, shape, name, dtype, device, rng, seed)
 
 
 def kaiming_normal(
@@ -80,14 +154,8 @@ def kaiming_normal(
     name="",  # pylint: disable=too-many-arguments
     dtype="float32",
     device="cpu",
+    rng="numpy",
+    seed=None,
 ):
-    fan_in, fan_out = _calc_fan_in_out(shape)
-    if mode == "fan_in":
-        fan = fan_in
-    elif mode == "fan_out":
-        fan = fan_out
-    else:
-        raise ValueError("Cannot recognize mode in kaiming_uniform", mode)
-    gain = _calc_gain(nonlinearity, a)
-    std = gain / math.sqrt(fan)
-    return normal(0, std, name=name, dtype=dtype, device=device)
+    dist = _kaiming_normal(shape, a, mode, nonlinearity)
+    return _sample(dist, shape, name, dtype, device, rng, seed)
@@ -0,0 +1,233 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+# pylint: disable=too-many-arguments,too-many-locals
+"""Random tensor samplers that run on the target device with the threefry generator.
+
+Every tensor is sampled from its own threefry key, which is derived from a global seed and the
+tensor name. The samples of a tensor therefore only depend on (seed, name, shape, dtype), no
+matter how many tensors are sampled together, in which order, or on which device. All tensors
+of a batch are generated by a single VM function on the device, so nothing but the keys is
+transferred from the host.
+"""
+import functools
+import hashlib
+import math
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+from tvm import relay
+
+from raf._core.executor import VMExecutor
+from raf._core.module import IRModule
+from raf._core.ir_ext import extended_var
+from raf._core.ndarray import ndarray, array
+from raf._ffi.binding import BindNDArray
+from raf._ffi.pass_ import InferType
+from raf._lib import PassContext
+from raf.ir.anf_builder import ANFBuilder
+from raf.ir.constant import const
+
+Uniform = namedtuple("Uniform", ["low", "high"])
+Uniform.__doc__ = "The uniform distribution in [low, high)."
+
+Normal = namedtuple("Normal", ["mean", "std"])
+Normal.__doc__ = "The normal distribution with the given mean and standard deviation."
+
+# The number of random bits kept for each sample, which fits the mantissa of the compute dtype.
+_MANTISSA_BITS = {"float32": 24, "float64": 53}
+
+
+def make_key(seed, name=""):
+    """Derive the threefry key of a tensor from the global seed and the tensor name.
+
+    Parameters
+    ----------
+    seed : int
+        The global seed in [0, 2^128).
+
+    name : str
+        The tensor name.
+
+    Returns
+    -------
+    ret : numpy.ndarray
+        The uint64 threefry key.
+    """
+    if not 0 <= seed < (1 << 128):
+        raise ValueError("The seed must be in [0, 2^128), but got %s" % seed)
+    digest = int.from_bytes(hashlib.sha256(name.encode("utf-8")).digest()[:16], "big")
+    return relay.random.threefry_key((seed << 128) | digest).data.numpy()
+
+
+def _default_seed():
+    return int(np.random.randint(0, np.iinfo(np.int64).max))
+
+
+def _compute_dtype(dtype):
+    if dtype not in ["float16", "bfloat16", "float32", "float64"]:
+        raise ValueError("Only floating-point dtypes can be sampled, but got %s" % dtype)
+    return "float64" if dtype == "float64" else "float32"
+
+
+def _const(value, dtype):
+    return const(np.array(value, dtype=dtype))
+
+
+class _SampleBuilder:
+    """Build the function that transforms the random bits of each key to the samples."""
+
+    def __init__(self):
+        self.builder = ANFBuilder()
+
+    def call(self, op_name, *args):
+        """Call an op. Python constants are converted to the corresponding expressions."""
+        args = [arg if isinstance(arg, relay.Expr) else self.builder.const(arg) for arg in args]
+        return self.builder.call(op_name, args)
+
+    def unit(self, key, size, dtype, open_zero):
+        """Sample the standard uniform distribution in [0, 1), or (0, 1] if open_zero."""
+        nbits = _MANTISSA_BITS[dtype]
+        bits = self.builder.get_tuple_item(self.call("threefry_generate", key, (size,)), 1)
+        bits = self.call("right_shift", bits, _const(64 - nbits, "uint64"))
+        if open_zero:
+            bits = self.call("add", bits, _const(1, "uint64"), const(None), const(None))
+        bits = self.call("cast", bits, dtype)
+        return self.call("multiply", bits, _const(2.0**-nbits, dtype))
+
+    def sample(self, key, dist, shape, dtype):
+        """Sample the given distribution."""
+        compute_dtype = _compute_dtype(dtype)
+        size = int(np.prod(shape, dtype="int64"))
+        null = const(None)
+        if isinstance(dist, Uniform):
+            out = self.unit(key, size, compute_dtype, open_zero=False)
+            out = self.call("multiply", out, _const(dist.high - dist.low, compute_dtype))
+            out = self.call("add", out, _const(dist.low, compute_dtype), null, null)
+        elif isinstance(dist, Normal):
+            # Box-Muller transform. The first uniform sample excludes 0 to keep the log finite.
+            pair = self.unit(key, 2 * size, compute_dtype, open_zero=True)
+            pair = self.call("split", pair, 2, 0)
+            radius = self.call("log", self.builder.get_tuple_item(pair, 0))
+            radius = self.call("sqrt", self.call("multiply", radius, _const(-2.0, compute_dtype)))
+            theta = self.builder.get_tuple_item(pair, 1)
+            theta = self.call("multiply", theta, _const(2 * math.pi, compute_dtype))
+            theta = self.call("cos", theta)
+            out = self.call("multiply", radius, theta)
+            out = self.call("multiply", out, _const(dist.std, compute_dtype))
+            out = self.call("add", out, _const(dist.mean, compute_dtype), null, null)
+        else:
+            raise TypeError("Unknown distribution: %s" % type(dist))
+        if dtype != compute_dtype:
+            out = self.call("cast", out, dtype)
+        return self.call("reshape", out, tuple(shape), False)
+
+    def ret(self, outputs):
+        """Return all samples as a tuple."""
+        return self.builder.ret(self.builder.make_tuple(outputs))
+
+
+@functools.lru_cache(maxsize=64)
+def _get_executor(signature, device):
+    """Build and compile the sampling function of the given signature, which is a tuple of
+    (distribution type, distribution parameters, shape, dtype) of each tensor. The function only
+    depends on the signature and the device, so it is cached across calls.
+    """
+    builder = _SampleBuilder()
+    params, outputs = [], []
+    for dist_type, dist_params, shape, dtype in signature:
+        key = extended_var("key_%d" % len(params), shape=(10,), dtype="uint64")
+        params.append(key)
+        outputs.append(builder.sample(key, dist_type(*dist_params), shape, dtype))
+    body = builder.ret(outputs)
+
+    mod = IRModule()
+    mod["main"] = relay.Function(params, body)
+    with PassContext(opt_level=2):
+        mod = InferType()(mod)
+        return VMExecutor(mod, device).make_executor()
+
+
+def sample(specs, device="cpu", seed=None):
+    """Sample a batch of tensors on the device with a single function.
+
+    Parameters
+    ----------
+    specs : Dict[str, Tuple[Union[Uniform, Normal], List[int], str]]
+        The map from the tensor name to its distribution, shape and dtype.
+
+    device : str
+        The device to generate the tensors.
+
+    seed : Optional[int]
+        The global seed. A random one drawn from numpy is used if None.
+
+    Returns
+    -------
+    ret : Dict[str, ndarray]
+        The map from the tensor name to the sampled tensor.
+    """
+    if not specs:
+        return OrderedDict()
+    seed = _default_seed() if seed is None else seed
+    signature = tuple(
+        (type(dist), tuple(float(x) for x in dist), tuple(int(dim) for dim in (shape or ())), dtype)
+        for dist, shape, dtype in specs.values()
+    )
+    executor = _get_executor(signature, device)
+    keys = [array(make_key(seed, name), dtype="uint64", device=device) for name in specs]
+    ret = executor(*keys)
+    return OrderedDict(
+        (name, ndarray(BindNDArray(ret[i], None, name))) for i, name in enumerate(specs)
+    )
+
+
+def uniform(
+    low=0.0, high=1.0, shape=None, name="", device="cpu", dtype="float32", seed=None
+):  # pylint: disable=missing-function-docstring
+    return sample({name: (Uniform(low, high), shape, dtype)}, device, seed)[name]
+
+
+def normal(
+    mean=0.0, std=1.0, shape=None, name="", device="cpu", dtype="float32", seed=None
+):  # pylint: disable=missing-function-docstring
+    return sample({name: (Normal(mean, std), shape, dtype)}, device, seed)[name]
+
+
+def init_model(model, initializer, seed=None):
+    """Initialize the parameters of a model in place on their devices. The parameters on the
+    same device are sampled by a single function.
+
+    Parameters
+    ----------
+    model : raf.Model
+        The model to be initialized.
+
+    initializer : Callable[[str, ndarray], Optional[Union[Uniform, Normal]]]
+        The function that returns the distribution of a parameter given its name and the
+        parameter, or None to keep the parameter unchanged.
+
+    seed : Optional[int]
+        The global seed. A random one drawn from numpy is used if None.
+
+    Returns
+    -------
+    ret : List[str]
+        The names of the initialized parameters.
+    """
+    seed = _default_seed() if seed is None else seed
+    params = model.state()
+    specs_per_device = OrderedDict()
+    for name, param in params.items():
+        dist = initializer(name, param)
+        if dist is None:
+            continue
+        specs = specs_per_device.setdefault(param.device, OrderedDict())
+        specs[name] = (dist, param.shape, param.dtype)
+
+    initialized = []
+    for device, specs in specs_per_device.items():
+        for name, value in sample(specs, device, seed).items():
+            params[name].update(value)
+            initialized.append(name)
+    return initialized
@@ -0,0 +1,351 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Dynamic batching executor on top of the RAF VM."""
+# pylint: disable=too-many-instance-attributes,too-many-arguments,protected-access
+import threading
+import time
+from collections import deque, Counter
+from concurrent.futures import Future
+
+import numpy as np
+
+from raf._core import vm
+from raf._core.device import Device
+from raf._core.ndarray import ndarray, array
+from raf._core.value import TupleValue
+from raf._ffi.pass_ import InferType
+from raf.model.trace import _get_func_inputs
+from raf._lib import PassContext
+
+
+class _Request:
+    """A request waiting in the queue."""
+
+    def __init__(self, args, size):
+        self.args = args
+        self.size = size
+        self.arrival = time.perf_counter()
+        self.future = Future()
+
+
+def _to_numpy(arg):
+    if isinstance(arg, ndarray):
+        return arg.numpy()
+    return np.asarray(arg)
+
+
+def _unpack(value):
+    """Convert the VM output to a list of numpy arrays and whether it is a tuple."""
+    if isinstance(value, TupleValue):
+        return [value[i].numpy() for i in range(len(value))], True
+    return [value.numpy()], False
+
+
+class BatchingExecutor:
+    """Serve requests from multiple threads by coalescing them into batches, which are executed
+    by worker threads with the RAF VM.
+
+    A request consists of the batched inputs of the model, whose sizes along the batch axis may
+    differ. Requests are queued and coalesced in the arrival order until the batch is full or the
+    oldest request has waited for max_latency_ms. The batch is padded with zeros to
+    max_batch_size, because the executable is compiled for a static batch size, and the outputs
+    are split along the batch axis and returned to each request.
+
+    Each batch is run in its own VMContext. The VM runs in C++ without holding the GIL, so
+    num_workers batches can be executed concurrently. Each worker owns a VirtualMachine of the
+    same executable, because a VirtualMachine lazily loads its constants without locking, and
+    CUDA graph allows only one context per VirtualMachine.
+
+    Parameters
+    ----------
+    mod : raf.ir.IRModule
+        The module whose batched inputs have the batch size of max_batch_size.
+
+    device : str
+        The device to run the module.
+
+    max_batch_size : int
+        The batch size of the module.
+
+    params : Optional[List[Union[ndarray, numpy.ndarray]]]
+        The inputs that are shared by all requests, e.g., the model parameters. They are appended
+        to the batched inputs of each request.
+
+    batch_axis : int
+        The batch axis of the batched inputs and the outputs.
+
+    max_latency_ms : float
+        The maximum time a request waits in the queue for more requests to batch with.
+
+    num_workers : int
+        The number of worker threads.
+
+    enable_cuda_graph : bool
+        Whether to use CUDA graph.
+    """
+
+    def __init__(
+        self,
+        mod,
+        device,
+        max_batch_size,
+        params=None,
+        batch_axis=0,
+        max_latency_ms=5.0,
+        num_workers=2,
+        enable_cuda_graph=False,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("Invalid max_batch_size: %d" % max_batch_size)
+        if num_workers < 1:
+            raise ValueError("Invalid num_workers: %d" % num_workers)
+        self.device = Device(device)
+        self.max_batch_size = max_batch_size
+        self.batch_axis = batch_axis
+        self.max_latency = max_latency_ms / 1000.0
+        # The shared inputs stay on the device so that they are not copied for every batch.
+        self.params = [
+            param if isinstance(param, ndarray) else array(param, device=device)
+            for param in params or []
+        ]
+        if "cuda" not in device:
+            enable_cuda_graph = False
+
+        # The shapes and dtypes of the batched inputs, which are checked on submission.
+        params = InferType()(mod)["main"].params
+        self._input_types = [
+            ([int(dim) for dim in param.checked_type.shape], param.checked_type.dtype)
+            for param in params[: len(params) - len(self.params)]
+        ]
+        for shape, _ in self._input_types:
+            if not -len(shape) <= batch_axis < len(shape):
+                raise ValueError(
+                    "Invalid batch_axis %d for a batched input with the shape %s"
+                    % (batch_axis, shape)
+                )
+        with PassContext(opt_level=3):
+            self.executable = vm.compile(mod, self.device)
+        self._vms = [
+            vm.VirtualMachine(self.executable, self.device, enable_cuda_graph=enable_cuda_graph)
+            for _ in range(num_workers)
+        ]
+
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._stats_lock = threading.Lock()
+        self._reset_stats()
+        self._workers = [
+            threading.Thread(target=self._worker, args=(machine,), name="raf-batching-%d" % i)
+            for i, machine in enumerate(self._vms)
+        ]
+        for worker in self._workers:
+            worker.daemon = True
+            worker.start()
+
+    @staticmethod
+    def from_model(model, args, device, **kwargs):
+        """Create the executor from a model.
+
+        Parameters
+        ----------
+        model : raf.Model
+            The model to serve.
+
+        args : List[Union[ndarray, numpy.ndarray]]
+            The example batched inputs of the model, whose batch size is max_batch_size.
+
+        device : str
+            The device to run the model.
+
+        kwargs : Dict[str, Any]
+            The other arguments of BatchingExecutor.
+
+        Returns
+        -------
+        ret : BatchingExecutor
+            The executor.
+        """
+        record = model._internal(*args)
+        inputs = _get_func_inputs(record, args, {}, get_handle=False)
+        kwargs.setdefault("max_batch_size", _to_numpy(args[0]).shape[kwargs.get("batch_axis", 0)])
+        return BatchingExecutor(record.mod, device, params=inputs[len(args) :], **kwargs)
+
+    def submit(self, *args):
+        """Submit a request.
+
+        Parameters
+        ----------
+        args : List[Union[ndarray, numpy.ndarray]]
+            The batched inputs of the request.
+
+        Returns
+        -------
+        ret : concurrent.futures.Future
+            The future of the outputs, which are numpy arrays or a tuple of numpy arrays.
+        """
+        args = [_to_numpy(arg) for arg in args]
+        if len(args) != len(self._input_types):
+            raise ValueError(
+                "Expected %d batched inputs, but got %d" % (len(self._input_types), len(args))
+            )
+        for i, (arg, (shape, dtype)) in enumerate(zip(args, self._input_types)):
+            # The batch axis is checked below, so it is not compared with the compiled shape.
+            if (
+                arg.ndim != len(shape)
+                or str(arg.dtype) != dtype
+                or any(
+                    arg.shape[d] != shape[d]
+                    for d in range(arg.ndim)
+                    if d != self.batch_axis % arg.ndim
+                )
+            ):
+                raise ValueError(
+                    "The batched input %d must be %s with the shape %s except the batch axis, "
+                    "but got %s with the shape %s" % (i, dtype, shape, arg.dtype, list(arg.shape))
+                )
+        size = args[0].shape[self.batch_axis]
+        for arg in args:
+            if arg.shape[self.batch_axis] != size:
+                raise ValueError("The batched inputs of a request must have the same batch size")
+        if not 0 < size <= self.max_batch_size:
+            raise ValueError(
+                "The batch size of a request must be in (0, %d], but got %d"
+                % (self.max_batch_size, size)
+            )
+        req = _Request(args, size)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("The executor has been closed")
+            self._queue.append(req)
+            self._cond.notify()
+        return req.future
+
+    def __call__(self, *args):
+        """Submit a request and wait for its outputs."""
+        return self.submit(*args).result()
+
+    def close(self):
+        """Stop accepting requests, serve the queued ones, and stop the workers."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for worker in self._workers:
+            worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _next_batch(self):
+        """Wait for the next batch. Return None if the executor is closed and drained."""
+        with self._cond:
+            while True:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return None
+                # Wait for more requests until the batch is full or the oldest request is due.
+                deadline = self._queue[0].arrival + self.max_latency
+                queued = sum(req.size for req in self._queue)
+                while queued < self.max_batch_size and not self._closed:
+                    timeout = deadline - time.perf_counter()
+                    if timeout <= 0:
+                        break
+                    self._cond.wait(timeout)
+                    queued = sum(req.size for req in self._queue)
+                # Another worker may have taken the requests while waiting.
+                batch, size = [], 0
+                while self._queue and size + self._queue[0].size <= self.max_batch_size:
+                    req = self._queue.popleft()
+                    batch.append(req)
+                    size += req.size
+                if batch:
+                    return batch
+
+    def _worker(self, machine):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                outputs = self._run_batch(machine, batch)
+            except Exception as err:  # pylint: disable=broad-except
+                for req in batch:
+                    req.future.set_exception(err)
+                continue
+            finish = time.perf_counter()
+            for req, out in zip(batch, outputs):
+                req.future.set_result(out)
+            self._record(batch, finish)
+
+    def _run_batch(self, machine, batch):
+        """Merge the requests, run the batch and split the outputs."""
+        axis = self.batch_axis
+        size = sum(req.size for req in batch)
+        inputs = []
+        for i, first in enumerate(batch[0].args):
+            arrs = [req.args[i] for req in batch]
+            if size < self.max_batch_size:
+                pad_shape = list(first.shape)
+                pad_shape[axis] = self.max_batch_size - size
+                arrs.append(np.zeros(pad_shape, dtype=first.dtype))
+            inputs.append(np.concatenate(arrs, axis=axis))
+        ctx = machine.prepare_context("main", *inputs, *self.params)
+        outs, is_tuple = _unpack(machine._run(ctx))
+
+        offsets = np.cumsum([0] + [req.size for req in batch])
+        ret = []
+        for i in range(len(batch)):
+            sliced = []
+            for out in outs:
+                index = [slice(None)] * out.ndim
+                index[axis] = slice(offsets[i], offsets[i + 1])
+                sliced.append(out[tuple(index)])
+            ret.append(tuple(sliced) if is_tuple else sliced[0])
+        return ret
+
+    def _reset_stats(self):
+        self._batch_sizes = Counter()
+        self._latencies = deque(maxlen=10000)
+        self._num_requests = 0
+
+    def _record(self, batch, finish):
+        with self._stats_lock:
+            self._batch_sizes[sum(req.size for req in batch)] += 1
+            self._num_requests += len(batch)
+            self._latencies.extend((finish - req.arrival) * 1000.0 for req in batch)
+
+    def get_stats(self, reset=False):
+        """Get the serving statistics.
+
+        Parameters
+        ----------
+        reset : bool
+            Whether to reset the statistics after reading them.
+
+        Returns
+        -------
+        ret : Dict[str, Any]
+            The statistics, including the number of queued requests ("queue_depth"), the number of
+            served requests ("num_requests"), the histogram from the batch size before padding
+            to the number of batches ("batch_sizes"), and the "p50" and "p99" latency in
+            milliseconds from the submission to the completion of the latest 10000 requests.
+        """
+        with self._cond:
+            queue_depth = len(self._queue)
+        with self._stats_lock:
+            latencies = np.array(self._latencies)
+            ret = {
+                "queue_depth": queue_depth,
+                "num_requests": self._num_requests,
+                "batch_sizes": dict(sorted(self._batch_sizes.items())),
+                "p50": float(np.percentile(latencies, 50)) if latencies.size else 0.0,
+                "p99": float(np.percentile(latencies, 99)) if latencies.size else 0.0,
+            }
+            if reset:
+                self._reset_stats()
+        return ret
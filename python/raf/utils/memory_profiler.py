@@ -5,6 +5,7 @@
 
 from raf._ffi.memory_profiler import EnableMemoryProfiler, DisableMemoryeProfiler
 from raf._ffi.memory_profiler import ResetMemoryProfiler, GetMaxMemoryInfo, GetMemoryTrace
+from raf._ffi.memory_pool import GetPoolStats
 
 
 def start():
@@ -53,3 +54,20 @@ def get_memory_trace(device):
         The complete trace in a string.
     """
     return GetMemoryTrace(device)
+
+
+def get_pool_stats(device):
+    """Get the statistics of the memory pool of the given device.
+
+    Parameters
+    ----------
+    device: Device
+        The device to get the pool statistics.
+
+    Returns
+    -------
+    ret: Dict[str, float]
+        A map of pool statistics in MBs, including used and pool sizes. Pools that track
+        more details, such as arena_pool, also report the peak sizes and the fragmentation.
+    """
+    return {key: value.value for key, value in GetPoolStats(device).items()}
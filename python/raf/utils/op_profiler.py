@@ -0,0 +1,98 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Op profiler and its latency database.
+
+The op profiler measures the latency of ops and op groups for cost-model-driven passes, such as
+the IOS stream scheduler. Profiled latencies are recorded in a database, which is persisted to
+the file specified by RAF_OP_LATENCY_DB (or to op_latency.db under the persistent cache path
+when RAF_PERSIST_CACHE=1), so that other processes reuse them instead of profiling again.
+"""
+from raf._ffi.op_profiler import SetNoProfile, ExportLatencyDB, ImportLatencyDB
+from raf._ffi.op_profiler import MergeLatencyDB, ClearLatencyDB, GetLatencyDBStats
+
+
+def set_no_profile(no_profile=True):
+    """Set whether to skip profiling. When enabled, the latency of ops missing in the database is
+    estimated from their GFLOPS and the peak throughput of the device, which can be set by
+    RAF_OP_PROFILER_PEAK_GFLOPS.
+
+    Parameters
+    ----------
+    no_profile : bool
+        Whether to skip profiling.
+    """
+    SetNoProfile(no_profile)
+
+
+def export_db(path):
+    """Write all records of the latency database to a file.
+
+    Parameters
+    ----------
+    path : str
+        The database file.
+
+    Returns
+    -------
+    ret : int
+        The number of written records.
+    """
+    return ExportLatencyDB(path)
+
+
+def import_db(path, overwrite=False):
+    """Merge the records of a database file into the latency database.
+
+    Parameters
+    ----------
+    path : str
+        The database file.
+
+    overwrite : bool
+        Whether to overwrite the existing records with the imported ones.
+
+    Returns
+    -------
+    ret : int
+        The number of added records.
+    """
+    return ImportLatencyDB(path, overwrite)
+
+
+def merge_db(inputs, output, overwrite=False):
+    """Merge database files, e.g., the ones gathered from several machines, into one file.
+
+    Parameters
+    ----------
+    inputs : List[str]
+        The database files to be merged.
+
+    output : str
+        The merged database file.
+
+    overwrite : bool
+        Whether a record in a later file overwrites the one with the same key in an earlier file.
+
+    Returns
+    -------
+    ret : int
+        The number of records in the merged database.
+    """
+    return MergeLatencyDB(inputs, output, overwrite)
+
+
+def clear_db():
+    """Remove all records of the latency database in memory. The database file is untouched."""
+    ClearLatencyDB()
+
+
+def get_db_stats():
+    """Get the statistics of the latency database.
+
+    Returns
+    -------
+    ret : Dict[str, int]
+        The number of entries, lookups, hits and misses.
+    """
+    return {key: val.value for key, val in GetLatencyDBStats().items()}
@@ -7,17 +7,26 @@ from raf import build
 from raf._ffi.profiler import EnableProfiler, DisableProfiler
 from raf._ffi.profiler import CollectBaseProfile, CollectCudaProfile, GetProfile
 from raf._ffi.profiler import ClearProfile, ClearCudaProfile
+from raf._ffi.profiler import EnableLightProfiler, ClearLightProfile, GetLightProfileSummary
 
 
-def start(prof_level=1):
+def start(prof_level=1, light=False):
     """Enable the profiler in backend and start to profile the execution from now.
 
     Parameters
     ----------
     prof_level : int
         Specify the profiling level.
+
+    light : bool
+        If True, enable the light-weight profiler instead, which records one fixed-size event
+        per operator into per-thread ring buffers without locking. The results are only
+        available via summary(). The ring size can be set by RAF_PROFILER_RING_SIZE.
     """
-    EnableProfiler(prof_level)
+    if light:
+        EnableLightProfiler()
+    else:
+        EnableProfiler(prof_level)
 
 
 def stop():
@@ -28,6 +37,7 @@ def stop():
 def clear():
     """Clear the cached profiler records in backend."""
     ClearProfile()
+    ClearLightProfile()
     if build.with_cuda():
         ClearCudaProfile()
 
@@ -58,6 +68,35 @@ def get():
     return json.loads(GetProfile())
 
 
+def summary(category=None):
+    """Aggregate the events recorded by the light-weight profiler by name.
+
+    Parameters
+    ----------
+    category : Optional[str]
+        Only aggregate the events of this category. None matches any category. The available
+        categories includes:
+        - 'Operator': The operators executed by the interpreter.
+        - 'ComputationOperator': The operators executed by the virtual machine on CPU.
+        - 'Pass': The passes run by RAFSequential, e.g., when compiling the virtual machine.
+        The events on GPU are timed by device events without synchronizing the device, and
+        this call waits for them to complete.
+
+    Returns
+    -------
+    ret : Dict[str, Dict[str, float]]
+        Map from the event name to its statistics, including "count", and "total", "mean",
+        "p50" and "p99" time in milliseconds.
+    """
+    ret = {}
+    for name, stats in GetLightProfileSummary(category or "").items():
+        ret[str(name)] = {
+            key: int(val.value) if key == "count" else val.value / 1000.0
+            for key, val in stats.items()
+        }
+    return ret
+
+
 def get_duration(data, event, category=None):
     """
     Get the duration of given event on given category in milliseconds.
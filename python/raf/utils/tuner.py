@@ -8,6 +8,7 @@ The tuning utilities.
 # pylint: disable=missing-class-docstring, missing-function-docstring, no-self-use
 # pylint: disable=attribute-defined-outside-init
 import os
+import platform
 from copy import copy
 
 import tvm
@@ -21,6 +22,100 @@ from raf.testing import randn, randint, randn_torch
 from tvm import auto_scheduler, autotvm
 from tvm.auto_scheduler import compute_dag
 
+# The -mcpu of x86 CPUs with the CPU flags in /proc/cpuinfo, from the most specific one.
+X86_MCPU_FLAGS = [
+    ("cascadelake", ["avx512f", "avx512bw", "avx512vl", "avx512_vnni"]),
+    ("skylake-avx512", ["avx512f", "avx512bw", "avx512vl"]),
+    ("core-avx2", ["avx2", "fma"]),
+]
+
+
+def _read_cpu_flags():
+    if not os.path.exists("/proc/cpuinfo"):
+        return set()
+    with open("/proc/cpuinfo") as filep:
+        for line in filep:
+            if line.startswith("flags"):
+                return set(line.split(":", 1)[1].split())
+    return set()
+
+
+def get_host_cpu_target():
+    """Get the LLVM target with the features of the host CPU, so that the tuned schedules are
+    measured with the SIMD instructions that the host supports.
+
+    Returns
+    -------
+    target: tvm.target.Target
+        The LLVM target.
+    """
+    machine = platform.machine().lower()
+    if machine in ("x86_64", "amd64"):
+        flags = _read_cpu_flags()
+        for mcpu, required in X86_MCPU_FLAGS:
+            if all(flag in flags for flag in required):
+                return tvm.target.Target("llvm -mcpu=%s" % mcpu)
+    elif machine in ("aarch64", "arm64"):
+        triple = "arm64-apple-darwin" if platform.system() == "Darwin" else "aarch64-linux-gnu"
+        return tvm.target.Target("llvm -mtriple=%s -mattr=+neon" % triple)
+    return tvm.target.Target("llvm")
+
+
+def get_cpu_target():
+    """Get the LLVM target that RAF compiles the CPU kernels with, which is RAF_CPU_TARGET, or
+    the generic "llvm" if it is not set.
+
+    Returns
+    -------
+    target: tvm.target.Target
+        The LLVM target.
+    """
+    return tvm.target.Target(os.environ.get("RAF_CPU_TARGET") or "llvm")
+
+
+def set_cpu_target(target=None):
+    """Set the LLVM target that RAF compiles the CPU kernels with in this process, i.e.,
+    RAF_CPU_TARGET. Call it once before compiling or tuning any CPU kernel, and set
+    RAF_CPU_TARGET to the same target when running the tuned schedules in other processes.
+
+    Parameters
+    ----------
+    target: Optional[Union[str, tvm.target.Target]]
+        The LLVM target. The host CPU target is used if None.
+
+    Returns
+    -------
+    target: tvm.target.Target
+        The LLVM target.
+    """
+    target = tvm.target.Target(target) if target is not None else get_host_cpu_target()
+    os.environ["RAF_CPU_TARGET"] = str(target)
+    return target
+
+
+def get_tuning_target(device):
+    """Get the TVM target to tune the schedules for the device.
+
+    Parameters
+    ----------
+    device: str
+        The target device, or a TVM target string.
+
+    Returns
+    -------
+    target: tvm.target.Target
+        The TVM target. The CPU device maps to the target of get_cpu_target.
+    """
+    if device == "cpu" or device.startswith("cpu("):
+        return get_cpu_target()
+    return tvm.target.Target(device)
+
+
+def _default_device(device):
+    if device is not None:
+        return device
+    return "cuda" if raf.build.with_cuda() else "cpu"
+
 
 def extract_tuning_tasks(mod_or_executor, args, device, *, fusion=False, pass_seq=None):
     """Extract tuning tasks from the given function and the target.
@@ -48,6 +143,7 @@ def extract_tuning_tasks(mod_or_executor, args, device, *, fusion=False, pass_se
         A tuple of tasks and weights (appearance in the model).
     """
     # pylint: disable=protected-access
+    tvm_target = get_tuning_target(device)
     if isinstance(mod_or_executor, VMExecutor):
         executor = mod_or_executor
     else:
@@ -86,8 +182,6 @@ def extract_tuning_tasks(mod_or_executor, args, device, *, fusion=False, pass_se
     autotvm.GLOBAL_SCOPE.silent = old_autotvm_silent
     auto_scheduler.DispatchContext.current = old_auto_scheduler_fallback_context
 
-    tvm_target = tvm.target.Target(device)
-
     tasks = []
     weights = []
     for wkl_key, (weight, func_names) in env_tracing_task.wkl_key_to_weight.items():
@@ -96,11 +190,10 @@ def extract_tuning_tasks(mod_or_executor, args, device, *, fusion=False, pass_se
                 workload_key=wkl_key,
                 target=tvm_target,
                 hardware_params=None,
-                # When auto scheduler is used in end to end network, try to apply layout rewrite
-                # to improve the overall performance
-                layout_rewrite_option=compute_dag.LayoutRewriteOption.get_target_default(
-                    tvm_target, True
-                ),
+                # RAF compiles the ops with AutoSchedulerLayoutRewrite disabled, so the
+                # candidates have to be measured without layout rewrite as well. It only
+                # makes a difference for CPU targets, where it is enabled by default.
+                layout_rewrite_option=compute_dag.LayoutRewriteOption.NO_REWRITE,
                 desc=",".join(func_names),
             )
         )
@@ -108,7 +201,7 @@ def extract_tuning_tasks(mod_or_executor, args, device, *, fusion=False, pass_se
     return tasks, weights
 
 
-def tune_tasks(tasks, weights, log_file, n_trials):
+def tune_tasks(tasks, weights, log_file, n_trials, n_parallel=None):
     """Tune a set of given tasks.
 
     tasks: List[tvm.auto_scheduler.SearchTask]
@@ -123,8 +216,25 @@ def tune_tasks(tasks, weights, log_file, n_trials):
     n_trials: Callable[[int], int] or int
         An integer of total number of measurement trials, or a function that determines
         the total number of measurement trials by taking the task number.
+
+    n_parallel: Optional[int]
+        The number of processes to build the candidates of CPU tasks. Default is the number
+        of local cores.
     """
-    measure_device = auto_scheduler.LocalRPCMeasureContext(repeat=1, min_repeat_ms=400, timeout=20)
+    if all(task.target.kind.name == "llvm" for task in tasks):
+        # CPU tasks are measured on the local machine without the RPC tracker. The candidates
+        # are built in parallel, while the measurements are sequential as each kernel itself
+        # runs on all cores.
+        measure_device = None
+        builder = auto_scheduler.LocalBuilder(n_parallel=n_parallel or os.cpu_count())
+        runner = auto_scheduler.LocalRunner(
+            repeat=1, min_repeat_ms=300, timeout=20, enable_cpu_cache_flush=True
+        )
+    else:
+        measure_device = auto_scheduler.LocalRPCMeasureContext(
+            repeat=1, min_repeat_ms=400, timeout=20
+        )
+        builder, runner = "local", measure_device.runner
 
     # FIXME(comaniac): Remove this custom objective function after
     # https://github.com/apache/tvm/pull/8984
@@ -147,7 +257,8 @@ def tune_tasks(tasks, weights, log_file, n_trials):
     print("Start tuning for maximal %d trials" % n_trials)
     tune_option = auto_scheduler.TuningOptions(
         num_measure_trials=n_trials,
-        runner=measure_device.runner,
+        builder=builder,
+        runner=runner,
         measure_callbacks=[auto_scheduler.RecordToFile(log_file)],
     )
     tuner.tune(tune_option)
@@ -165,7 +276,8 @@ def run_tuning(
     pass_seq=None,
     n_trials=lambda l: 300 * min(l, 100),
     only_tune_tasks_with_name=None,
-    only_extract_tasks=False
+    only_extract_tasks=False,
+    n_parallel=None
 ):
     """Tune the given tasks.
 
@@ -201,6 +313,10 @@ def run_tuning(
 
     only_extract_tasks: bool
         Whether to extract and print tasks only without actual tuning them.
+
+    n_parallel: Optional[int]
+        The number of processes to build the candidates of CPU tasks. Default is the number
+        of local cores.
     """
     print("Extracting tasks...")
     tasks, weights = extract_tuning_tasks(
@@ -226,9 +342,12 @@ def run_tuning(
 
     if only_extract_tasks:
         return
+    if not tasks:
+        print("No task to tune")
+        return
 
     print("Tuning %d out of %s tasks..." % (len(tasks), ori_task_num))
-    tune_tasks(tasks, weights, log_file, n_trials)
+    tune_tasks(tasks, weights, log_file, n_trials, n_parallel)
 
 
 def tune_op(
@@ -237,7 +356,7 @@ def tune_op(
     gen_arg_func,
     space_dict,
     n_trials=None,
-    device="cuda",
+    device=None,
     fusion=False,
     only_extract_tasks=False,
 ):
@@ -258,8 +377,8 @@ def tune_op(
     n_trials: Optional[int]
         Tuning trials. If None, we use #task * 1.2 * 64 trials.
 
-    device: str
-        The target device. Default cuda.
+    device: Optional[str]
+        The target device. Default is cuda if RAF is built with CUDA, or cpu otherwise.
 
     fusion: bool
         Whether to apply fusion.
@@ -267,6 +386,7 @@ def tune_op(
     only_extract_tasks: bool
         Whether to extract and print tasks only without actual tuning them.
     """
+    device = _default_device(device)
     configs = []
     space_list = list(space_dict.items())
 
@@ -308,7 +428,7 @@ def tune_op(
     tune_tasks(tasks, [1 for _ in range(len(tasks))], sch_file, n_trials=n_trials)
 
 
-def tune_softmax_dx(sch_file, space_dict=None, device="cuda", only_extract_tasks=False):
+def tune_softmax_dx(sch_file, space_dict=None, device=None, only_extract_tasks=False):
     """Tune softmax_dx with various shapes.
 
     sch_file: str
@@ -317,12 +437,13 @@ def tune_softmax_dx(sch_file, space_dict=None, device="cuda", only_extract_tasks
     space_dict: Optional[Dict[str, List[Any]]]
         The target space (configs) of this op. If not present, the default space will be used.
 
-    device: str
-        The target device. Default cuda.
+    device: Optional[str]
+        The target device. Default is cuda if RAF is built with CUDA, or cpu otherwise.
 
     only_extract_tasks: bool
         Whether to extract and print tasks only without actual tuning them.
     """
+    device = _default_device(device)
 
     class SoftmaxDxModel(raf.Model):
         def build(self):
@@ -352,7 +473,7 @@ def tune_softmax_dx(sch_file, space_dict=None, device="cuda", only_extract_tasks
     )
 
 
-def tune_layer_norm(sch_file, space_dict=None, device="cuda", only_extract_tasks=False):
+def tune_layer_norm(sch_file, space_dict=None, device=None, only_extract_tasks=False):
     """Tune layer_norm with various shapes.
 
     sch_file: str
@@ -361,12 +482,13 @@ def tune_layer_norm(sch_file, space_dict=None, device="cuda", only_extract_tasks
     space_dict: Optional[Dict[str, List[Any]]]
         The target space (configs) of this op. If not present, the default space will be used.
 
-    device: str
-        The target device. Default cuda.
+    device: Optional[str]
+        The target device. Default is cuda if RAF is built with CUDA, or cpu otherwise.
 
     only_extract_tasks: bool
         Whether to extract and print tasks only without actual tuning them.
     """
+    device = _default_device(device)
 
     class LayerNormModel(raf.Model):
         def build(self, eps):
@@ -401,7 +523,7 @@ def tune_layer_norm(sch_file, space_dict=None, device="cuda", only_extract_tasks
     )
 
 
-def tune_layer_norm_dx(sch_file, space_dict=None, device="cuda", only_extract_tasks=False):
+def tune_layer_norm_dx(sch_file, space_dict=None, device=None, only_extract_tasks=False):
     """Tune layer_norm_dx with various shapes.
 
     sch_file: str
@@ -410,12 +532,13 @@ def tune_layer_norm_dx(sch_file, space_dict=None, device="cuda", only_extract_ta
     space_dict: Optional[Dict[str, List[Any]]]
         The target space (configs) of this op. If not present, the default space will be used.
 
-    device: str
-        The target device. Default cuda.
+    device: Optional[str]
+        The target device. Default is cuda if RAF is built with CUDA, or cpu otherwise.
 
     only_extract_tasks: bool
         Whether to extract and print tasks only without actual tuning them.
     """
+    device = _default_device(device)
 
     class LayerNormDxModel(raf.Model):
         def build(self, eps):
@@ -450,7 +573,7 @@ def tune_layer_norm_dx(sch_file, space_dict=None, device="cuda", only_extract_ta
     )
 
 
-def tune_take_dx(sch_file, space_dict=None, device="cuda", only_extract_tasks=False):
+def tune_take_dx(sch_file, space_dict=None, device=None, only_extract_tasks=False):
     """Tune take_dx with various shapes in transformer-based models.
 
     sch_file: str
@@ -459,12 +582,13 @@ def tune_take_dx(sch_file, space_dict=None, device="cuda", only_extract_tasks=Fa
     space_dict: Optional[Dict[str, List[Any]]]
         The target space (configs) of this op. If not present, the default space will be used.
 
-    device: str
-        The target device. Default cuda.
+    device: Optional[str]
+        The target device. Default is cuda if RAF is built with CUDA, or cpu otherwise.
 
     only_extract_tasks: bool
         Whether to extract and print tasks only without actual tuning them.
     """
+    device = _default_device(device)
 
     class TakeDxModel(raf.Model):
         def build(self):
@@ -501,7 +625,7 @@ def tune_take_dx(sch_file, space_dict=None, device="cuda", only_extract_tasks=Fa
     )
 
 
-def tune_fused_take_dx(sch_file, space_dict=None, device="cuda", only_extract_tasks=False):
+def tune_fused_take_dx(sch_file, space_dict=None, device=None, only_extract_tasks=False):
     """Tune fused take_dx with various shapes in transformer-based models.
 
     sch_file: str
@@ -510,12 +634,13 @@ def tune_fused_take_dx(sch_file, space_dict=None, device="cuda", only_extract_ta
     space_dict: Optional[Dict[str, List[Any]]]
         The target space (configs) of this op. If not present, the default space will be used.
 
-    device: str
-        The target device. Default cuda.
+    device: Optional[str]
+        The target device. Default is cuda if RAF is built with CUDA, or cpu otherwise.
 
     only_extract_tasks: bool
         Whether to extract and print tasks only without actual tuning them.
     """
+    device = _default_device(device)
 
     class TakeDxModel(raf.Model):
         def build(self):
@@ -555,18 +680,19 @@ def tune_fused_take_dx(sch_file, space_dict=None, device="cuda", only_extract_ta
     )
 
 
-def tune_all_ops(sch_file, device="cuda", only_extract_tasks=False):
+def tune_all_ops(sch_file, device=None, only_extract_tasks=False):
     """Tune all listed ops.
 
     sch_file: str
         The tuning log.
 
-    device: str
-        The target device. Default cuda.
+    device: Optional[str]
+        The target device. Default is cuda if RAF is built with CUDA, or cpu otherwise.
 
     only_extract_tasks: bool
         Whether to extract and print tasks only without actual tuning them.
     """
+    device = _default_device(device)
     for tune_func in [
         tune_fused_take_dx,
         tune_take_dx,
@@ -0,0 +1,87 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Benchmark the GEMM ops on CPU with the cpublas dialect versus the TVM fallback.
+
+Each op runs imperatively with the dialect preference set to either cpublas or tvm, and the
+throughput is reported in GFLOPS:
+
+    python3 scripts/benchmark/cpublas_gemm.py --shapes 128x128x128,1024x1024x1024 --batch 8
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+import raf
+from raf.testing import with_dialect
+
+OPS = {
+    "matmul": raf.matmul,
+    "matmul_nt": raf.matmul_nt,
+    "matmul_tn": raf.matmul_tn,
+    "dense": raf.dense,
+    "batch_matmul": raf.batch_matmul,
+}
+
+
+def make_inputs(op, batch, m, n, k, dtype):
+    """Make the inputs of the op, which computes a (batch of) m x n output with depth k. The op
+    is dense or one of the matmul family, whose suffix tells which inputs are transposed.
+    """
+    shape_a = (k, m) if op.endswith(("_tn", "_tt")) else (m, k)
+    shape_b = (n, k) if op.endswith(("_nt", "_tt")) or op == "dense" else (k, n)
+    if op.startswith("batch_matmul"):
+        shape_a, shape_b = (batch,) + shape_a, (batch,) + shape_b
+    return [raf.array(np.random.randn(*shape).astype(dtype)) for shape in (shape_a, shape_b)]
+
+
+def measure(func, args, repeat):
+    """Return the median latency in milliseconds after a warm up, which compiles the kernel."""
+    func(*args).numpy()
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args).numpy()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return sorted(latencies)[len(latencies) // 2]
+
+
+def main():
+    """Main entry."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--ops", type=str, default=",".join(OPS))
+    parser.add_argument("--shapes", type=str, default="64x64x64,256x256x256,1024x1024x1024")
+    parser.add_argument("--batch", type=int, default=4, help="The batch size of batch_matmul")
+    parser.add_argument("--dtype", type=str, default="float32")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--json", type=str, default=None, help="Dump the results to a JSON file")
+    args = parser.parse_args()
+
+    results = []
+    header = ["op", "MxNxK", "cpublas(ms)", "tvm(ms)", "GFLOPS", "speedup"]
+    print("{:>14} {:>16} {:>12} {:>10} {:>8} {:>8}".format(*header))
+    for op in args.ops.split(","):
+        for shape in args.shapes.split(","):
+            m, n, k = [int(dim) for dim in shape.split("x")]
+            inputs = make_inputs(op, args.batch, m, n, k, args.dtype)
+            res = {"op": op, "shape": shape}
+            for dialects in [["cpublas", "tvm"], ["tvm"]]:
+                func = with_dialect(dialects)(OPS[op])
+                res[dialects[0]] = measure(func, inputs, args.repeat)
+            batch = args.batch if op == "batch_matmul" else 1
+            gflops = 2.0 * batch * m * n * k / res["cpublas"] / 1e6
+            speedup = res["tvm"] / res["cpublas"]
+            results.append(res)
+            print(
+                f"{op:>14} {shape:>16} {res['cpublas']:>12.3f} {res['tvm']:>10.3f} "
+                f"{gflops:>8.1f} {speedup:>7.1f}x"
+            )
+    if args.json is not None:
+        with open(args.json, "w") as filep:
+            json.dump(results, filep, indent=2)
+
+
+if __name__ == "__main__":
+    main()
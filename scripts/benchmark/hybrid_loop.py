@@ -0,0 +1,105 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Benchmark loop-heavy hybrid functions executed by the interpreter and by the VM.
+
+The first call of a workload with each executor includes the conversion to RAF IR (and the
+compilation for the VM), so it is reported separately from the median latency of the following
+calls. The converted functions and the VM executables are cached across the iteration counts:
+
+    python3 scripts/benchmark/hybrid_loop.py --iters 10,100,1000
+"""
+# pylint: disable=invalid-name
+import argparse
+import json
+import time
+
+from raf import hybrid
+
+
+def count_primes(n):
+    count = 0
+    i = 2
+    while i < n:
+        j = 2
+        is_prime = 1
+        while j * j <= i:
+            if i % j == 0:
+                is_prime = 0
+                j = i
+            j = j + 1
+        count = count + is_prime
+        i = i + 1
+    return count
+
+
+def collatz(n):
+    steps = 0
+    while n != 1:
+        if n % 2 == 0:
+            n = n // 2
+        else:
+            n = 3 * n + 1
+        steps = steps + 1
+    return steps
+
+
+def accumulate(n):
+    s = 0
+    i = 0
+    while i < n:
+        s = s + (i % 7) * (i % 5)
+        i = i + 1
+    return s
+
+
+WORKLOADS = {"count_primes": count_primes, "collatz": collatz, "accumulate": accumulate}
+
+
+def measure(func, arg, repeat):
+    """Return the latency of the first call and the median latency of the following calls in ms."""
+    start = time.perf_counter()
+    ret = func(arg)
+    first = (time.perf_counter() - start) * 1000
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return ret, first, sorted(latencies)[len(latencies) // 2]
+
+
+def main():
+    """Main entry."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--workloads", type=str, default=",".join(WORKLOADS))
+    parser.add_argument("--iters", type=str, default="10,100,1000")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", type=str, default=None, help="Dump the results to a JSON file")
+    args = parser.parse_args()
+
+    results = []
+    header = ["workload", "n", "interp 1st", "interp(ms)", "vm 1st", "vm(ms)", "speedup"]
+    print("{:>14} {:>6} {:>11} {:>11} {:>9} {:>9} {:>8}".format(*header))
+    for name in args.workloads.split(","):
+        for n in [int(n) for n in args.iters.split(",")]:
+            res = {"workload": name, "n": n}
+            for executor in ["interpreter", "vm"]:
+                func = hybrid(executor=executor)(WORKLOADS[name])
+                ret, first, latency = measure(func, n, args.repeat)
+                res[executor] = {"first_ms": first, "ms": latency}
+                expected = res.setdefault("result", ret)
+                assert ret == expected, "%s returns %s, expected %s" % (executor, ret, expected)
+            interp, vm = res["interpreter"], res["vm"]
+            print(
+                f"{name:>14} {n:>6} {interp['first_ms']:>11.2f} {interp['ms']:>11.3f} "
+                f"{vm['first_ms']:>9.2f} {vm['ms']:>9.3f} {interp['ms'] / vm['ms']:>7.1f}x"
+            )
+            results.append(res)
+    if args.json is not None:
+        with open(args.json, "w") as filep:
+            json.dump(results, filep, indent=2)
+
+
+if __name__ == "__main__":
+    main()
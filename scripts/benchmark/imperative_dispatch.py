@@ -0,0 +1,80 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Benchmark the per-op latency of the imperative op API (e.g., raf.add).
+
+Each imperative call runs the op declaration, dispatches an OpEnv and executes it. With the OpEnv
+cache, the repeated calls with the same shapes skip the dispatching. The benchmark measures the
+latency of small elementwise ops with the cache enabled and disabled:
+
+    python3 scripts/benchmark/imperative_dispatch.py --shape 4 --json results.json
+"""
+import argparse
+import json
+import time
+
+import raf
+from raf._core.executor import (
+    clear_op_env_cache,
+    get_op_env_cache_stats,
+    set_op_env_cache_capacity,
+)
+from raf.testing import randn
+
+OPS = {
+    "add": lambda x: raf.add(x, x),
+    "multiply": lambda x: raf.multiply(x, x),
+    "relu": raf.relu,
+    "tanh": raf.tanh,
+}
+
+
+def measure(func, m_x, warmup, number, repeat):
+    """Measure the per-call latency in microseconds."""
+    for _ in range(warmup):
+        func(m_x)
+    latency = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func(m_x)
+        latency.append((time.perf_counter() - start) * 1e6 / number)
+    latency.sort()
+    return {"median_us": latency[len(latency) // 2], "min_us": latency[0]}
+
+
+def main():
+    """Main entry."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--ops", type=str, nargs="+", default=list(OPS.keys()))
+    parser.add_argument("--shape", type=int, nargs="+", default=[4], help="The tensor shape")
+    parser.add_argument("--device", type=str, default="cpu", help="The device to run on")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--number", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--json", type=str, default=None, help="Dump the results to a JSON file")
+    args = parser.parse_args()
+
+    m_x, _ = randn(args.shape, device=args.device)
+    capacity = get_op_env_cache_stats()["Capacity"]
+    results = {}
+    for mode, mode_capacity in [("cached", max(capacity, 1)), ("uncached", 0)]:
+        set_op_env_cache_capacity(mode_capacity)
+        clear_op_env_cache()
+        results[mode] = {}
+        for name in args.ops:
+            res = measure(OPS[name], m_x, args.warmup, args.number, args.repeat)
+            results[mode][name] = res
+            print(
+                "%-8s %-10s: median %.3f us/op, min %.3f us/op"
+                % (mode, name, res["median_us"], res["min_us"])
+            )
+        results[mode]["stats"] = get_op_env_cache_stats()
+    set_op_env_cache_capacity(capacity)
+    if args.json is not None:
+        with open(args.json, "w") as filep:
+            json.dump(results, filep, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Benchmark the throughput of ingesting host arrays into raf.ndarray.
+
+The benchmark compares the copying constructor (raf.array), the zero-copy paths
+(raf.array(copy=False) and raf.from_dlpack), and ndarray.to between devices:
+
+    python3 scripts/benchmark/ndarray_ingest.py --size 64 --json results.json
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+import raf
+
+
+def measure(func, nbytes, warmup, number, repeat):
+    """Measure the latency in microseconds and the throughput in GB/s."""
+    for _ in range(warmup):
+        func()
+    latency = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        latency.append((time.perf_counter() - start) / number)
+    latency.sort()
+    median = latency[len(latency) // 2]
+    return {"median_us": median * 1e6, "gbps": nbytes / median / 1e9}
+
+
+def main():
+    """Main entry."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--size", type=float, default=64, help="The array size in MiB")
+    parser.add_argument("--device", type=str, default="cpu", help="The device for ndarray.to")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--number", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", type=str, default=None, help="Dump the results to a JSON file")
+    args = parser.parse_args()
+
+    n_x = np.random.randn(int(args.size * 2**20) // 4).astype("float32")
+    m_x = raf.array(n_x)
+    cases = {
+        "array": lambda: raf.array(n_x),
+        "array_no_copy": lambda: raf.array(n_x, copy=False),
+        "to_%s" % args.device: lambda: m_x.to(device=args.device),
+    }
+    if hasattr(n_x, "__dlpack__"):
+        cases["from_dlpack"] = lambda: raf.from_dlpack(n_x)
+    results = {}
+    for name, func in cases.items():
+        res = measure(func, n_x.nbytes, args.warmup, args.number, args.repeat)
+        results[name] = res
+        print("%-16s: median %.3f us, %.3f GB/s" % (name, res["median_us"], res["gbps"]))
+    if args.json is not None:
+        with open(args.json, "w") as filep:
+            json.dump(results, filep, indent=2)
+
+
+if __name__ == "__main__":
+    main()
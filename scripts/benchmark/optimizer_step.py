@@ -0,0 +1,90 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Benchmark the step time of the imperative optimizers versus the number of parameters.
+
+The benchmark updates a list of small parameters with precomputed gradients, either one by one
+with raf.sgd (the per-parameter loop the SGD optimizer used to run), or in a single dispatch with
+raf.multi_tensor_sgd and raf.lans:
+
+    python3 scripts/benchmark/optimizer_step.py --device cpu --num-params 10,100,1000
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+import raf
+
+
+def make_tensors(num_params, size, device):
+    """Make the parameter, gradient and state tensors."""
+
+    def make():
+        return [
+            raf.array(np.random.randn(size).astype("float32"), device=device)
+            for _ in range(num_params)
+        ]
+
+    return make(), make(), make(), make()
+
+
+def step_loop(grads, params, moms, _, lr, momentum):
+    """Update the parameters one by one."""
+    for dx, x, v in zip(grads, params, moms):
+        v1, x1 = raf.sgd(x, dx, v, lr, momentum)
+        x.update(x1)
+        v.update(v1)
+
+
+def step_fused_sgd(grads, params, moms, _, lr, momentum):
+    """Update all parameters with a single multi-tensor SGD."""
+    raf.multi_tensor_sgd(grads + params + moms, lr, momentum)
+
+
+def step_fused_lans(grads, params, moms, vars_, lr, _):
+    """Update all parameters with a single multi-tensor LANS."""
+    step = raf.array(1.0, dtype="float32", device=params[0].device)
+    raf.lans(grads + params + moms + vars_, step, lr, 0.9, 0.999, 1e-6, 1, 0.01, 1, 1, True)
+
+
+def main():
+    """Main entry."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--num-params", type=str, default="10,100,1000")
+    parser.add_argument("--size", type=int, default=1024, help="The elements per parameter")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", type=str, default=None, help="Dump the results to a JSON file")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'params':>8} {'loop(ms)':>10} {'sgd(ms)':>10} {'lans(ms)':>10}")
+    for num_params in [int(num) for num in args.num_params.split(",")]:
+        tensors = make_tensors(num_params, args.size, args.device)
+        res = {}
+        for name, func in [
+            ("loop", step_loop),
+            ("sgd", step_fused_sgd),
+            ("lans", step_fused_lans),
+        ]:
+            # Warm up to exclude the kernel compilation.
+            func(*tensors, 0.01, 0.9)
+            latencies = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                func(*tensors, 0.01, 0.9)
+                # Copy a parameter back to wait for the device.
+                tensors[1][-1].numpy()
+                latencies.append((time.perf_counter() - start) * 1000)
+            res[name] = sorted(latencies)[len(latencies) // 2]
+        results[num_params] = res
+        print(f"{num_params:>8} {res['loop']:>10.2f} {res['sgd']:>10.2f} {res['lans']:>10.2f}")
+    if args.json is not None:
+        with open(args.json, "w") as filep:
+            json.dump(results, filep, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Benchmark the parameter initialization with numpy on the host and threefry on the device.
+
+The benchmark initializes a stack of square weights with xavier_uniform, either one by one with
+numpy followed by a copy to the device, or in one batch on the device with raf.random.init_model:
+
+    python3 scripts/benchmark/random_init.py --device cuda --num-layers 24 --hidden 4096
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+import raf
+
+
+def make_model(num_layers, hidden, device):
+    """Make a model with the given number of zero-initialized square weights."""
+
+    class Stack(raf.Model):
+        """A stack of dense layers."""
+
+        # pylint: disable=attribute-defined-outside-init
+        def build(self):
+            for i in range(num_layers):
+                weight = raf.array(np.zeros((hidden, hidden), dtype="float32"), device=device)
+                setattr(self, f"w_{i}", weight)
+
+        @raf.model.trace
+        def forward(self, x):
+            for i in range(num_layers):
+                x = raf.matmul_nt(x, getattr(self, f"w_{i}"))
+            return x
+
+    return Stack()
+
+
+def init_numpy(model, device):
+    """Initialize the parameters one by one on the host."""
+    for param in model.state().values():
+        value = raf.random.nn.xavier_uniform(param.shape, device=device)
+        param.update(value)
+
+
+def init_threefry(model, seed):
+    """Initialize all parameters in one batch on their devices."""
+    raf.random.init_model(
+        model,
+        lambda _, param: raf.random.nn.distribution("xavier_uniform", param.shape),
+        seed=seed,
+    )
+
+
+def main():
+    """Main entry."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--num-layers", type=int, default=8)
+    parser.add_argument("--hidden", type=int, default=2048)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", type=str, default=None, help="Dump the results to a JSON file")
+    args = parser.parse_args()
+
+    model = make_model(args.num_layers, args.hidden, args.device)
+    num_params = args.num_layers * args.hidden * args.hidden
+    results = {"num_params": num_params}
+    print(f"Parameters: {num_params / 1e6:.1f} M on {args.device}")
+    for name, func in [
+        ("numpy", lambda: init_numpy(model, args.device)),
+        ("threefry", lambda: init_threefry(model, 0)),
+    ]:
+        latencies = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            func()
+            # Copy a parameter back to wait for the device.
+            model.w_0.numpy()
+            latencies.append((time.perf_counter() - start) * 1000)
+        results[name] = {"median_ms": sorted(latencies)[len(latencies) // 2]}
+        print(f"{name:>10}: {results[name]['median_ms']:.1f} ms")
+    if args.json is not None:
+        with open(args.json, "w") as filep:
+            json.dump(results, filep, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Benchmark the throughput and latency of serving concurrent requests with dynamic batching.
+
+The benchmark sends single-sample requests from multiple client threads, either to a VM that
+runs each request on its own, or to raf.serving.BatchingExecutor that coalesces the requests:
+
+    python3 scripts/benchmark/serving.py --model mlp --clients 16 --max-batch-size 16
+"""
+import argparse
+import json
+import threading
+import time
+
+import numpy as np
+
+import raf
+from raf._core.executor import VMExecutor
+from raf.model.trace import _get_func_inputs
+from raf.serving import BatchingExecutor
+from raf.testing import mlp, resnet
+
+
+def get_model(name, batch_size, device):
+    """Get the model in inference mode and an example input with the given batch size."""
+    if name == "mlp":
+        config = (784, 10, 256, 256)
+        model, _ = mlp.get_model(config, train=False)
+        (m_x,), _ = mlp.get_input(config, batch_size, device=device, train=False)
+    else:
+        model, _ = resnet.get_model([3, 4, 6, 3], train=False)
+        (m_x,), _ = resnet.get_input(batch_size, device=device, train=False)
+    model.to(device=device)
+    return model, m_x
+
+
+def run_clients(func, inputs, num_clients, num_requests):
+    """Send requests from the clients and return the per-request latencies in ms."""
+    latencies = []
+    lock = threading.Lock()
+
+    def client(idx):
+        local = []
+        for i in range(num_requests):
+            start = time.perf_counter()
+            func(inputs[(idx + i) % len(inputs)])
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(num_clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+def main():
+    """Main entry."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--model", type=str, default="mlp", choices=["mlp", "resnet50"])
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=50, help="The requests per client")
+    parser.add_argument("--max-batch-size", type=int, default=16)
+    parser.add_argument("--max-latency-ms", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--json", type=str, default=None, help="Dump the results to a JSON file")
+    args = parser.parse_args()
+
+    single_model, single_x = get_model(args.model, 1, args.device)
+    inputs = [np.random.randn(*single_x.shape).astype(single_x.dtype) for _ in range(8)]
+
+    # Baseline: every request is run on its own, serialized by a lock to mimic a single VM.
+    record = single_model._internal(single_x)  # pylint: disable=protected-access
+    params = _get_func_inputs(record, [single_x], {}, get_handle=False)[1:]
+    with raf.ir.PassContext(opt_level=3):
+        vm_func = VMExecutor(record.mod, args.device).make_executor()
+    vm_lock = threading.Lock()
+
+    def run_single(x):
+        with vm_lock:
+            return vm_func(x, *params).numpy()
+
+    batch_model, batch_x = get_model(args.model, args.max_batch_size, args.device)
+    executor = BatchingExecutor.from_model(
+        batch_model,
+        [batch_x],
+        args.device,
+        max_latency_ms=args.max_latency_ms,
+        num_workers=args.workers,
+    )
+
+    results = {}
+    for name, func in [("single", run_single), ("batching", executor)]:
+        # Warm up to exclude the kernel compilation.
+        run_clients(func, inputs, args.clients, 2)
+        start = time.perf_counter()
+        latencies = run_clients(func, inputs, args.clients, args.requests)
+        elapsed = time.perf_counter() - start
+        results[name] = {
+            "throughput": len(latencies) / elapsed,
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p99_ms": float(np.percentile(latencies, 99)),
+        }
+        print(
+            f"{name:>10}: {results[name]['throughput']:.1f} req/s, "
+            f"p50 {results[name]['p50_ms']:.2f} ms, p99 {results[name]['p99_ms']:.2f} ms"
+        )
+    results["batch_sizes"] = executor.get_stats()["batch_sizes"]
+    print(f"Batch sizes: {results['batch_sizes']}")
+    executor.close()
+    if args.json is not None:
+        with open(args.json, "w") as filep:
+            json.dump(results, filep, indent=2)
+
+
+if __name__ == "__main__":
+    main()
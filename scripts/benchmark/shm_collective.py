@@ -0,0 +1,149 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Benchmark the bandwidth of the collective ops on CPU with the shared-memory communicator.
+
+The script spawns one process per rank on this host and reports, for each message size, the
+algorithm bandwidth (message bytes / latency) and the bus bandwidth, which scales the algorithm
+bandwidth by the amount of data every rank has to move (2(n-1)/n for allreduce and (n-1)/n for
+allgather and reduce_scatter), following the convention of nccl-tests:
+
+    python3 scripts/benchmark/shm_collective.py --num-ranks 4 --op allreduce --json shm.json
+"""
+# pylint: disable=import-outside-toplevel
+import argparse
+import json
+import multiprocessing as mp
+import os
+import time
+import uuid
+
+import numpy as np
+
+BUS_FACTOR = {
+    "allreduce": lambda n: 2.0 * (n - 1) / n,
+    "allgather": lambda n: (n - 1) / n,
+    "reduce_scatter": lambda n: (n - 1) / n,
+}
+
+
+def make_model(op):
+    """Make a model that runs the given collective op."""
+    import raf
+
+    class Collective(raf.Model):
+        """A single collective op."""
+
+        def build(self):
+            pass
+
+        @raf.model.trace
+        def forward(self, x):
+            if op == "allreduce":
+                return raf.allreduce(x, computation="sum")
+            if op == "allgather":
+                return raf.allgather(x, axis=0)
+            return raf.reduce_scatter(x, computation="sum")
+
+    return Collective()
+
+
+def run_rank(rank, size, session, args, queue):
+    """Measure the latency of every message size on one rank."""
+    os.environ["RAF_SHM_SESSION"] = session
+    if args.slot_bytes:
+        os.environ["RAF_SHM_SLOT_BYTES"] = str(args.slot_bytes)
+    import raf
+    from raf import distributed as dist
+
+    comm = dist.get_communicator()
+    comm.size = size
+    comm.rank = rank
+    comm.local_size = size
+    comm.local_rank = rank
+
+    model = make_model(args.op)
+    results = []
+    nbytes = args.min_bytes
+    while nbytes <= args.max_bytes:
+        # The message size is the input of allreduce and reduce_scatter, and the output of
+        # allgather.
+        num_elems = max(nbytes // 4, size)
+        num_elems -= num_elems % size
+        if args.op == "allgather":
+            num_elems //= size
+        x = raf.array(np.ones((num_elems,), dtype="float32"))
+        for _ in range(args.warmup):
+            model(x)
+        start = time.perf_counter()
+        for _ in range(args.number):
+            model(x)
+        latency = (time.perf_counter() - start) / args.number
+        msg_bytes = num_elems * 4 * (size if args.op == "allgather" else 1)
+        algbw = msg_bytes / latency / 1e9
+        results.append(
+            {
+                "bytes": msg_bytes,
+                "latency_us": latency * 1e6,
+                "algbw_GBps": algbw,
+                "busbw_GBps": algbw * BUS_FACTOR[args.op](size),
+            }
+        )
+        nbytes *= 2
+    queue.put((rank, results))
+
+
+def main():
+    """Main entry."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--num-ranks", type=int, default=2)
+    parser.add_argument("--op", choices=list(BUS_FACTOR.keys()), default="allreduce")
+    parser.add_argument("--min-bytes", type=int, default=1 << 10)
+    parser.add_argument("--max-bytes", type=int, default=1 << 26)
+    parser.add_argument("--slot-bytes", type=int, default=0, help="0 for the default slot size")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--json", type=str, default=None, help="Dump the results to a file")
+    args = parser.parse_args()
+
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    session = uuid.uuid4().hex[:8]
+    procs = [
+        ctx.Process(target=run_rank, args=(rank, args.num_ranks, session, args, queue))
+        for rank in range(args.num_ranks)
+    ]
+    for proc in procs:
+        proc.start()
+    per_rank = dict(queue.get() for _ in procs)
+    for proc in procs:
+        proc.join()
+
+    # A collective is only as fast as its slowest rank.
+    results = []
+    for i, res in enumerate(per_rank[0]):
+        latency = max(per_rank[rank][i]["latency_us"] for rank in per_rank)
+        scale = res["latency_us"] / latency
+        results.append(
+            {
+                "bytes": res["bytes"],
+                "latency_us": latency,
+                "algbw_GBps": res["algbw_GBps"] * scale,
+                "busbw_GBps": res["busbw_GBps"] * scale,
+            }
+        )
+
+    print(f"{args.op} over {args.num_ranks} ranks")
+    print(f"{'bytes':>12} {'latency(us)':>12} {'algbw(GB/s)':>12} {'busbw(GB/s)':>12}")
+    for res in results:
+        print(
+            f"{res['bytes']:>12} {res['latency_us']:>12.1f} "
+            f"{res['algbw_GBps']:>12.3f} {res['busbw_GBps']:>12.3f}"
+        )
+    if args.json:
+        with open(args.json, "w") as filep:
+            json.dump({"op": args.op, "num_ranks": args.num_ranks, "results": results}, filep)
+
+
+if __name__ == "__main__":
+    main()
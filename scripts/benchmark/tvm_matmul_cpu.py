@@ -0,0 +1,77 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Benchmark the TVM schedules of the matmul family on CPU with the shapes of transformers.
+
+The shapes default to the projections and the attention of BERT-base with a sequence length of
+128. Each op runs imperatively with the tvm dialect, and optionally with cpublas as a reference:
+
+    python3 scripts/benchmark/tvm_matmul_cpu.py --ops matmul,batch_matmul_nt --cpublas
+"""
+import argparse
+import json
+
+import raf
+from raf.testing import with_dialect
+
+# The script directory is on the path when the script runs, so the helpers are shared.
+from cpublas_gemm import make_inputs, measure  # pylint: disable=import-error
+
+# Each shape is (batch, m, n, k), where batch is ignored by the 2D ops.
+SHAPES = {
+    "qkv": (1, 128, 768, 768),
+    "ffn_up": (1, 128, 3072, 768),
+    "ffn_down": (1, 128, 768, 3072),
+    "attn_score": (12, 128, 128, 64),
+    "attn_context": (12, 128, 64, 128),
+}
+
+OPS = {
+    "matmul": raf.matmul,
+    "matmul_nt": raf.matmul_nt,
+    "matmul_tn": raf.matmul_tn,
+    "matmul_tt": raf.matmul_tt,
+    "batch_matmul": raf.batch_matmul,
+    "batch_matmul_nt": raf.batch_matmul_nt,
+    "batch_matmul_tn": raf.batch_matmul_tn,
+    "batch_matmul_tt": raf.batch_matmul_tt,
+}
+
+
+def main():
+    """Main entry."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--ops", type=str, default="matmul,matmul_nt,batch_matmul,batch_matmul_tn")
+    parser.add_argument("--shapes", type=str, default=",".join(SHAPES))
+    parser.add_argument("--dtype", type=str, default="float32")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--cpublas", action="store_true", help="Also measure the cpublas dialect")
+    parser.add_argument("--json", type=str, default=None, help="Dump the results to a JSON file")
+    args = parser.parse_args()
+
+    dialects = [["tvm"]] + ([["cpublas", "tvm"]] if args.cpublas else [])
+    results = []
+    header = ["op", "shape", "tvm(ms)", "GFLOPS", "cpublas(ms)", "GFLOPS"]
+    print("{:>16} {:>13} {:>9} {:>8} {:>12} {:>8}".format(*header))
+    for op in args.ops.split(","):
+        for name in args.shapes.split(","):
+            batch, m, n, k = SHAPES[name]
+            batch = batch if op.startswith("batch_matmul") else 1
+            inputs = make_inputs(op, batch, m, n, k, args.dtype)
+            flops = 2.0 * batch * m * n * k
+            res = {"op": op, "shape": name, "bmnk": [batch, m, n, k]}
+            line = f"{op:>16} {name:>13}"
+            for dialect in dialects:
+                latency = measure(with_dialect(dialect)(OPS[op]), inputs, args.repeat)
+                res[dialect[0]] = {"ms": latency, "gflops": flops / latency / 1e6}
+                width = 9 if dialect[0] == "tvm" else 12
+                line += f" {latency:>{width}.3f} {res[dialect[0]]['gflops']:>8.1f}"
+            results.append(res)
+            print(line)
+    if args.json is not None:
+        with open(args.json, "w") as filep:
+            json.dump(results, filep, indent=2)
+
+
+if __name__ == "__main__":
+    main()
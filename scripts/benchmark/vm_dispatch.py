@@ -0,0 +1,90 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Benchmark the VM dispatch overhead per InvokeJit instruction.
+
+The benchmark compiles a chain of small elementwise ops with fusion disabled, so that every op
+becomes one InvokeJit instruction, and runs it with a dryrun VM that skips the kernel execution.
+The measured latency is therefore dominated by the dispatch overhead (reading registers, building
+the OpEnv signature and looking up the OpEnv cache).
+
+Run this script on two commits to compare the dispatch overhead before and after a change:
+
+    python3 scripts/benchmark/vm_dispatch.py --num-ops 200 --json before.json
+"""
+# pylint: disable=protected-access
+import argparse
+import json
+
+import raf
+from raf._core.executor import VMExecutor
+from raf.testing import randn
+
+
+class ElemwiseChain(raf.Model):
+    """A chain of small elementwise ops."""
+
+    # pylint: disable=attribute-defined-outside-init
+    def build(self, num_ops):
+        self.num_ops = num_ops
+
+    @raf.model.trace
+    def forward(self, x):
+        for _ in range(self.num_ops // 2):
+            x = raf.add(x, x)
+            x = raf.relu(x)
+        return x
+
+
+def measure(num_ops, shape, device, dryrun, warmup, number, repeat):
+    """Measure the per-instruction latency in microseconds."""
+    model = ElemwiseChain(num_ops)
+    model.infer_mode()
+    m_x, _ = randn(shape, device=device)
+    mod = model._internal(m_x).mod
+    with raf.ir.PassContext(disabled_pass=["FuseTVM", "FuseDialect"]):
+        executor = VMExecutor(mod, device, dryrun=dryrun)
+    num_jits = executor.executable.bytecode.count("invoke_jit")
+    latency = executor.vm.profile(m_x, warmup=warmup, number=number, repeat=repeat)
+    per_instr = [lat * 1000.0 / num_jits for lat in latency]
+    per_instr.sort()
+    return {
+        "num_invoke_jit": num_jits,
+        "median_us_per_instr": per_instr[len(per_instr) // 2],
+        "min_us_per_instr": per_instr[0],
+    }
+
+
+def main():
+    """Main entry."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--num-ops", type=int, default=200, help="The number of ops in the chain")
+    parser.add_argument("--shape", type=int, nargs="+", default=[4], help="The tensor shape")
+    parser.add_argument("--device", type=str, default="cpu", help="The device to run on")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--json", type=str, default=None, help="Dump the results to a JSON file")
+    args = parser.parse_args()
+
+    results = {}
+    for mode, dryrun in [("dispatch_only", True), ("dispatch_and_execute", False)]:
+        results[mode] = measure(
+            args.num_ops, args.shape, args.device, dryrun, args.warmup, args.number, args.repeat
+        )
+        print(
+            "%-22s: %d InvokeJit, median %.3f us/instr, min %.3f us/instr"
+            % (
+                mode,
+                results[mode]["num_invoke_jit"],
+                results[mode]["median_us_per_instr"],
+                results[mode]["min_us_per_instr"],
+            )
+        )
+    if args.json is not None:
+        with open(args.json, "w") as filep:
+            json.dump(results, filep, indent=2)
+
+
+if __name__ == "__main__":
+    main()
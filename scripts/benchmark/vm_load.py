@@ -0,0 +1,129 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Benchmark the load time and memory of a VM executable with large constants.
+
+The benchmark compiles a chain of dense layers whose weights are constants, saves the executable
+in both the bytecode format (Executable.save) and the single-file artifact format
+(Executable.save_artifact), and loads each of them in a fresh process. It reports the time to load
+the executable, the time of the first inference, and the peak resident memory increase of the
+process, which shows that the artifact maps the weights instead of reading them into memory:
+
+    python3 scripts/benchmark/vm_load.py --num-layers 16 --hidden 2048 --json load.json
+"""
+# pylint: disable=import-outside-toplevel, protected-access
+import argparse
+import json
+import multiprocessing as mp
+import os
+import resource
+import tempfile
+import time
+
+import numpy as np
+
+
+def build_and_save(num_layers, hidden, workdir):
+    """Compile the model and save it in both formats."""
+    import raf
+    from raf._core.executor import VMExecutor
+    from tvm import relay
+
+    x = raf.ir.var("x", shape=(1, hidden))
+    y = x
+    for _ in range(num_layers):
+        weight = np.random.randn(hidden, hidden).astype("float32") / np.sqrt(hidden)
+        y = raf.ir.op.relu(raf.ir.op.dense(y, raf.ir.const(weight)))
+    mod = raf.ir.IRModule()
+    mod["main"] = relay.Function([x], y)
+    mod = raf._ffi.pass_.ToANormalForm()(mod)
+    with raf.ir.PassContext(opt_level=1):
+        exe = VMExecutor(mod, "cpu").executable
+
+    code, _ = exe.save()
+    with open(os.path.join(workdir, "code.ro"), "wb") as filep:
+        filep.write(code)
+    exe.save_artifact(os.path.join(workdir, "model.rafx"))
+
+
+def load_and_run(fmt, hidden, workdir, queue):
+    """Load the executable in the given format and run the first inference."""
+    import raf
+    from raf._core.device import Device
+    from raf._core.vm import Executable, VirtualMachine
+
+    x = raf.array(np.random.randn(1, hidden).astype("float32"))
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    if fmt == "bytecode":
+        with open(os.path.join(workdir, "code.ro"), "rb") as filep:
+            exe = Executable.load_exec(bytearray(filep.read()), None)
+    else:
+        exe = Executable.load_artifact(os.path.join(workdir, "model.rafx"))
+    load_ms = (time.perf_counter() - start) * 1000
+    load_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    VirtualMachine(exe, Device("cpu")).run(x)
+    first_run_ms = (time.perf_counter() - start) * 1000
+    run_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    queue.put(
+        {
+            "load_ms": load_ms,
+            "first_run_ms": first_run_ms,
+            # ru_maxrss is in KBs on Linux.
+            "load_peak_rss_mb": (load_rss - base_rss) / 1024.0,
+            "run_peak_rss_mb": (run_rss - base_rss) / 1024.0,
+        }
+    )
+
+
+def main():
+    """Main entry."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--num-layers", type=int, default=16)
+    parser.add_argument("--hidden", type=int, default=2048)
+    parser.add_argument("--repeat", type=int, default=3, help="The number of fresh processes")
+    parser.add_argument("--json", type=str, default=None, help="Dump the results to a JSON file")
+    args = parser.parse_args()
+
+    ctx = mp.get_context("spawn")
+    weight_mb = args.num_layers * args.hidden * args.hidden * 4 / 1024.0 / 1024.0
+    results = {"weight_mb": weight_mb}
+    with tempfile.TemporaryDirectory() as workdir:
+        proc = ctx.Process(target=build_and_save, args=(args.num_layers, args.hidden, workdir))
+        proc.start()
+        proc.join()
+        assert proc.exitcode == 0, "Failed to build the model"
+
+        print(f"Weights: {weight_mb:.1f} MB")
+        print(
+            f"{'format':>10} {'load(ms)':>10} {'run(ms)':>10} {'load RSS(MB)':>13} "
+            f"{'run RSS(MB)':>12}"
+        )
+        for fmt in ["bytecode", "artifact"]:
+            runs = []
+            for _ in range(args.repeat):
+                queue = ctx.Queue()
+                proc = ctx.Process(target=load_and_run, args=(fmt, args.hidden, workdir, queue))
+                proc.start()
+                runs.append(queue.get())
+                proc.join()
+            # Report the median of each metric.
+            res = {
+                key: sorted(run[key] for run in runs)[len(runs) // 2] for key in runs[0].keys()
+            }
+            results[fmt] = res
+            print(
+                f"{fmt:>10} {res['load_ms']:>10.1f} {res['first_run_ms']:>10.1f} "
+                f"{res['load_peak_rss_mb']:>13.1f} {res['run_peak_rss_mb']:>12.1f}"
+            )
+    if args.json is not None:
+        with open(args.json, "w") as filep:
+            json.dump(results, filep, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -692,6 +692,15 @@ SCHEMAS = {
         Arg(name="mode", cxx_type="int"),
         Arg(name="normalize_grad", cxx_type="bool"),
     ],
+    "optimizer.h::multi_tensor_sgd": [
+        Arg(
+            name="tensor_list",
+            cxx_type="std::vector<value::BaseTensorValue>",
+            cxx_normalizer="TensorTuple",
+        ),
+        Arg(name="learning_rate", cxx_type="float"),
+        Arg(name="mu", cxx_type="float"),
+    ],
     "stream.h::stream": [
         Arg(name="x", cxx_type="value::BaseTensorValue"),
         Arg(name="stream_tag", cxx_type="int", cxx_default=0),
@@ -885,6 +894,7 @@ SCHEMAS = {
             py_default="None",
         ),
         Arg(name="own", cxx_type="bool", cxx_default=True),
+        Arg(name="offset", cxx_type="int64_t", cxx_default=0),
     ],
     "vm.h::free": [
         Arg(name="memory", cxx_type="value::BaseTensorValue"),
@@ -285,7 +285,13 @@ namespace imperative {
   } catch (const dmlc::Error &e) {                                                             \\
     FillError(e, "{op}", names::op);                                                           \\
   }                                                                                            \\
-  Value value = InvokePrimitive(CallValues::make(opack->opv, _schema));                        \\
+  const auto *schema = _schema.as<obj>();                                                      \\
+  Array<Value> _values;
+
+#define RAF_VALUE(v) _values.push_back(v);
+
+#define RAF_INVOKE()                                                                           \\
+  Value value = InvokePrimitive(CallValues::make(opack->opv, _schema), _values);               \\
   int n_tapes = grads.size();                                                                  \\
   bool full_grads = RemoveNoGrad(prev_tapes.data(), grads.data(), &n_tapes);                   \\
   /* case 1: no grad required */                                                               \\
@@ -302,7 +308,6 @@ namespace imperative {
     /* case 3: partial grad required, have to collect vars */                                  \\
     CollectVars(body, &used_vars);                                                             \\
   }                                                                                            \\
-  const auto *schema = _schema.as<obj>();                                                      \\
   Map<Var, Value> env;
 
 #define RAF_SET_ENV(var, value)                                                        \\
@@ -323,6 +328,8 @@ namespace imperative {
 IMPERATIVE_API_EPILOG = """
 #undef RAF_RET
 #undef RAF_SET_ENV
+#undef RAF_INVOKE
+#undef RAF_VALUE
 #undef RAF_PRELUDE
 
 }  // namespace imperative
@@ -337,6 +344,8 @@ def gen_imperative_api(op):
 RAF_REGISTER_GLOBAL("raf.op.imp.{OP_NAME}")
 .set_body([](TVMArgs args, TVMRetValue* ret) {{
   RAF_PRELUDE({OP_VAR}, {N_ARGS}, ffi2schema::{SCHEMA_NAME}, schema::{SCHEMA_NAME}Args);  // NOLINT(whitespace/line_length)
+{VALUES}
+  RAF_INVOKE();
 {ARGS}
   RAF_SET_ENV(vpack->y, value);
   *ret = RAF_RET();
@@ -345,22 +354,32 @@ RAF_REGISTER_GLOBAL("raf.op.imp.{OP_NAME}")
     ARG = (
         " " * 2
         + """
-  RAF_SET_ENV(vpack->x[{I}], schema2value::{NORM}(schema->{ARG_NAME}));
+  RAF_SET_ENV(vpack->x[{I}], _values[{I}]);
+""".strip()
+    )
+    VALUE = (
+        " " * 2
+        + """
+  RAF_VALUE(schema2value::{NORM}(schema->{ARG_NAME}));
 """.strip()
     )
     n_args = len(op.schema)
     schema_name = snake_to_pascal(op.schema_name)
     args = []
+    values = []
     for i, entry in enumerate(op.schema):
         norm = NORM_CONVERTER[NORM_MAP[entry.cxx_normalizer or entry.cxx_type]]
         arg_name = entry.name
-        args.append(ARG.format(I=i, NORM=norm, ARG_NAME=arg_name))
+        args.append(ARG.format(I=i))
+        values.append(VALUE.format(NORM=norm, ARG_NAME=arg_name))
     args = "\n".join(map(add_no_lint, args))
+    values = "\n".join(map(add_no_lint, values))
     return IMPERATIVE_API.format(
         OP_NAME=op.name,
         OP_VAR=op.name.replace(".", "_"),
         SCHEMA_NAME=schema_name,
         N_ARGS=n_args,
+        VALUES=values,
         ARGS=args,
     )
 
@@ -0,0 +1,76 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tune the schedules of the raf.testing models on the host CPU and generate the schedule bundle.
+
+The tasks are extracted from the models in raf.benchmark.models as well as the op-level tuning
+spaces in raf.utils.tuner, and are tuned for the LLVM target of the host CPU. All measurement
+records are appended to the tuning log, so an interrupted run can be resumed. The best record
+of each task is distilled to the bundle, which can be used together with the CUDA bundle. RAF
+compiles the CPU kernels with RAF_CPU_TARGET, so set it to the printed target when running the
+tuned models:
+
+    python3 scripts/tune/tune_cpu_schedules.py --models mlp,resnet_cifar10 --output sch/cpu.json
+    export RAF_SCH_FILE=$PWD/sch/latest.json:$PWD/sch/cpu.json
+    export RAF_CPU_TARGET="<the printed target>"
+"""
+import argparse
+import os
+
+from tvm.auto_scheduler.measure_record import distill_record_file
+
+from raf.benchmark.models import MODELS, get_model
+from raf.utils import tuner
+
+OP_TUNERS = {
+    "softmax_dx": tuner.tune_softmax_dx,
+    "layer_norm": tuner.tune_layer_norm,
+    "layer_norm_dx": tuner.tune_layer_norm_dx,
+    "take_dx": tuner.tune_take_dx,
+    "fused_take_dx": tuner.tune_fused_take_dx,
+}
+
+
+def main():
+    """Main entry."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--models", type=str, default=",".join(MODELS))
+    parser.add_argument("--ops", type=str, default="", help="The ops in raf.utils.tuner to tune")
+    parser.add_argument("--batch-sizes", type=str, default="1,16")
+    parser.add_argument("--modes", type=str, default="infer,train")
+    parser.add_argument("--trials-per-task", type=int, default=300)
+    parser.add_argument("--log", type=str, default="cpu_tuning.json", help="The tuning log")
+    parser.add_argument("--output", type=str, default="sch/cpu.json", help="The bundle")
+    parser.add_argument("--n-parallel", type=int, default=None, help="The build processes")
+    parser.add_argument("--only-extract-tasks", action="store_true")
+    args = parser.parse_args()
+
+    # Tune and compile with the host CPU target, unless RAF_CPU_TARGET is already set.
+    if not os.environ.get("RAF_CPU_TARGET"):
+        tuner.set_cpu_target()
+    print("Tuning for %s" % tuner.get_cpu_target())
+    for name in filter(None, args.models.split(",")):
+        for mode in args.modes.split(","):
+            for batch_size in [int(batch) for batch in args.batch_sizes.split(",")]:
+                print("### %s, batch size %d, %s ###" % (name, batch_size, mode))
+                model, inputs = get_model(name, batch_size, "cpu", mode == "train")
+                tuner.run_tuning(
+                    model,
+                    "cpu",
+                    inputs,
+                    args.log,
+                    fusion=True,
+                    n_trials=lambda num_tasks: args.trials_per_task * num_tasks,
+                    only_extract_tasks=args.only_extract_tasks,
+                    n_parallel=args.n_parallel,
+                )
+    for name in filter(None, args.ops.split(",")):
+        OP_TUNERS[name](args.log, device="cpu", only_extract_tasks=args.only_extract_tasks)
+
+    if not args.only_extract_tasks and os.path.exists(args.log):
+        distill_record_file(args.log, args.output)
+        print("The schedule bundle is saved in %s" % args.output)
+
+
+if __name__ == "__main__":
+    main()
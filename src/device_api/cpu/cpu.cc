@@ -7,7 +7,18 @@
  * \file src/device_api/cpu/cpu.cc
  * \brief CPU device API
  */
+#include <algorithm>
+#include <chrono>
+#include <condition_variable>
+#include <deque>
+#include <mutex>
+#include <sstream>
 #include <thread>
+#include <unordered_set>
+#ifdef __linux__
+#include <pthread.h>
+#include <sched.h>
+#endif
 #include "raf/device_api.h"
 #include "raf/registry.h"
 
@@ -15,6 +26,316 @@ namespace raf {
 namespace device_api {
 namespace cpu {
 
+class CPUStream;
+
+/*!
+ * \brief An event on CPU streams. Each record on a stream bumps the record counter, and the
+ * stream completes the record when it reaches the record. An event completes when all its
+ * records are completed.
+ */
+class CPUEvent {
+ public:
+  /*! \brief Reserve a new record and return its id. */
+  int64_t Record() {
+    std::lock_guard<std::mutex> lock(mu_);
+    return ++recorded_;
+  }
+
+  /*! \brief Complete a record, and resume the streams waiting for it. */
+  void Complete(int64_t record);
+
+  /*! \brief Get the id of the last record. */
+  int64_t LastRecord() {
+    std::lock_guard<std::mutex> lock(mu_);
+    return recorded_;
+  }
+
+  /*!
+   * \brief Register a stream that waits for a record if the record is not completed yet.
+   * \return False if the record is already completed.
+   */
+  bool AddWaiter(int64_t record, CPUStream* stream) {
+    std::lock_guard<std::mutex> lock(mu_);
+    if (completed_ >= record) {
+      return false;
+    }
+    waiters_.emplace_back(record, stream);
+    return true;
+  }
+
+  /*! \brief Block the host thread until the record is completed. */
+  void Wait(int64_t record) {
+    std::unique_lock<std::mutex> lock(mu_);
+    cv_.wait(lock, [this, record] { return completed_ >= record; });
+  }
+
+  /*! \brief The time when the last record is completed. */
+  std::chrono::steady_clock::time_point CompletedTime() {
+    std::unique_lock<std::mutex> lock(mu_);
+    cv_.wait(lock, [this] { return completed_ >= recorded_; });
+    return completed_time_;
+  }
+
+ private:
+  std::mutex mu_;
+  std::condition_variable cv_;
+  int64_t recorded_ = 0;
+  int64_t completed_ = 0;
+  std::chrono::steady_clock::time_point completed_time_ = std::chrono::steady_clock::now();
+  std::vector<std::pair<int64_t, CPUStream*>> waiters_;
+};
+
+/*!
+ * \brief The shared worker pool that runs the tasks of CPU streams. A stream with pending tasks
+ * is put to the ready queue, and a worker runs its tasks in order until the stream is empty or
+ * waits for an event.
+ */
+class CPUWorkerPool {
+ public:
+  static CPUWorkerPool* Get() {
+    static CPUWorkerPool* instance = new CPUWorkerPool();
+    return instance;
+  }
+
+  /*!
+   * \brief Restart the workers.
+   * \param num_threads The number of worker threads. Non-positive means the number of cores.
+   * \param cores The cores to pin the workers to, in a round-robin way. Empty means no pinning.
+   */
+  void Configure(int num_threads, std::vector<int> cores) {
+    Stop();
+    std::lock_guard<std::mutex> lock(mu_);
+    Start(num_threads, std::move(cores));
+  }
+
+  void Schedule(CPUStream* stream) {
+    {
+      std::lock_guard<std::mutex> lock(mu_);
+      if (workers_.empty()) {
+        StartFromEnv();
+      }
+      ready_.push_back(stream);
+    }
+    cv_.notify_one();
+  }
+
+  int NumThreads() {
+    std::lock_guard<std::mutex> lock(mu_);
+    return workers_.size();
+  }
+
+ private:
+  CPUWorkerPool() = default;
+
+  /*! \brief Start the workers with RAF_CPU_STREAM_THREADS and RAF_CPU_STREAM_CORES. */
+  void StartFromEnv() {
+    int num_threads = 0;
+    std::vector<int> cores;
+    if (const char* val = getenv("RAF_CPU_STREAM_THREADS")) {
+      num_threads = atoi(val);
+    }
+    if (const char* val = getenv("RAF_CPU_STREAM_CORES")) {
+      cores = ParseCores(val);
+    }
+    Start(num_threads, std::move(cores));
+  }
+
+  void Start(int num_threads, std::vector<int> cores) {
+    if (num_threads <= 0) {
+      num_threads = std::max(1U, std::thread::hardware_concurrency());
+    }
+    stop_ = false;
+    cores_ = std::move(cores);
+    for (int i = 0; i < num_threads; ++i) {
+      workers_.emplace_back([this, i] { WorkerLoop(i); });
+    }
+  }
+
+  void Stop() {
+    std::vector<std::thread> workers;
+    {
+      std::lock_guard<std::mutex> lock(mu_);
+      CHECK(ready_.empty()) << "Cannot reconfigure the CPU stream workers with pending tasks";
+      stop_ = true;
+      workers.swap(workers_);
+    }
+    cv_.notify_all();
+    for (auto& worker : workers) {
+      worker.join();
+    }
+  }
+
+  void WorkerLoop(int index);
+
+  std::mutex mu_;
+  std::condition_variable cv_;
+  std::deque<CPUStream*> ready_;
+  std::vector<std::thread> workers_;
+  std::vector<int> cores_;
+  bool stop_ = false;
+
+ public:
+  /*! \brief Parse a core list such as "0,2,4-7". */
+  static std::vector<int> ParseCores(const std::string& str) {
+    std::vector<int> cores;
+    std::stringstream ss(str);
+    std::string item;
+    while (std::getline(ss, item, ',')) {
+      if (item.empty()) {
+        continue;
+      }
+      auto dash = item.find('-');
+      if (dash == std::string::npos) {
+        cores.push_back(std::stoi(item));
+      } else {
+        int begin = std::stoi(item.substr(0, dash));
+        int end = std::stoi(item.substr(dash + 1));
+        CHECK_LE(begin, end) << "Invalid core range: " << item;
+        for (int i = begin; i <= end; ++i) {
+          cores.push_back(i);
+        }
+      }
+    }
+    return cores;
+  }
+};
+
+/*!
+ * \brief A CPU stream, which is an ordered queue of tasks running on the shared worker pool.
+ * A task is either a host function or a wait for an event record.
+ */
+class CPUStream {
+ public:
+  void Launch(std::function<void()> func) {
+    Push(Task{std::move(func), nullptr, 0});
+  }
+
+  void WaitEvent(CPUEvent* event, int64_t record) {
+    Push(Task{nullptr, event, record});
+  }
+
+  /*! \brief Run the tasks until the stream is empty or waits for an event. */
+  void Run() {
+    while (true) {
+      Task task;
+      bool failed;
+      {
+        std::lock_guard<std::mutex> lock(mu_);
+        if (tasks_.empty()) {
+          active_ = false;
+          cv_.notify_all();
+          return;
+        }
+        task = tasks_.front();
+        failed = !error_.empty();
+      }
+      if (task.event != nullptr) {
+        if (task.event->AddWaiter(task.record, this)) {
+          // The stream is scheduled again when the record is completed.
+          return;
+        }
+      } else if (!failed) {
+        try {
+          task.func();
+        } catch (const std::exception& e) {
+          std::lock_guard<std::mutex> lock(mu_);
+          error_ = e.what();
+        }
+      }
+      std::lock_guard<std::mutex> lock(mu_);
+      tasks_.pop_front();
+    }
+  }
+
+  /*! \brief Block the host thread until all tasks are done. */
+  void Wait() {
+    std::unique_lock<std::mutex> lock(mu_);
+    cv_.wait(lock, [this] { return !active_; });
+    if (!error_.empty()) {
+      std::string error;
+      error.swap(error_);
+      LOG(FATAL) << "Error in the CPU stream: " << error;
+    }
+  }
+
+ private:
+  struct Task {
+    std::function<void()> func;
+    CPUEvent* event;
+    int64_t record;
+  };
+
+  void Push(Task task) {
+    bool schedule = false;
+    {
+      std::lock_guard<std::mutex> lock(mu_);
+      tasks_.push_back(std::move(task));
+      if (!active_) {
+        active_ = schedule = true;
+      }
+    }
+    if (schedule) {
+      CPUWorkerPool::Get()->Schedule(this);
+    }
+  }
+
+  std::mutex mu_;
+  std::condition_variable cv_;
+  std::deque<Task> tasks_;
+  /*! \brief Whether the stream has pending tasks, i.e., it is scheduled, running or waiting. */
+  bool active_ = false;
+  /*! \brief The error message of a failed task. The following tasks are skipped. */
+  std::string error_;
+};
+
+void CPUEvent::Complete(int64_t record) {
+  std::vector<CPUStream*> resumed;
+  {
+    std::lock_guard<std::mutex> lock(mu_);
+    completed_ = std::max(completed_, record);
+    completed_time_ = std::chrono::steady_clock::now();
+    auto it = std::partition(waiters_.begin(), waiters_.end(),
+                             [this](const auto& waiter) { return waiter.first > completed_; });
+    for (auto w = it; w != waiters_.end(); ++w) {
+      resumed.push_back(w->second);
+    }
+    waiters_.erase(it, waiters_.end());
+  }
+  cv_.notify_all();
+  for (auto* stream : resumed) {
+    CPUWorkerPool::Get()->Schedule(stream);
+  }
+}
+
+void CPUWorkerPool::WorkerLoop(int index) {
+#ifdef __linux__
+  {
+    std::lock_guard<std::mutex> lock(mu_);
+    if (!cores_.empty()) {
+      cpu_set_t cpuset;
+      CPU_ZERO(&cpuset);
+      CPU_SET(cores_[index % cores_.size()], &cpuset);
+      pthread_setaffinity_np(pthread_self(), sizeof(cpu_set_t), &cpuset);
+    }
+  }
+#endif
+  while (true) {
+    CPUStream* stream;
+    {
+      std::unique_lock<std::mutex> lock(mu_);
+      cv_.wait(lock, [this] { return stop_ || !ready_.empty(); });
+      if (ready_.empty()) {
+        return;
+      }
+      stream = ready_.front();
+      ready_.pop_front();
+    }
+    stream->Run();
+  }
+}
+
+thread_local void* current_stream = nullptr;
+
 class CPUDeviceAPI final : public DeviceAPI {
  public:
   CPUDeviceAPI() = default;
@@ -68,68 +389,139 @@ class CPUDeviceAPI final : public DeviceAPI {
 
     auto from_data_ptr = static_cast<const char*>(from->data) + from->byte_offset;
     auto to_data_ptr = static_cast<char*>(to->data) + to->byte_offset;
+    if (stream != nullptr) {
+      WaitStream(stream);
+    }
     memcpy(to_data_ptr, from_data_ptr, nbytes);
   }
 
   void* CreateStream(const Device&) override {
-    throw;
+    auto* stream = new CPUStream();
+    std::lock_guard<std::mutex> lock(mu_);
+    streams_.insert(stream);
+    return stream;
   }
 
   void FreeStream(const Device&, void* stream) override {
-    throw;
+    auto* cpu_stream = static_cast<CPUStream*>(stream);
+    cpu_stream->Wait();
+    {
+      std::lock_guard<std::mutex> lock(mu_);
+      streams_.erase(cpu_stream);
+    }
+    delete cpu_stream;
   }
 
   void SetStream(const Device&, void* stream) override {
-    throw;
+    current_stream = stream;
   }
 
   void* GetStream() override {
-    return nullptr;
+    return current_stream;
   }
 
   void* CreateEvent(const Device& dev, uint32_t flags) override {
-    throw;
+    return new CPUEvent();
   }
 
   void FreeEvent(const Device& dev, void* event) {
-    throw;
+    auto* cpu_event = static_cast<CPUEvent*>(event);
+    cpu_event->Wait(cpu_event->LastRecord());
+    delete cpu_event;
   }
 
   float EventElapsedTimeInMilliSeconds(void* start_event, void* end_event) override {
-    throw;
+    auto start = static_cast<CPUEvent*>(start_event)->CompletedTime();
+    auto end = static_cast<CPUEvent*>(end_event)->CompletedTime();
+    return std::chrono::duration<float, std::milli>(end - start).count();
   }
 
   void EventRecordOnStream(void* event, void* stream) override {
-    throw;
+    auto* cpu_event = static_cast<CPUEvent*>(event);
+    int64_t record = cpu_event->Record();
+    if (stream == nullptr) {
+      // Like the legacy default stream of CUDA, the default stream synchronizes with all streams.
+      WaitAllStreams();
+      cpu_event->Complete(record);
+      return;
+    }
+    static_cast<CPUStream*>(stream)->Launch([cpu_event, record]() {
+      cpu_event->Complete(record);
+    });
   }
 
   void StreamWaitEvent(void* stream, void* event) override {
-    throw;
+    auto* cpu_event = static_cast<CPUEvent*>(event);
+    int64_t record = cpu_event->LastRecord();
+    if (stream == nullptr) {
+      // The default stream runs on the host thread.
+      cpu_event->Wait(record);
+      return;
+    }
+    static_cast<CPUStream*>(stream)->WaitEvent(cpu_event, record);
   }
 
   void WaitDevice(const Device&) override {
-    // Do nothing
+    WaitAllStreams();
   }
 
   void WaitStream(void* stream) override {
-    throw;
+    if (stream == nullptr) {
+      WaitAllStreams();
+      return;
+    }
+    static_cast<CPUStream*>(stream)->Wait();
   }
 
   void WaitEvent(void* event) {
-    throw;
+    auto* cpu_event = static_cast<CPUEvent*>(event);
+    cpu_event->Wait(cpu_event->LastRecord());
   }
 
   void SetDevice(const int device_id) override {
     throw;
   }
 
+  void LaunchHostFunc(void* stream, std::function<void()> func) override {
+    if (stream == nullptr) {
+      func();
+      return;
+    }
+    static_cast<CPUStream*>(stream)->Launch(std::move(func));
+  }
+
   static void* make() {
     return new CPUDeviceAPI();
   }
+
+ private:
+  void WaitAllStreams() {
+    std::vector<CPUStream*> streams;
+    {
+      std::lock_guard<std::mutex> lock(mu_);
+      streams.assign(streams_.begin(), streams_.end());
+    }
+    for (auto* stream : streams) {
+      stream->Wait();
+    }
+  }
+
+  /*! \brief The live streams, which are synchronized by the default stream. */
+  std::unordered_set<CPUStream*> streams_;
+  std::mutex mu_;
 };
 
 RAF_REGISTER_GLOBAL("raf.device_api._make.cpu").set_body_typed(CPUDeviceAPI::make);
 
+RAF_REGISTER_GLOBAL("raf.device_api.cpu.ConfigureStreamWorkers")
+    .set_body_typed([](int num_threads, std::string cores) {
+      CPUWorkerPool::Get()->Configure(num_threads, CPUWorkerPool::ParseCores(cores));
+    });
+
+RAF_REGISTER_GLOBAL("raf.device_api.cpu.GetNumStreamWorkers").set_body_typed([]() {
+  return CPUWorkerPool::Get()->NumThreads();
+});
+
 }  // namespace cpu
 }  // namespace device_api
 }  // namespace raf
@@ -0,0 +1,394 @@
+/*
+ * Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ * SPDX-License-Identifier: Apache-2.0
+ */
+
+/*!
+ * \file src/distributed/common/shm_communicator.cc
+ * \brief Shared-memory communicator for the ranks on a single host.
+ */
+#include <errno.h>
+#include <fcntl.h>
+#include <signal.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <algorithm>
+#include <atomic>
+#include <chrono>
+#include <cstring>
+#include <new>
+#include <thread>
+#include "raf/shm_communicator.h"
+
+namespace raf {
+namespace distributed {
+namespace communicator {
+
+namespace {
+
+constexpr uint64_t kShmMagic = 0x5241465f53484d31;  // "RAF_SHM1"
+constexpr size_t kCacheLine = 64;
+constexpr size_t kDefaultSlotBytes = 1 << 20;
+constexpr int kOpenTimeoutSec = 120;
+
+/*! \brief The header at the beginning of a segment. Each field lives in its own cache line. */
+struct ShmHeader {
+  alignas(kCacheLine) std::atomic<uint64_t> magic;
+  alignas(kCacheLine) std::atomic<int64_t> creator_pid;
+  alignas(kCacheLine) std::atomic<int32_t> barrier_count;
+  alignas(kCacheLine) std::atomic<int32_t> barrier_generation;
+};
+
+constexpr size_t kHeaderBytes = (sizeof(ShmHeader) + kCacheLine - 1) / kCacheLine * kCacheLine;
+
+inline ShmHeader* GetHeader(void* segment) {
+  return reinterpret_cast<ShmHeader*>(segment);
+}
+
+inline uint8_t* GetSlot(void* segment, size_t slot_bytes, int index) {
+  return reinterpret_cast<uint8_t*>(segment) + kHeaderBytes + slot_bytes * index;
+}
+
+/*! \brief Spin for a while before yielding, as the peers are usually only slightly behind. */
+template <typename F>
+inline void SpinUntil(F cond) {
+  int spins = 0;
+  while (!cond()) {
+    if (++spins > 1024) {
+      std::this_thread::yield();
+    }
+  }
+}
+
+template <typename T>
+void ReduceInto(T* dst, const T* src, int64_t n, ShmReduceOp op) {
+  switch (op) {
+    case ShmReduceOp::kSum:
+    case ShmReduceOp::kAvg:
+      for (int64_t i = 0; i < n; ++i) dst[i] += src[i];
+      break;
+    case ShmReduceOp::kProd:
+      for (int64_t i = 0; i < n; ++i) dst[i] *= src[i];
+      break;
+    case ShmReduceOp::kMin:
+      for (int64_t i = 0; i < n; ++i) dst[i] = std::min(dst[i], src[i]);
+      break;
+    case ShmReduceOp::kMax:
+      for (int64_t i = 0; i < n; ++i) dst[i] = std::max(dst[i], src[i]);
+      break;
+  }
+}
+
+template <typename T>
+void DivideBy(T* dst, int64_t n, int size) {
+  for (int64_t i = 0; i < n; ++i) dst[i] /= static_cast<T>(size);
+}
+
+/*!
+ * \brief Reduce the n elements at the same offset of all slots into dst.
+ * \param slots The base addresses of the slots, already moved to the offset.
+ */
+template <typename T>
+void ReduceSlots(const std::vector<const uint8_t*>& slots, void* dst, int64_t n, ShmReduceOp op) {
+  T* out = reinterpret_cast<T*>(dst);
+  if (out != reinterpret_cast<const T*>(slots[0])) {
+    std::memcpy(out, slots[0], n * sizeof(T));
+  }
+  for (size_t i = 1; i < slots.size(); ++i) {
+    ReduceInto(out, reinterpret_cast<const T*>(slots[i]), n, op);
+  }
+  if (op == ShmReduceOp::kAvg) {
+    DivideBy(out, n, static_cast<int>(slots.size()));
+  }
+}
+
+void ReduceSlots(const std::vector<const uint8_t*>& slots, void* dst, int64_t n, DType dtype,
+                 ShmReduceOp op) {
+  DLDataType dt = dtype;
+  switch (dt.code) {
+    case kDLInt:
+      if (dt.bits == 8) return ReduceSlots<int8_t>(slots, dst, n, op);
+      if (dt.bits == 32) return ReduceSlots<int32_t>(slots, dst, n, op);
+      if (dt.bits == 64) return ReduceSlots<int64_t>(slots, dst, n, op);
+      break;
+    case kDLUInt:
+      if (dt.bits == 8) return ReduceSlots<uint8_t>(slots, dst, n, op);
+      break;
+    case kDLFloat:
+      if (dt.bits == 32) return ReduceSlots<float>(slots, dst, n, op);
+      if (dt.bits == 64) return ReduceSlots<double>(slots, dst, n, op);
+      break;
+  }
+  LOG(FATAL) << "NotImplementedError: shared-memory reduction of " << dtype.c_str();
+}
+
+std::string GetSessionName() {
+  const char* session = getenv("RAF_SHM_SESSION");
+  if (session != nullptr) {
+    return session;
+  }
+  // Ranks launched by the same launcher share the parent process.
+  return std::to_string(getppid());
+}
+
+size_t GetSlotBytes(int size) {
+  size_t slot_bytes = kDefaultSlotBytes;
+  const char* env = getenv("RAF_SHM_SLOT_BYTES");
+  if (env != nullptr) {
+    slot_bytes = std::stoull(env);
+  }
+  // Each rank takes at least one element of the widest type from every slot.
+  slot_bytes = std::max(slot_bytes, static_cast<size_t>(size) * sizeof(double));
+  return (slot_bytes + kCacheLine - 1) / kCacheLine * kCacheLine;
+}
+
+}  // namespace
+
+ShmReduceOp ShmReduceOpFromString(const std::string& computation) {
+  if (computation == "sum") {
+    return ShmReduceOp::kSum;
+  } else if (computation == "prod") {
+    return ShmReduceOp::kProd;
+  } else if (computation == "min") {
+    return ShmReduceOp::kMin;
+  } else if (computation == "max") {
+    return ShmReduceOp::kMax;
+  } else if (computation == "avg") {
+    return ShmReduceOp::kAvg;
+  }
+  LOG(FATAL) << "Invalid computation " << computation;
+  throw;
+}
+
+void ShmCommunicatorObj::Barrier() {
+  if (size == 1) {
+    return;
+  }
+  auto* header = GetHeader(segment);
+  int32_t generation = header->barrier_generation.load(std::memory_order_acquire);
+  if (header->barrier_count.fetch_add(1, std::memory_order_acq_rel) + 1 == size) {
+    header->barrier_count.store(0, std::memory_order_relaxed);
+    header->barrier_generation.fetch_add(1, std::memory_order_acq_rel);
+  } else {
+    SpinUntil([&]() {
+      return header->barrier_generation.load(std::memory_order_acquire) != generation;
+    });
+  }
+}
+
+void ShmCommunicatorObj::AllReduce(const void* send_buf, void* recv_buf, int64_t count,
+                                   DType dtype, ShmReduceOp op) {
+  int64_t elem_bytes = GetSizeInBytes(dtype);
+  if (size == 1) {
+    if (send_buf != recv_buf) {
+      std::memcpy(recv_buf, send_buf, count * elem_bytes);
+    }
+    return;
+  }
+  const uint8_t* src = reinterpret_cast<const uint8_t*>(send_buf);
+  uint8_t* dst = reinterpret_cast<uint8_t*>(recv_buf);
+  int64_t chunk = slot_bytes / elem_bytes;
+  std::vector<const uint8_t*> slots(size);
+  for (int64_t offset = 0; offset < count; offset += chunk) {
+    int64_t n = std::min(chunk, count - offset);
+    std::memcpy(GetSlot(segment, slot_bytes, rank), src + offset * elem_bytes, n * elem_bytes);
+    Barrier();
+    // Every rank reduces its own partition of the chunk in place into the first slot.
+    int64_t part = (n + size - 1) / size;
+    int64_t begin = std::min(n, part * rank);
+    int64_t end = std::min(n, begin + part);
+    if (begin < end) {
+      for (int i = 0; i < size; ++i) {
+        slots[i] = GetSlot(segment, slot_bytes, i) + begin * elem_bytes;
+      }
+      ReduceSlots(slots, const_cast<uint8_t*>(slots[0]), end - begin, dtype, op);
+    }
+    Barrier();
+    std::memcpy(dst + offset * elem_bytes, GetSlot(segment, slot_bytes, 0), n * elem_bytes);
+    // The slots are reused by the next chunk.
+    Barrier();
+  }
+}
+
+void ShmCommunicatorObj::AllGather(const void* send_buf, void* recv_buf, int64_t bytes) {
+  const uint8_t* src = reinterpret_cast<const uint8_t*>(send_buf);
+  uint8_t* dst = reinterpret_cast<uint8_t*>(recv_buf);
+  if (size == 1) {
+    if (src != dst) {
+      std::memcpy(dst, src, bytes);
+    }
+    return;
+  }
+  int64_t chunk = slot_bytes;
+  for (int64_t offset = 0; offset < bytes; offset += chunk) {
+    int64_t n = std::min(chunk, bytes - offset);
+    std::memcpy(GetSlot(segment, slot_bytes, rank), src + offset, n);
+    Barrier();
+    for (int i = 0; i < size; ++i) {
+      std::memcpy(dst + i * bytes + offset, GetSlot(segment, slot_bytes, i), n);
+    }
+    Barrier();
+  }
+}
+
+void ShmCommunicatorObj::ReduceScatter(const void* send_buf, void* recv_buf, int64_t count,
+                                       DType dtype, ShmReduceOp op) {
+  int64_t elem_bytes = GetSizeInBytes(dtype);
+  const uint8_t* src = reinterpret_cast<const uint8_t*>(send_buf);
+  uint8_t* dst = reinterpret_cast<uint8_t*>(recv_buf);
+  if (size == 1) {
+    if (src != dst) {
+      std::memcpy(dst, src, count * elem_bytes);
+    }
+    return;
+  }
+  // Each slot holds the same chunk of every partition, so that rank i only reads the i-th
+  // sub-slot of all slots.
+  int64_t chunk = slot_bytes / elem_bytes / size;
+  std::vector<const uint8_t*> slots(size);
+  for (int64_t offset = 0; offset < count; offset += chunk) {
+    int64_t n = std::min(chunk, count - offset);
+    uint8_t* slot = GetSlot(segment, slot_bytes, rank);
+    for (int i = 0; i < size; ++i) {
+      std::memcpy(slot + i * n * elem_bytes, src + (i * count + offset) * elem_bytes,
+                  n * elem_bytes);
+    }
+    Barrier();
+    for (int i = 0; i < size; ++i) {
+      slots[i] = GetSlot(segment, slot_bytes, i) + rank * n * elem_bytes;
+    }
+    ReduceSlots(slots, dst + offset * elem_bytes, n, dtype, op);
+    Barrier();
+  }
+}
+
+ShmCommunicatorObj::~ShmCommunicatorObj() {
+  if (segment != nullptr) {
+    munmap(segment, segment_bytes);
+  }
+  if (linked) {
+    shm_unlink(segment_name.c_str());
+  }
+}
+
+/*!
+ * \brief Create (on the group root) or attach (on the other ranks) the segment of a group.
+ */
+static void AttachSegment(ShmCommunicatorObj* obj) {
+  size_t bytes = kHeaderBytes + obj->slot_bytes * obj->size;
+  const char* name = obj->segment_name.c_str();
+  void* addr = MAP_FAILED;
+  if (obj->rank == 0) {
+    // Remove the leftover of a crashed run with the same name.
+    shm_unlink(name);
+    int fd = shm_open(name, O_CREAT | O_EXCL | O_RDWR, S_IRUSR | S_IWUSR);
+    CHECK_GE(fd, 0) << "Failed to create shared memory " << name << ": " << strerror(errno);
+    obj->linked = true;
+    CHECK_EQ(ftruncate(fd, bytes), 0)
+        << "Failed to resize shared memory " << name << ": " << strerror(errno);
+    addr = mmap(nullptr, bytes, PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+    close(fd);
+    CHECK(addr != MAP_FAILED) << "Failed to map shared memory " << name << ": " << strerror(errno);
+    auto* header = new (addr) ShmHeader();
+    header->creator_pid.store(getpid(), std::memory_order_relaxed);
+    header->barrier_count.store(0, std::memory_order_relaxed);
+    header->barrier_generation.store(0, std::memory_order_relaxed);
+    // Publish the header last; the peers wait for the magic number.
+    header->magic.store(kShmMagic, std::memory_order_release);
+  } else {
+    // The segment may not exist yet, or may be a leftover of a crashed run that the root has
+    // not removed yet, so retry until a segment published by a live root shows up.
+    auto deadline = std::chrono::steady_clock::now() + std::chrono::seconds(kOpenTimeoutSec);
+    while (true) {
+      int fd = shm_open(name, O_RDWR, S_IRUSR | S_IWUSR);
+      if (fd >= 0) {
+        struct stat st;
+        if (fstat(fd, &st) == 0 && static_cast<size_t>(st.st_size) == bytes) {
+          addr = mmap(nullptr, bytes, PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+        }
+        close(fd);
+      }
+      if (addr != MAP_FAILED) {
+        auto* header = GetHeader(addr);
+        if (header->magic.load(std::memory_order_acquire) == kShmMagic &&
+            kill(header->creator_pid.load(std::memory_order_relaxed), 0) == 0) {
+          break;
+        }
+        munmap(addr, bytes);
+        addr = MAP_FAILED;
+      }
+      CHECK(std::chrono::steady_clock::now() < deadline)
+          << "Timed out waiting for rank " << obj->group_ranks[0] << " to create shared memory "
+          << name;
+      std::this_thread::sleep_for(std::chrono::milliseconds(1));
+    }
+  }
+  obj->segment = addr;
+  obj->segment_bytes = bytes;
+  obj->Barrier();
+  if (obj->rank == 0) {
+    // Everyone has attached; drop the name so that nothing is left behind on a crash.
+    shm_unlink(name);
+    obj->linked = false;
+  }
+}
+
+ShmCommunicator ShmCommunicator::make(Value rank_list) {
+  auto global_comm = GetGlobalCommunicator();
+  auto obj = make_object<ShmCommunicatorObj>();
+
+  if (!rank_list.defined()) {
+    // Create Global Communicator
+    obj->local_size = global_comm->local_size;
+    obj->local_rank = global_comm->local_rank;
+    obj->size = global_comm->size;
+    obj->rank = global_comm->rank;
+    obj->world_size = global_comm->world_size;
+    obj->world_rank = global_comm->world_rank;
+    obj->root_rank = global_comm->root_rank;
+    obj->group_id = -1;
+    obj->group_size = 0;
+    obj->host_ids = global_comm->host_ids;
+    for (int i = 0; i < obj->size; ++i) {
+      obj->group_ranks.push_back(i);
+    }
+  } else {
+    // Create Sub-communicator
+    InitSubCommunicator(obj.get(), rank_list, global_comm);
+    if (obj->group_id == -1) {
+      obj->group_ranks.push_back(global_comm->rank);
+    } else {
+      auto group = Downcast<TupleValue>(Downcast<TupleValue>(rank_list)->fields[obj->group_id]);
+      for (auto rank : group->fields) {
+        obj->group_ranks.push_back(Downcast<IntValue>(rank)->value);
+      }
+    }
+  }
+  obj->parent_comm = global_comm;
+
+  for (auto host_id : obj->host_ids) {
+    CHECK_EQ(host_id, obj->host_ids[0])
+        << "The shared-memory communicator requires all the ranks to be on the same host";
+  }
+  if (obj->size == 1) {
+    return ShmCommunicator(obj);
+  }
+
+  std::string group_key;
+  for (auto rank : obj->group_ranks) {
+    group_key += std::to_string(rank) + ",";
+  }
+  obj->segment_name = "/raf_shm_" + GetSessionName() + "_" +
+                      std::to_string(std::hash<std::string>{}(group_key));
+  obj->slot_bytes = GetSlotBytes(obj->size);
+  AttachSegment(obj.get());
+  return ShmCommunicator(obj);
+}
+
+RAF_REGISTER_GLOBAL("raf.distributed.communicator._make.shm").set_body_typed(ShmCommunicator::make);
+
+RAF_REGISTER_OBJECT_REFLECT(ShmCommunicatorObj);
+
+}  // namespace communicator
+}  // namespace distributed
+}  // namespace raf
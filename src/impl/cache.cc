@@ -0,0 +1,682 @@
+/*
+ * Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ * SPDX-License-Identifier: Apache-2.0
+ */
+
+/*!
+ * \file src/impl/cache.cc
+ * \brief The persistent stores of RAF caches.
+ */
+#include <fcntl.h>
+#include <sys/file.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#include <algorithm>
+#include <cstdlib>
+#include <iterator>
+#include "raf/cache.h"
+#include "raf/file.h"
+
+namespace raf {
+namespace op {
+
+namespace {
+
+inline size_t GetEnvSize(const char* name) {
+  const char* val = getenv(name);
+  return (val == nullptr) ? 0 : std::strtoull(val, nullptr, 10);
+}
+
+inline bool GetEnvFlag(const char* name) {
+  const char* val = getenv(name);
+  return val != nullptr && strcmp(val, "1") == 0;
+}
+
+bool ReadBinaryFile(const std::string& path, std::string* data) {
+  std::ifstream ifs(path, std::ios::in | std::ios::binary);
+  if (!ifs.is_open()) {
+    return false;
+  }
+  data->assign(std::istreambuf_iterator<char>(ifs), std::istreambuf_iterator<char>());
+  return true;
+}
+
+void WriteFile(const std::string& path, const char* data, size_t nbytes) {
+  std::ofstream ofs(path, std::ios::out | std::ios::binary);
+  CHECK(ofs.is_open()) << "Failed to open " << path << ": " << strerror(errno);
+  ofs.write(data, nbytes);
+}
+
+/*! \brief The total size of the regular files in a directory. */
+size_t DirSize(const std::string& path) {
+  size_t ret = 0;
+  for (const auto& name : ListDir(path)) {
+    std::string sub_path = path + "/" + name;
+    struct stat st;
+    if (lstat(sub_path.c_str(), &st) != 0) {
+      continue;
+    }
+    ret += S_ISDIR(st.st_mode) ? DirSize(sub_path) : st.st_size;
+  }
+  return ret;
+}
+
+/*! \brief Create a temporary directory for unpacking or packing an entry. */
+std::string MakeScratchDir() {
+  const char* tmp = getenv("TMPDIR");
+  std::string path = std::string(tmp == nullptr ? "/tmp" : tmp) + "/raf_cache.XXXXXX";
+  CHECK(mkdtemp(&path[0]) != nullptr) << "Failed to create a temporary directory " << path << ": "
+                                      << strerror(errno);
+  return path;
+}
+
+/*! \brief Hold an exclusive advisory lock of a file in the scope. */
+class FileLock {
+ public:
+  explicit FileLock(int fd) : fd_(fd) {
+    CHECK_EQ(flock(fd_, LOCK_EX), 0) << "Failed to lock the cache file: " << strerror(errno);
+  }
+
+  ~FileLock() {
+    flock(fd_, LOCK_UN);
+  }
+
+ private:
+  int fd_;
+};
+
+/*! \brief The entry stored in its own directory. */
+class DirPersistEntry : public PersistEntry {
+ public:
+  explicit DirPersistEntry(const std::string& path) : path_(path) {
+  }
+
+  bool ReadFile(const std::string& name, std::string* data) override {
+    return ReadBinaryFile(path_ + "/" + name, data);
+  }
+
+  std::string FilePath(const std::string& name) override {
+    return path_ + "/" + name;
+  }
+
+ private:
+  std::string path_;
+};
+
+/*!
+ * \brief The entry packed in a payload of (num files, (name, content)...), which points into the
+ * memory map of the packed file. Files are read from the map on demand, and only the files asked
+ * by FilePath are written to a scratch directory, which is removed with the entry.
+ */
+class PackedPersistEntry : public PersistEntry {
+ public:
+  PackedPersistEntry(const char* payload, uint64_t nbytes) {
+    uint64_t offset = 0;
+    auto read_str = [&](const char** str) -> uint64_t {
+      uint64_t len;
+      CHECK_LE(offset + sizeof(len), nbytes) << "Corrupted cache entry";
+      memcpy(&len, payload + offset, sizeof(len));
+      offset += sizeof(len);
+      CHECK_LE(offset + len, nbytes) << "Corrupted cache entry";
+      *str = payload + offset;
+      offset += len;
+      return len;
+    };
+    uint64_t num_files;
+    CHECK_LE(sizeof(num_files), nbytes) << "Corrupted cache entry";
+    memcpy(&num_files, payload, sizeof(num_files));
+    offset += sizeof(num_files);
+    for (uint64_t i = 0; i < num_files; ++i) {
+      const char* name;
+      const char* content;
+      uint64_t name_len = read_str(&name);
+      uint64_t content_len = read_str(&content);
+      std::string file_name(name, name_len);
+      CHECK(file_name.find('/') == std::string::npos) << "Corrupted cache entry";
+      files_[file_name] = std::make_pair(content, content_len);
+    }
+  }
+
+  ~PackedPersistEntry() {
+    if (!scratch_dir_.empty()) {
+      RemoveDir(scratch_dir_);
+    }
+  }
+
+  bool ReadFile(const std::string& name, std::string* data) override {
+    auto it = files_.find(name);
+    if (it == files_.end()) {
+      return false;
+    }
+    data->assign(it->second.first, it->second.second);
+    return true;
+  }
+
+  std::string FilePath(const std::string& name) override {
+    auto it = files_.find(name);
+    CHECK(it != files_.end()) << "File " << name << " does not exist in the cache entry";
+    if (scratch_dir_.empty()) {
+      scratch_dir_ = MakeScratchDir();
+    }
+    std::string path = scratch_dir_ + "/" + name;
+    if (access(path.c_str(), F_OK) != 0) {
+      WriteFile(path, it->second.first, it->second.second);
+    }
+    return path;
+  }
+
+ private:
+  /*! \brief Map from the file name to its content in the memory map. */
+  std::unordered_map<std::string, std::pair<const char*, uint64_t>> files_;
+  /*! \brief The directory of the files written by FilePath. */
+  std::string scratch_dir_;
+};
+
+}  // namespace
+
+PersistCacheConfig PersistCacheConfig::FromEnv() {
+  PersistCacheConfig config;
+  config.max_entries = GetEnvSize("RAF_CACHE_MAX_ENTRIES");
+  config.persist = GetEnvFlag("RAF_PERSIST_CACHE");
+  if (!config.persist) {
+    return config;
+  }
+
+  // Determine the directory for the cache root.
+  const char* temp = getenv("RAF_PERSIST_CACHE_PATH");
+  if (temp == nullptr) {
+    const char* home = getenv("HOME");
+    CHECK(home != nullptr) << "HOME environment variable is not set";
+    config.root_path = std::string(home) + "/.raf_cache";
+  } else {
+    config.root_path = std::string(temp);
+  }
+  config.max_persist_entries = GetEnvSize("RAF_PERSIST_CACHE_MAX_ENTRIES");
+  config.max_persist_bytes = GetEnvSize("RAF_PERSIST_CACHE_MAX_BYTES");
+  config.packed = GetEnvFlag("RAF_PERSIST_CACHE_PACKED");
+  return config;
+}
+
+std::unordered_map<std::string, size_t> PersistStore::GetMetric() {
+  auto ret = metrics_;
+  if (indexed_) {
+    ret["PersistCacheEntries"] = index_.size();
+    ret["PersistCacheBytes"] = total_bytes_;
+  }
+  return ret;
+}
+
+void PersistStore::Touch(const std::string& id) {
+  auto it = index_.find(id);
+  if (it != index_.end()) {
+    lru_.splice(lru_.begin(), lru_, it->second.second);
+  }
+}
+
+void PersistStore::Insert(const std::string& id, size_t nbytes) {
+  Erase(id);
+  lru_.push_front(id);
+  index_[id] = std::make_pair(nbytes, lru_.begin());
+  total_bytes_ += nbytes;
+}
+
+void PersistStore::Erase(const std::string& id) {
+  auto it = index_.find(id);
+  if (it == index_.end()) {
+    return;
+  }
+  total_bytes_ -= it->second.first;
+  lru_.erase(it->second.second);
+  index_.erase(it);
+}
+
+void PersistStore::Evict() {
+  while (lru_.size() > 1 && ((max_entries_ > 0 && index_.size() > max_entries_) ||
+                             (max_bytes_ > 0 && total_bytes_ > max_bytes_))) {
+    std::string id = lru_.back();
+    Remove(id);
+    Erase(id);
+    metrics_["PersistCacheEvict"] += 1;
+  }
+}
+
+/*!
+ * \brief The store that saves each entry in its own directory, named by the hash of the key.
+ * The full key and the last access time are stored next to the entry files.
+ */
+class DirPersistStore : public PersistStore {
+ public:
+  DirPersistStore(const std::string& path, size_t max_entries, size_t max_bytes)
+      : PersistStore(path, max_entries, max_bytes) {
+    // Scanning all entry directories is slow for a large cache, so only build the index when
+    // there is a budget to enforce.
+    indexed_ = max_entries > 0 || max_bytes > 0;
+    if (!indexed_) {
+      return;
+    }
+    std::vector<std::pair<time_t, std::string>> entries;
+    for (const auto& name : ListDir(path_)) {
+      std::string entry_path = path_ + "/" + name;
+      struct stat st;
+      if (stat(entry_path.c_str(), &st) != 0 || !S_ISDIR(st.st_mode)) {
+        continue;
+      }
+      struct stat ts;
+      time_t access_time = st.st_mtime;
+      if (stat((entry_path + "/" + kTimestampFile).c_str(), &ts) == 0) {
+        access_time = ts.st_mtime;
+      }
+      entries.emplace_back(access_time, name);
+    }
+    std::sort(entries.begin(), entries.end());
+    for (const auto& it : entries) {
+      Insert(it.second, DirSize(path_ + "/" + it.second));
+    }
+    Evict();
+  }
+
+  bool Load(const std::string& key, const FLoad& f_load) override {
+    std::string id = GetId(key);
+    std::string entry_path = path_ + "/" + id;
+    if (!DirExists(entry_path)) {
+      return false;
+    }
+
+    // Different keys may have the same hash, so check the full key stored with the entry.
+    // Entries persisted without the key are not trusted either.
+    std::string stored_key;
+    if (!ReadBinaryFile(entry_path + "/" + kKeyFile, &stored_key) || stored_key != key) {
+      metrics_["PersistCacheKeyMismatch"] += 1;
+      return false;
+    }
+    DirPersistEntry entry(entry_path);
+    f_load(&entry);
+    Touch(id);
+    WriteTimestamp(entry_path);
+    return true;
+  }
+
+  bool Save(const std::string& key, const FSave& f_save) override {
+    std::string id = GetId(key);
+    std::string entry_path = path_ + "/" + id;
+
+    // Overwrite the stale entry, or the entry of another key with the same hash.
+    RemoveDir(entry_path);
+    Erase(id);
+    CreateDir(entry_path);
+    try {
+      if (!f_save(entry_path)) {
+        RemoveDir(entry_path);
+        return false;
+      }
+    } catch (...) {
+      RemoveDir(entry_path);
+      throw;
+    }
+    WriteFile(entry_path + "/" + kKeyFile, key.data(), key.size());
+    WriteTimestamp(entry_path);
+    if (indexed_) {
+      Insert(id, DirSize(entry_path));
+      Evict();
+    }
+    return true;
+  }
+
+ protected:
+  void Remove(const std::string& id) override {
+    RemoveDir(path_ + "/" + id);
+  }
+
+ private:
+  inline std::string GetId(const std::string& key) {
+    return std::to_string(std::hash<std::string>{}(key));
+  }
+
+  inline void WriteTimestamp(const std::string& entry_path) {
+    std::ofstream metadata_file(entry_path + "/" + kTimestampFile);
+    metadata_file << std::chrono::system_clock::to_time_t(std::chrono::system_clock::now())
+                  << std::endl;
+  }
+
+  /*! \brief The file of the full key. */
+  static constexpr const char* kKeyFile = "key.bin";
+  /*! \brief The file of the last access time. */
+  static constexpr const char* kTimestampFile = "timestamp";
+};
+
+/*!
+ * \brief The store that appends all entries of a cache to a single file. The file starts with
+ * a magic string, followed by records of (key length, payload length, kind, key, payload). The
+ * payload is the packed files of an entry directory, and an evicted entry is marked by a
+ * tombstone record. The key index is built by scanning the record headers when the store is
+ * created, and the payloads are read lazily from a memory map of the file. The file is compacted
+ * when more than half of it is dead.
+ *
+ * The file may be shared by processes. Every update holds the advisory lock of a separate lock
+ * file, which is never replaced, and first catches up with the records appended by others. A
+ * compaction writes a new file and renames it over the old one, so the other processes detect
+ * the replaced inode on their next update or miss, and reopen the file and rebuild the index.
+ */
+class PackedPersistStore : public PersistStore {
+ public:
+  PackedPersistStore(const std::string& path, size_t max_entries, size_t max_bytes)
+      : PersistStore(path, max_entries, max_bytes) {
+    file_path_ = path_ + "/" + kPackFile;
+    std::string lock_path = file_path_ + ".lock";
+    lock_fd_ = open(lock_path.c_str(), O_RDWR | O_CREAT, 0644);
+    CHECK_GE(lock_fd_, 0) << "Failed to open " << lock_path << ": " << strerror(errno);
+    FileLock lock(lock_fd_);
+    Sync();
+    Evict();
+    MaybeCompact();
+  }
+
+  ~PackedPersistStore() {
+    Unmap();
+    if (fd_ >= 0) {
+      close(fd_);
+    }
+    if (lock_fd_ >= 0) {
+      close(lock_fd_);
+    }
+  }
+
+  bool Load(const std::string& key, const FLoad& f_load) override {
+    auto it = locations_.find(key);
+    if (it == locations_.end()) {
+      // The entry may have been saved by another process.
+      FileLock lock(lock_fd_);
+      Sync();
+      it = locations_.find(key);
+      if (it == locations_.end()) {
+        return false;
+      }
+    }
+    PackedPersistEntry entry(Map() + it->second.first, it->second.second);
+    f_load(&entry);
+    Touch(key);
+    return true;
+  }
+
+  bool Save(const std::string& key, const FSave& f_save) override {
+    std::string entry_path = MakeScratchDir();
+    std::string payload;
+    try {
+      if (!f_save(entry_path)) {
+        RemoveDir(entry_path);
+        return false;
+      }
+      payload = Pack(entry_path);
+    } catch (...) {
+      RemoveDir(entry_path);
+      throw;
+    }
+    RemoveDir(entry_path);
+
+    FileLock lock(lock_fd_);
+    Sync();
+    uint64_t offset = Append(key, kEntry, payload);
+    uint64_t record_size = kHeaderSize + key.size() + payload.size();
+    Insert(key, record_size);
+    locations_[key] = std::make_pair(offset + kHeaderSize + key.size(), payload.size());
+    Evict();
+    MaybeCompact();
+    return true;
+  }
+
+ protected:
+  /*! \brief Append a tombstone of an entry. Must be called with the lock held. */
+  void Remove(const std::string& id) override {
+    Append(id, kTombstone, "");
+    locations_.erase(id);
+  }
+
+ private:
+  /*!
+   * \brief Catch up with the file. If the file has been replaced by a compaction of another
+   * process, reopen it and rebuild the index. Otherwise, scan the records appended since the last
+   * scan. Must be called with the lock held.
+   */
+  void Sync() {
+    struct stat st;
+    if (fd_ < 0 || stat(file_path_.c_str(), &st) != 0 || st.st_ino != file_ino_ ||
+        st.st_dev != file_dev_ || static_cast<uint64_t>(st.st_size) < file_size_) {
+      Unmap();
+      if (fd_ >= 0) {
+        close(fd_);
+      }
+      fd_ = open(file_path_.c_str(), O_RDWR | O_CREAT, 0644);
+      CHECK_GE(fd_, 0) << "Failed to open " << file_path_ << ": " << strerror(errno);
+      UpdateFileId();
+      lru_.clear();
+      index_.clear();
+      total_bytes_ = 0;
+      locations_.clear();
+      file_size_ = 0;
+    }
+    Scan();
+  }
+
+  /*! \brief Record the inode of the opened file, which identifies a replaced file. */
+  void UpdateFileId() {
+    struct stat st;
+    CHECK_EQ(fstat(fd_, &st), 0) << "Failed to stat " << file_path_ << ": " << strerror(errno);
+    file_ino_ = st.st_ino;
+    file_dev_ = st.st_dev;
+  }
+
+  /*!
+   * \brief Update the index with the record headers after file_size_, and drop the truncated tail
+   * if any. Must be called with the lock held.
+   */
+  void Scan() {
+    struct stat st;
+    CHECK_EQ(fstat(fd_, &st), 0) << "Failed to stat " << file_path_ << ": " << strerror(errno);
+    uint64_t size = st.st_size;
+    if (file_size_ == 0) {
+      std::string magic(kMagicSize, '\0');
+      if (size < kMagicSize ||
+          pread(fd_, &magic[0], kMagicSize, 0) != static_cast<ssize_t>(kMagicSize) ||
+          magic != std::string(kMagic, kMagicSize)) {
+        if (size > 0) {
+          LOG(WARNING) << "Invalid cache file " << file_path_ << ", recreating it";
+        }
+        CHECK_EQ(ftruncate(fd_, 0), 0);
+        WriteAt(fd_, kMagic, kMagicSize, 0);
+        file_size_ = kMagicSize;
+        return;
+      }
+      file_size_ = kMagicSize;
+    }
+
+    uint64_t offset = file_size_;
+    while (offset + kHeaderSize <= size) {
+      uint64_t header[3];
+      if (pread(fd_, header, kHeaderSize, offset) != static_cast<ssize_t>(kHeaderSize)) {
+        break;
+      }
+      uint64_t key_len = header[0], payload_len = header[1], kind = header[2];
+      uint64_t end = offset + kHeaderSize + key_len + payload_len;
+      if (end > size || (kind != kEntry && kind != kTombstone)) {
+        break;
+      }
+      std::string key(key_len, '\0');
+      if (pread(fd_, &key[0], key_len, offset + kHeaderSize) != static_cast<ssize_t>(key_len)) {
+        break;
+      }
+      if (kind == kEntry) {
+        Insert(key, end - offset);
+        locations_[key] = std::make_pair(offset + kHeaderSize + key_len, payload_len);
+      } else {
+        Erase(key);
+        locations_.erase(key);
+      }
+      offset = end;
+    }
+    if (offset != size) {
+      // The tail was left by an interrupted write, since writers hold the lock.
+      LOG(WARNING) << "Dropped " << size - offset << " bytes of truncated records in "
+                   << file_path_;
+      CHECK_EQ(ftruncate(fd_, offset), 0);
+    }
+    file_size_ = offset;
+  }
+
+  /*!
+   * \brief Append a record to the end of the file and return its offset. Must be called with the
+   * lock held after Sync, so file_size_ is the end of the file.
+   */
+  uint64_t Append(const std::string& key, uint64_t kind, const std::string& payload) {
+    uint64_t header[3] = {key.size(), payload.size(), kind};
+    std::string record(reinterpret_cast<const char*>(header), kHeaderSize);
+    record += key;
+    record += payload;
+
+    uint64_t offset = file_size_;
+    WriteAt(fd_, record.data(), record.size(), offset);
+    file_size_ = offset + record.size();
+    return offset;
+  }
+
+  /*!
+   * \brief Rewrite the file with the live entries if more than half of it is dead. Must be called
+   * with the lock held after Sync, so the index covers the entries of all processes.
+   */
+  void MaybeCompact() {
+    uint64_t dead_bytes = file_size_ - kMagicSize - total_bytes_;
+    if (dead_bytes < kMinCompactBytes || dead_bytes < total_bytes_) {
+      return;
+    }
+    std::string tmp_path = file_path_ + ".tmp.XXXXXX";
+    int fd = mkstemp(&tmp_path[0]);
+    CHECK_GE(fd, 0) << "Failed to create " << tmp_path << ": " << strerror(errno);
+    fchmod(fd, 0644);
+
+    const char* data = Map();
+    WriteAt(fd, kMagic, kMagicSize, 0);
+    uint64_t offset = kMagicSize;
+    std::unordered_map<std::string, std::pair<uint64_t, uint64_t>> locations;
+    // Write the least recently used entries first, so the LRU order is restored on loading.
+    for (auto it = lru_.rbegin(); it != lru_.rend(); ++it) {
+      const auto& loc = locations_.at(*it);
+      uint64_t header[3] = {it->size(), loc.second, kEntry};
+      std::string record(reinterpret_cast<const char*>(header), kHeaderSize);
+      record += *it;
+      record.append(data + loc.first, loc.second);
+      WriteAt(fd, record.data(), record.size(), offset);
+      locations[*it] = std::make_pair(offset + kHeaderSize + it->size(), loc.second);
+      offset += record.size();
+    }
+    if (rename(tmp_path.c_str(), file_path_.c_str()) != 0) {
+      LOG(WARNING) << "Failed to replace " << file_path_ << ": " << strerror(errno);
+      close(fd);
+      unlink(tmp_path.c_str());
+      return;
+    }
+
+    // Keep using the new file, whose inode is now the one at file_path_.
+    Unmap();
+    close(fd_);
+    fd_ = fd;
+    UpdateFileId();
+    file_size_ = offset;
+    locations_.swap(locations);
+    metrics_["PersistCacheCompact"] += 1;
+  }
+
+  /*! \brief Map the whole file to memory, and remap it if the file has grown. */
+  const char* Map() {
+    if (mapped_ == nullptr || mapped_size_ < file_size_) {
+      Unmap();
+      void* ptr = mmap(nullptr, file_size_, PROT_READ, MAP_SHARED, fd_, 0);
+      CHECK(ptr != MAP_FAILED) << "Failed to map " << file_path_ << ": " << strerror(errno);
+      mapped_ = static_cast<const char*>(ptr);
+      mapped_size_ = file_size_;
+    }
+    return mapped_;
+  }
+
+  void Unmap() {
+    if (mapped_ != nullptr) {
+      munmap(const_cast<char*>(mapped_), mapped_size_);
+      mapped_ = nullptr;
+      mapped_size_ = 0;
+    }
+  }
+
+  static void WriteAt(int fd, const char* data, size_t nbytes, uint64_t offset) {
+    while (nbytes > 0) {
+      ssize_t written = pwrite(fd, data, nbytes, offset);
+      CHECK_GT(written, 0) << "Failed to write the cache file: " << strerror(errno);
+      data += written;
+      nbytes -= written;
+      offset += written;
+    }
+  }
+
+  /*! \brief Pack the files in an entry directory to (num files, (name, content)...). */
+  static std::string Pack(const std::string& entry_path) {
+    std::string ret;
+    auto append_str = [&ret](const std::string& str) {
+      uint64_t len = str.size();
+      ret.append(reinterpret_cast<const char*>(&len), sizeof(len));
+      ret += str;
+    };
+    std::vector<std::string> names = ListDir(entry_path);
+    uint64_t num_files = names.size();
+    ret.append(reinterpret_cast<const char*>(&num_files), sizeof(num_files));
+    for (const auto& name : names) {
+      std::string content;
+      CHECK(ReadBinaryFile(entry_path + "/" + name, &content))
+          << "Failed to read " << entry_path << "/" << name;
+      append_str(name);
+      append_str(content);
+    }
+    return ret;
+  }
+
+  /*! \brief The packed file name. */
+  static constexpr const char* kPackFile = "entries.pack";
+  /*! \brief The magic string at the beginning of the file. */
+  static constexpr const char* kMagic = "RAFPACK1";
+  static constexpr uint64_t kMagicSize = 8;
+  /*! \brief The record header size, which has the key length, payload length and kind. */
+  static constexpr uint64_t kHeaderSize = 3 * sizeof(uint64_t);
+  /*! \brief The record kinds. */
+  static constexpr uint64_t kEntry = 0;
+  static constexpr uint64_t kTombstone = 1;
+  /*! \brief The minimum dead bytes to trigger a compaction. */
+  static constexpr uint64_t kMinCompactBytes = 1 << 20;
+
+  /*! \brief The path of the packed file. */
+  std::string file_path_;
+  /*! \brief The file descriptor of the lock file. */
+  int lock_fd_ = -1;
+  /*! \brief The file descriptor of the packed file. */
+  int fd_ = -1;
+  /*! \brief The device and inode of the opened packed file. */
+  dev_t file_dev_ = 0;
+  ino_t file_ino_ = 0;
+  /*! \brief The size of the packed file that has been scanned. */
+  uint64_t file_size_ = 0;
+  /*! \brief The memory map of the packed file. */
+  const char* mapped_ = nullptr;
+  /*! \brief The size of the memory map. */
+  uint64_t mapped_size_ = 0;
+  /*! \brief Map from the key to the (offset, length) of its payload. */
+  std::unordered_map<std::string, std::pair<uint64_t, uint64_t>> locations_;
+};
+
+std::unique_ptr<PersistStore> PersistStore::Create(const std::string& path,
+                                                   const PersistCacheConfig& config) {
+  if (config.packed) {
+    return std::unique_ptr<PersistStore>(new PackedPersistStore(
+        path, config.max_persist_entries, config.max_persist_bytes));
+  }
+  return std::unique_ptr<PersistStore>(
+      new DirPersistStore(path, config.max_persist_entries, config.max_persist_bytes));
+}
+
+}  // namespace op
+}  // namespace raf
@@ -16,6 +16,7 @@
 #include "raf/tensor.h"
 #include "raf/value.h"
 #include "raf/binding.h"
+#include "raf/cache.h"
 #include "raf/profiler.h"
 #include "raf/communicator.h"
 #include "dmlc/thread_local.h"
@@ -24,6 +25,7 @@
 #include "../op/schema/reduce.h"
 
 #include <list>
+#include <mutex>
 
 namespace raf {
 namespace executor {
@@ -41,10 +43,149 @@ using binding::NDArrayBinding;
 using binding::SymbolBindingObj;
 using common::shape_utils::BytesCompactTensor;
 using memory_pool::Memory;
+using op::HashKey;
 using requests::Requests;
 using stream_pool::Stream;
 using tensor::Tensor;
 
+/*!
+ * \brief A process-wide cache of the OpEnvs dispatched by the interpreter, so that the eager calls
+ * of the same op with the same argument shapes skip the dispatching. An OpEnv is checked out of
+ * the cache while it is being executed, so it is never executed by two threads at the same time.
+ */
+class OpEnvCache {
+ public:
+  static OpEnvCache* Get() {
+    static OpEnvCache* instance = new OpEnvCache();
+    return instance;
+  }
+
+  /*!
+   * \brief Take the OpEnv of a key out of the cache.
+   * \param key The key.
+   * \return The OpEnv, or nullptr if the key is not cached.
+   */
+  std::shared_ptr<OpEnv> Acquire(const std::string& key) {
+    std::lock_guard<std::mutex> lock(mu_);
+    auto it = cached_.find(key);
+    if (it == cached_.end()) {
+      misses_++;
+      return nullptr;
+    }
+    hits_++;
+    std::shared_ptr<OpEnv> op_env = std::move(it->second->second);
+    lru_.erase(it->second);
+    cached_.erase(it);
+    return op_env;
+  }
+
+  /*!
+   * \brief Put an OpEnv to the cache as the most recently used one, and evict the least recently
+   * used ones if the cache is full.
+   * \param key The key.
+   * \param op_env The OpEnv.
+   */
+  void Release(const std::string& key, std::shared_ptr<OpEnv> op_env) {
+    std::lock_guard<std::mutex> lock(mu_);
+    if (cached_.count(key)) {
+      return;
+    }
+    lru_.emplace_front(key, std::move(op_env));
+    cached_[key] = lru_.begin();
+    EvictIfFull();
+  }
+
+  void Clear() {
+    std::lock_guard<std::mutex> lock(mu_);
+    cached_.clear();
+    lru_.clear();
+    hits_ = misses_ = evictions_ = 0;
+  }
+
+  size_t GetCapacity() {
+    std::lock_guard<std::mutex> lock(mu_);
+    return capacity_;
+  }
+
+  void SetCapacity(size_t capacity) {
+    std::lock_guard<std::mutex> lock(mu_);
+    capacity_ = capacity;
+    EvictIfFull();
+  }
+
+  Map<String, Integer> GetStats() {
+    std::lock_guard<std::mutex> lock(mu_);
+    auto make_int = [](int64_t v) { return Integer(IntImm(DataType::Int(64), v)); };
+    Map<String, Integer> stats;
+    stats.Set("Size", make_int(cached_.size()));
+    stats.Set("Capacity", make_int(capacity_));
+    stats.Set("Hit", make_int(hits_));
+    stats.Set("Miss", make_int(misses_));
+    stats.Set("Evict", make_int(evictions_));
+    return stats;
+  }
+
+ private:
+  OpEnvCache() {
+    if (const char* val = getenv("RAF_OP_ENV_CACHE_SIZE")) {
+      capacity_ = atol(val);
+    }
+  }
+
+  void EvictIfFull() {
+    while (cached_.size() > capacity_) {
+      cached_.erase(lru_.back().first);
+      lru_.pop_back();
+      evictions_++;
+    }
+  }
+
+  /*! \brief The maximum number of cached OpEnvs. 0 disables the cache. */
+  size_t capacity_ = 1024;
+  /*! \brief The keys and OpEnvs from the most to the least recently used. */
+  std::list<std::pair<std::string, std::shared_ptr<OpEnv>>> lru_;
+  /*! \brief Map from the key to its position in lru_. */
+  std::unordered_map<std::string, decltype(lru_)::iterator> cached_;
+  int64_t hits_ = 0;
+  int64_t misses_ = 0;
+  int64_t evictions_ = 0;
+  std::mutex mu_;
+};
+
+/*!
+ * \brief Append the signature of a value to the OpEnv cache key, i.e., the dtype, shape and device
+ * of a tensor, or the value of a scalar.
+ * \return False if the value cannot be part of the key (e.g., a closure).
+ */
+bool AppendOpEnvKey(const Value& value, HashKey* key) {
+  if (!value.defined()) {
+    *key << static_cast<int8_t>(0);
+  } else if (value->IsInstance<TensorValueObj>()) {
+    DLTensor* t = value;
+    *key << static_cast<int8_t>(1) << *t << t->device;
+  } else if (const auto* tv = value.as<TupleValueObj>()) {
+    *key << static_cast<int8_t>(2) << static_cast<int64_t>(tv->fields.size());
+    for (const auto& field : tv->fields) {
+      if (!AppendOpEnvKey(field, key)) {
+        return false;
+      }
+    }
+  } else if (const auto* iv = value.as<IntValueObj>()) {
+    *key << static_cast<int8_t>(3) << DLDataType(iv->dtype) << iv->value;
+  } else if (const auto* fv = value.as<FloatValueObj>()) {
+    *key << static_cast<int8_t>(4) << DLDataType(fv->dtype) << fv->value;
+  } else if (const auto* bv = value.as<BoolValueObj>()) {
+    *key << static_cast<int8_t>(5) << bv->value;
+  } else if (const auto* sv = value.as<StringValueObj>()) {
+    *key << static_cast<int8_t>(6) << sv->value;
+  } else if (value->IsInstance<VoidValueObj>()) {
+    *key << static_cast<int8_t>(7);
+  } else {
+    return false;
+  }
+  return true;
+}
+
 class SymbolTable {
  public:
   std::unordered_map<const VarNode*, std::vector<Value>> tab;
@@ -176,7 +317,7 @@ class Interpreter final : public ExprFunctor<Value(const Expr& n)>, public Execu
       call_values->args = fschema[opv->op](args);
       Value output_value;
       WITH_BASE_PROFILER(call_values->device, opv->op->name, "SchedulingCommunication", {},
-                         { output_value = InvokePrimitive(call_values); });
+                         { output_value = InvokePrimitive(call_values, &args); });
       return output_value;
     }
     LOG(FATAL) << "ValueError: type " << call_values->callee->GetTypeKey() << " is not callable";
@@ -244,7 +385,14 @@ class Interpreter final : public ExprFunctor<Value(const Expr& n)>, public Execu
   }
 
  public:
-  Value InvokePrimitive(const CallValues& call) {
+  /*!
+   * \brief Invoke a primitive op.
+   * \param call The call values.
+   * \param args The arguments in the order of the op schema, or nullptr if unknown. When the
+   * arguments are given, the OpEnv is executed with them and cached for the next calls.
+   * \return The output value.
+   */
+  Value InvokePrimitive(const CallValues& call, const Array<Value>* args = nullptr) {
     const Op& op = Downcast<OpValue>(call->callee)->op;
     bool use_upper_bound = false;
     static auto upper_bound_map = Op::GetAttrMap<Op>("TRAFUpperBoundOp");
@@ -259,16 +407,53 @@ class Interpreter final : public ExprFunctor<Value(const Expr& n)>, public Execu
     ICHECK(call->out.defined()) << "ValueError: Tensor compute of " << op->name
                                 << " is not implemented.";
     AllocOutputBuffer(call->out);
-    std::shared_ptr<OpEnv> op_env = Dispatch(call);
-    if (op_env != nullptr) {
-      InvokePrimitiveOpEnv(std::move(op_env), call, use_upper_bound);
-    } else {
+
+    // The output shape of an upper bound op depends on the data, so it is not cached.
+    OpEnvCache* op_env_cache = OpEnvCache::Get();
+    std::string key;
+    bool cacheable = args != nullptr && !use_upper_bound && op_env_cache->GetCapacity() > 0 &&
+                     MakeOpEnvKey(call, *args, &key);
+    std::shared_ptr<OpEnv> op_env = cacheable ? op_env_cache->Acquire(key) : nullptr;
+    if (op_env == nullptr) {
+      op_env = Dispatch(call);
+    }
+    if (op_env == nullptr) {
       LOG(FATAL) << "ValueError: Cannot dispatch " << op->name << "@" << call->device.c_str();
       throw;
     }
+    // The arguments of a Relay call may omit the trailing fields with default values.
+    if (args != nullptr) {
+      for (int i : op_env->arg_indices) {
+        if (i >= static_cast<int>(args->size())) {
+          args = nullptr;
+          cacheable = false;
+          break;
+        }
+      }
+    }
+    InvokePrimitiveOpEnv(op_env, call, args, use_upper_bound);
+    // Communicators may change between calls, so do not cache the ops that request them.
+    if (cacheable && op_env->GetRequests()->distributed.empty()) {
+      op_env_cache->Release(key, std::move(op_env));
+    }
     return call->out;
   }
 
+  bool MakeOpEnvKey(const CallValues& call, const Array<Value>& args, std::string* key) {
+    HashKey hash_key;
+    hash_key << Downcast<OpValue>(call->callee)->op->name << static_cast<DLDevice>(call->device);
+    for (const auto& arg : args) {
+      if (!AppendOpEnvKey(arg, &hash_key)) {
+        return false;
+      }
+    }
+    if (!AppendOpEnvKey(call->out, &hash_key)) {
+      return false;
+    }
+    key->assign(hash_key.byte_vector.begin(), hash_key.byte_vector.end());
+    return true;
+  }
+
   void RunDeclare(const CallValues& call) {
     static const auto f_op_make_output = Op::GetAttrMap<FRAFDeclare>("FRAFDeclare");
     const Op& op = Downcast<OpValue>(call->callee)->op;
@@ -277,7 +462,7 @@ class Interpreter final : public ExprFunctor<Value(const Expr& n)>, public Execu
   }
 
   void InvokePrimitiveOpEnv(std::shared_ptr<OpEnv> op_env, const CallValues& call,
-                            bool use_upper_bound) {
+                            const Array<Value>* args, bool use_upper_bound) {
     const Op& op = Downcast<OpValue>(call->callee)->op;
     std::shared_ptr<Requests> req = op_env->GetRequests();
     {
@@ -310,27 +495,44 @@ class Interpreter final : public ExprFunctor<Value(const Expr& n)>, public Execu
                          });
     }
 
-    // note: Execute the Operator.
-    WITH_BASE_PROFILER(call->device, op->name, "CUDA_CALL", {}, { op_env->Execute(call); });
+    // note: Execute the Operator. A cached OpEnv may be created with other inputs, so execute it
+    // with the inputs of this call when they are given.
+    if (args != nullptr) {
+      std::vector<Value> inputs;
+      for (int i : op_env->arg_indices) {
+        inputs.push_back((*args)[i]);
+      }
+      WITH_LIGHT_PROFILER(call->device, op->name, "Operator", {
+        WITH_BASE_PROFILER(call->device, op->name, "CUDA_CALL", {},
+                           { op_env->Execute(inputs, call->out); });
+      });
+    } else {
+      WITH_LIGHT_PROFILER(call->device, op->name, "Operator", {
+        WITH_BASE_PROFILER(call->device, op->name, "CUDA_CALL", {}, { op_env->Execute(call); });
+      });
+    }
 
     {
       // note: Force op to run synchronously.
       for (int i = 0, n = req->stream.size(); i < n; ++i) {
         req->stream[i].stream->Wait();
       }
-      // note: Free the workspace of this op.
+      // note: Free the workspace of this op. The requests are kept, so the OpEnv can be reused.
       WITH_BASE_PROFILER(call->device, op->name, "WorkspaceClear", {}, {
-        req->workspace.clear();
-        req->workspace.shrink_to_fit();
+        for (auto& entry : req->workspace) {
+          *entry.dest = nullptr;
+          entry.memory.reset();
+        }
       });
 
-      req->stream.clear();
-      req->stream.shrink_to_fit();
+      for (auto& entry : req->stream) {
+        entry.stream.reset();
+      }
     }
 
     // note: The next op holds a reference to this op. It will make sure that the memories requested
     // by this op will not be freed after the return of this op.
-    call->out->op_env = std::move(op_env);
+    call->out->op_env = op_env;
 
     if (use_upper_bound) {
       auto tup = Downcast<TupleValue>(call->out);
@@ -454,6 +656,14 @@ Value InvokePrimitive(const CallValues& call) {
   return ret;
 }
 
+Value InvokePrimitive(const CallValues& call, const Array<Value>& args) {
+  Interpreter* intrp = IntrpThreadEntry::ThreadLocal();
+  auto ret = intrp->InvokePrimitive(call, &args);
+  intrp->mod = {};
+  intrp->st.tab = {};
+  return ret;
+}
+
 Value InvokeClosure(const CallValues& call) {
   Interpreter* intrp = IntrpThreadEntry::ThreadLocal();
   auto ret = intrp->InvokeClosure(call);
@@ -467,6 +677,16 @@ ObjectRef _Interpret(Expr expr, Optional<IRModule> mod) {
 }
 
 RAF_REGISTER_GLOBAL("raf.executor.Interpret").set_body_typed(_Interpret);
+RAF_REGISTER_GLOBAL("raf.executor.ClearOpEnvCache").set_body_typed([]() {
+  OpEnvCache::Get()->Clear();
+});
+RAF_REGISTER_GLOBAL("raf.executor.SetOpEnvCacheCapacity").set_body_typed([](int64_t capacity) {
+  CHECK_GE(capacity, 0);
+  OpEnvCache::Get()->SetCapacity(capacity);
+});
+RAF_REGISTER_GLOBAL("raf.executor.GetOpEnvCacheStats").set_body_typed([]() {
+  return OpEnvCache::Get()->GetStats();
+});
 }  // namespace interpreter
 }  // namespace executor
 }  // namespace raf
@@ -112,6 +112,11 @@ std::pair<float, float> Memory::GetPoolSize(const Device& dev) {
   return mgr->GetPool(dev, "")->GetPoolSize();
 }
 
+std::unordered_map<std::string, float> Memory::GetPoolStats(const Device& dev) {
+  MemoryPoolManager* mgr = MemoryPoolManager::Get();
+  return mgr->GetPool(dev, "")->GetPoolStats();
+}
+
 void Memory::RemovePool(const Device& dev) {
   MemoryPoolManager* mgr = MemoryPoolManager::Get();
   mgr->Remove(dev);
@@ -170,6 +175,18 @@ RAF_REGISTER_GLOBAL("raf.memory_pool.InitPool")
       return InitPool(dev, pool_name);
     });
 
+RAF_REGISTER_GLOBAL("raf.memory_pool.GetPoolStats").set_body_typed([](const Device& dev) {
+  Map<String, FloatImm> ret;
+  for (const auto& kv : Memory::GetPoolStats(dev)) {
+    ret.Set(kv.first, FloatImm(DataType::Float(32), kv.second));
+  }
+  return ret;
+});
+
+RAF_REGISTER_GLOBAL("raf.memory_pool.GetPoolName").set_body_typed([](const Device& dev) {
+  return Memory::GetPool(dev)->GetName();
+});
+
 RAF_REGISTER_GLOBAL("raf.memory_pool.RemovePool").set_body_typed([](const Device& dev) {
   return RemovePool(dev);
 });
@@ -7,13 +7,17 @@
  * \file model.cc
  * \brief Helpers for running models.
  */
+#include <list>
+#include <mutex>
 #include "raf/binding.h"
+#include "raf/cache.h"
 #include "raf/ir.h"
 #include "raf/value.h"
 #include "raf/registry.h"
 #include "raf/executor.h"
 #include "raf/pass.h"
 #include "raf/dist_config.h"
+#include "raf/vm/vm.h"
 
 namespace raf {
 namespace model {
@@ -25,66 +29,241 @@ using binding::DeTuple;
 using binding::GradTape;
 using binding::NDArrayBindingObj;
 using executor::interpreter::Interpret;
+using executor::vm::VirtualMachine;
+using executor::vm::VMContext;
+using op::HashKey;
 using pass::AutoDataParallel;
 using pass::AutoDiff;
-using pass::BindParam;
 using pass::CanonicalizeOps;
 using pass::FoldConstant;
 
+/*! \brief A traced module optimized by RunModel for a requires-grad mask. */
+struct CompiledModel {
+  /*! \brief The traced module, which is held so that its address is not reused. */
+  IRModule mod;
+  /*! \brief The optimized module. */
+  IRModule optimized;
+  /*! \brief The VM executable and VM of the optimized module, if it runs with the VM. */
+  tvm::runtime::Module exec;
+  tvm::runtime::Module vm;
+};
+
+/*!
+ * \brief The LRU cache of the compiled models, so that RunModel only optimizes a traced module
+ * once instead of at every call.
+ */
+class CompiledModelCache {
+ public:
+  static CompiledModelCache* Get() {
+    static CompiledModelCache* instance = new CompiledModelCache();
+    return instance;
+  }
+
+  std::shared_ptr<CompiledModel> Lookup(const std::string& key) {
+    std::lock_guard<std::mutex> lock(mu_);
+    auto it = cached_.find(key);
+    if (it == cached_.end()) {
+      misses_++;
+      return nullptr;
+    }
+    hits_++;
+    lru_.splice(lru_.begin(), lru_, it->second);
+    return it->second->second;
+  }
+
+  void Insert(const std::string& key, std::shared_ptr<CompiledModel> model) {
+    std::lock_guard<std::mutex> lock(mu_);
+    if (capacity_ == 0 || cached_.count(key)) {
+      return;
+    }
+    lru_.emplace_front(key, std::move(model));
+    cached_[key] = lru_.begin();
+    EvictIfFull();
+  }
+
+  void Clear() {
+    std::lock_guard<std::mutex> lock(mu_);
+    cached_.clear();
+    lru_.clear();
+    hits_ = misses_ = evictions_ = 0;
+  }
+
+  void SetOptions(int64_t capacity, bool use_vm) {
+    std::lock_guard<std::mutex> lock(mu_);
+    if (capacity >= 0) {
+      capacity_ = capacity;
+      EvictIfFull();
+    }
+    use_vm_ = use_vm;
+  }
+
+  bool UseVM() {
+    std::lock_guard<std::mutex> lock(mu_);
+    return use_vm_;
+  }
+
+  Map<String, Integer> GetStats() {
+    std::lock_guard<std::mutex> lock(mu_);
+    auto make_int = [](int64_t v) { return Integer(IntImm(DataType::Int(64), v)); };
+    Map<String, Integer> stats;
+    stats.Set("Size", make_int(cached_.size()));
+    stats.Set("Capacity", make_int(capacity_));
+    stats.Set("Hit", make_int(hits_));
+    stats.Set("Miss", make_int(misses_));
+    stats.Set("Evict", make_int(evictions_));
+    stats.Set("UseVM", make_int(use_vm_));
+    return stats;
+  }
+
+ private:
+  CompiledModelCache() {
+    if (const char* val = getenv("RAF_RUN_MODEL_CACHE_SIZE")) {
+      capacity_ = atol(val);
+    }
+    if (const char* val = getenv("RAF_RUN_MODEL_USE_VM")) {
+      use_vm_ = atoi(val) != 0;
+    }
+  }
+
+  void EvictIfFull() {
+    while (cached_.size() > capacity_) {
+      cached_.erase(lru_.back().first);
+      lru_.pop_back();
+      evictions_++;
+    }
+  }
+
+  /*! \brief The maximum number of the compiled models. 0 disables the cache. */
+  size_t capacity_ = 32;
+  /*! \brief Whether to run the inference models with the VM instead of the interpreter. */
+  bool use_vm_ = false;
+  std::list<std::pair<std::string, std::shared_ptr<CompiledModel>>> lru_;
+  std::unordered_map<std::string, decltype(lru_)::iterator> cached_;
+  int64_t hits_ = 0;
+  int64_t misses_ = 0;
+  int64_t evictions_ = 0;
+  std::mutex mu_;
+};
+
+/*!
+ * \brief Compile the optimized module with the VM.
+ * \param model The compiled model to be updated.
+ * \param inputs The input values of the module, which determine the device.
+ * \return Whether the module is compiled.
+ */
+bool CompileWithVM(CompiledModel* model, const std::vector<Value>& inputs) {
+  const DLTensor* tensor = nullptr;
+  for (const auto& input : inputs) {
+    if (input->IsInstance<TensorValueObj>()) {
+      tensor = input;
+      break;
+    }
+  }
+  if (tensor == nullptr) {
+    return false;
+  }
+  Device device(tensor->device);
+  static const auto& f_compiler = registry::GetPackedFunc("raf.vm.VMCompiler");
+  static const auto& f_vm = registry::GetPackedFunc("raf.vm.VirtualMachine");
+  tvm::runtime::Module compiler = f_compiler();
+  Map<tvm::Integer, Device> device_map{{tvm::Integer(device.device_type()), device}};
+  compiler.GetFunction("lower")(model->optimized, device_map);
+  model->exec = compiler.GetFunction("get_executable")();
+  model->vm = f_vm(model->exec, false, false);
+  static_cast<VirtualMachine*>(model->vm.operator->())->SetDevices({device});
+  return true;
+}
+
 ObjectRef RunModel(ir::IRModule mod, Array<Expr> args) {
-  ir::IRModule updated_mod = ir::IRModule(mod->functions);
   std::vector<GradTape> grads;
   ir::Array<Bool> requires_grads;
+  // The values of the inputs if all of them are bound to ndarrays.
+  std::vector<Value> inputs;
   grads.reserve(args.size());
   bool requires_grad = false;
+  HashKey key;
+  key << reinterpret_cast<int64_t>(mod.get());
   for (const Expr& arg : args) {
+    const NDArrayBindingObj* bound = nullptr;
     if (const auto* a = arg.as<VarNode>()) {
-      if (const auto* bound = binding::LookupBinding(a).as<NDArrayBindingObj>()) {
-        if (bound->tape.defined()) {
-          requires_grad = true;
-        }
-        requires_grads.push_back(Bool(bound->tape.defined()));
-        grads.push_back(bound->tape);
+      bound = binding::LookupBinding(a).as<NDArrayBindingObj>();
+    }
+    if (bound != nullptr) {
+      if (bound->tape.defined()) {
+        requires_grad = true;
       }
+      requires_grads.push_back(Bool(bound->tape.defined()));
+      grads.push_back(bound->tape);
+      inputs.push_back(bound->value);
+    }
+    key << static_cast<int8_t>(bound == nullptr ? 0 : (bound->tape.defined() ? 2 : 1));
+    // The VM is compiled for the device of the inputs.
+    if (bound != nullptr && bound->value->IsInstance<TensorValueObj>()) {
+      const DLTensor* tensor = bound->value;
+      key << tensor->device;
     }
   }
+  const auto& dist_config = distributed::DistConfig::Global();
+  key << dist_config->enable_data_parallel << dist_config->zero_opt_level;
+  // The passes and their options are determined by the pass context.
+  pass::PassContext pass_ctx = pass::PassContext::Current();
+  key << static_cast<int64_t>(pass_ctx->opt_level)
+      << static_cast<uint64_t>(tvm::StructuralHash()(pass_ctx->config))
+      << static_cast<uint64_t>(tvm::StructuralHash()(pass_ctx->required_pass))
+      << static_cast<uint64_t>(tvm::StructuralHash()(pass_ctx->disabled_pass));
+  std::string key_str(key.byte_vector.begin(), key.byte_vector.end());
 
-  // TODO - Revisit which passes require update due to presence of module
-  Function func = Downcast<Function>(updated_mod->Lookup("main"));
-  func = Downcast<Function>(BindParam(func, args));
-  auto gvar = updated_mod->GetGlobalVar("main");
-  updated_mod->Add(gvar, func);
+  // Reuse the module optimized for the same traced module, requires-grad mask, input devices and
+  // pass context. The parameters are not bound to the module as constants, so the optimized module
+  // works with the new values.
+  CompiledModelCache* cache = CompiledModelCache::Get();
+  bool use_vm = !requires_grad && inputs.size() == args.size() && cache->UseVM();
+  std::shared_ptr<CompiledModel> model = cache->Lookup(key_str);
+  if (model == nullptr) {
+    model = std::make_shared<CompiledModel>();
+    model->mod = mod;
+    ir::IRModule updated_mod = ir::IRModule(mod->functions);
+    // Glob the needed passes.
+    Array<tvm::transform::Pass> passes;
+    // run canonicalize ops pass (it needs "inter type pass" to work properly.)
+    passes.push_back(CanonicalizeOps());
+    // run const folding pass to avoid AD on constant ops
+    passes.push_back(FoldConstant());
+    if (requires_grad) {
+      // run auto diff pass
+      passes.push_back(AutoDiff(requires_grads));
 
-  if (!requires_grad) {
+      // run auto parallel
+      if (dist_config->enable_data_parallel) {
+        passes.push_back(AutoDataParallel());
+      }
+
+      // run const folding pass
+      passes.push_back(FoldConstant());
+    }
     // TODO(haibin): add simplify inference pass - simplify the compute of
     // BN, LN, Dropout, GN, etc.
-    raf::pass::RAFSequential seq({CanonicalizeOps(), FoldConstant()}, "interpreter_infer_optimize");
-    updated_mod = seq(updated_mod);
-    func = Downcast<Function>(updated_mod->Lookup("main"));
-    auto call_node = Call(func, args);
-    return DeTuple(Interpret(call_node, updated_mod));
+    raf::pass::RAFSequential seq(
+        passes, requires_grad ? "interpreter_optimize" : "interpreter_infer_optimize");
+    model->optimized = seq(updated_mod);
+    if (use_vm && !CompileWithVM(model.get(), inputs)) {
+      use_vm = false;
+    }
+    cache->Insert(key_str, model);
   }
 
-  // Glob the needed passes.
-  Array<tvm::transform::Pass> passes;
-  // run canonicalize ops pass (it needs "inter type pass" to work properly.)
-  passes.push_back(CanonicalizeOps());
-  // run const folding pass to avoid AD on constant ops
-  passes.push_back(FoldConstant());
-  // run auto diff pass
-  passes.push_back(AutoDiff(requires_grads));
-
-  // run auto parallel
-  if (distributed::DistConfig::Global()->enable_data_parallel) {
-    passes.push_back(AutoDataParallel());
+  if (!requires_grad) {
+    if (use_vm && model->vm.defined()) {
+      auto* vm = static_cast<VirtualMachine*>(model->vm.operator->());
+      VMContext ctx = vm->PrepareVMContext("main", inputs);
+      return DeTuple(vm->Run(ctx));
+    }
+    Function func = Downcast<Function>(model->optimized->Lookup("main"));
+    return DeTuple(Interpret(Call(func, args), model->optimized));
   }
 
-  // run const folding pass
-  passes.push_back(FoldConstant());
-  raf::pass::RAFSequential seq(passes, "interpreter_optimize");
-  updated_mod = seq(updated_mod);
-  func = Downcast<Function>(updated_mod->Lookup("main"));
-  TupleValue result = Downcast<TupleValue>(Interpret(Call(func, args), updated_mod));
+  Function func = Downcast<Function>(model->optimized->Lookup("main"));
+  TupleValue result = Downcast<TupleValue>(Interpret(Call(func, args), model->optimized));
   CHECK_EQ(result->fields.size(), 2U);
   return DeStruct(/*value=*/result->fields[0],
                   /*bp=*/Downcast<ClosureValue>(result->fields[1]),
@@ -92,6 +271,16 @@ ObjectRef RunModel(ir::IRModule mod, Array<Expr> args) {
 }
 
 RAF_REGISTER_GLOBAL("raf.model.RunModel").set_body_typed(RunModel);
+RAF_REGISTER_GLOBAL("raf.model.ClearRunModelCache").set_body_typed([]() {
+  CompiledModelCache::Get()->Clear();
+});
+RAF_REGISTER_GLOBAL("raf.model.SetRunModelOptions")
+    .set_body_typed([](int64_t capacity, bool use_vm) {
+      CompiledModelCache::Get()->SetOptions(capacity, use_vm);
+    });
+RAF_REGISTER_GLOBAL("raf.model.GetRunModelCacheStats").set_body_typed([]() {
+  return CompiledModelCache::Get()->GetStats();
+});
 
 }  // namespace model
 }  // namespace raf
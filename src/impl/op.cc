@@ -8,6 +8,7 @@
  * \brief RAF operator interface underlying implementation
  */
 #include <tvm/runtime/device_api.h>
+#include <mutex>
 #include "dmlc/registry.h"
 #include "raf/executor.h"
 #include "raf/ir.h"
@@ -262,6 +263,8 @@ Array<Value> GetListArgs(const Attrs& attrs) {
 
 std::string GetUniqueName(std::string name) {
   static std::unordered_map<std::string, int> name_map;
+  static std::mutex mu;
+  std::lock_guard<std::mutex> lock(mu);
   for (size_t i = 0; i < name.length(); ++i) {
     if (name[i] == '.') name[i] = '_';
   }
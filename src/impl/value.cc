@@ -8,6 +8,7 @@
  * \brief RAF value underlying implementation
  */
 #include <tvm/runtime/data_type.h>
+#include <tvm/runtime/device_api.h>
 #include <tvm/runtime/ndarray.h>
 #include <tvm/node/functor.h>
 #include <tvm/ir/module.h>
@@ -359,6 +360,22 @@ Value CopyTo(Value src, const Device& dev) {
   return src;
 }
 
+TensorValue CopyTensorTo(TensorValue src, const Device& dev) {
+  const DLTensor* dlt = src;
+  std::vector<int64_t> shape(dlt->shape, dlt->shape + dlt->ndim);
+  int64_t nbytes = tvm::runtime::GetDataSize(*dlt);
+  std::shared_ptr<memory_pool::Memory> memory = memory_pool::Memory::Alloc(dev, nbytes);
+  TensorValue ret = TensorValue::Assemble(dev, dlt->dtype, shape, {}, memory->data, memory);
+  // The copy between the host and a device is issued by the API of the device.
+  tvm::Device api_dev = dlt->device.device_type != kDLCPU ? dlt->device : tvm::Device(dev);
+  tvm::runtime::DeviceAPI* api = tvm::runtime::DeviceAPI::Get(api_dev);
+  const DLTensor* dst = ret;
+  api->CopyDataFromTo(const_cast<DLTensor*>(dlt), const_cast<DLTensor*>(dst), nullptr);
+  // The copy is on the default stream, which is synchronized so the tensor is ready to read.
+  api->StreamSync(api_dev, nullptr);
+  return ret;
+}
+
 void CopyTo(Value src, Value dst) {
   if (!src.defined()) {
     return;
@@ -428,6 +445,10 @@ RAF_REGISTER_GLOBAL("raf.value.AssembleTensorValue")
 RAF_REGISTER_GLOBAL("raf.value.DeTuple").set_body_typed(DeTuple);
 RAF_REGISTER_GLOBAL("raf.value.FromTVM").set_body_typed(FromTVM);
 RAF_REGISTER_GLOBAL("raf.value.ToTVM").set_body_typed(ToTVM);
+RAF_REGISTER_GLOBAL("raf.value.CopyTensorTo")
+    .set_body_typed([](TensorValue src, const tvm::Device& dev) {
+      return CopyTensorTo(src, Device(dev));
+    });
 RAF_REGISTER_GLOBAL("raf.value._make.TupleValue").set_body_typed(TupleValue::make);
 RAF_REGISTER_GLOBAL("raf.value._make.IntValue").set_body_typed(IntValue::make);
 RAF_REGISTER_GLOBAL("raf.value._make.FloatValue").set_body_typed(FloatValue::make);
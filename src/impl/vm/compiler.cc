@@ -410,16 +410,23 @@ class VMFunctionCompiler : ExprFunctor<void(const Expr& expr)> {
           .Match("raf.op.vm.alloc_tensor",
                  [this](const Array<Expr>& args, const Attrs& attrs, const Array<Type>& type_arg) {
                    bool own = true;
-                   if (args.size() == 5) {
-                     // The last "own" argument is usually specified by the MemoryPlan pass
+                   Index offset = 0;
+                   CHECK(args.size() >= 4 && args.size() <= 6);
+                   if (args.size() >= 5) {
+                     // The "own" argument is usually specified by the MemoryPlan pass
                      // to indicate that this tensor is not the final output so it should not
                      // own the memory pointer.
                      CHECK(args[4].as<ConstantNode>());
                      auto own_val = args[4].as<ConstantNode>()->value;
                      CHECK(own_val->IsInstance<BoolValueObj>());
                      own = own_val.as<BoolValueObj>()->value;
-                   } else {
-                     CHECK_EQ(args.size(), 4);
+                   }
+                   if (args.size() == 6) {
+                     // The byte offset of this tensor in a storage arena planned by MemoryPlan.
+                     CHECK(args[5].as<ConstantNode>());
+                     auto offset_val = args[5].as<ConstantNode>()->value;
+                     CHECK(offset_val->IsInstance<IntValueObj>());
+                     offset = offset_val.as<IntValueObj>()->value;
                    }
 
                    // The storage will be passed dynamically.
@@ -446,12 +453,12 @@ class VMFunctionCompiler : ExprFunctor<void(const Expr& expr)> {
                        raw_shape.push_back(imm->value);
                      }
                      // Add context field.
-                     Emit(Instruction::AllocTensor(storage_register, 0, raw_shape, dtype,
+                     Emit(Instruction::AllocTensor(storage_register, offset, raw_shape, dtype,
                                                    NewRegister(), own));
                    } else {
                      this->VisitExpr(args[1]);
-                     Emit(Instruction::AllocTensorReg(storage_register, 0, last_register_, dtype,
-                                                      NewRegister(), own));
+                     Emit(Instruction::AllocTensorReg(storage_register, offset, last_register_,
+                                                      dtype, NewRegister(), own));
                    }
                  })
           .Match("raf.op.vm.alloc_storage",
@@ -850,8 +857,12 @@ IRModule VMCompiler::OptimizeModule(const IRModule& mod, const DeviceMap& device
   pass_seqs.push_back(pass::GradInputSelect());
   pass_seqs.push_back(pass::InlineLet());
   pass_seqs.push_back(pass::DeadCodeElimination());
-  // enable group all gather for ZeRO.
-  if (dcfg->zero_opt_level > 1 && dcfg->group_bucket_size > 1 && device_t == DevType::kCUDA()) {
+  // enable group all gather for ZeRO. On CPU, the grouped op is only implemented by the shm
+  // communicator.
+  bool group_allgather_supported =
+      device_t == DevType::kCUDA() ||
+      (device_t == DevType::kCPU() && op::Dialect::IsEnabled("shm", DevType::kCPU()));
+  if (dcfg->zero_opt_level > 1 && dcfg->group_bucket_size > 1 && group_allgather_supported) {
     pass_seqs.push_back(pass::GroupAllgather());
   }
 
@@ -869,9 +880,10 @@ IRModule VMCompiler::OptimizeModule(const IRModule& mod, const DeviceMap& device
     // output type than the base ops.
     pass_seqs.push_back(pass::EraseType());
 
-    // optimization passes that transform BBNF into ANF
-    if (device_t == DevType::kCUDA()) {
-      if (DistConfig::Global()->enable_data_parallel) {
+    // optimization passes that transform BBNF into ANF. On CPU, the streams are task queues on
+    // a shared worker pool, so the multi-stream schedules also run independent ops in parallel.
+    if (device_t == DevType::kCUDA() || device_t == DevType::kCPU()) {
+      if (device_t == DevType::kCUDA() && DistConfig::Global()->enable_data_parallel) {
         // The current design of EnforceSync assumes ops are executed on multiple CUDA streams:
         // all computation ops are executed on a computation stream, and all communication
         // collectives are executed on another communication stream. Memory copy ops added in
@@ -895,6 +907,7 @@ IRModule VMCompiler::OptimizeModule(const IRModule& mod, const DeviceMap& device
         } else if (policy_name == "asap") {
           pass_seqs.push_back(pass::ASAPStreamSchedule());
         } else if (policy_name == "ios") {
+          CHECK(device_t == DevType::kCUDA()) << "The ios schedule policy only supports CUDA";
           pass_seqs.push_back(pass::InferType());
           pass_seqs.push_back(pass::IOSStreamSchedule());
         } else {
@@ -9,15 +9,23 @@
  */
 
 #include <dmlc/memory_io.h>
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
 #include <tvm/runtime/memory.h>
 #include <tvm/runtime/object.h>
+#include <unistd.h>
 
 #include <algorithm>
+#include <cerrno>
 #include <chrono>
+#include <cstring>
+#include <fstream>
 #include <iostream>
 #include <sstream>
 #include <vector>
 
+#include "raf/memory_pool.h"
 #include "raf/serialization.h"
 #include "raf/vm/vm.h"
 #include "./serialize_util.h"
@@ -49,6 +57,11 @@ PackedFunc Executable::GetFunction(const std::string& name, const ObjectPtr<Obje
     return PackedFunc([sptr_to_self, this](TVMArgs args, TVMRetValue* rv) { *rv = this->Stats(); });
   } else if (name == "save") {
     return PackedFunc([sptr_to_self, this](TVMArgs args, TVMRetValue* rv) { *rv = this->Save(); });
+  } else if (name == "save_artifact") {
+    return PackedFunc([sptr_to_self, this](TVMArgs args, TVMRetValue* rv) {
+      std::string path = args[0];
+      this->SaveArtifact(path);
+    });
   } else if (name == "get_function_arity") {
     return PackedFunc([sptr_to_self, this](TVMArgs args, TVMRetValue* rv) {
       std::string func_name = args[0];
@@ -798,6 +811,213 @@ void Executable::LoadCodeSection(dmlc::Stream* strm) {
   }
 }
 
+/*! \brief A read-only file mapped into memory, which is unmapped when destructed. */
+class MappedFile {
+ public:
+  explicit MappedFile(const std::string& path) : path_(path) {
+    int fd = open(path.c_str(), O_RDONLY);
+    CHECK_NE(fd, -1) << "Failed to open " << path << ": " << strerror(errno);
+    struct stat st;
+    CHECK_EQ(fstat(fd, &st), 0) << "Failed to stat " << path << ": " << strerror(errno);
+    size = st.st_size;
+    // The mapping is private and writable, so that an accidental write to a constant only
+    // affects its own copy-on-write page instead of crashing or modifying the file.
+    void* addr = mmap(nullptr, size, PROT_READ | PROT_WRITE, MAP_PRIVATE, fd, 0);
+    close(fd);
+    CHECK_NE(addr, MAP_FAILED) << "Failed to mmap " << path << ": " << strerror(errno);
+    data = static_cast<uint8_t*>(addr);
+  }
+
+  ~MappedFile() {
+    munmap(data, size);
+  }
+
+  /*! \brief Get a stream to read the given section. */
+  dmlc::MemoryFixedSizeStream GetSection(const VMArtifactHeader* header, int section) {
+    uint64_t offset = header->section_offsets[section];
+    uint64_t nbytes = header->section_sizes[section];
+    CHECK_LE(offset + nbytes, size) << "Truncated VM artifact " << path_;
+    return dmlc::MemoryFixedSizeStream(data + offset, nbytes);
+  }
+
+  /*! \brief The mapped address. */
+  uint8_t* data = nullptr;
+  /*! \brief The size of the file. */
+  size_t size = 0;
+
+ private:
+  /*! \brief The path of the file. */
+  std::string path_;
+};
+
+/*! \brief A chunk of memory in a mapped file, which keeps the file mapped while in use. */
+class MappedMemory : public memory_pool::Memory {
+ public:
+  MappedMemory(std::shared_ptr<MappedFile> file, void* ptr) : file_(file) {
+    data = ptr;
+    device = Device(DevType::kCPU(), 0);
+  }
+
+ private:
+  /*! \brief The mapped file that the memory belongs to. */
+  std::shared_ptr<MappedFile> file_;
+};
+
+inline uint64_t AlignUp(uint64_t offset, uint64_t alignment) {
+  return (offset + alignment - 1) / alignment * alignment;
+}
+
+void Executable::SaveArtifact(const std::string& path) {
+  VMArtifactHeader header;
+  std::memset(&header, 0, sizeof(header));
+  header.magic = kVMArtifactMagic;
+  header.version = kVMArtifactVersion;
+  std::string sections[kArtifactNumSections];
+
+  // Constant index. Tensors are laid out in the constant section in order, and device tensors
+  // are saved with their data copied to the host.
+  std::vector<const DLTensor*> tensors;
+  std::vector<tvm::runtime::NDArray> host_tensors;
+  std::vector<uint64_t> tensor_offsets;
+  uint64_t const_nbytes = 0;
+  {
+    dmlc::MemoryStringStream strm(&sections[kArtifactIndex]);
+    strm.Write(static_cast<uint64_t>(constants.size()));
+    for (const auto& value : constants) {
+      if (!value.as<TensorValueObj>()) {
+        strm.Write(static_cast<uint8_t>(kArtifactValueConstant));
+        serialization::SerializeValue(&strm, value);
+        continue;
+      }
+      tvm::runtime::NDArray tensor = Downcast<TensorValue>(value)->tensor;
+      if (tensor->device.device_type != kDLCPU) {
+        tensor = tensor.CopyTo(Device(DevType::kCPU(), 0));
+      }
+      host_tensors.push_back(tensor);
+      const DLTensor* dlt = tensor.operator->();
+      uint64_t nbytes = tvm::runtime::GetDataSize(*dlt);
+      uint64_t offset = AlignUp(const_nbytes, kVMArtifactTensorAlignment);
+      const_nbytes = offset + nbytes;
+      tensors.push_back(dlt);
+      tensor_offsets.push_back(offset);
+
+      strm.Write(static_cast<uint8_t>(kArtifactTensorConstant));
+      strm.Write(dlt->dtype);
+      strm.Write(std::vector<int64_t>(dlt->shape, dlt->shape + dlt->ndim));
+      strm.Write(offset);
+      strm.Write(nbytes);
+    }
+  }
+
+  // Code section.
+  {
+    dmlc::MemoryStringStream strm(&sections[kArtifactCode]);
+    SaveHeader(&strm);
+    SaveGlobalSection(&strm);
+    SavePrimitiveOpNames(&strm);
+    SaveCodeSection(&strm);
+  }
+
+  // Library section. Only the modules that support binary serialization (e.g., device modules)
+  // can be embedded. The compiler does not generate a library by default as ops are JIT-compiled,
+  // so the section is usually empty.
+  if (lib.defined()) {
+    dmlc::MemoryStringStream strm(&sections[kArtifactLib]);
+    strm.Write(std::string(lib->type_key()));
+    lib->SaveToBinary(&strm);
+  }
+
+  // Lay out the sections. The constant section is the last one and is page-aligned.
+  uint64_t offset = sizeof(header);
+  for (int i = 0; i < kArtifactConstant; ++i) {
+    header.section_offsets[i] = offset;
+    header.section_sizes[i] = sections[i].size();
+    offset += sections[i].size();
+  }
+  header.section_offsets[kArtifactConstant] = AlignUp(offset, kVMArtifactSectionAlignment);
+  header.section_sizes[kArtifactConstant] = const_nbytes;
+
+  std::ofstream fout(path, std::ios::binary);
+  CHECK(fout) << "Failed to open " << path;
+  fout.write(reinterpret_cast<const char*>(&header), sizeof(header));
+  for (int i = 0; i < kArtifactConstant; ++i) {
+    fout.write(sections[i].data(), sections[i].size());
+  }
+  uint64_t pos = offset;
+  const std::string padding(kVMArtifactSectionAlignment, '\0');
+  for (size_t i = 0; i < tensors.size(); ++i) {
+    uint64_t target = header.section_offsets[kArtifactConstant] + tensor_offsets[i];
+    fout.write(padding.data(), target - pos);
+    const DLTensor* dlt = tensors[i];
+    uint64_t nbytes = tvm::runtime::GetDataSize(*dlt);
+    fout.write(static_cast<const char*>(dlt->data) + dlt->byte_offset, nbytes);
+    pos = target + nbytes;
+  }
+  CHECK(fout) << "Failed to write " << path;
+}
+
+tvm::runtime::Module Executable::LoadArtifact(const std::string& path) {
+  auto file = std::make_shared<MappedFile>(path);
+  CHECK_GE(file->size, sizeof(VMArtifactHeader)) << "Invalid VM artifact " << path;
+  const auto* header = reinterpret_cast<const VMArtifactHeader*>(file->data);
+  CHECK_EQ(header->magic, kVMArtifactMagic) << "Invalid VM artifact " << path;
+  CHECK_EQ(header->version, kVMArtifactVersion)
+      << "Unsupported VM artifact version " << header->version << " of " << path;
+
+  auto exec = make_object<Executable>();
+
+  // Code section.
+  auto code_strm = file->GetSection(header, kArtifactCode);
+  LoadHeader(&code_strm);
+  exec->LoadGlobalSection(&code_strm);
+  exec->LoadPrimitiveOpNames(&code_strm);
+  exec->LoadCodeSection(&code_strm);
+
+  // Constants. Tensors refer to the mapped constant section without copying.
+  uint64_t const_offset = header->section_offsets[kArtifactConstant];
+  uint64_t const_nbytes = header->section_sizes[kArtifactConstant];
+  CHECK(const_nbytes == 0 || const_offset + const_nbytes <= file->size)
+      << "Truncated VM artifact " << path;
+  uint8_t* const_base = file->data + const_offset;
+  auto index_strm = file->GetSection(header, kArtifactIndex);
+  uint64_t num_constants;
+  STREAM_CHECK(index_strm.Read(&num_constants), "constant");
+  for (uint64_t i = 0; i < num_constants; ++i) {
+    uint8_t kind;
+    STREAM_CHECK(index_strm.Read(&kind), "constant");
+    if (kind == kArtifactValueConstant) {
+      exec->constants.push_back(serialization::DeserializeValue(&index_strm));
+      continue;
+    }
+    STREAM_CHECK(kind == kArtifactTensorConstant, "constant");
+    DLDataType dtype;
+    std::vector<int64_t> shape;
+    uint64_t offset, nbytes;
+    STREAM_CHECK(index_strm.Read(&dtype), "constant");
+    STREAM_CHECK(index_strm.Read(&shape), "constant");
+    STREAM_CHECK(index_strm.Read(&offset), "constant");
+    STREAM_CHECK(index_strm.Read(&nbytes), "constant");
+    STREAM_CHECK(offset + nbytes <= const_nbytes, "constant");
+    void* data = const_base + offset;
+    auto mem = std::make_shared<MappedMemory>(file, data);
+    exec->constants.push_back(
+        TensorValue::Assemble(Device(DevType::kCPU(), 0), dtype, shape, {}, data, mem));
+  }
+
+  // Library section.
+  if (header->section_sizes[kArtifactLib] > 0) {
+    auto lib_strm = file->GetSection(header, kArtifactLib);
+    std::string type_key;
+    STREAM_CHECK(lib_strm.Read(&type_key), "library");
+    std::string loader_name = "runtime.module.loadbinary_" + type_key;
+    const auto* loader = registry::Registry::Get(loader_name);
+    CHECK(loader) << "Cannot load the embedded library of type " << type_key << ": "
+                  << loader_name << " is not registered";
+    exec->lib = (*loader)(static_cast<void*>(&lib_strm));
+  }
+  return tvm::runtime::Module(exec);
+}
+
 RAF_REGISTER_GLOBAL("raf.vm.GetNumOfGlobals").set_body([](TVMArgs args, TVMRetValue* rv) {
   tvm::runtime::Module mod = args[0];
   const auto* exec = dynamic_cast<Executable*>(mod.operator->());
@@ -848,6 +1068,8 @@ RAF_REGISTER_GLOBAL("raf.vm.Load_Executable")
       return Executable::Load(code, lib);
     });
 
+RAF_REGISTER_GLOBAL("raf.vm.LoadExecutableArtifact").set_body_typed(Executable::LoadArtifact);
+
 }  // namespace vm
 }  // namespace executor
 }  // namespace raf
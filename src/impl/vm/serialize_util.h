@@ -25,6 +25,51 @@ namespace vm {
 /*! \brief The magic number for the serialized VM bytecode file  */
 constexpr uint64_t kMetaVMBytecodeMagic = 0xD225DE2F4214151D;
 
+/*! \brief The magic number for the VM executable artifact file. */
+constexpr uint64_t kVMArtifactMagic = 0x31544641524D5652;
+
+/*! \brief The format version of the VM executable artifact file. */
+constexpr uint64_t kVMArtifactVersion = 1;
+
+/*! \brief The alignment of the constant section in the artifact file, which is the page size
+ * so that the section can be mapped from the file directly. */
+constexpr uint64_t kVMArtifactSectionAlignment = 4096;
+
+/*! \brief The alignment of each tensor in the constant section. */
+constexpr uint64_t kVMArtifactTensorAlignment = 64;
+
+/*! \brief The sections of the VM executable artifact file. */
+enum VMArtifactSection : int {
+  /*! \brief The metadata of constants. Tensors refer to their data in the constant section,
+   * while other values (e.g., tuples and closures) are serialized in place. */
+  kArtifactIndex = 0,
+  /*! \brief The globals, primitive op names and VM functions, as in the bytecode. */
+  kArtifactCode = 1,
+  /*! \brief The embedded runtime library, if any. */
+  kArtifactLib = 2,
+  /*! \brief The aligned raw data of the tensor constants. */
+  kArtifactConstant = 3,
+  kArtifactNumSections = 4,
+};
+
+/*! \brief The kinds of constants in the index section of the artifact file. */
+enum VMArtifactConstantKind : uint8_t {
+  kArtifactTensorConstant = 0,
+  kArtifactValueConstant = 1,
+};
+
+/*! \brief The fixed size header at the beginning of the VM executable artifact file. */
+struct VMArtifactHeader {
+  /*! \brief The magic number, kVMArtifactMagic. */
+  uint64_t magic;
+  /*! \brief The format version, kVMArtifactVersion. */
+  uint64_t version;
+  /*! \brief The byte offsets of the sections from the beginning of the file. */
+  uint64_t section_offsets[kArtifactNumSections];
+  /*! \brief The byte sizes of the sections. */
+  uint64_t section_sizes[kArtifactNumSections];
+};
+
 template <typename T>
 static inline size_t VectorHash(size_t key, const std::vector<T>& values) {
   for (const auto& it : values) {
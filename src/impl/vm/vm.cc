@@ -15,10 +15,12 @@
 
 #include <algorithm>
 #include <chrono>
+#include <cstring>
 #include <iostream>
 #include <memory>
 #include <mutex>
 #include <stdexcept>
+#include <thread>
 #include <vector>
 
 #include "raf/communicator.h"
@@ -63,7 +65,8 @@ using namespace raf::stream_pool;
 using namespace raf::distributed::communicator;
 
 namespace utils {
-inline std::shared_ptr<Event> GetEventById(const VMContext& ctx, Index device_id, Index event_id) {
+inline std::shared_ptr<Event> GetEventById(const VMContext& ctx, DevType device_type,
+                                           Index device_id, Index event_id) {
   if (device_id >= ctx->events.size()) {
     ctx->events.resize(device_id + 1);
   }
@@ -71,15 +74,15 @@ inline std::shared_ptr<Event> GetEventById(const VMContext& ctx, Index device_id
     ctx->events[device_id].resize(event_id + 1);
   }
   if (ctx->events[device_id][event_id] == nullptr) {
-    Device device(DevType::kCUDA(), static_cast<int>(device_id));
+    Device device(device_type, static_cast<int>(device_id));
     ctx->events[device_id][event_id] =
         EventPool::Get(device)->GetEvent(0x02 /*cudaEventDisableTiming*/);
   }
   return ctx->events[device_id][event_id];
 }
 
-inline std::shared_ptr<Stream> GetStreamById(const VMContext& ctx, Index device_id,
-                                             Index stream_id) {
+inline std::shared_ptr<Stream> GetStreamById(const VMContext& ctx, DevType device_type,
+                                             Index device_id, Index stream_id) {
   if (device_id >= ctx->streams.size()) {
     ctx->streams.resize(device_id + 1);
   }
@@ -90,14 +93,32 @@ inline std::shared_ptr<Stream> GetStreamById(const VMContext& ctx, Index device_
     if (stream_id == 0) {
       ctx->streams[device_id][stream_id] = std::make_shared<Stream>(nullptr);
     } else {
-      Device device(DevType::kCUDA(), static_cast<int>(device_id));
+      Device device(device_type, static_cast<int>(device_id));
       ctx->streams[device_id][stream_id] =
           Stream::Get(device, kCudaCompute, static_cast<int>(stream_id));
+      ctx->has_cpu_streams |= device_type == DevType::kCPU();
     }
   }
   return ctx->streams[device_id][stream_id];
 }
 
+/*!
+ * \brief Wait for the ops launched to the CPU streams, and release their memory.
+ */
+inline void WaitCPUStreams(const VMContext& ctx) {
+  if (!ctx->has_cpu_streams || ctx->async_op_tasks.empty()) {
+    return;
+  }
+  for (const auto& device_streams : ctx->streams) {
+    for (const auto& stream : device_streams) {
+      if (stream != nullptr && stream->data() != nullptr) {
+        stream->Wait();
+      }
+    }
+  }
+  ctx->async_op_tasks.clear();
+}
+
 const char* GetStreamName(Index stream_id) {
   static std::vector<std::string> names = {"Default Stream"};
   while (stream_id >= names.size()) {
@@ -139,6 +160,170 @@ void TensorRepr(std::ostringstream& os, const TensorValueObj* tensor) {
   }
   os << ">";
 }
+/*! \brief Get the name of an op or the text of a closure for error messages. */
+inline std::string GetCalleeName(const Value& callee) {
+  if (const auto* op = callee.as<OpValueObj>()) {
+    return op->op->name;
+  }
+  return PrettyPrint(callee.as<ClosureValueObj>()->func);
+}
+
+/*! \brief Generate a human readable signature of the inputs and output of an InvokeJit. */
+std::string ReadableSignature(const Array<Value>& args, const Value& output, const VMContext& ctx,
+                              const Instruction& instr) {
+  std::ostringstream os;
+  for (size_t i = 0; i < args.size(); i++) {
+    if (ctx.IsConst(instr.invoke_jit.args[i])) {
+      continue;
+    }
+    if (auto tensor = args[i].as<TensorValueObj>()) {
+      TensorRepr(os, tensor);
+    } else if (auto tup = args[i].as<TupleValueObj>()) {
+      os << "(";
+      for (auto field : tup->fields) {
+        auto t = field.as<TensorValueObj>();
+        if (t != nullptr) {
+          TensorRepr(os, t);
+        }
+        os << ",";
+      }
+      os << ")";
+    }
+    os << ",";
+  }
+  os << "|";
+  if (auto tensor = output.as<TensorValueObj>()) {
+    TensorRepr(os, tensor);
+  } else if (auto tup = output.as<TupleValueObj>()) {
+    os << "(";
+    for (auto field : tup->fields) {
+      TensorRepr(os, field.as<TensorValueObj>());
+      os << ",";
+    }
+    os << ")";
+  }
+  return os.str();
+}
+
+/*! \brief The signature tags for values that are not a tensor. */
+constexpr int64_t kSigConstTag = -1;
+constexpr int64_t kSigTupleTag = -2;
+constexpr int64_t kSigNonTensorTag = -3;
+constexpr int64_t kSigOutputTag = -4;
+constexpr int64_t kSigIntTag = -5;
+constexpr int64_t kSigFloatTag = -6;
+constexpr int64_t kSigBoolTag = -7;
+constexpr int64_t kSigNullTag = -8;
+constexpr int64_t kSigDataTag = -9;
+
+/*! \brief The max number of elements of a tensor whose data is appended to the signature. */
+constexpr int64_t kSigMaxDataSize = 64;
+
+/*!
+ * \brief Append the dtype and shape of a tensor to the signature. The dtype and rank are packed
+ * into one non-negative word, followed by one word per dimension.
+ */
+inline void TensorSignature(OpEnvSignature* sig, const TensorValueObj* tensor) {
+  const DLTensor* t = tensor->tensor.operator->();
+  uint64_t head = (static_cast<uint64_t>(t->dtype.code) << 48) |
+                  (static_cast<uint64_t>(t->dtype.bits) << 40) |
+                  (static_cast<uint64_t>(t->dtype.lanes) << 24) | static_cast<uint64_t>(t->ndim);
+  sig->Append(static_cast<int64_t>(head));
+  for (int i = 0; i < t->ndim; ++i) {
+    sig->Append(t->shape[i]);
+  }
+}
+
+/*!
+ * \brief Append the data of a small tensor to the signature, so that the signature tells apart
+ * the values read by the type functions (e.g., the start, stop and step of arange). The data on
+ * devices is only read if the type function may read it, in which case it is copied to the host
+ * first. Otherwise only the dtype and shape of the tensor are in the signature.
+ * \param read_device_data Whether the type function may read the data of tensors on devices.
+ * \return Whether the data can be represented in the signature.
+ */
+inline bool TensorDataSignature(OpEnvSignature* sig, const DLTensor* t, bool read_device_data) {
+  if (t->device.device_type != kDLCPU && !read_device_data) {
+    return true;
+  }
+  int64_t size = t->ndim == 0 ? 1 : t->shape[0];
+  int64_t elem_bytes = (t->dtype.bits + 7) / 8;
+  if (size > kSigMaxDataSize) {
+    // Large float vectors (e.g., biases) are never read as shapes, while large integer vectors
+    // may be, so they are not memoized.
+    return t->dtype.code != kDLInt && t->dtype.code != kDLUInt;
+  }
+  if (t->dtype.lanes != 1 || elem_bytes > 8) {
+    return false;
+  }
+  int64_t stride = t->ndim == 1 && t->strides != nullptr ? t->strides[0] : 1;
+  if (stride != 1 && size > 1) {
+    return false;
+  }
+  char buf[kSigMaxDataSize * 8];
+  if (t->device.device_type == kDLCPU) {
+    std::memcpy(buf, static_cast<const char*>(t->data) + t->byte_offset, size * elem_bytes);
+  } else {
+    DLTensor host = *t;
+    host.data = buf;
+    host.device = {kDLCPU, 0};
+    host.byte_offset = 0;
+    host.strides = nullptr;
+    auto* api = tvm::runtime::DeviceAPI::Get(t->device);
+    api->CopyDataFromTo(const_cast<DLTensor*>(t), &host, nullptr);
+    api->StreamSync(t->device, nullptr);
+  }
+  sig->Append(kSigDataTag);
+  for (int64_t i = 0; i < size; ++i) {
+    // Append the raw bits, so that the values of any dtype are compared exactly.
+    int64_t word = 0;
+    std::memcpy(&word, buf + i * elem_bytes, elem_bytes);
+    sig->Append(word);
+  }
+  return true;
+}
+
+/*!
+ * \brief Append an argument of an InferType instruction to the signature. Type functions may
+ * read the data of the shape-like arguments, so the values of scalars and the data of small
+ * tensors are included besides the dtypes and shapes.
+ * \param read_device_data Whether the type function may read the data of tensors on devices.
+ * \return Whether the argument can be represented in the signature.
+ */
+inline bool InferTypeSignature(OpEnvSignature* sig, const Value& value, bool read_device_data) {
+  if (!value.defined()) {
+    sig->Append(kSigNullTag);
+  } else if (const auto* tensor = value.as<TensorValueObj>()) {
+    TensorSignature(sig, tensor);
+    const DLTensor* t = tensor->tensor.operator->();
+    if (t->ndim <= 1 && !TensorDataSignature(sig, t, read_device_data)) {
+      return false;
+    }
+  } else if (const auto* tup = value.as<TupleValueObj>()) {
+    sig->Append(kSigTupleTag);
+    sig->Append(static_cast<int64_t>(tup->fields.size()));
+    for (const auto& field : tup->fields) {
+      if (!InferTypeSignature(sig, field, read_device_data)) {
+        return false;
+      }
+    }
+  } else if (const auto* iv = value.as<IntValueObj>()) {
+    sig->Append(kSigIntTag);
+    sig->Append(iv->value);
+  } else if (const auto* fv = value.as<FloatValueObj>()) {
+    double data = fv->value;
+    int64_t word;
+    std::memcpy(&word, &data, sizeof(word));
+    sig->Append(kSigFloatTag);
+    sig->Append(word);
+  } else if (const auto* bv = value.as<BoolValueObj>()) {
+    sig->Append(kSigBoolTag);
+    sig->Append(bv->value);
+  } else {
+    return false;
+  }
+  return true;
+}
 }  // namespace utils
 
 RAF_REGISTER_OBJECT_REFLECT(VMContextObj);
@@ -230,20 +415,103 @@ inline Index VMContext::PopFrame() {
   return fr.caller_return_register;
 }
 
-std::shared_ptr<OpEnvCache> VMFuncOpEnvCache::Get(Index pc) {
+OpEnvPtr InstrOpEnvCache::Get(const OpEnvSignature& sig, bool* fast_path) {
+  std::lock_guard<std::mutex> lock(mu_);
+  if (last_op_env_ != nullptr && last_sig_ == sig) {
+    *fast_path = true;
+    return last_op_env_;
+  }
+  *fast_path = false;
+  auto it = cached_.find(sig);
+  if (it == cached_.end()) {
+    return nullptr;
+  }
+  last_sig_ = it->first;
+  last_op_env_ = it->second;
+  return last_op_env_;
+}
+
+void InstrOpEnvCache::Set(const OpEnvSignature& sig, OpEnvPtr op_env) {
+  std::lock_guard<std::mutex> lock(mu_);
+  cached_[sig] = op_env;
+  last_sig_ = sig;
+  last_op_env_ = op_env;
+}
+
+void InstrOpEnvCache::Clear() {
   std::lock_guard<std::mutex> lock(mu_);
-  auto it = cache_map_.find(pc);
-  if (it != cache_map_.end()) {
-    return it->second;
+  cached_.clear();
+  last_sig_.Clear();
+  last_op_env_ = nullptr;
+}
+
+VMFuncOpEnvCache::VMFuncOpEnvCache(const VMFunction& func) {
+  cache_.resize(func.instructions.size());
+  for (size_t pc = 0; pc < func.instructions.size(); ++pc) {
+    if (func.instructions[pc].op == Opcode::InvokeJit) {
+      cache_[pc] = std::make_unique<InstrOpEnvCache>();
+    }
   }
-  auto cache = std::make_shared<OpEnvCache>();
-  cache_map_.emplace(pc, cache);
-  return cache;
+}
+
+InstrOpEnvCache* VMFuncOpEnvCache::Get(Index pc) {
+  CHECK_LT(pc, cache_.size());
+  CHECK(cache_[pc] != nullptr) << "Instruction " << pc << " is not an InvokeJit instruction";
+  return cache_[pc].get();
 }
 
 void VMFuncOpEnvCache::Clear() {
+  for (auto& cache : cache_) {
+    if (cache != nullptr) {
+      cache->Clear();
+    }
+  }
+}
+
+Value InferTypeCache::Get(const OpEnvSignature& sig) {
+  std::lock_guard<std::mutex> lock(mu_);
+  auto it = cached_.find(sig);
+  if (it == cached_.end()) {
+    return Value();
+  }
+  lru_.splice(lru_.begin(), lru_, it->second);
+  return it->second->second;
+}
+
+void InferTypeCache::Set(const OpEnvSignature& sig, Value value) {
+  std::lock_guard<std::mutex> lock(mu_);
+  if (capacity_ == 0 || cached_.count(sig)) {
+    return;
+  }
+  lru_.emplace_front(sig, std::move(value));
+  cached_[sig] = lru_.begin();
+  EvictIfFull();
+}
+
+void InferTypeCache::SetCapacity(size_t capacity) {
+  std::lock_guard<std::mutex> lock(mu_);
+  capacity_ = capacity;
+  EvictIfFull();
+}
+
+void InferTypeCache::Clear() {
+  std::lock_guard<std::mutex> lock(mu_);
+  cached_.clear();
+  lru_.clear();
+  evictions_ = 0;
+}
+
+std::pair<int64_t, int64_t> InferTypeCache::GetSizeAndEvictions() {
   std::lock_guard<std::mutex> lock(mu_);
-  cache_map_.clear();
+  return {static_cast<int64_t>(lru_.size()), evictions_};
+}
+
+void InferTypeCache::EvictIfFull() {
+  while (lru_.size() > capacity_) {
+    cached_.erase(lru_.back().first);
+    lru_.pop_back();
+    evictions_++;
+  }
 }
 
 #ifdef RAF_USE_CUDA
@@ -312,6 +580,21 @@ PackedFunc VirtualMachine::GetFunction(const std::string& name,
       int repeat = args[3];
       *rv = Profile(ctx, warmup, number, repeat);
     });
+  } else if (name == "warmup") {
+    return PackedFunc([sptr_to_self, this](registry::TVMArgs args, registry::TVMRetValue* rv) {
+      CHECK(exec_) << "The executable is not loaded yet.";
+      std::string func_name = args[0];
+      int num_workers = args[1];
+      std::vector<Value> inputs(args.size() - 2);
+      for (size_t i = 2; i < args.size(); ++i) {
+        inputs[i - 2] = args[i];
+      }
+      *rv = Warmup(func_name, inputs, num_workers);
+    });
+  } else if (name == "get_stats") {
+    return PackedFunc([sptr_to_self, this](registry::TVMArgs args, registry::TVMRetValue* rv) {
+      *rv = GetStats();
+    });
   } else if (name == "set_devices") {
     return PackedFunc([sptr_to_self, this](registry::TVMArgs args, registry::TVMRetValue* rv) {
       std::vector<Device> devices;
@@ -340,8 +623,8 @@ PackedFunc VirtualMachine::GetFunction(const std::string& name,
 void VirtualMachine::LoadExecutable(const Executable* exec) {
   CHECK(exec) << "The executable is not created yet.";
   exec_ = exec;
-  for (int i = 0; i < exec_->functions.size(); ++i) {
-    op_env_cache_.push_back(std::make_shared<VMFuncOpEnvCache>());
+  for (const auto& func : exec_->functions) {
+    op_env_cache_.push_back(std::make_shared<VMFuncOpEnvCache>(func));
   }
 
   tvm::runtime::Module lib = exec_->lib;
@@ -370,17 +653,6 @@ VMContext VirtualMachine::PrepareVMContext(const std::string& func_name,
   CHECK_EQ(inputs.size(), vm_func.params.size())
       << "The number of inputs doesn't match the number of parameters for function " << func_name;
 
-  auto fcreate_ctx = [&]() {
-    auto ctx = VMContext::make(exec_);
-    ctx->entry_func_index = func_index;
-    ctx->inputs.resize(inputs.size());
-    // TODO(@zhiics, @icemelon9): For heterogeneous execution, get input device information
-    Device dev = devices_[0];
-    for (size_t i = 0; i < inputs.size(); ++i) {
-      ctx->inputs[i] = CopyTo(inputs[i], dev);
-    }
-    return ctx;
-  };
 #ifdef RAF_USE_CUDA
   if (enable_cuda_graph_) {
     std::lock_guard<std::mutex> lock(cuda_graph_mutex_);
@@ -390,7 +662,7 @@ VMContext VirtualMachine::PrepareVMContext(const std::string& func_name,
       // Initialize the cuda graph context for the first time, or reset the cuda graph context
       // because this time invokes a different function
       cuda_graph_impl_ = nullptr;
-      cuda_graph_ctx_ = fcreate_ctx();
+      cuda_graph_ctx_ = CreateVMContext(func_index, inputs);
     } else {
       for (int i = 0; i < inputs.size(); i++) {
         Value new_arg = inputs[i];
@@ -408,7 +680,19 @@ VMContext VirtualMachine::PrepareVMContext(const std::string& func_name,
     return cuda_graph_ctx_;
   }
 #endif
-  auto ctx = fcreate_ctx();
+  auto ctx = CreateVMContext(func_index, inputs);
+  return ctx;
+}
+
+VMContext VirtualMachine::CreateVMContext(Index func_index, const std::vector<Value>& inputs) {
+  auto ctx = VMContext::make(exec_);
+  ctx->entry_func_index = func_index;
+  ctx->inputs.resize(inputs.size());
+  // TODO(@zhiics, @icemelon9): For heterogeneous execution, get input device information
+  Device dev = devices_[0];
+  for (size_t i = 0; i < inputs.size(); ++i) {
+    ctx->inputs[i] = CopyTo(inputs[i], dev);
+  }
   return ctx;
 }
 
@@ -438,7 +722,8 @@ Value VirtualMachine::Run(VMContext ctx) {
   }
 #endif
   frun();
-  if (ctx->current_stream_id != 0) {
+  utils::WaitCPUStreams(ctx);
+  if (use_cuda_ && ctx->current_stream_id != 0) {
     // reset the working stream to default stream.
     OpEnv::SetStreamForAllBackends(devices_[0], nullptr);
   }
@@ -468,6 +753,88 @@ Array<FloatValue> VirtualMachine::Profile(VMContext ctx, int warmup, int number,
   return results;
 }
 
+Map<String, ObjectRef> VirtualMachine::Warmup(const std::string& func_name,
+                                              const std::vector<Value>& inputs, int num_workers) {
+  auto gvit = exec_->global_map.find(func_name);
+  CHECK(gvit != exec_->global_map.end()) << "Cannot find function " << func_name;
+  auto func_index = gvit->second;
+  CHECK_EQ(inputs.size(), exec_->functions[func_index].params.size())
+      << "The number of inputs doesn't match the number of parameters for function " << func_name;
+  auto beg = raf::profiler::ProfileStat::NowInMicrosec();
+
+  // Walk the bytecode without executing ops to collect the OpEnvs to be created.
+  auto ctx = CreateVMContext(func_index, inputs);
+  ctx->warmup = true;
+  ctx.PushFrame(ctx->entry_func_index, ctx->inputs, -1);
+  RunLoop(ctx);
+  if (use_cuda_ && ctx->current_stream_id != 0) {
+    OpEnv::SetStreamForAllBackends(devices_[0], nullptr);
+  }
+  auto& tasks = ctx->warmup_tasks;
+
+  // Create the OpEnvs concurrently. Each worker enters a copy of the current pass context,
+  // because the pass context is thread local and may be updated when building kernels.
+  if (num_workers <= 0) {
+    num_workers = static_cast<int>(std::thread::hardware_concurrency());
+  }
+  num_workers = std::max(1, std::min(num_workers, static_cast<int>(tasks.size())));
+  pass::PassContext pass_ctx = pass::PassContext::Current();
+  std::vector<OpEnvPtr> op_envs(tasks.size());
+  std::vector<std::string> errors(tasks.size());
+  std::atomic<size_t> next_task{0};
+  auto workload = [&]() {
+    pass::PassContext local_pass_ctx(make_object<tvm::transform::PassContextNode>(*pass_ctx.get()));
+    tvm::With<pass::PassContext> scope(local_pass_ctx);
+    for (size_t i = next_task++; i < tasks.size(); i = next_task++) {
+      try {
+        op_envs[i] = Dispatch(tasks[i].call_values);
+      } catch (const dmlc::Error& e) {
+        errors[i] = e.what();
+      }
+    }
+  };
+  std::vector<std::thread> threads;
+  for (int i = 0; i < num_workers; ++i) {
+    threads.emplace_back(workload);
+  }
+  for (auto& thread : threads) {
+    thread.join();
+  }
+
+  // Fill the OpEnv caches.
+  for (size_t i = 0; i < tasks.size(); ++i) {
+    CHECK(errors[i].empty()) << "Failed to create OpEnv during warmup: " << errors[i];
+    CHECK(op_envs[i] != nullptr) << "ValueError: Cannot dispatch "
+                                 << utils::GetCalleeName(tasks[i].call_values->callee) << " @"
+                                 << devices_[0].c_str();
+    PrepareRequests(ctx, op_envs[i]);
+    op_env_cache_[tasks[i].func_index]->Get(tasks[i].pc)->Set(tasks[i].sig, op_envs[i]);
+  }
+  op_env_cache_misses_ += tasks.size();
+  auto end = raf::profiler::ProfileStat::NowInMicrosec();
+
+  Map<String, ObjectRef> ret;
+  // One OpEnv per op instance and signature. Op instances with the same kernel share the
+  // compiled module through the kernel caches, so this may exceed the number of kernels.
+  ret.Set("num_op_envs", Integer(static_cast<int>(tasks.size())));
+  ret.Set("elapsed_ms", FloatImm(DataType::Float(64), static_cast<double>(end - beg) / 1000.0));
+  return ret;
+}
+
+Map<String, Integer> VirtualMachine::GetStats() const {
+  auto make_int = [](int64_t value) { return Integer(IntImm(DataType::Int(64), value)); };
+  Map<String, Integer> stats;
+  stats.Set("OpEnvFastPathHit", make_int(op_env_fast_path_hits_.load()));
+  stats.Set("OpEnvCacheHit", make_int(op_env_cache_hits_.load()));
+  stats.Set("OpEnvCacheMiss", make_int(op_env_cache_misses_.load()));
+  auto infer_type_cache = infer_type_cache_.GetSizeAndEvictions();
+  stats.Set("InferTypeCacheHit", make_int(infer_type_cache_hits_.load()));
+  stats.Set("InferTypeCacheMiss", make_int(infer_type_cache_misses_.load()));
+  stats.Set("InferTypeCacheEvict", make_int(infer_type_cache.second));
+  stats.Set("InferTypeCacheSize", make_int(infer_type_cache.first));
+  return stats;
+}
+
 Device VirtualMachine::GetParamsDevice() const {
   CHECK(!devices_.empty()) << "Devices have not been initialized yet.";
 
@@ -505,7 +872,8 @@ inline std::shared_ptr<Memory> VirtualMachine::Alloc(const VMContext& ctx, Devic
       // We can not use async memory allocation in cuda graph tracing mode
       return memory_pool::Memory::Alloc(dev, nbytes, alignment);
     } else {
-      auto stream = utils::GetStreamById(ctx, ctx->current_device_id, ctx->current_stream_id);
+      auto stream = utils::GetStreamById(ctx, DevType::kCUDA(), ctx->current_device_id,
+                                         ctx->current_stream_id);
       return memory_pool::Memory::AllocAsync(dev, nbytes, stream->data(), alignment);
     }
 #else
@@ -694,6 +1062,8 @@ void VirtualMachine::HandleGetField(VMContext& ctx, const Instruction& instr) {
 }
 
 void VirtualMachine::HandleIf(VMContext& ctx, const Instruction& instr) {
+  // The condition may be computed by an op on a CPU stream.
+  utils::WaitCPUStreams(ctx);
   int32_t test_val = ctx.LoadTensorInt(instr.if_op.test);
   int32_t target_val = ctx.LoadScalarInt(instr.if_op.target);
 
@@ -734,8 +1104,9 @@ void VirtualMachine::HandleAllocTensor(VMContext& ctx, const Instruction& instr)
   if (instr.alloc_tensor.own) {
     mem = storage->buffer;
   }
+  auto data = static_cast<uint8_t*>(storage->buffer->data) + instr.alloc_tensor.offset;
   auto tensor = TensorValue::Assemble(storage->buffer->device, instr.alloc_tensor.dtype, shape, {},
-                                      storage->buffer->data, mem);
+                                      data, mem);
   ctx.WriteRegister(instr.dst, tensor);
   ctx->pc++;
 }
@@ -754,8 +1125,9 @@ void VirtualMachine::HandleAllocTensorReg(VMContext& ctx, const Instruction& ins
   if (instr.alloc_tensor_reg.own) {
     mem = storage->buffer;
   }
+  auto data = static_cast<uint8_t*>(storage->buffer->data) + instr.alloc_tensor_reg.offset;
   auto tensor = TensorValue::Assemble(storage->buffer->device, instr.alloc_tensor_reg.dtype, shape,
-                                      {}, storage->buffer->data, mem);
+                                      {}, data, mem);
   ctx.WriteRegister(instr.dst, tensor);
   ctx->pc++;
 }
@@ -818,22 +1190,41 @@ void VirtualMachine::HandleInvokeJit(VMContext& ctx, const Instruction& instr) {
   OpEnvPtr op_env;
   std::vector<Value> inputs;
   Value output;
-  std::string op_env_cache_key;
+  std::string readable_sig;
 
-  std::tie(op_env, inputs, output, op_env_cache_key) = PrepareOpEnv(ctx, instr);
+  std::tie(op_env, inputs, output, readable_sig) = PrepareOpEnv(ctx, instr);
+  if (ctx->warmup) {
+    // The OpEnv is created later by the warmup
+    ctx->pc++;
+    return;
+  }
+  if (!dryrun_ && !use_cuda_ && ctx->current_stream_id != 0) {
+    LaunchOnCPUStream(ctx, op_env, std::move(inputs), std::move(output), readable_sig);
+    ctx->pc++;
+    return;
+  }
+  if (!dryrun_ && ctx->has_cpu_streams) {
+    // The ops on the default stream run on the VM thread, so they wait for the ops launched to
+    // the CPU streams, whose results they may read, like the legacy CUDA default stream.
+    utils::WaitCPUStreams(ctx);
+  }
   if (!dryrun_) {  // Skip the execution in dryrun mode
 #ifdef RAF_USE_CUDA
     if (use_cuda_) {
       WITH_CUDA_PROFILER(
           devices_[0],
-          utils::GetStreamById(ctx, ctx->current_device_id, ctx->current_stream_id)->data(),
-          op_env->name(), utils::GetStreamName(ctx->current_stream_id), {op_env_cache_key},
+          utils::GetStreamById(ctx, DevType::kCUDA(), ctx->current_device_id,
+                               ctx->current_stream_id)
+              ->data(),
+          op_env->name(), utils::GetStreamName(ctx->current_stream_id), {readable_sig},
           { op_env->Execute(inputs, output); });
     } else
 #endif
     {  // cpu
-      WITH_BASE_PROFILER(devices_[0], op_env->name(), "ComputationOperator", {op_env_cache_key},
-                         { op_env->Execute(inputs, output); });
+      WITH_LIGHT_PROFILER(devices_[0], op_env->name(), "ComputationOperator", {
+        WITH_BASE_PROFILER(devices_[0], op_env->name(), "ComputationOperator", {readable_sig},
+                           { op_env->Execute(inputs, output); });
+      });
     }
   }
   PROFILE_MEMORY(devices_[0], op_env->name());
@@ -853,6 +1244,36 @@ void VirtualMachine::HandleInvokeJit(VMContext& ctx, const Instruction& instr) {
   ctx->pc++;
 }
 
+void VirtualMachine::LaunchOnCPUStream(VMContext& ctx, const OpEnvPtr& op_env,
+                                       std::vector<Value> inputs, Value output,
+                                       const std::string& readable_sig) {
+  auto task = std::make_shared<AsyncOpTask>();
+  task->op_env = op_env;
+  task->inputs = std::move(inputs);
+  task->output = std::move(output);
+  // The workspace is held by the task until the stream is synchronized.
+  std::shared_ptr<Requests> requests = op_env->GetRequests();
+  for (size_t i = 0; i < requests->workspace.size(); ++i) {
+    Requests::WorkspaceRequest& entry = requests->workspace[i];
+    if (entry.nbytes > 0 && entry.memory != nullptr) {
+      task->workspace.push_back(std::move(entry.memory));
+    }
+  }
+  ctx->async_op_tasks.push_back(task);
+  auto stream =
+      utils::GetStreamById(ctx, DevType::kCPU(), ctx->current_device_id, ctx->current_stream_id);
+  Device device = devices_[0];
+  // The task is owned by the context, so the memory is not released by the worker threads.
+  AsyncOpTask* task_ptr = task.get();
+  auto func = [device, task_ptr, readable_sig]() {
+    WITH_LIGHT_PROFILER(device, task_ptr->op_env->name(), "ComputationOperator", {
+      WITH_BASE_PROFILER(device, task_ptr->op_env->name(), "ComputationOperator", {readable_sig},
+                         { task_ptr->op_env->Execute(task_ptr->inputs, task_ptr->output); });
+    });
+  };
+  DeviceAPI::Get(DevType::kCPU())->LaunchHostFunc(stream->data(), std::move(func));
+}
+
 void VirtualMachine::HandleSetShape(VMContext& ctx, const Instruction& instr) {
   auto data = Downcast<TensorValue>(ctx.ReadRegister(instr.set_shape.data));
   auto raw_shape = ctx.ReadRegister(instr.set_shape.shape);
@@ -862,6 +1283,7 @@ void VirtualMachine::HandleSetShape(VMContext& ctx, const Instruction& instr) {
       shape.push_back(Downcast<IntValue>(tuple->fields[i])->value);
     }
   } else {
+    utils::WaitCPUStreams(ctx);
     raw_shape = CopyTo(raw_shape, Device(DevType::kCPU(), 0));
     shape = common::shape_utils::GetShapeVecFromData(raw_shape);
   }
@@ -884,12 +1306,50 @@ bool VirtualMachine::HandleRet(VMContext& ctx, const Instruction& instr) {
 }
 
 void VirtualMachine::HandleInferType(VMContext& ctx, const Instruction& instr) {
+  // The type functions may read the values computed by the ops on the CPU streams.
+  if (ctx->has_cpu_streams) {
+    utils::WaitCPUStreams(ctx);
+  }
   Array<Value> args;
   for (Index i = 0; i < instr.infer_type.num_args; i++) {
     args.push_back(ctx.ReadRegister(instr.infer_type.args[i]));
   }
-  // infer type
   const Value& callee = ctx.ReadRegister(instr.infer_type.op_reg);
+  // Lookup the memo table. The key is the instruction, the callee and the argument signature.
+  static thread_local OpEnvSignature sig;
+  bool memoizable = infer_type_cache_.capacity() > 0;
+  if (memoizable) {
+    sig.Clear();
+    sig.Append(ctx->func_index);
+    sig.Append(ctx->pc);
+    // Closures are conservatively assumed to contain ops that read the data on devices.
+    bool read_device_data = true;
+    if (const auto* opv = callee.as<OpValueObj>()) {
+      sig.Append(reinterpret_cast<int64_t>(opv->op.get()));
+      read_device_data = IsValueDependentTypeOp(opv->op);
+    } else if (const auto* closure = callee.as<ClosureValueObj>()) {
+      sig.Append(reinterpret_cast<int64_t>(closure->func.get()));
+    } else {
+      memoizable = false;
+    }
+    for (size_t i = 0; memoizable && i < args.size(); ++i) {
+      if (!utils::InferTypeSignature(&sig, args[i], read_device_data)) {
+        memoizable = false;
+        break;
+      }
+    }
+  }
+  if (memoizable) {
+    Value cached = infer_type_cache_.Get(sig);
+    if (cached.defined()) {
+      infer_type_cache_hits_++;
+      ctx.WriteRegister(instr.dst, cached);
+      ctx->pc++;
+      return;
+    }
+  }
+  infer_type_cache_misses_++;
+  // infer type
   Type ret_type;
   Array<Value> ret_tup;
   if (const auto* opv = callee.as<OpValueObj>()) {
@@ -900,7 +1360,9 @@ void VirtualMachine::HandleInferType(VMContext& ctx, const Instruction& instr) {
     ret_type = ti->func(call_values);
     ret_tup.push_back(NullValue<Value>());
   } else {
-    auto func = callee.as<ClosureValueObj>()->func;
+    const auto* closure = callee.as<ClosureValueObj>();
+    CHECK(closure) << "InferType expects an op or a closure, but got " << callee->GetTypeKey();
+    auto func = closure->func;
     CHECK_EQ(func->params.size(), args.size());
     auto new_func =
         Function(func->params, func->body, {}, func->type_params, func->attrs, func->span);
@@ -929,16 +1391,23 @@ void VirtualMachine::HandleInferType(VMContext& ctx, const Instruction& instr) {
   } else {
     LOG(FATAL) << "Unknown type " << ret_type->_type_key;
   }
-  ctx.WriteRegister(instr.dst, TupleValue::make(ret_tup));
+  auto ret = TupleValue::make(ret_tup);
+  if (memoizable) {
+    infer_type_cache_.Set(sig, ret);
+  }
+  ctx.WriteRegister(instr.dst, ret);
   ctx->pc++;
 }
 
 void VirtualMachine::HandleCudaSetStream(VMContext& ctx, const Instruction& instr) {
   Index device_id = instr.cuda_set_stream.device_id;
   Index stream_id = instr.cuda_set_stream.stream_id;
-  Device device(DevType::kCUDA(), static_cast<int>(device_id));
-  auto stream = utils::GetStreamById(ctx, device_id, stream_id);
-  OpEnv::SetStreamForAllBackends(device, stream->data());
+  Device device(StreamDeviceType(), static_cast<int>(device_id));
+  auto stream = utils::GetStreamById(ctx, StreamDeviceType(), device_id, stream_id);
+  if (use_cuda_) {
+    // The CPU streams are task queues of the VM, which the backends know nothing about.
+    OpEnv::SetStreamForAllBackends(device, stream->data());
+  }
   ctx->current_device_id = device_id;
   ctx->current_stream_id = stream_id;
   ctx->pc++;
@@ -951,10 +1420,9 @@ void VirtualMachine::HandleCudaAddEvent(VMContext& ctx, const Instruction& instr
     stream_id = ctx->current_stream_id;
   }
   Index event_id = instr.cuda_event.event_id;
-  auto event = utils::GetEventById(ctx, device_id, event_id);
-  auto stream = utils::GetStreamById(ctx, device_id, stream_id);
-  auto api = DeviceAPI::Get(DevType::kCUDA());
-  Device device(DevType::kCUDA(), static_cast<int>(device_id));
+  auto event = utils::GetEventById(ctx, StreamDeviceType(), device_id, event_id);
+  auto stream = utils::GetStreamById(ctx, StreamDeviceType(), device_id, stream_id);
+  auto api = DeviceAPI::Get(StreamDeviceType());
   api->EventRecordOnStream(event->data(), stream->data());
   ctx->pc++;
 }
@@ -966,21 +1434,21 @@ void VirtualMachine::HandleCudaWaitEvent(VMContext& ctx, const Instruction& inst
     stream_id = ctx->current_stream_id;
   }
   Index event_id = instr.cuda_event.event_id;
-  auto event = utils::GetEventById(ctx, device_id, event_id);
-  auto stream = utils::GetStreamById(ctx, device_id, stream_id);
-  auto api = DeviceAPI::Get(DevType::kCUDA());
+  auto event = utils::GetEventById(ctx, StreamDeviceType(), device_id, event_id);
+  auto stream = utils::GetStreamById(ctx, StreamDeviceType(), device_id, stream_id);
+  auto api = DeviceAPI::Get(StreamDeviceType());
   api->StreamWaitEvent(stream->data(), event->data());
   ctx->pc++;
 }
 
 void VirtualMachine::HandleCudaStreamBarrier(VMContext& ctx, const Instruction& instr) {
   if (ctx->current_barrier_event_index >= ctx->barrier_events.size()) {
-    Device device(DevType::kCUDA(), static_cast<int>(ctx->current_device_id));
+    Device device(StreamDeviceType(), static_cast<int>(ctx->current_device_id));
     ctx->barrier_events.resize(ctx->current_barrier_event_index + 1);
     ctx->barrier_events[ctx->current_barrier_event_index] =
         EventPool::Get(device)->GetEvent(0x02 /*cudaEventDisableTiming*/);
   }
-  auto api = DeviceAPI::Get(DevType::kCUDA());
+  auto api = DeviceAPI::Get(StreamDeviceType());
   /*
    * We implement the cuda stream barrier by recording an event on the default stream. See also
    * the cudaEventRecord API in
@@ -998,101 +1466,93 @@ void VirtualMachine::HandleCudaStreamBarrier(VMContext& ctx, const Instruction&
 
 std::tuple<std::shared_ptr<OpEnv>, std::vector<Value>, Value, std::string>
 VirtualMachine::PrepareOpEnv(const VMContext& ctx, const Instruction& instr) {
+  // The signature buffer is reused across instructions to avoid memory allocation.
+  static thread_local OpEnvSignature sig;
   Index num_inputs = instr.invoke_jit.arity - instr.invoke_jit.output_size;
   Array<Value> args;
   Value output;
 
-  // extract the input args and prepare the hash key to query op env
-  std::ostringstream os;
+  // extract the input args and prepare the signature to query op env
+  sig.Clear();
   for (Index i = 0; i < num_inputs; i++) {
     Index reg_idx = instr.invoke_jit.args[i];
     auto reg = ctx.ReadRegister(reg_idx);
     args.push_back(reg);
     if (ctx.IsConst(reg_idx)) {
-      // Skip constatnts in the hash key
+      // Constants are not distinguished by their shapes
+      sig.Append(utils::kSigConstTag);
       continue;
     }
     if (auto tensor = reg.as<TensorValueObj>()) {
-      utils::TensorRepr(os, tensor);
+      utils::TensorSignature(&sig, tensor);
     } else if (auto tup = reg.as<TupleValueObj>()) {
-      os << "(";
+      sig.Append(utils::kSigTupleTag);
+      sig.Append(static_cast<int64_t>(tup->fields.size()));
       for (auto field : tup->fields) {
         auto t = field.as<TensorValueObj>();
         if (t != nullptr) {
-          utils::TensorRepr(os, t);
+          utils::TensorSignature(&sig, t);
+        } else {
+          sig.Append(utils::kSigNonTensorTag);
         }
-        os << ",";
       }
-      os << ")";
     } else {
       LOG(FATAL) << "Unsupported non-const register type: " << reg->GetTypeKey();
     }
-    os << ",";
   }
 
   // extract the output
-  os << "|";
+  sig.Append(utils::kSigOutputTag);
   if (instr.invoke_jit.output_size == 1) {
     output = ctx.ReadRegister(instr.invoke_jit.args[num_inputs]);
-    utils::TensorRepr(os, output.as<TensorValueObj>());
+    utils::TensorSignature(&sig, output.as<TensorValueObj>());
   } else {
-    os << "(";
     Array<Value> outs;
     for (Index i = num_inputs; i < instr.invoke_jit.arity; i++) {
       Value val = ctx.ReadRegister(instr.invoke_jit.args[i]);
       outs.push_back(val);
-      utils::TensorRepr(os, val.as<TensorValueObj>());
-      os << ",";
+      utils::TensorSignature(&sig, val.as<TensorValueObj>());
     }
-    os << ")";
     output = TupleValue::make(outs);
   }
-  std::string op_env_cache_key = os.str();
 
   // check the OpEnv cache
-  std::shared_ptr<OpEnv> op_env;
+  bool fast_path = false;
   auto op_env_cache = op_env_cache_[ctx->func_index]->Get(ctx->pc);
-  if (auto p = op_env_cache->Get(op_env_cache_key)) {
+  std::shared_ptr<OpEnv> op_env = op_env_cache->Get(sig, &fast_path);
+  if (op_env != nullptr) {
     // Cache hit. Reuse the OpEnv from the cache.
-    op_env = *p;
-  } else {
-    // Create a new OpEnv.
-    auto call_values = CallValues::make();
-    Value callee = ctx.ReadRegister(instr.invoke_jit.op_reg);
-    const auto* op = callee.as<OpValueObj>();
-    const auto* closure = callee.as<ClosureValueObj>();
-    call_values->callee = callee;
-    if (op) {
-      call_values->args = GetOpAttr<FRAFSchema>(op->op, "FRAFSchema")(args);
+    if (fast_path) {
+      op_env_fast_path_hits_++;
     } else {
-      call_values->args = MakeListArgs(args);
+      op_env_cache_hits_++;
+    }
+  } else {
+    auto call_values = MakeCallValues(ctx, instr, args, output);
+    if (ctx->warmup) {
+      // Defer the OpEnv creation to the warmup workers.
+      OpEnvSignature task_key = sig;
+      task_key.Append(ctx->func_index);
+      task_key.Append(ctx->pc);
+      if (ctx->warmup_queued.insert(std::move(task_key)).second) {
+        ctx->warmup_tasks.push_back({ctx->func_index, ctx->pc, sig, call_values});
+      }
+      return std::make_tuple(OpEnvPtr(), std::vector<Value>(), output, std::string());
     }
-    call_values->device = devices_[0];
-    call_values->out = output;
+    op_env_cache_misses_++;
+    // Create a new OpEnv.
     op_env = Dispatch(call_values);
     CHECK(op_env != nullptr) << "ValueError: Cannot dispatch "
-                             << (op ? op->op->name : PrettyPrint(closure->func)) << " @"
+                             << utils::GetCalleeName(call_values->callee) << " @"
                              << call_values->device.c_str();
-    std::shared_ptr<Requests> requests = op_env->GetRequests();
-    // prepare distributed requests
-    for (size_t i = 0; i < requests->distributed.size(); i++) {
-      Requests::DistributedRequest& entry = requests->distributed[i];
-      *entry.dest = (void*)(Communicator::Get(entry.name, entry.rank_list).as<CommunicatorObj>());
-    }
-#ifdef RAF_USE_CUDA
-    // prepare cuda stream requests
-    for (size_t i = 0; i < requests->stream.size(); i++) {
-      Requests::StreamRequest& entry = requests->stream[i];
-      // currently ignores the stream_idx field in requests, all requests with the same tag_idx will
-      // get the same cuda stream in vm
-      std::shared_ptr<Stream> stream =
-          utils::GetStreamById(ctx, entry.device.device_id(), entry.tag_idx);
-      *entry.dest = stream->data();
-      entry.stream = stream;
-    }
-#endif
+    PrepareRequests(ctx, op_env);
     // add to cache
-    op_env_cache->Set(op_env_cache_key, op_env);
+    op_env_cache->Set(sig, op_env);
+  }
+
+  if (ctx->warmup) {
+    // No need to allocate the workspace because the op is not executed.
+    return std::make_tuple(op_env, std::vector<Value>(), output, std::string());
   }
 
   std::shared_ptr<Requests> requests = op_env->GetRequests();
@@ -1108,7 +1568,48 @@ VirtualMachine::PrepareOpEnv(const VMContext& ctx, const Instruction& instr) {
     CHECK_GE(i, 0) << "Invalid input index: " << i;
     inputs.push_back(args[i]);
   }
-  return std::make_tuple(op_env, std::move(inputs), std::move(output), op_env_cache_key);
+  // The readable signature is only used to annotate the profiling results.
+  std::string readable_sig;
+  if (profiler::Profiler::Get()->IsProfiling(1)) {
+    readable_sig = utils::ReadableSignature(args, output, ctx, instr);
+  }
+  return std::make_tuple(op_env, std::move(inputs), std::move(output), std::move(readable_sig));
+}
+
+CallValues VirtualMachine::MakeCallValues(const VMContext& ctx, const Instruction& instr,
+                                          const Array<Value>& args, const Value& output) {
+  auto call_values = CallValues::make();
+  Value callee = ctx.ReadRegister(instr.invoke_jit.op_reg);
+  call_values->callee = callee;
+  if (const auto* op = callee.as<OpValueObj>()) {
+    call_values->args = GetOpAttr<FRAFSchema>(op->op, "FRAFSchema")(args);
+  } else {
+    call_values->args = MakeListArgs(args);
+  }
+  call_values->device = devices_[0];
+  call_values->out = output;
+  return call_values;
+}
+
+void VirtualMachine::PrepareRequests(const VMContext& ctx, const OpEnvPtr& op_env) {
+  std::shared_ptr<Requests> requests = op_env->GetRequests();
+  // prepare distributed requests
+  for (size_t i = 0; i < requests->distributed.size(); i++) {
+    Requests::DistributedRequest& entry = requests->distributed[i];
+    *entry.dest = (void*)(Communicator::Get(entry.name, entry.rank_list).as<CommunicatorObj>());
+  }
+#ifdef RAF_USE_CUDA
+  // prepare cuda stream requests
+  for (size_t i = 0; i < requests->stream.size(); i++) {
+    Requests::StreamRequest& entry = requests->stream[i];
+    // currently ignores the stream_idx field in requests, all requests with the same tag_idx will
+    // get the same cuda stream in vm
+    std::shared_ptr<Stream> stream =
+        utils::GetStreamById(ctx, DevType::kCUDA(), entry.device.device_id(), entry.tag_idx);
+    *entry.dest = stream->data();
+    entry.stream = stream;
+  }
+#endif
 }
 
 tvm::runtime::Module CreateVirtualMachine(const Executable* exec, bool enable_cuda_graph,
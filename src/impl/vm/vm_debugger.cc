@@ -85,9 +85,14 @@ void VMDebugger::HandleInvokeJit(VMContext& ctx, const Instruction& instr) {
   OpEnvPtr op_env;
   std::vector<Value> inputs;
   Value output;
-  std::string op_env_cache_key;
+  std::string readable_sig;
 
-  std::tie(op_env, inputs, output, op_env_cache_key) = PrepareOpEnv(ctx, instr);
+  std::tie(op_env, inputs, output, readable_sig) = PrepareOpEnv(ctx, instr);
+  if (ctx->warmup) {
+    // The OpEnv is created later by the warmup
+    ctx->pc++;
+    return;
+  }
   op_env->Execute(inputs, output);
   ctx->pc++;
 
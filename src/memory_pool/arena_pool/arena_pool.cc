@@ -0,0 +1,432 @@
+/*
+ * Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ * SPDX-License-Identifier: Apache-2.0
+ */
+
+/*!
+ * \file src/memory_pool/arena_pool/arena_pool.cc
+ * \brief A memory pool that carves best-fit blocks out of large memory segments
+ */
+#include <algorithm>
+#include <functional>
+#include <mutex>
+#include <set>
+#include <unordered_map>
+#include "raf/device_api.h"
+#include "raf/memory_pool.h"
+#include "raf/registry.h"
+
+namespace raf {
+namespace memory_pool {
+namespace arena_pool {
+
+using device_api::DeviceAPI;
+
+/*! \brief All block sizes are rounded up to a multiple of this size. */
+static const int64_t kMinBlockSize = 512;
+/*! \brief Requests up to this size are served from the small segments. */
+static const int64_t kSmallSize = 1048576;
+/*! \brief The size of a segment for small requests. */
+static const int64_t kSmallSegmentSize = 2097152;
+/*! \brief The size of a segment for large requests. */
+static const int64_t kLargeSegmentSize = 20971520;
+/*! \brief Requests of at least this size get a dedicated segment. */
+static const int64_t kMinLargeAlloc = 10485760;
+/*! \brief Dedicated segments are rounded up to a multiple of this size. */
+static const int64_t kRoundLarge = 2097152;
+/*! \brief The alignment of the segments allocated from the device. */
+static const int64_t kSegmentAlignment = 4096;
+
+inline int64_t RoundUp(int64_t nbytes, int64_t unit) {
+  return (nbytes + unit - 1) / unit * unit;
+}
+
+/*!
+ * \brief A contiguous range of memory in a segment. Blocks in the same segment form a doubly
+ * linked list in the address order, so that adjacent free blocks can be coalesced.
+ */
+struct Block {
+  Block(void* segment, int64_t size, char* ptr) : segment(segment), size(size), ptr(ptr) {
+  }
+
+  /*! \brief The base address of the segment that this block belongs to. */
+  void* segment;
+  /*! \brief The size of this block in bytes. */
+  int64_t size;
+  /*! \brief The start address of this block. */
+  char* ptr;
+  /*! \brief Whether this block is being used. */
+  bool allocated = false;
+  /*! \brief The previous block in the same segment. */
+  Block* prev = nullptr;
+  /*! \brief The next block in the same segment. */
+  Block* next = nullptr;
+};
+
+/*! \brief Order the free blocks by (size, address), so best-fit is a lower_bound. */
+struct BlockComparator {
+  bool operator()(const Block* a, const Block* b) const {
+    if (a->size != b->size) {
+      return a->size < b->size;
+    }
+    return std::less<char*>()(a->ptr, b->ptr);
+  }
+};
+
+using BlockSet = std::set<Block*, BlockComparator>;
+
+/*!
+ * \brief The segments and blocks of an arena pool. It is shared by the pool and all memory
+ * chunks allocated from it, because the chunks may outlive the pool after it is removed.
+ */
+class Arena {
+ public:
+  explicit Arena(std::shared_ptr<DeviceAPI> api, int64_t pool_limit)
+      : api_(std::move(api)), max_pool_size_(pool_limit) {
+  }
+
+  ~Arena() {
+    // All chunks have been returned at this point, so every segment is a single free block.
+    for (BlockSet* blocks : {&small_blocks_, &large_blocks_}) {
+      for (Block* block : *blocks) {
+        delete block;
+      }
+      blocks->clear();
+    }
+    for (const auto& kv : segments_) {
+      api_->FreeMemory(kv.first);
+    }
+  }
+
+  /*!
+   * \brief Allocate a block with the best-fit strategy.
+   * \param nbytes The size of the block, which must be a multiple of kMinBlockSize.
+   * \return The allocated block.
+   */
+  Block* Alloc(int64_t nbytes) {
+    std::lock_guard<std::mutex> lock(mu_);
+    bool is_small = nbytes <= kSmallSize;
+    BlockSet& free_blocks = is_small ? small_blocks_ : large_blocks_;
+
+    Block* block = nullptr;
+    Block key(nullptr, nbytes, nullptr);
+    auto it = free_blocks.lower_bound(&key);
+    if (it != free_blocks.end()) {
+      block = *it;
+      free_blocks.erase(it);
+    } else {
+      int64_t segment_size = GetSegmentSize(nbytes);
+      void* data = AllocSegment(segment_size);
+      block = new Block(data, segment_size, static_cast<char*>(data));
+    }
+
+    // Split the block if the remaining part is worth being reused. Large blocks are only split
+    // when the remaining part is not small, to avoid carving the large segments into pieces.
+    int64_t remaining_size = block->size - nbytes;
+    if ((is_small && remaining_size >= kMinBlockSize) ||
+        (!is_small && remaining_size > kSmallSize)) {
+      Block* remaining = new Block(block->segment, remaining_size, block->ptr + nbytes);
+      remaining->prev = block;
+      remaining->next = block->next;
+      if (block->next != nullptr) {
+        block->next->prev = remaining;
+      }
+      block->next = remaining;
+      block->size = nbytes;
+      free_blocks.insert(remaining);
+    }
+
+    block->allocated = true;
+    used_bytes_ += block->size;
+    peak_used_bytes_ = std::max(peak_used_bytes_, used_bytes_);
+    return block;
+  }
+
+  /*!
+   * \brief Return a block to the arena and coalesce it with its adjacent free blocks.
+   * \param block The block to be freed.
+   */
+  void Free(Block* block) {
+    std::lock_guard<std::mutex> lock(mu_);
+    BlockSet& free_blocks = IsSmallSegment(block) ? small_blocks_ : large_blocks_;
+    block->allocated = false;
+    used_bytes_ -= block->size;
+    Merge(block, block->prev, &free_blocks);
+    Merge(block, block->next, &free_blocks);
+    free_blocks.insert(block);
+  }
+
+  std::pair<int64_t, int64_t> GetPoolSize() {
+    std::lock_guard<std::mutex> lock(mu_);
+    return {used_bytes_, pool_bytes_};
+  }
+
+  std::unordered_map<std::string, float> GetPoolStats() {
+    std::lock_guard<std::mutex> lock(mu_);
+    int64_t free_bytes = 0;
+    int64_t largest_free_bytes = 0;
+    for (BlockSet* blocks : {&small_blocks_, &large_blocks_}) {
+      for (Block* block : *blocks) {
+        free_bytes += block->size;
+      }
+      if (!blocks->empty()) {
+        largest_free_bytes = std::max(largest_free_bytes, (*blocks->rbegin())->size);
+      }
+    }
+    // The fraction of the free memory that cannot be used by a request of the total free size.
+    float fragmentation = (free_bytes > 0) ? 1.0 - 1.0 * largest_free_bytes / free_bytes : 0.0;
+    return {
+        {"used", BytesToMegaBytes(used_bytes_)},
+        {"pool", BytesToMegaBytes(pool_bytes_)},
+        {"peak_used", BytesToMegaBytes(peak_used_bytes_)},
+        {"peak_pool", BytesToMegaBytes(peak_pool_bytes_)},
+        {"free", BytesToMegaBytes(free_bytes)},
+        {"largest_free_block", BytesToMegaBytes(largest_free_bytes)},
+        {"fragmentation", fragmentation},
+        {"num_segments", static_cast<float>(segments_.size())},
+        {"num_free_blocks", static_cast<float>(small_blocks_.size() + large_blocks_.size())},
+    };
+  }
+
+ private:
+  inline float BytesToMegaBytes(float nbytes) {
+    return nbytes / 1048576.0;
+  }
+
+  inline bool IsSmallSegment(const Block* block) {
+    return segments_.at(block->segment) == kSmallSegmentSize;
+  }
+
+  int64_t GetSegmentSize(int64_t nbytes) {
+    if (nbytes <= kSmallSize) {
+      return kSmallSegmentSize;
+    } else if (nbytes < kMinLargeAlloc) {
+      return kLargeSegmentSize;
+    }
+    return RoundUp(nbytes, kRoundLarge);
+  }
+
+  /*! \brief Merge the free block src into its adjacent block dst, and delete src. */
+  void Merge(Block* dst, Block* src, BlockSet* free_blocks) {
+    if (src == nullptr || src->allocated) {
+      return;
+    }
+    free_blocks->erase(src);
+    if (dst->prev == src) {
+      dst->ptr = src->ptr;
+      dst->prev = src->prev;
+      if (dst->prev != nullptr) {
+        dst->prev->next = dst;
+      }
+    } else {
+      dst->next = src->next;
+      if (dst->next != nullptr) {
+        dst->next->prev = dst;
+      }
+    }
+    dst->size += src->size;
+    delete src;
+  }
+
+  void* TryAllocDeviceMemory(int64_t nbytes) {
+    try {
+      return api_->AllocMemory(nbytes, kSegmentAlignment);
+    } catch (const dmlc::Error& e) {
+      return nullptr;
+    }
+  }
+
+  /*! \brief Return the segments without any used block to the device. */
+  int64_t ReleaseFreeSegments() {
+    int64_t total_free = 0;
+    for (BlockSet* blocks : {&small_blocks_, &large_blocks_}) {
+      for (auto it = blocks->begin(); it != blocks->end();) {
+        Block* block = *it;
+        if (block->prev == nullptr && block->next == nullptr) {
+          api_->FreeMemory(block->segment);
+          segments_.erase(block->segment);
+          pool_bytes_ -= block->size;
+          total_free += block->size;
+          delete block;
+          it = blocks->erase(it);
+        } else {
+          ++it;
+        }
+      }
+    }
+    return total_free;
+  }
+
+  void* AllocSegment(int64_t nbytes) {
+    void* data = nullptr;
+    bool exceed_limit = max_pool_size_ > 0 && pool_bytes_ + nbytes > max_pool_size_;
+    if (!exceed_limit) {
+      data = TryAllocDeviceMemory(nbytes);
+    }
+    if (data == nullptr) {
+      // Out of memory or exceed the user-specified limitation, release the free segments.
+      int64_t free_nbytes = ReleaseFreeSegments();
+      DLOG(WARNING) << "Failed to allocate a segment of " << BytesToMegaBytes(nbytes)
+                    << " MBs. Released " << BytesToMegaBytes(free_nbytes)
+                    << " MBs of free segments";
+      data = TryAllocDeviceMemory(nbytes);
+    }
+    if (data == nullptr) {
+      LOG(FATAL) << "Out-Of-Memory. Tried to allocate a segment of " << BytesToMegaBytes(nbytes)
+                 << " MBs; Already allocated " << BytesToMegaBytes(pool_bytes_) << " MBs and used "
+                 << BytesToMegaBytes(used_bytes_) << " MBs";
+      throw;
+    }
+    segments_[data] = nbytes;
+    pool_bytes_ += nbytes;
+    peak_pool_bytes_ = std::max(peak_pool_bytes_, pool_bytes_);
+    return data;
+  }
+
+  /*! \brief The pointer to the DeviceAPI which determines the context of memory. */
+  std::shared_ptr<DeviceAPI> api_;
+  /*! \brief The maximum allowed size (bytes) of all segments. 0 means no limit. */
+  int64_t max_pool_size_ = 0;
+  /*! \brief The free blocks in the small segments. */
+  BlockSet small_blocks_;
+  /*! \brief The free blocks in the large segments. */
+  BlockSet large_blocks_;
+  /*! \brief Map from the base address of a segment to its size. */
+  std::unordered_map<void*, int64_t> segments_;
+  /*! \brief The total size of the allocated blocks in bytes. */
+  int64_t used_bytes_ = 0;
+  /*! \brief The total size of the segments in bytes. */
+  int64_t pool_bytes_ = 0;
+  /*! \brief The peak of used_bytes_. */
+  int64_t peak_used_bytes_ = 0;
+  /*! \brief The peak of pool_bytes_. */
+  int64_t peak_pool_bytes_ = 0;
+  /*! \brief The mutex protecting the blocks and the segments. */
+  std::mutex mu_;
+};
+
+/*!
+ * \brief A wrapper which holds a block allocated from an arena. The block is returned to the
+ * arena when this object is destructed.
+ *
+ * \sa ArenaMemory
+ */
+class ArenaMemory final : public Memory {
+ public:
+  explicit ArenaMemory(void* data, const Device& dev, Block* block, std::shared_ptr<Arena> arena) {
+    this->data = data;
+    this->device = dev;
+    this->block = block;
+    this->arena = std::move(arena);
+  }
+
+  ~ArenaMemory() {
+    if (block != nullptr) {
+      arena->Free(block);
+    }
+  }
+
+ public:
+  /*! \brief The block that holds the memory. */
+  Block* block;
+  /*! \brief The arena that the block belongs to. */
+  std::shared_ptr<Arena> arena;
+};
+
+/*!
+ * \brief A Memory Pool that allocates large segments from the device and carves memory chunks out
+ * of them.
+ *
+ * Free blocks are kept in sets ordered by size, one for the small segments and one for the large
+ * segments, so a request takes the smallest free block that fits in O(log n). The block is split
+ * when the remaining part is large enough, and a freed block is coalesced with its adjacent free
+ * blocks in the same segment. Compared to PageUnitPool, which only reuses a chunk of the exact
+ * same size, this pool can serve requests of varying sizes (e.g., dynamic batch sizes or sequence
+ * lengths) from the same memory.
+ *
+ * Segments are returned to the device only when an allocation fails or the pool exceeds the limit
+ * set by RAF_MEMORY_POOL_SIZE_LIMIT, and only if none of their blocks are in use.
+ *
+ * \sa ArenaPool
+ */
+class ArenaPool : public MemoryPool {
+ public:
+  explicit ArenaPool(Device dev, int64_t pool_limit = 0) {
+    this->device = dev;
+    this->api = DeviceAPI::Get(dev.device_type());
+    this->arena = std::make_shared<Arena>(this->api, pool_limit);
+
+    if (dev.device_type() == DevType::kCUDA()) {
+      this->api->SetDevice(dev.device_id());
+    }
+  }
+
+  std::string GetName() {
+    return "arena_pool";
+  }
+
+  int64_t GetAllocBytes(int64_t nbytes) override {
+    return RoundUp(nbytes, kMinBlockSize);
+  }
+
+  std::shared_ptr<Memory> Alloc(int64_t nbytes, int64_t alignment) override {
+    CHECK_GE(nbytes, 0);
+    if (nbytes == 0) {
+      return std::make_shared<ArenaMemory>(nullptr, device, nullptr, nullptr);
+    }
+    // Blocks are aligned to kMinBlockSize, so pad the request for larger alignments.
+    int64_t padding = (kMinBlockSize % alignment == 0) ? 0 : alignment;
+    Block* block = arena->Alloc(GetAllocBytes(nbytes + padding));
+    int64_t address = RoundUp(reinterpret_cast<int64_t>(block->ptr), alignment);
+    return std::make_shared<ArenaMemory>(reinterpret_cast<void*>(address), device, block, arena);
+  }
+
+  std::shared_ptr<Memory> AllocAsync(int64_t nbytes, void* stream,
+                                     int64_t alignment = kDefaultMemoryAlignment) override {
+    LOG(FATAL) << "Please use NoPool to use AllocAsync.";
+    throw;
+  }
+
+  std::vector<std::shared_ptr<Memory>> AllocBatch(const std::vector<int64_t>& nbytes,
+                                                  int64_t alignment) override {
+    std::vector<std::shared_ptr<Memory>> ret;
+    ret.reserve(nbytes.size());
+    for (int64_t bytes : nbytes) {
+      ret.emplace_back(Alloc(bytes, alignment));
+    }
+    return ret;
+  }
+
+  std::pair<float, float> GetPoolSize() override {
+    auto ret = arena->GetPoolSize();
+    return {BytesToMegaBytes(ret.first), BytesToMegaBytes(ret.second)};
+  }
+
+  std::unordered_map<std::string, float> GetPoolStats() override {
+    return arena->GetPoolStats();
+  }
+
+ public:
+  static void* make(const Device& dev) {
+    int64_t max_pool_limit = 0;
+    if (const char* val = getenv("RAF_MEMORY_POOL_SIZE_LIMIT")) {
+      max_pool_limit = atol(val);
+    }
+    return new ArenaPool(dev, max_pool_limit);
+  }
+
+ protected:
+  Device device;
+  /*! \brief The pointer to the DeviceAPI which determines the context of memory. */
+  std::shared_ptr<DeviceAPI> api;
+  /*! \brief The segments and blocks of this pool. */
+  std::shared_ptr<Arena> arena;
+};
+
+RAF_REGISTER_GLOBAL("raf.memory_pool._make.arena_pool").set_body_typed([](const Device& dev) {
+  return ArenaPool::make(dev);
+});
+
+}  // namespace arena_pool
+}  // namespace memory_pool
+}  // namespace raf
@@ -60,6 +60,37 @@ void LansDecl(const CallValues& call) {
 RAF_OP_DECLARE("raf.op.lans", LansDecl)
     .set_attr<TOpPattern>("TOpPattern", kOpaque)
     .set_attr<TRAFInplaceUpdate>("TRAFInplaceUpdate", {{0, 0}});
+
+void MultiTensorSgdDecl(const CallValues& call) {
+  const auto* args = call->args.as<MultiTensorSgdArgs>();
+  CHECK(args != nullptr);
+  CHECK(!args->tensor_list.empty() && args->tensor_list.size() % 3 == 0)
+      << "multi_tensor_sgd expects gradients, weights and momentums of the same number of tensors";
+  int ntensors = args->tensor_list.size() / 3;
+  for (int i = 0; i < ntensors; ++i) {
+    const DLTensor* dx = args->tensor_list[i];
+    const DLTensor* x = args->tensor_list[ntensors + i];
+    const DLTensor* v = args->tensor_list[2 * ntensors + i];
+    CHECK_EQ(x->ndim, dx->ndim);
+    CHECK_EQ(v->ndim, dx->ndim);
+    for (int j = 0; j < dx->ndim; ++j) {
+      CHECK_EQ(x->shape[j], dx->shape[j]);
+      CHECK_EQ(v->shape[j], dx->shape[j]);
+    }
+  }
+  const DLTensor* x = args->tensor_list[0];
+  call->device = x->device;
+  // The weights and momentums are updated in place.
+  Array<Value> output;
+  for (int i = 0; i < args->tensor_list.size(); ++i) {
+    output.push_back(args->tensor_list[i]);
+  }
+  call->out = TupleValue::make(output);
+}
+
+RAF_OP_DECLARE("raf.op.multi_tensor_sgd", MultiTensorSgdDecl)
+    .set_attr<TOpPattern>("TOpPattern", kOpaque)
+    .set_attr<TRAFInplaceUpdate>("TRAFInplaceUpdate", {{0, 0}});
 }  // namespace declare
 }  // namespace op
 }  // namespace raf
@@ -0,0 +1,62 @@
+/*
+ * Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ * SPDX-License-Identifier: Apache-2.0
+ */
+
+/*!
+ * \file src/op/dialect/cpu/cpu_utils.cc
+ * \brief CPU dialect utils
+ */
+#include <tvm/runtime/c_backend_api.h>
+#include <algorithm>
+#include "./cpu_utils.h"
+
+namespace raf {
+namespace op {
+namespace cpu {
+
+RAF_REGISTER_DIALECT("cpu").set_enable(DevType::kCPU());
+
+std::vector<TensorChunk> SplitIntoChunks(const std::vector<int64_t>& numels, int64_t chunk_size) {
+  std::vector<TensorChunk> chunks;
+  for (int i = 0; i < numels.size(); ++i) {
+    for (int64_t begin = 0; begin < numels[i]; begin += chunk_size) {
+      chunks.push_back({i, begin, std::min(begin + chunk_size, numels[i])});
+    }
+  }
+  return chunks;
+}
+
+namespace {
+
+struct ParallelForClosure {
+  int64_t n;
+  const std::function<void(int64_t)>* func;
+};
+
+int ParallelForLambda(int task_id, TVMParallelGroupEnv* penv, void* cdata) {
+  auto* closure = static_cast<ParallelForClosure*>(cdata);
+  for (int64_t i = task_id; i < closure->n; i += penv->num_task) {
+    (*closure->func)(i);
+  }
+  return 0;
+}
+
+}  // namespace
+
+void ParallelFor(int64_t n, const std::function<void(int64_t)>& func) {
+  if (n <= 1) {
+    for (int64_t i = 0; i < n; ++i) {
+      func(i);
+    }
+    return;
+  }
+  ParallelForClosure closure{n, &func};
+  // num_task = 0 uses all workers of the thread pool.
+  CHECK_EQ(TVMBackendParallelLaunch(ParallelForLambda, &closure, 0), 0)
+      << "Failed to launch the parallel tasks";
+}
+
+}  // namespace cpu
+}  // namespace op
+}  // namespace raf
@@ -0,0 +1,54 @@
+/*
+ * Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ * SPDX-License-Identifier: Apache-2.0
+ */
+
+/*!
+ * \file src/op/dialect/cpu/cpu_utils.h
+ * \brief Helper functions for the hand-written CPU kernels
+ */
+#pragma once
+#include <functional>
+#include <vector>
+#include "raf/op.h"
+
+namespace raf {
+namespace op {
+namespace cpu {
+
+/*! \brief A range [begin, end) of the elements of the tensor at index tensor. */
+struct TensorChunk {
+  int tensor;
+  int64_t begin;
+  int64_t end;
+};
+
+/*!
+ * \brief Split tensors into chunks of at most chunk_size elements, so that a list of tensors with
+ * skewed sizes can be evenly processed in parallel.
+ * \param numels The number of elements of each tensor.
+ * \param chunk_size The maximum number of elements in a chunk.
+ * \return The chunks of all tensors.
+ */
+std::vector<TensorChunk> SplitIntoChunks(const std::vector<int64_t>& numels, int64_t chunk_size);
+
+/*!
+ * \brief Run func(i) for i in [0, n) with the TVM thread pool, which is shared with the kernels
+ * generated by TVM. It must not be called inside another parallel region.
+ * \param n The number of tasks.
+ * \param func The task function.
+ */
+void ParallelFor(int64_t n, const std::function<void(int64_t)>& func);
+
+/*! \brief The number of elements of a tensor. */
+inline int64_t NumElements(const DLTensor* x) {
+  int64_t numel = 1;
+  for (int i = 0; i < x->ndim; ++i) {
+    numel *= x->shape[i];
+  }
+  return numel;
+}
+
+}  // namespace cpu
+}  // namespace op
+}  // namespace raf
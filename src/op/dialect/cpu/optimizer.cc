@@ -0,0 +1,288 @@
+/*
+ * Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ * SPDX-License-Identifier: Apache-2.0
+ */
+
+/*!
+ * \file src/op/dialect/cpu/optimizer.cc
+ * \brief Multi-tensor optimizers on CPU. The elements of all tensors are split into chunks that
+ * are updated in parallel, so a step of a model with many small parameters is a single dispatch.
+ */
+#include <cmath>
+#include "raf/op.h"
+#include "raf/value.h"
+#include "../../schema/optimizer.h"
+#include "./cpu_utils.h"
+
+namespace raf {
+namespace op {
+namespace cpu {
+
+using namespace raf::value;
+
+/*! \brief The maximum number of elements updated by a parallel task. */
+constexpr int64_t kChunkSize = 65536;
+
+/*! \brief Get the data pointers of a list of FP32 tensors. */
+std::vector<float*> GetFloatData(const Array<Value>& fields) {
+  std::vector<float*> ret;
+  for (const auto& field : fields) {
+    DLTensor* tensor = ir::Downcast<TensorValue>(field);
+    ret.push_back(static_cast<float*>(tensor->data));
+  }
+  return ret;
+}
+
+/*!
+ * \brief Collect the number of elements of the first ntensors tensors and check the dtypes.
+ */
+std::vector<int64_t> GetNumels(const std::vector<BaseTensorValue>& tensor_list, int ntensors,
+                               const std::string& op_name) {
+  std::vector<int64_t> numels;
+  for (int i = 0; i < tensor_list.size(); ++i) {
+    DLTensor* t = ir::Downcast<TensorValue>(tensor_list[i]);
+    CHECK(t->dtype.code == kDLFloat && t->dtype.bits == 32)
+        << op_name << " only takes FP32 inputs";
+    if (i < ntensors) {
+      numels.push_back(NumElements(t));
+    }
+  }
+  return numels;
+}
+
+class MultiTensorSgdImpl : public raf::op::OpEnv {
+ public:
+  explicit MultiTensorSgdImpl(const CallValues& cv) {
+    static auto fschema_index =
+        ir::Op::GetAttrMap<op::FRAFSchemaFieldIndex>("FRAFSchemaFieldIndex");
+    static auto sgd_op = ir::Op::Get("raf.op.multi_tensor_sgd");
+    auto args = cv->args.as<op::schema::MultiTensorSgdArgs>();
+    this->arg_indices = {fschema_index[sgd_op]("tensor_list")};
+    learning_rate_ = args->learning_rate;
+    mu_ = args->mu;
+    CHECK(args->tensor_list.size() % 3 == 0);
+    ntensors_ = args->tensor_list.size() / 3;
+    chunks_ = SplitIntoChunks(GetNumels(args->tensor_list, ntensors_, "multi_tensor_sgd"),
+                              kChunkSize);
+  }
+
+  void Execute(const CallValues& cv) override {
+    auto args = cv->args.as<op::schema::MultiTensorSgdArgs>();
+    Array<Value> tvalue = {args->tensor_list.begin(), args->tensor_list.end()};
+    Execute(std::vector<Value>{TupleValue::make(tvalue)}, cv->out);
+  }
+
+  void Execute(const std::vector<Value>& inputs, Value output) override {
+    auto tlist = GetFloatData(ir::Downcast<TupleValue>(inputs[0])->fields);
+    const float lr = learning_rate_;
+    const float mu = mu_;
+    const int n = ntensors_;
+    ParallelFor(chunks_.size(), [&](int64_t c) {
+      const TensorChunk& chunk = chunks_[c];
+      const float* g = tlist[chunk.tensor];
+      float* p = tlist[n + chunk.tensor];
+      float* v = tlist[2 * n + chunk.tensor];
+      for (int64_t i = chunk.begin; i < chunk.end; ++i) {
+        v[i] = mu * v[i] + g[i];
+        p[i] -= lr * v[i];
+      }
+    });
+  }
+
+  std::string name() const override {
+    return TruncateName(GetUniqueName("raf.op.cpu.multi_tensor_sgd"));
+  }
+
+  static OpEnv* make(const CallValues& cv) {
+    return new MultiTensorSgdImpl(cv);
+  }
+
+ private:
+  float learning_rate_;
+  float mu_;
+  int ntensors_;
+  std::vector<TensorChunk> chunks_;
+};
+
+RAF_REGISTER_DIALECT_OP(cpu, multi_tensor_sgd, 20);
+RAF_OP_ENV_MAKER("raf.op.cpu.multi_tensor_sgd", MultiTensorSgdImpl::make);
+
+/*!
+ * \brief LANS on CPU, which follows the same algorithm as the CUDA kernel: the gradients are
+ * overwritten by the update of the first moment, and the update of the gradient is kept in a
+ * workspace, then the weights are updated with the trust ratios of the two updates.
+ */
+class LansImpl : public raf::op::OpEnv {
+ public:
+  explicit LansImpl(const CallValues& cv) {
+    static auto fschema_index =
+        ir::Op::GetAttrMap<op::FRAFSchemaFieldIndex>("FRAFSchemaFieldIndex");
+    static auto lans_op = ir::Op::Get("raf.op.lans");
+    auto args = cv->args.as<op::schema::LansArgs>();
+    this->arg_indices = {
+        fschema_index[lans_op]("tensor_list"),
+        fschema_index[lans_op]("step"),
+    };
+    learning_rate_ = args->learning_rate;
+    beta1_ = args->beta1;
+    beta2_ = args->beta2;
+    eps_ = args->eps;
+    bias_correction_ = args->bias_correction;
+    weight_decay_ = args->weight_decay;
+    grad_averaging_ = args->grad_averaging;
+    mode_ = args->mode;
+    normalize_grad_ = args->normalize_grad;
+
+    CHECK(args->tensor_list.size() % 4 == 0);
+    ntensors_ = args->tensor_list.size() / 4;
+    auto numels = GetNumels(args->tensor_list, ntensors_, "LANS");
+    int64_t total = 0;
+    for (auto numel : numels) {
+      q_offsets_.push_back(total);
+      total += numel;
+    }
+    chunks_ = SplitIntoChunks(numels, kChunkSize);
+    RequestWorkspace(&q_tensor_buf_, cv->device, sizeof(float) * total);
+  }
+
+  void Execute(const CallValues& cv) override {
+    auto args = cv->args.as<op::schema::LansArgs>();
+    Array<Value> tvalue = {args->tensor_list.begin(), args->tensor_list.end()};
+    Execute(std::vector<Value>{TupleValue::make(tvalue), args->step}, cv->out);
+  }
+
+  void Execute(const std::vector<Value>& inputs, Value output) override {
+    auto tlist = GetFloatData(ir::Downcast<TupleValue>(inputs[0])->fields);
+    DLTensor* step_tensor = ir::Downcast<TensorValue>(inputs[1]);
+    CHECK(step_tensor->ndim == 0);
+    int step = static_cast<int>(static_cast<float*>(step_tensor->data)[0]);
+    const float bias_correction1 = bias_correction_ == 1 ? 1 - std::pow(beta1_, step) : 1.0f;
+    const float bias_correction2 = bias_correction_ == 1 ? 1 - std::pow(beta2_, step) : 1.0f;
+    const float beta3 = grad_averaging_ == 1 ? 1 - beta1_ : 1.0f;
+    const int n = ntensors_;
+    float* q_base = static_cast<float*>(q_tensor_buf_);
+    std::vector<double> partial0(chunks_.size()), partial1(chunks_.size());
+
+    // Per-tensor L2 norms are reduced from the partial sums of squares of the chunks.
+    auto reduce_norms = [&](const std::vector<double>& partial) {
+      std::vector<float> norms(n, 0.0f);
+      std::vector<double> sums(n, 0.0);
+      for (size_t c = 0; c < chunks_.size(); ++c) {
+        sums[chunks_[c].tensor] += partial[c];
+      }
+      for (int t = 0; t < n; ++t) {
+        norms[t] = std::sqrt(sums[t]);
+      }
+      return norms;
+    };
+
+    // Pass 1: the norms of the gradients and the weights.
+    ParallelFor(chunks_.size(), [&](int64_t c) {
+      const TensorChunk& chunk = chunks_[c];
+      const float* g = tlist[chunk.tensor];
+      const float* p = tlist[n + chunk.tensor];
+      double g_sum = 0, p_sum = 0;
+      for (int64_t i = chunk.begin; i < chunk.end; ++i) {
+        g_sum += g[i] * g[i];
+        p_sum += p[i] * p[i];
+      }
+      partial0[c] = g_sum;
+      partial1[c] = p_sum;
+    });
+    auto grad_norms = reduce_norms(partial0);
+    auto param_norms = reduce_norms(partial1);
+
+    // Pass 2: update the moments and compute the two updates together with their norms.
+    ParallelFor(chunks_.size(), [&](int64_t c) {
+      const TensorChunk& chunk = chunks_[c];
+      float* g = tlist[chunk.tensor];
+      const float* p = tlist[n + chunk.tensor];
+      float* m = tlist[2 * n + chunk.tensor];
+      float* v = tlist[3 * n + chunk.tensor];
+      float* q = q_base + q_offsets_[chunk.tensor];
+      const float grad_norm = grad_norms[chunk.tensor];
+      double m_sum = 0, q_sum = 0;
+      for (int64_t i = chunk.begin; i < chunk.end; ++i) {
+        float scaled_grad = g[i];
+        if (normalize_grad_ && grad_norm != 0.0f) {
+          scaled_grad /= (grad_norm + eps_);
+        }
+        const float decayed_p = weight_decay_ == 0 ? 0.0f : weight_decay_ * p[i];
+        if (mode_ == 0) {
+          // L2 regularization on the scaled gradient.
+          scaled_grad += decayed_p;
+        }
+        m[i] = m[i] * beta1_ + beta3 * scaled_grad;
+        v[i] = v[i] * beta2_ + (1 - beta2_) * scaled_grad * scaled_grad;
+        const float denom = std::sqrt(v[i] / bias_correction2) + eps_;
+        float update_m = (m[i] / bias_correction1) / denom;
+        float update_g = scaled_grad / denom;
+        if (mode_ != 0) {
+          // Decoupled weight decay.
+          update_m += decayed_p;
+          update_g += decayed_p;
+        }
+        g[i] = update_m;
+        q[i] = update_g;
+        m_sum += update_m * update_m;
+        q_sum += update_g * update_g;
+      }
+      partial0[c] = m_sum;
+      partial1[c] = q_sum;
+    });
+    auto update_m_norms = reduce_norms(partial0);
+    auto q_norms = reduce_norms(partial1);
+
+    // Pass 3: update the weights with the trust ratios.
+    ParallelFor(chunks_.size(), [&](int64_t c) {
+      const TensorChunk& chunk = chunks_[c];
+      const float* update_m = tlist[chunk.tensor];
+      float* p = tlist[n + chunk.tensor];
+      const float* update_g = q_base + q_offsets_[chunk.tensor];
+      const float param_norm = param_norms[chunk.tensor];
+      const float m_norm = update_m_norms[chunk.tensor];
+      const float q_norm = q_norms[chunk.tensor];
+      float ratio_m = (m_norm != 0.0f && param_norm != 0.0f)
+                          ? learning_rate_ * (param_norm / m_norm)
+                          : learning_rate_;
+      float ratio_g = (q_norm != 0.0f && param_norm != 0.0f)
+                          ? learning_rate_ * (param_norm / q_norm)
+                          : learning_rate_;
+      ratio_m *= beta1_;
+      ratio_g *= beta3;
+      for (int64_t i = chunk.begin; i < chunk.end; ++i) {
+        p[i] = p[i] - ratio_m * update_m[i] - ratio_g * update_g[i];
+      }
+    });
+  }
+
+  std::string name() const override {
+    return TruncateName(GetUniqueName("raf.op.cpu.lans"));
+  }
+
+  static OpEnv* make(const CallValues& cv) {
+    return new LansImpl(cv);
+  }
+
+ private:
+  float learning_rate_;
+  float beta1_;
+  float beta2_;
+  float eps_;
+  int bias_correction_;
+  float weight_decay_;
+  int grad_averaging_;
+  int mode_;
+  bool normalize_grad_;
+  int ntensors_;
+  std::vector<TensorChunk> chunks_;
+  std::vector<int64_t> q_offsets_;
+  void* q_tensor_buf_;
+};
+
+RAF_REGISTER_DIALECT_OP(cpu, lans, 20);
+RAF_OP_ENV_MAKER("raf.op.cpu.lans", LansImpl::make);
+
+}  // namespace cpu
+}  // namespace op
+}  // namespace raf
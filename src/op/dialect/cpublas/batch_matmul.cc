@@ -0,0 +1,87 @@
+/*
+ * Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ * SPDX-License-Identifier: Apache-2.0
+ */
+
+/*!
+ * \file src/op/dialect/cpublas/batch_matmul.cc
+ * \brief batch_matmul on CPU
+ */
+#include "raf/op.h"
+#include "raf/value.h"
+#include "./cpublas_utils.h"
+#include "../../schema/ufunc.h"
+
+namespace raf {
+namespace op {
+namespace cpublas {
+
+using namespace raf::value;
+
+template <bool transpose_a, bool transpose_b>
+class BatchMatmulImpl : public raf::op::OpEnv {
+  std::string env_name_;
+
+ public:
+  explicit BatchMatmulImpl(const CallValues& cv) {
+    static auto fschema_index =
+        ir::Op::GetAttrMap<op::FRAFSchemaFieldIndex>("FRAFSchemaFieldIndex");
+    auto op = ir::Op::Get("raf.op.batch_matmul");
+    this->arg_indices = {
+        fschema_index[op]("x1"),
+        fschema_index[op]("x2"),
+    };
+    auto args = cv->args.as<op::schema::BinaryArgs>();
+    CHECK(args != nullptr);
+    std::string op_name = "raf.op.cpublas.batch_matmul";
+    if (transpose_a || transpose_b) {
+      op_name += "_";
+      op_name += (transpose_a) ? "t" : "n";
+      op_name += (transpose_b) ? "t" : "n";
+    }
+    env_name_ = TruncateName(GetUniqueName(op_name));
+  }
+
+  std::string name() const override {
+    return env_name_;
+  }
+
+  void Execute(const CallValues& cv) override {
+    auto args = cv->args.as<op::schema::BinaryArgs>();
+    GemmImpl(args->x1, transpose_a, args->x2, transpose_b, cv->out);
+  }
+
+  void Execute(const std::vector<Value>& inputs, Value output) override {
+    DLTensor* x1 = ir::Downcast<TensorValue>(inputs[0]);
+    DLTensor* x2 = ir::Downcast<TensorValue>(inputs[1]);
+    DLTensor* out = ir::Downcast<TensorValue>(output);
+    GemmImpl(x1, transpose_a, x2, transpose_b, out);
+  }
+
+  static OpEnv* make(const CallValues& cv) {
+    // Fall back to the other dialects for the unsupported dtypes, e.g., float16.
+    DLTensor* out = cv->out;
+    if (!IsSupported(out->dtype)) {
+      return nullptr;
+    }
+    return new BatchMatmulImpl<transpose_a, transpose_b>(cv);
+  }
+};
+
+using BatchMatmulNN = BatchMatmulImpl<false, false>;
+using BatchMatmulNT = BatchMatmulImpl<false, true>;
+using BatchMatmulTN = BatchMatmulImpl<true, false>;
+using BatchMatmulTT = BatchMatmulImpl<true, true>;
+
+RAF_REGISTER_DIALECT_OP(cpublas, batch_matmul, 15);
+RAF_REGISTER_DIALECT_OP(cpublas, batch_matmul_nt, 15);
+RAF_REGISTER_DIALECT_OP(cpublas, batch_matmul_tn, 15);
+RAF_REGISTER_DIALECT_OP(cpublas, batch_matmul_tt, 15);
+RAF_OP_ENV_MAKER("raf.op.cpublas.batch_matmul", BatchMatmulNN::make);
+RAF_OP_ENV_MAKER("raf.op.cpublas.batch_matmul_nt", BatchMatmulNT::make);
+RAF_OP_ENV_MAKER("raf.op.cpublas.batch_matmul_tn", BatchMatmulTN::make);
+RAF_OP_ENV_MAKER("raf.op.cpublas.batch_matmul_tt", BatchMatmulTT::make);
+
+}  // namespace cpublas
+}  // namespace op
+}  // namespace raf
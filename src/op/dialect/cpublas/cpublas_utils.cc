@@ -0,0 +1,231 @@
+/*
+ * Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ * SPDX-License-Identifier: Apache-2.0
+ */
+
+/*!
+ * \file src/op/dialect/cpublas/cpublas_utils.cc
+ * \brief GEMM on CPU. It calls the CBLAS library if RAF is built with RAF_USE_CPU_BLAS, or the
+ * built-in kernel otherwise, which packs blocks of the inputs into contiguous panels that fit in
+ * the cache and computes register tiles of the output with a vectorizable micro kernel.
+ */
+#include <algorithm>
+#include <cstring>
+#include <vector>
+#ifdef RAF_CXX_USE_CPU_BLAS
+#include <cblas.h>
+#endif
+#include "../cpu/cpu_utils.h"
+#include "./cpublas_utils.h"
+
+namespace raf {
+namespace op {
+namespace cpublas {
+
+RAF_REGISTER_DIALECT("cpublas").set_enable(DevType::kCPU());
+
+namespace {
+
+#ifdef RAF_CXX_USE_CPU_BLAS
+
+inline void BlasGemm(bool transpose_a, bool transpose_b, int m, int n, int k, const float* a,
+                     int lda, const float* b, int ldb, float* c) {
+  cblas_sgemm(CblasRowMajor, transpose_a ? CblasTrans : CblasNoTrans,
+              transpose_b ? CblasTrans : CblasNoTrans, m, n, k, 1.0f, a, lda, b, ldb, 0.0f, c,
+              std::max<int>(1, n));
+}
+
+inline void BlasGemm(bool transpose_a, bool transpose_b, int m, int n, int k, const double* a,
+                     int lda, const double* b, int ldb, double* c) {
+  cblas_dgemm(CblasRowMajor, transpose_a ? CblasTrans : CblasNoTrans,
+              transpose_b ? CblasTrans : CblasNoTrans, m, n, k, 1.0, a, lda, b, ldb, 0.0, c,
+              std::max<int>(1, n));
+}
+
+#else
+
+/*! \brief A matrix with the row and column strides, which views the transpose without a copy. */
+template <typename T>
+struct MatrixView {
+  const T* data;
+  int64_t row_stride;
+  int64_t col_stride;
+
+  const T& operator()(int64_t i, int64_t j) const {
+    return data[i * row_stride + j * col_stride];
+  }
+};
+
+/*! \brief The number of rows of the register tile. */
+constexpr int kMR = 4;
+/*! \brief The number of columns of the register tile, which fills a cache line. */
+template <typename T>
+constexpr int NR() {
+  return 64 / sizeof(T);
+}
+/*! \brief The rows of a block of a, which is a multiple of kMR. */
+constexpr int64_t kMC = 128;
+/*! \brief The depth of a block. A packed block of a and a panel of b stay in the L2 cache. */
+constexpr int64_t kKC = 256;
+/*! \brief The columns of a block of b, which is a multiple of NR. */
+constexpr int64_t kNC = 512;
+/*! \brief The problems with fewer multiply-adds run on the calling thread. */
+constexpr int64_t kMinParallelMACs = 1 << 16;
+
+/*! \brief Pack the mc x kc block of a at (i0, p0) into panels of kMR rows padded with zeros. */
+template <typename T>
+void PackA(const MatrixView<T>& a, int64_t i0, int64_t p0, int64_t mc, int64_t kc, T* buf) {
+  for (int64_t ir = 0; ir < mc; ir += kMR) {
+    int64_t mr = std::min<int64_t>(kMR, mc - ir);
+    for (int64_t p = 0; p < kc; ++p) {
+      for (int64_t i = 0; i < kMR; ++i) {
+        *buf++ = i < mr ? a(i0 + ir + i, p0 + p) : T(0);
+      }
+    }
+  }
+}
+
+/*! \brief Pack the kc x nc block of b at (p0, j0) into panels of NR columns padded with zeros. */
+template <typename T>
+void PackB(const MatrixView<T>& b, int64_t p0, int64_t j0, int64_t kc, int64_t nc, T* buf) {
+  constexpr int nr_max = NR<T>();
+  for (int64_t jr = 0; jr < nc; jr += nr_max) {
+    int64_t nr = std::min<int64_t>(nr_max, nc - jr);
+    for (int64_t p = 0; p < kc; ++p) {
+      for (int64_t j = 0; j < nr_max; ++j) {
+        *buf++ = j < nr ? b(p0 + p, j0 + jr + j) : T(0);
+      }
+    }
+  }
+}
+
+/*! \brief Compute a register tile of c from a packed panel of a and a packed panel of b. */
+template <typename T>
+void MicroKernel(int64_t kc, const T* __restrict__ a, const T* __restrict__ b, T* c, int64_t ldc,
+                 int64_t mr, int64_t nr, bool accumulate) {
+  constexpr int nr_max = NR<T>();
+  T acc[kMR][nr_max] = {};
+  for (int64_t p = 0; p < kc; ++p, a += kMR, b += nr_max) {
+    for (int i = 0; i < kMR; ++i) {
+      for (int j = 0; j < nr_max; ++j) {
+        acc[i][j] += a[i] * b[j];
+      }
+    }
+  }
+  for (int64_t i = 0; i < mr; ++i) {
+    T* row = c + i * ldc;
+    for (int64_t j = 0; j < nr; ++j) {
+      row[j] = accumulate ? row[j] + acc[i][j] : acc[i][j];
+    }
+  }
+}
+
+/*! \brief Compute the mc x nc block of c at (i0, j0). */
+template <typename T>
+void GemmBlock(const MatrixView<T>& a, const MatrixView<T>& b, T* c, int64_t ldc, int64_t k,
+               int64_t i0, int64_t j0, int64_t mc, int64_t nc) {
+  constexpr int nr_max = NR<T>();
+  thread_local std::vector<T> a_buf(kMC * kKC);
+  thread_local std::vector<T> b_buf(kKC * kNC);
+  for (int64_t p0 = 0; p0 < k; p0 += kKC) {
+    int64_t kc = std::min(kKC, k - p0);
+    PackA(a, i0, p0, mc, kc, a_buf.data());
+    PackB(b, p0, j0, kc, nc, b_buf.data());
+    for (int64_t jr = 0; jr < nc; jr += nr_max) {
+      for (int64_t ir = 0; ir < mc; ir += kMR) {
+        MicroKernel(kc, a_buf.data() + ir * kc, b_buf.data() + jr * kc,
+                    c + (i0 + ir) * ldc + j0 + jr, ldc, std::min<int64_t>(kMR, mc - ir),
+                    std::min<int64_t>(nr_max, nc - jr), p0 > 0);
+      }
+    }
+  }
+}
+
+#endif
+
+/*!
+ * \brief Compute the batched row-major c = op(a) * op(b), where a stride of 0 broadcasts the
+ * input to all batches.
+ */
+template <typename T>
+void Gemm(int64_t batch, int64_t m, int64_t n, int64_t k, const T* a, int64_t stride_a,
+          bool transpose_a, const T* b, int64_t stride_b, bool transpose_b, T* c) {
+  if (k == 0) {
+    std::memset(c, 0, batch * m * n * sizeof(T));
+    return;
+  }
+#ifdef RAF_CXX_USE_CPU_BLAS
+  // The BLAS library is multi-threaded by itself.
+  int lda = std::max<int64_t>(1, transpose_a ? m : k);
+  int ldb = std::max<int64_t>(1, transpose_b ? k : n);
+  for (int64_t i = 0; i < batch; ++i) {
+    BlasGemm(transpose_a, transpose_b, m, n, k, a + i * stride_a, lda, b + i * stride_b, ldb,
+             c + i * m * n);
+  }
+#else
+  int64_t m_blocks = (m + kMC - 1) / kMC;
+  int64_t n_blocks = (n + kNC - 1) / kNC;
+  auto task = [&](int64_t task_id) {
+    int64_t i = task_id / (m_blocks * n_blocks);
+    int64_t ib = task_id % (m_blocks * n_blocks) / n_blocks;
+    int64_t jb = task_id % n_blocks;
+    MatrixView<T> va{a + i * stride_a, transpose_a ? 1 : k, transpose_a ? m : 1};
+    MatrixView<T> vb{b + i * stride_b, transpose_b ? 1 : n, transpose_b ? k : 1};
+    GemmBlock(va, vb, c + i * m * n, n, k, ib * kMC, jb * kNC, std::min(kMC, m - ib * kMC),
+              std::min(kNC, n - jb * kNC));
+  };
+  int64_t num_tasks = batch * m_blocks * n_blocks;
+  if (batch * m * n * k < kMinParallelMACs) {
+    for (int64_t i = 0; i < num_tasks; ++i) {
+      task(i);
+    }
+  } else {
+    cpu::ParallelFor(num_tasks, task);
+  }
+#endif
+}
+
+template <typename T>
+const T* GetData(const DLTensor* x) {
+  return reinterpret_cast<const T*>(static_cast<const char*>(x->data) + x->byte_offset);
+}
+
+}  // namespace
+
+void GemmImpl(const DLTensor* a, bool transpose_a, const DLTensor* b, bool transpose_b,
+              DLTensor* c) {
+  CHECK(IsSupported(c->dtype)) << "cpublas only supports float32 and float64, but got "
+                               << DType(c->dtype).c_str();
+  CHECK(DType(a->dtype) == DType(c->dtype) && DType(b->dtype) == DType(c->dtype))
+      << "The inputs and the output of cpublas GEMM must have the same dtype";
+  CHECK(c->ndim == 2 || c->ndim == 3) << "Expected 2D or 3D output, but got " << c->ndim;
+  CHECK_EQ(a->ndim, c->ndim) << "Expected " << c->ndim << "D tensor a, but got " << a->ndim;
+  CHECK_EQ(b->ndim, c->ndim) << "Expected " << c->ndim << "D tensor b, but got " << b->ndim;
+  int ndim = c->ndim;
+  int64_t batch = ndim == 3 ? c->shape[0] : 1;
+  int64_t m = c->shape[ndim - 2];
+  int64_t n = c->shape[ndim - 1];
+  int64_t k = a->shape[transpose_a ? ndim - 2 : ndim - 1];
+  int64_t stride_a = 0;
+  int64_t stride_b = 0;
+  if (ndim == 3) {
+    CHECK(a->shape[0] == batch || a->shape[0] == 1)
+        << "Batch size of tensor and output are mismatched";
+    CHECK(b->shape[0] == batch || b->shape[0] == 1)
+        << "Batch size of tensor and output are mismatched";
+    // Set the stride of the broadcast tensor to 0.
+    stride_a = a->shape[0] == 1 ? 0 : m * k;
+    stride_b = b->shape[0] == 1 ? 0 : k * n;
+  }
+  if (c->dtype.bits == 32) {
+    Gemm(batch, m, n, k, GetData<float>(a), stride_a, transpose_a, GetData<float>(b), stride_b,
+         transpose_b, const_cast<float*>(GetData<float>(c)));
+  } else {
+    Gemm(batch, m, n, k, GetData<double>(a), stride_a, transpose_a, GetData<double>(b), stride_b,
+         transpose_b, const_cast<double*>(GetData<double>(c)));
+  }
+}
+
+}  // namespace cpublas
+}  // namespace op
+}  // namespace raf
@@ -0,0 +1,37 @@
+/*
+ * Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ * SPDX-License-Identifier: Apache-2.0
+ */
+
+/*!
+ * \file src/op/dialect/cpublas/cpublas_utils.h
+ * \brief GEMM on CPU with a CBLAS library or the built-in blocked kernel
+ */
+#pragma once
+#include "raf/op.h"
+
+namespace raf {
+namespace op {
+namespace cpublas {
+
+/*! \brief Whether the GEMM kernels support the data type. */
+inline bool IsSupported(const DLDataType& dtype) {
+  return dtype.code == kDLFloat && dtype.lanes == 1 && (dtype.bits == 32 || dtype.bits == 64);
+}
+
+/*!
+ * \brief Compute c = op(a) * op(b), where op transposes the last two dimensions of the tensor if
+ * the corresponding transpose flag is set. The tensors are either 2D (matmul), or 3D (batch_matmul)
+ * whose batch dimension of a or b may be 1 to broadcast.
+ * \param a The first input.
+ * \param transpose_a Whether to transpose a.
+ * \param b The second input.
+ * \param transpose_b Whether to transpose b.
+ * \param c The output.
+ */
+void GemmImpl(const DLTensor* a, bool transpose_a, const DLTensor* b, bool transpose_b,
+              DLTensor* c);
+
+}  // namespace cpublas
+}  // namespace op
+}  // namespace raf
@@ -33,6 +33,10 @@ void multi_tensor_lans_cuda(int chunk_size, std::vector<T*> tensor_lists, const
                             float* param_norm_tensor, float* update_m_norm, float* q_norm_tensor,
                             int max_chunks_per_tensor);
 
+template <typename T>
+void multi_tensor_sgd_cuda(int chunk_size, std::vector<T*> tensor_lists, const float lr,
+                           const float mu, const std::vector<int> numels, void* stream);
+
 }  // namespace cuda
 }  // namespace op
 }  // namespace raf
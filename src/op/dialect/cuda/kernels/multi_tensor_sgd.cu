@@ -0,0 +1,51 @@
+/*
+ * Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ * SPDX-License-Identifier: Apache-2.0
+ */
+
+/*!
+ * \file src/op/dialect/cuda/kernels/multi_tensor_sgd.cu
+ * \brief Multi-tensor SGD cuda kernel
+ */
+#include "./kernel_util.cuh"
+#include "./multi_tensor_apply.cuh"
+#define BLOCK_SIZE 512
+
+namespace raf {
+namespace op {
+namespace cuda {
+
+template <typename T>
+struct SGDFunctor {
+  __device__ __forceinline__ void operator()(int chunk_size, TensorListMetadata<3>& tl,
+                                             const float lr, const float mu) {
+    int tensor_loc = tl.block_to_tensor[blockIdx.x];
+    int chunk_idx = tl.block_to_chunk[blockIdx.x];
+    int n = tl.sizes[tensor_loc] - chunk_idx * chunk_size;
+
+    T* g = (T*)tl.addresses[0][tensor_loc] + chunk_idx * chunk_size;
+    T* p = (T*)tl.addresses[1][tensor_loc] + chunk_idx * chunk_size;
+    T* v = (T*)tl.addresses[2][tensor_loc] + chunk_idx * chunk_size;
+
+    for (int i = threadIdx.x; i < n && i < chunk_size; i += blockDim.x) {
+      float next_v = mu * static_cast<float>(v[i]) + static_cast<float>(g[i]);
+      v[i] = static_cast<T>(next_v);
+      p[i] = static_cast<T>(static_cast<float>(p[i]) - lr * next_v);
+    }
+  }
+};
+
+template <typename T>
+void multi_tensor_sgd_cuda(int chunk_size, std::vector<T*> tensor_lists, const float lr,
+                           const float mu, const std::vector<int> numels, void* stream) {
+  multi_tensor_apply<3>(BLOCK_SIZE, chunk_size, tensor_lists, numels, stream, SGDFunctor<T>(), lr,
+                        mu);
+}
+
+template void multi_tensor_sgd_cuda<float>(int chunk_size, std::vector<float*> tensor_lists,
+                                           const float lr, const float mu,
+                                           const std::vector<int> numels, void* stream);
+
+}  // namespace cuda
+}  // namespace op
+}  // namespace raf
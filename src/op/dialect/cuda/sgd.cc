@@ -0,0 +1,90 @@
+/*
+ * Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ * SPDX-License-Identifier: Apache-2.0
+ */
+
+/*!
+ * \file src/op/dialect/cuda/sgd.cc
+ * \brief Multi-tensor SGD cuda backend
+ */
+#include "raf/op.h"
+#include "raf/device_api.h"
+#include "../../schema/optimizer.h"
+#include "./kernels/kernel_util.cuh"
+
+namespace raf {
+namespace op {
+namespace cuda {
+
+using namespace raf::value;
+using device_api::DeviceAPI;
+#define CHUNK_SIZE 65536
+
+class MultiTensorSgdImpl : public raf::op::OpEnv {
+ public:
+  explicit MultiTensorSgdImpl(const CallValues& cv) {
+    static auto fschema_index =
+        ir::Op::GetAttrMap<op::FRAFSchemaFieldIndex>("FRAFSchemaFieldIndex");
+    static auto sgd_op = ir::Op::Get("raf.op.multi_tensor_sgd");
+    auto args = cv->args.as<op::schema::MultiTensorSgdArgs>();
+    this->arg_indices = {fschema_index[sgd_op]("tensor_list")};
+    learning_rate_ = args->learning_rate;
+    mu_ = args->mu;
+
+    int n = args->tensor_list.size();
+    CHECK(n % 3 == 0);
+    for (int i = 0; i < n; ++i) {
+      DLTensor* t = ir::Downcast<TensorValue>(args->tensor_list[i]);
+      CHECK(t->dtype.code == kDLFloat && t->dtype.bits == 32)
+          << "multi_tensor_sgd only takes FP32 inputs";
+      if (i < n / 3) {
+        int numel = 1;
+        for (int j = 0; j < t->ndim; ++j) {
+          numel *= t->shape[j];
+        }
+        numels_.push_back(numel);
+      }
+    }
+
+    static auto cuda_device_api = DeviceAPI::Get(DevType::kCUDA());
+    compute_stream_ = cuda_device_api->GetStream();
+  }
+
+  void Execute(const CallValues& cv) override {
+    auto args = cv->args.as<op::schema::MultiTensorSgdArgs>();
+    Array<Value> tvalue = {args->tensor_list.begin(), args->tensor_list.end()};
+    Execute(std::vector<Value>{TupleValue::make(tvalue)}, cv->out);
+  }
+
+  void Execute(const std::vector<Value>& inputs, Value output) override {
+    TupleValue tuple = ir::Downcast<TupleValue>(inputs[0]);
+    std::vector<float*> tlist;
+    for (const auto& field : tuple->fields) {
+      DLTensor* tensor = ir::Downcast<TensorValue>(field);
+      tlist.push_back(static_cast<float*>(tensor->data));
+    }
+    multi_tensor_sgd_cuda<float>(CHUNK_SIZE, tlist, learning_rate_, mu_, numels_,
+                                 compute_stream_);
+  }
+
+  std::string name() const override {
+    return TruncateName(GetUniqueName("raf.op.cuda.multi_tensor_sgd"));
+  }
+
+  static OpEnv* make(const CallValues& cv) {
+    return new MultiTensorSgdImpl(cv);
+  }
+
+ private:
+  float learning_rate_;
+  float mu_;
+  std::vector<int> numels_;
+  void* compute_stream_;
+};
+
+RAF_REGISTER_DIALECT_OP(cuda, multi_tensor_sgd, 20);
+RAF_OP_ENV_MAKER("raf.op.cuda.multi_tensor_sgd", MultiTensorSgdImpl::make);
+
+}  // namespace cuda
+}  // namespace op
+}  // namespace raf
@@ -37,9 +37,9 @@ class CuDNNConvAlgoCacheEntry {
     return algo_perf_;
   }
 
-  static CuDNNConvAlgoCacheEntry Load(const std::string& path) {
+  static CuDNNConvAlgoCacheEntry Load(PersistEntry* entry) {
     std::string data;
-    tvm::runtime::LoadBinaryFromFile(path + "/value.bin", &data);
+    CHECK(entry->ReadFile("value.bin", &data)) << "Value file does not exist";
     dmlc::MemoryStringStream reader(&data);
     dmlc::Stream* stream = &reader;
 
@@ -107,7 +107,7 @@ cudnnConvolutionFwdAlgoPerf_t FindcudnnConvolutionFwdAlgoPerf_tExWrapper(
     const std::vector<uint8_t>& key, const cudnnTensorDescriptor_t xDesc, const void* x,
     const cudnnFilterDescriptor_t wDesc, const void* w, const cudnnConvolutionDescriptor_t convDesc,
     const cudnnTensorDescriptor_t yDesc, void* y, const Device& device) {
-  if (auto* val = CacheCudnnConvFwdAlgoPerf.Get(key)) {
+  if (auto val = CacheCudnnConvFwdAlgoPerf.Get(key)) {
     return val->Value();
   }
   static const cudnnConvolutionFwdAlgo_t algos[] = {
@@ -167,7 +167,7 @@ cudnnConvolutionBwdDataAlgoPerf_t FindcudnnConvolutionBwdDataAlgoPerf_tExWrapper
     const cudnnTensorDescriptor_t dyDesc, const void* dy,
     const cudnnConvolutionDescriptor_t convDesc, const cudnnTensorDescriptor_t dxDesc, void* dx,
     const Device& device) {
-  if (auto* val = CacheCudnnConvBwdDataAlgoPerf.Get(key)) {
+  if (auto val = CacheCudnnConvBwdDataAlgoPerf.Get(key)) {
     return val->Value();
   }
   static const cudnnConvolutionBwdDataAlgo_t algos[] = {
@@ -223,7 +223,7 @@ cudnnConvolutionBwdFilterAlgoPerf_t FindcudnnConvolutionBwdFilterAlgoPerf_tExWra
     const cudnnTensorDescriptor_t dyDesc, const void* dy,
     const cudnnConvolutionDescriptor_t convDesc, const cudnnFilterDescriptor_t dwDesc, void* dw,
     const Device& device) {
-  if (auto* val = CacheCudnnConvBwdFilterAlgoPerf.Get(key)) {
+  if (auto val = CacheCudnnConvBwdFilterAlgoPerf.Get(key)) {
     return val->Value();
   }
   static const cudnnConvolutionBwdFilterAlgo_t algos[] = {
@@ -44,7 +44,7 @@ class CUTLASSConfigCacheEntry {
     return config_;
   }
 
-  static CUTLASSConfigCacheEntry Load(const std::string path) {
+  static CUTLASSConfigCacheEntry Load(PersistEntry* entry) {
     // Not support deserialization yet.
     throw;
   }
@@ -72,7 +72,7 @@ OpEnv* Tune(const op::CallValues& call, OpEnv* op_env) {
   auto key = HashFusedFunc(Downcast<ClosureValue>(call->callee)->func);
   std::shared_ptr<TunableConfig> best;
 
-  if (const auto* compiled = CacheConfig.Get(key.byte_vector)) {
+  if (auto compiled = CacheConfig.Get(key.byte_vector)) {
     CUTLASSConfigCacheEntry entry = *compiled;
     best = entry.GetConfig();
   } else {
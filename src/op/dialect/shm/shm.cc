@@ -0,0 +1,257 @@
+/*
+ * Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ * SPDX-License-Identifier: Apache-2.0
+ */
+
+/*!
+ * \file src/op/dialect/shm/shm.cc
+ * \brief Communication operators on CPU implemented by the shared-memory communicator.
+ */
+#include <vector>
+#include "raf/op_utils.h"
+#include "raf/shm_communicator.h"
+#include "../../schema/communication.h"
+#include "../../../common/shape_utils.h"
+
+namespace raf {
+namespace op {
+namespace communication {
+namespace shm {
+using namespace distributed;
+using namespace distributed::communicator;
+using common::shape_utils::BytesCompactTensor;
+
+RAF_REGISTER_DIALECT("shm").set_enable(DevType::kCPU());
+
+inline int64_t NumElements(const DLTensor* x) {
+  return BytesCompactTensor(*x) / GetSizeInBytes(x->dtype);
+}
+
+class ShmOpEnv : public raf::op::OpEnv {
+ protected:
+  void* communicator;
+
+  ShmCommunicatorObj* GetCommunicator() {
+    return reinterpret_cast<ShmCommunicatorObj*>(communicator);
+  }
+};
+
+class ShmAllReduce : public ShmOpEnv {
+  ShmReduceOp compute;
+
+  explicit ShmAllReduce(const CallValues& cv) {
+    auto op = ir::Op::Get("raf.op._allreduce");
+    auto fschema_index = ir::Op::GetAttrMap<op::FRAFSchemaFieldIndex>("FRAFSchemaFieldIndex");
+    auto args = cv->args.as<raf::op::schema::AllreduceArgs>();
+    this->arg_indices = {fschema_index[op]("x")};
+    RequestDistributed(&communicator, "shm", args->rank_list);
+    compute = ShmReduceOpFromString(args->computation);
+  }
+
+ public:
+  ~ShmAllReduce() {
+  }
+
+  std::string name() const override {
+    return TruncateName(GetUniqueName("raf.op.shm._allreduce"));
+  }
+
+  void Execute(const CallValues& cv) override {
+    auto args = cv->args.as<raf::op::schema::AllreduceArgs>();
+    Execute({TupleValue::make(ir::Array<Value>(args->x.begin(), args->x.end()))}, cv->out);
+  }
+
+  void Execute(const std::vector<value::Value>& inputs, value::Value output) override {
+    auto comm = GetCommunicator();
+    auto tv = Downcast<value::TupleValue>(inputs[0]);
+    if (tv->fields.size() == 1) {
+      DLTensor* x = tv->fields[0];
+      DLTensor* out = output;
+      comm->AllReduce(x->data, out->data, NumElements(x), x->dtype, compute);
+      return;
+    }
+    // Tensors are reduced one by one; the chunking in the communicator already amortizes the
+    // synchronization, so there is no need to fuse them into a workspace.
+    auto out = Downcast<value::TupleValue>(output);
+    for (int i = 0; i < tv->fields.size(); ++i) {
+      DLTensor* x = tv->fields[i];
+      DLTensor* ot = out->fields[i];
+      comm->AllReduce(x->data, ot->data, NumElements(x), x->dtype, compute);
+    }
+  }
+
+  static OpEnv* make(const CallValues& cv) {
+    return new ShmAllReduce(cv);
+  }
+};
+
+RAF_REGISTER_DIALECT_OP(shm, _allreduce, 10);
+RAF_OP_ENV_MAKER("raf.op.shm._allreduce", ShmAllReduce::make);
+
+class ShmAllGather : public ShmOpEnv {
+  explicit ShmAllGather(const CallValues& cv) {
+    auto op = ir::Op::Get("raf.op._allgather");
+    auto fschema_index = ir::Op::GetAttrMap<op::FRAFSchemaFieldIndex>("FRAFSchemaFieldIndex");
+    auto args = cv->args.as<raf::op::schema::AllgatherArgs>();
+    this->arg_indices = {fschema_index[op]("x")};
+    RequestDistributed(&communicator, "shm", args->rank_list);
+  }
+
+ public:
+  ~ShmAllGather() {
+  }
+
+  std::string name() const override {
+    return TruncateName(GetUniqueName("raf.op.shm._allgather"));
+  }
+
+  void Execute(const CallValues& cv) override {
+    auto args = cv->args.as<raf::op::schema::AllgatherArgs>();
+    Execute({args->x}, cv->out);
+  }
+
+  void Execute(const std::vector<value::Value>& inputs, value::Value output) override {
+    DLTensor* x = inputs[0];
+    DLTensor* out = output;
+    GetCommunicator()->AllGather(x->data, out->data, BytesCompactTensor(*x));
+  }
+
+  static OpEnv* make(const CallValues& cv) {
+    return new ShmAllGather(cv);
+  }
+};
+
+RAF_REGISTER_DIALECT_OP(shm, _allgather, 10);
+RAF_OP_ENV_MAKER("raf.op.shm._allgather", ShmAllGather::make);
+
+class ShmGroupAllGather : public ShmOpEnv {
+  explicit ShmGroupAllGather(const CallValues& cv) {
+    auto op = ir::Op::Get("raf.op._group_allgather");
+    auto fschema_index = ir::Op::GetAttrMap<op::FRAFSchemaFieldIndex>("FRAFSchemaFieldIndex");
+    this->arg_indices = {fschema_index[op]("tensor_list")};
+    RequestDistributed(&communicator, "shm", NullValue<Value>());
+  }
+
+ public:
+  ~ShmGroupAllGather() {
+  }
+
+  std::string name() const override {
+    return TruncateName(GetUniqueName("raf.op.shm._group_allgather"));
+  }
+
+  void Execute(const CallValues& cv) override {
+    auto args = cv->args.as<raf::op::schema::GroupAllgatherArgs>();
+    Execute(
+        {TupleValue::make(ir::Array<Value>(args->tensor_list.begin(), args->tensor_list.end()))},
+        cv->out);
+  }
+
+  void Execute(const std::vector<value::Value>& inputs, value::Value output) override {
+    auto comm = GetCommunicator();
+    auto tv = Downcast<value::TupleValue>(inputs[0]);
+    auto out = Downcast<value::TupleValue>(output);
+    for (int i = 0; i < tv->fields.size(); ++i) {
+      DLTensor* x = tv->fields[i];
+      DLTensor* ot = out->fields[i];
+      comm->AllGather(x->data, ot->data, BytesCompactTensor(*x));
+    }
+  }
+
+  static OpEnv* make(const CallValues& cv) {
+    return new ShmGroupAllGather(cv);
+  }
+};
+
+RAF_REGISTER_DIALECT_OP(shm, _group_allgather, 10);
+RAF_OP_ENV_MAKER("raf.op.shm._group_allgather", ShmGroupAllGather::make);
+
+class ShmReduceScatter : public ShmOpEnv {
+  ShmReduceOp compute;
+
+  explicit ShmReduceScatter(const CallValues& cv) {
+    auto op = ir::Op::Get("raf.op._reduce_scatter");
+    auto fschema_index = ir::Op::GetAttrMap<op::FRAFSchemaFieldIndex>("FRAFSchemaFieldIndex");
+    this->arg_indices = {fschema_index[op]("x")};
+    auto args = cv->args.as<raf::op::schema::ReduceScatterArgs>();
+    RequestDistributed(&communicator, "shm", args->rank_list);
+    compute = ShmReduceOpFromString(args->computation);
+  }
+
+ public:
+  ~ShmReduceScatter() {
+  }
+
+  std::string name() const override {
+    return TruncateName(GetUniqueName("raf.op.shm._reduce_scatter"));
+  }
+
+  void Execute(const CallValues& cv) override {
+    auto args = cv->args.as<raf::op::schema::ReduceScatterArgs>();
+    Execute({args->x}, cv->out);
+  }
+
+  void Execute(const std::vector<value::Value>& inputs, value::Value output) override {
+    DLTensor* x = inputs[0];
+    DLTensor* out = output;
+    GetCommunicator()->ReduceScatter(x->data, out->data, NumElements(out), x->dtype, compute);
+  }
+
+  static OpEnv* make(const CallValues& cv) {
+    return new ShmReduceScatter(cv);
+  }
+};
+
+RAF_REGISTER_DIALECT_OP(shm, _reduce_scatter, 10);
+RAF_OP_ENV_MAKER("raf.op.shm._reduce_scatter", ShmReduceScatter::make);
+
+class ShmGroupReduceScatter : public ShmOpEnv {
+  ShmReduceOp compute;
+
+  explicit ShmGroupReduceScatter(const CallValues& cv) {
+    auto op = ir::Op::Get("raf.op._group_reduce_scatter");
+    auto fschema_index = ir::Op::GetAttrMap<op::FRAFSchemaFieldIndex>("FRAFSchemaFieldIndex");
+    this->arg_indices = {fschema_index[op]("tensor_list")};
+    RequestDistributed(&communicator, "shm", NullValue<Value>());
+    auto args = cv->args.as<raf::op::schema::GroupReduceScatterArgs>();
+    compute = ShmReduceOpFromString(args->computation);
+  }
+
+ public:
+  ~ShmGroupReduceScatter() {
+  }
+
+  std::string name() const override {
+    return TruncateName(GetUniqueName("raf.op.shm._group_reduce_scatter"));
+  }
+
+  void Execute(const CallValues& cv) override {
+    auto args = cv->args.as<raf::op::schema::GroupReduceScatterArgs>();
+    Execute(
+        {TupleValue::make(ir::Array<Value>(args->tensor_list.begin(), args->tensor_list.end()))},
+        cv->out);
+  }
+
+  void Execute(const std::vector<value::Value>& inputs, value::Value output) override {
+    auto comm = GetCommunicator();
+    auto tv = Downcast<value::TupleValue>(inputs[0]);
+    auto out = Downcast<value::TupleValue>(output);
+    for (int i = 0; i < tv->fields.size(); ++i) {
+      DLTensor* x = tv->fields[i];
+      DLTensor* ot = out->fields[i];
+      comm->ReduceScatter(x->data, ot->data, NumElements(ot), x->dtype, compute);
+    }
+  }
+
+  static OpEnv* make(const CallValues& cv) {
+    return new ShmGroupReduceScatter(cv);
+  }
+};
+
+RAF_REGISTER_DIALECT_OP(shm, _group_reduce_scatter, 10);
+RAF_OP_ENV_MAKER("raf.op.shm._group_reduce_scatter", ShmGroupReduceScatter::make);
+
+}  // namespace shm
+}  // namespace communication
+}  // namespace op
+}  // namespace raf
@@ -281,21 +281,20 @@ OpEnv* FusedFuncBuild(const op::CallValues& call) {
   env->env_name = TruncateName(GetUniqueName(raf_to_tvm.func_name));
 
   auto key = HashFusedFunc(Downcast<ClosureValue>(call->callee)->func);
+  // The kernels compiled for different targets, e.g., with RAF_CPU_TARGET, are cached apart.
+  key << target->str();
   TVMModuleCacheEntry entry;
-  if (const auto* compiled = cache->Get(key.byte_vector)) {
-    entry = *compiled;
-  } else {
-    te_compiler->Clear();
-    try {
+  try {
+    entry = cache->GetOrCreate(key.byte_vector, [&]() {
+      te_compiler->Clear();
       auto cached_key = tvm::relay::tec::CCacheKey(func, target);
       auto cached_func = te_compiler->Lower(cached_key, [](String name) { return name; });
       auto mod = tvm::build(cached_func->funcs, cached_key->target, Target(nullptr));
-      entry = TVMModuleCacheEntry(mod, cached_func->prim_fn_var->name_hint);
-      cache->Set(key.byte_vector, entry);
-    } catch (const dmlc::Error& e) {
-      if (!AllowJitFailure()) {
-        LOG(FATAL) << "Failed to build a fused op " << env->env_name << ": " << e.what();
-      }
+      return TVMModuleCacheEntry(mod, cached_func->prim_fn_var->name_hint);
+    });
+  } catch (const dmlc::Error& e) {
+    if (!AllowJitFailure()) {
+      LOG(FATAL) << "Failed to build a fused op " << env->env_name << ": " << e.what();
     }
   }
 
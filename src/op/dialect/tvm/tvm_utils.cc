@@ -143,7 +143,7 @@ PackedMetricMap DumpTVMCacheMetric(const std::string& cache_name) {
 
   auto metrics = name_to_cache[cache_name]->GetMetric();
   for (const auto& it : metrics) {
-    ret.Set(it.first, it.second);
+    ret.Set(it.first, Integer(IntImm(DataType::Int(64), it.second)));
   }
   return ret;
 }
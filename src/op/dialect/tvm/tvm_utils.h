@@ -10,6 +10,7 @@
 #pragma once
 #include <vector>
 #include <memory>
+#include <sstream>
 #include <dmlc/filesystem.h>
 #include <tvm/node/serialization.h>
 #include "dlpack/dlpack.h"
@@ -66,13 +67,15 @@ class TVMModuleCacheEntry {
       : mod_(mod), func_name_(func_name) {
   }
 
-  static TVMModuleCacheEntry Load(const std::string path) {
+  static TVMModuleCacheEntry Load(PersistEntry* entry) {
     static auto f_load = registry::GetPackedFunc("raf._tvm_op.utils.load_module");
-    tvm::runtime::Module mod = f_load(path + "/" + MOD_SO_FILE);
+    tvm::runtime::Module mod = f_load(entry->FilePath(MOD_SO_FILE));
 
-    std::ifstream ifs(path + "/" + FUNC_NAME_FILE);
+    std::string data;
+    CHECK(entry->ReadFile(FUNC_NAME_FILE, &data)) << "Function name file does not exist";
+    std::istringstream iss(data);
     std::string func_name;
-    ifs >> func_name;
+    iss >> func_name;
 
     return TVMModuleCacheEntry(mod, func_name);
   }
@@ -117,20 +120,12 @@ class RelayFuncCacheEntry {
     return func_;
   }
 
-  static RelayFuncCacheEntry Load(const std::string path) {
-    std::ifstream ifs(path + "/" + FUNC_FILE, std::ios::in);
-    if (!ifs.is_open()) {
-      LOG(FATAL) << "Function JSON file does not exist: " << path + "/" + FUNC_FILE;
+  static RelayFuncCacheEntry Load(PersistEntry* entry) {
+    std::string func_json;
+    if (!entry->ReadFile(FUNC_FILE, &func_json)) {
+      LOG(FATAL) << "Function JSON file does not exist: " << FUNC_FILE;
       throw;
     }
-
-    std::string func_json;
-    ifs.seekg(0, std::ios::end);
-    size_t size = static_cast<size_t>(ifs.tellg());
-    ifs.seekg(0, std::ios::beg);
-    func_json.resize(size);
-    ifs.read(&func_json[0], size);
-    ifs.close();
     auto func = Downcast<Function>(tvm::LoadJSON(func_json));
     return RelayFuncCacheEntry(func);
   }
@@ -225,17 +220,12 @@ extern MetaPersistCache<RelayFuncCacheEntry> CacheLoweredFunc;
     } else {                                                                                       \
       ret_type = GetTupleType(env->outputs);                                                       \
     }                                                                                              \
-    RType ret;                                                                                     \
     HashKey key;                                                                                   \
-    key << #OP << HASH(param_types, ret_type, schema);                                             \
-    if (const auto* compiled = cache->Get(key.byte_vector)) {                                      \
-      ret = *compiled;                                                                             \
-    } else {                                                                                       \
+    key << #OP << call->device.tvm_target()->str() << HASH(param_types, ret_type, schema);         \
+    return cache->GetOrCreate(key.byte_vector, [&]() {                                             \
       auto lowered = LowerOp(op, attrs, param_types, ret_type);                                    \
-      ret = f_post_lower(lowered);                                                                 \
-      cache->Set(key.byte_vector, ret);                                                            \
-    }                                                                                              \
-    return ret;                                                                                    \
+      return f_post_lower(lowered);                                                                \
+    });                                                                                            \
   }                                                                                                \
   OpEnv* FUNC##Build(const op::CallValues call) {                                                  \
     tvm::relay::tec::TECompiler te_compiler;                                                       \
@@ -53,5 +53,29 @@ Type LansInfer(const CallValues& value) {
 
 RAF_OP_TYPE("raf.op.lans", "Lans", LansInfer);
 
+Type MultiTensorSgdInfer(const CallValues& value) {
+  const auto* args = value->args.as<MultiTensorSgdArgs>();
+  CHECK(args != nullptr);
+  CHECK(args->tensor_list.size() % 3 == 0);
+  int ntensors = args->tensor_list.size() / 3;
+  Array<Type> res;
+  for (int i = 0; i < args->tensor_list.size(); ++i) {
+    res.push_back(Downcast<TensorType>(GetType(args->tensor_list[i])));
+  }
+  for (int i = 0; i < ntensors; ++i) {
+    TensorType dx = Downcast<TensorType>(res[i]);
+    for (int j = 1; j < 3; ++j) {
+      TensorType t = Downcast<TensorType>(res[j * ntensors + i]);
+      CHECK_EQ(t->shape.size(), dx->shape.size());
+      for (size_t k = 0; k < dx->shape.size(); ++k) {
+        CHECK(TypeCheckCompare(t->shape[k], dx->shape[k], std::equal_to<int>()));
+      }
+    }
+  }
+  return TupleType(res);
+}
+
+RAF_OP_TYPE("raf.op.multi_tensor_sgd", "MultiTensorSgd", MultiTensorSgdInfer);
+
 }  // namespace op
 }  // namespace raf
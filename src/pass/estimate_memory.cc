@@ -7,12 +7,14 @@
  * \file estimate_memory.cc
  * \brief Estimate the memory footprint. Note that this can only be used after ManifestAlloc pass.
  */
+#include <algorithm>
 #include "raf/device.h"
 #include "raf/op.h"
 #include "raf/op_profiler.h"
 #include "raf/pass.h"
 #include "./let_list.h"
 #include "./common.h"
+#include "./liveness_analysis.h"
 #include "../common/shape_utils.h"
 
 namespace raf {
@@ -27,11 +29,13 @@ constexpr float kMegaBytes = 1048576;
 
 /*!
  * \brief A visitor to visit after ManifestAlloc ANF IR and estimate the memory footprint.
+ * If MemoryPlan packed the intermediate tensors into arenas, the footprint without arenas,
+ * where each tensor has its own storage released after its last use, is traced as well.
  */
 class MemoryTracer : public ExprVisitor {
  public:
   MemoryTracer(const Device& device, const Function& func, const IRModule& mod, bool include_params)
-      : ell_(ExplicitLetList::make(func->body)), device_(device), mod_(mod) {
+      : ell_(ExplicitLetList::make(func->body)), device_(device), mod_(mod), analyzer_(func) {
     profiler_ = op_profiler::OpProfiler::Get(device);
     if (include_params) {
       for (const auto param : func->params) {
@@ -39,6 +43,28 @@ class MemoryTracer : public ExprVisitor {
         curr_memoey_mbs_ += size / kMegaBytes;
       }
     }
+    curr_no_arena_mbs_ = curr_memoey_mbs_;
+
+    // Arenas are the storages of the alloc_tensors with offsets.
+    static const Op& alloc_tensor_op = Op::Get("raf.op.vm.alloc_tensor");
+    for (const auto& expr : ell_->exprs) {
+      auto call = expr.as<CallNode>();
+      if (call && call->op.same_as(alloc_tensor_op) && call->args.size() == 6) {
+        arena_vars_.insert(Downcast<Var>(call->args[0]));
+      }
+    }
+    if (!arena_vars_.empty()) {
+      try {
+        analyzer_.Run();
+        has_liveness_ = analyzer_.IsSuccess();
+      } catch (const dmlc::Error& e) {
+        has_liveness_ = false;
+      }
+      if (!has_liveness_) {
+        LOG(WARNING) << "Cannot estimate the memory footprint without arenas because liveness "
+                     << "analysis was failed";
+      }
+    }
   };
 
   MemoryTrace Run() {
@@ -62,13 +88,22 @@ class MemoryTracer : public ExprVisitor {
 
     // Add the final trace. At this point, the memory usage should just include the outputs.
     trace_.push_back({String("out"), FloatImm(DataType::Float(32), curr_memoey_mbs_)});
+    no_arena_trace_.push_back(curr_no_arena_mbs_);
     return trace_;
   }
 
+  /*! \brief Get the traced memory usages in MBs if the tensors in arenas had their own
+   * storages. This is the same as the memory trace if no arena is used. */
+  const std::vector<float>& GetNoArenaTrace() const {
+    return no_arena_trace_;
+  }
+
   void VisitExpr_(const CallNode* call) final {
     static const Op& alloc_storage_op = Op::Get("raf.op.vm.alloc_storage");
     static const Op& free_op = Op::Get("raf.op.vm.free");
     static const Op& invoke_op = Op::Get("raf.op.vm.invoke_op");
+    static const Op& alloc_tensor_op = Op::Get("raf.op.vm.alloc_tensor");
+    static const Op& set_shape_op = Op::Get("raf.op.vm.set_shape");
 
     const auto* op_node = call->op.as<OpNode>();
     CHECK(op_node != nullptr)
@@ -88,21 +123,64 @@ class MemoryTracer : public ExprVisitor {
       auto ws_size = exec_time_and_ws_size.second / kMegaBytes;
 
       trace_.push_back({String(name), FloatImm(DataType::Float(32), curr_memoey_mbs_ + ws_size)});
+      no_arena_trace_.push_back(curr_no_arena_mbs_ + GetLiveArenaTensorMBs() + ws_size);
     } else if (GetRef<Op>(op_node) == alloc_storage_op) {
       // Alloc a new buffer.
       auto size = call->args[0].as<ConstantNode>()->value.as<IntValueObj>()->value / kMegaBytes;
       curr_memoey_mbs_ += size;
       storage_vars_[curr_let_] = size;
+      if (arena_vars_.count(curr_let_) == 0) {
+        curr_no_arena_mbs_ += size;
+      }
     } else if (GetRef<Op>(op_node) == free_op) {
       // Free a buffer.
       auto storage_var = Downcast<Var>(call->args[0]);
       CHECK_GE(storage_vars_.count(storage_var), 1U);
       curr_memoey_mbs_ -= storage_vars_[storage_var];
+      if (arena_vars_.count(storage_var) == 0) {
+        curr_no_arena_mbs_ -= storage_vars_[storage_var];
+      }
       storage_vars_.erase(storage_var);
+    } else if (GetRef<Op>(op_node) == alloc_tensor_op && call->args.size() == 6 &&
+               has_liveness_) {
+      // A tensor in an arena, which is alive as long as its dummy tensor is alive.
+      auto size = common::shape_utils::BytesCompactType(call->checked_type()) / kMegaBytes;
+      for (const auto& tensor_var : analyzer_.GetTensorVars(curr_let_)) {
+        arena_tensor_ids_[tensor_var] = arena_tensor_mbs_.size();
+      }
+      arena_tensor_mbs_.push_back(size);
+    } else if (GetRef<Op>(op_node) == set_shape_op && has_liveness_) {
+      // A view of a tensor in an arena keeps the tensor alive.
+      auto src_tensor_vars = analyzer_.GetTensorVars(Downcast<Var>(call->args[0]));
+      if (src_tensor_vars.size() == 1 && arena_tensor_ids_.count(src_tensor_vars[0])) {
+        auto tensor_id = arena_tensor_ids_[src_tensor_vars[0]];
+        for (const auto& tensor_var : analyzer_.GetTensorVars(curr_let_)) {
+          arena_tensor_ids_[tensor_var] = tensor_id;
+        }
+      }
     }
   }
 
  private:
+  /*! \brief Get the total size of the tensors in arenas that are alive at the current line. */
+  float GetLiveArenaTensorMBs() {
+    if (arena_tensor_ids_.empty()) {
+      return 0;
+    }
+    std::unordered_set<int> live_ids;
+    for (const auto& tensor_var : analyzer_.GetLiveVars(curr_let_)) {
+      auto it = arena_tensor_ids_.find(tensor_var);
+      if (it != arena_tensor_ids_.end()) {
+        live_ids.insert(it->second);
+      }
+    }
+    float total = 0;
+    for (auto tensor_id : live_ids) {
+      total += arena_tensor_mbs_[tensor_id];
+    }
+    return total;
+  }
+
   /*! \brief The current processing let var. */
   Var curr_let_;
   /*! \brief Let binding vars to the expression. */
@@ -122,6 +200,20 @@ class MemoryTracer : public ExprVisitor {
   MemoryTrace trace_;
   /*! \brief Current memory usage. */
   float curr_memoey_mbs_ = 0;
+  /*! \brief The liveness analyzer to know the lifetime of the tensors in arenas. */
+  liveness_analysis::LivenessAnalyzer analyzer_;
+  /*! \brief Whether the liveness analysis is available. */
+  bool has_liveness_ = false;
+  /*! \brief The storage vars of arenas. */
+  std::unordered_set<Var, ObjectPtrHash, ObjectPtrEqual> arena_vars_;
+  /*! \brief The map from dummy tensor vars to the tensors in arenas. */
+  std::unordered_map<Var, int, ObjectPtrHash, ObjectPtrEqual> arena_tensor_ids_;
+  /*! \brief The sizes of the tensors in arenas. */
+  std::vector<float> arena_tensor_mbs_;
+  /*! \brief Current memory usage excluding arenas. */
+  float curr_no_arena_mbs_ = 0;
+  /*! \brief The collected memory trace without arenas. */
+  std::vector<float> no_arena_trace_;
 };
 
 }  // namespace estimate_memory
@@ -134,7 +226,24 @@ estimate_memory::MemoryTrace EstimateMemory(const IRModule& mod, const Device& d
   return estimator.Run();
 }
 
+Map<String, FloatImm> EstimateMemoryFootprint(const IRModule& mod, const Device& device,
+                                              bool include_params) {
+  auto entry = mod->GetGlobalVar("main");
+  auto func = Downcast<Function>(mod->Lookup(entry));
+  auto estimator = estimate_memory::MemoryTracer(device, func, mod, include_params);
+  auto trace = estimator.Run();
+  float peak = 0;
+  for (const auto& item : trace) {
+    peak = std::max(peak, static_cast<float>(Downcast<FloatImm>(item[1])->value));
+  }
+  const auto& no_arena_trace = estimator.GetNoArenaTrace();
+  float no_arena_peak = *std::max_element(no_arena_trace.begin(), no_arena_trace.end());
+  return {{"peak", FloatImm(DataType::Float(32), peak)},
+          {"peak_without_arena", FloatImm(DataType::Float(32), no_arena_peak)}};
+}
+
 RAF_REGISTER_GLOBAL("raf.pass_.EstimateMemory").set_body_typed(EstimateMemory);
+RAF_REGISTER_GLOBAL("raf.pass_.EstimateMemoryFootprint").set_body_typed(EstimateMemoryFootprint);
 
 }  // namespace pass
 }  // namespace raf
@@ -8,7 +8,10 @@
  * \brief Optimized allocated memory in the IR.
  */
 #include <algorithm>
+#include <limits>
+#include <map>
 #include <random>
+#include <tuple>
 #include <vector>
 
 #include "raf/op.h"
@@ -54,6 +57,44 @@ struct TensorGroup {
 
   /*! \brief The alignment of this group. */
   int64_t alignment;
+
+  /*! \brief The let index where this group is created, or -1 if the tensor is not allocated
+   * at the top level of the function.
+   */
+  int start = -1;
+
+  /*! \brief The last let index where one of the tensors in this group is alive. */
+  int end = -1;
+
+  /*! \brief The arena that this group is packed into, or -1 if it has its own storage. */
+  int arena_id = -1;
+
+  /*! \brief The byte offset of this group in its arena. */
+  int64_t offset = 0;
+};
+
+/*! \brief A storage arena. The tensor groups with non-overlapped lifetimes on the same device
+ * are packed into one arena at different offsets, so only one storage is allocated for them.
+ */
+struct Arena {
+  /*! \brief The binded variable for the arena storage. */
+  Var storage;
+
+  /*! \brief The arguments of the alloc_storage of one group in this arena, from which the
+   * device and dtype of the arena storage are taken.
+   */
+  Array<Expr> storage_args;
+
+  /*! \brief The buffer size of this arena. */
+  int64_t size = 0;
+
+  /*! \brief The alignment of this arena, which is the largest one of its groups. */
+  int64_t alignment = 0;
+
+  /*! \brief The let var that creates the first group in this arena. The arena is allocated
+   * right before it.
+   */
+  Var first_let;
 };
 
 /*! \brief A list of tensor groups with manipulation utilities. */
@@ -62,6 +103,9 @@ class TensorGroups {
   /*! \brief A list of storage allocation groups. */
   std::vector<TensorGroup> groups;
 
+  /*! \brief A list of arenas that the groups are packed into. */
+  std::vector<Arena> arenas;
+
   TensorGroups(liveness_analysis::LivenessAnalyzer* analyzer) : analyzer_(analyzer) {
     dummy_out_vars_ = analyzer_->GetOutputTensorVars();
   }
@@ -89,52 +133,27 @@ class TensorGroups {
     return false;
   }
 
+  /*! \brief Find the group ID that the dummy tensor var belongs to, or -1 if not found. */
+  int FindGroupIdByTensorVar(const Var& tensor_var) {
+    auto it = member_group_ids_.find(tensor_var);
+    return (it != member_group_ids_.end()) ? it->second : -1;
+  }
+
   /*! \brief Find the group ID that the target var belongs to, or -1 if not found. */
   int FindGroupIdByMember(const Var& let_var) {
-    const Var target_var = GetTensorVar(let_var);
-    for (size_t j = 0; j < groups.size(); ++j) {
-      if (groups[j].members.find(target_var) != groups[j].members.end()) {
-        return j;
-      }
-    }
-    return -1;
+    return FindGroupIdByTensorVar(GetTensorVar(let_var));
   }
 
   /*! \brief Find the group ID that the target storage var belongs to, or -1 if not found. */
   int FindGroupIdByStorageVar(const Var& storage_var) {
-    for (size_t j = 0; j < groups.size(); ++j) {
-      if (groups[j].storage == storage_var) {
-        return j;
-      }
-    }
-    return -1;
+    auto it = storage_group_ids_.find(storage_var);
+    return (it != storage_group_ids_.end()) ? it->second : -1;
   }
 
-  /*! \brief Find valid tensor groups of the given tensor and its alignment. */
-  std::vector<int> FindValidGroups(const Var& let_var, const int64_t alignment) {
-    // Live in vars.
-    auto live_in_vars = analyzer_->GetLiveVars(let_var);
-
-    // Find valid tensor groups.
-    std::vector<int> candidates;
-    for (size_t i = 0; i < groups.size(); ++i) {
-      bool valid = true;
-      for (const auto& member : groups[i].members) {
-        if (groups[i].size == -1 || live_in_vars.count(member.first) > 0 ||
-            groups[i].alignment != alignment) {
-          // This group is invalid for this tensor to join if:
-          // 1. Its size is dynamic,
-          // 2. One of its members appears at the live-in set, or
-          // 3. Its alignment is not the same as the current tensor.
-          valid = false;
-          break;
-        }
-      }
-      if (valid) {
-        candidates.push_back(i);
-      }
-    }
-    return candidates;
+  /*! \brief Get the storage var that the tensors in the given group should be allocated to. */
+  Var GetStorageVar(size_t group_id) {
+    const auto& group = groups[group_id];
+    return (group.arena_id != -1) ? arenas[group.arena_id].storage : group.storage;
   }
 
   /*! \brief Join the given tensor group. */
@@ -142,11 +161,13 @@ class TensorGroups {
     const Var target_var = GetTensorVar(let_var);
     groups[group_id].members[target_var] = std::make_pair(let_var, size);
     groups[group_id].size = (groups[group_id].size > size) ? groups[group_id].size : size;
+    member_group_ids_[target_var] = group_id;
   }
 
   /*! \brief Create a new group and return its ID. */
   int CreateGroup(const Var& storage_var, int64_t alignment) {
     groups.emplace_back(TensorGroup(storage_var, alignment));
+    storage_group_ids_.emplace(storage_var, groups.size() - 1);
     return groups.size() - 1;
   }
 
@@ -169,6 +190,7 @@ class TensorGroups {
       groups[group_id].size = max_size;
     }
     groups[group_id].members.erase(target_var);
+    member_group_ids_.erase(target_var);
     return storage_nbytes;
   }
 
@@ -176,7 +198,12 @@ class TensorGroups {
   float GetTotalMemoryMBs() {
     float total = 0.0;
     for (size_t j = 0; j < groups.size(); ++j) {
-      total += groups[j].size;
+      if (groups[j].arena_id == -1) {
+        total += groups[j].size;
+      }
+    }
+    for (const auto& arena : arenas) {
+      total += arena.size;
     }
     return total / 1024.0 / 1024.0;
   }
@@ -189,8 +216,15 @@ class TensorGroups {
       for (const auto member : group.members) {
         ss2 << member.second.first->name_hint() << "(" << member.second.second << "), ";
       }
-      ss1 << "Storage " << group.storage->name_hint() << ", size " << group.size
-          << ", members: " << ss2.str() << std::endl;
+      ss1 << "Storage " << group.storage->name_hint() << ", size " << group.size;
+      if (group.arena_id != -1) {
+        ss1 << ", arena " << group.arena_id << ", offset " << group.offset << ", lifetime ["
+            << group.start << ", " << group.end << "]";
+      }
+      ss1 << ", members: " << ss2.str() << std::endl;
+    }
+    for (size_t j = 0; j < arenas.size(); ++j) {
+      ss1 << "Arena " << j << ", size " << arenas[j].size << std::endl;
     }
     return ss1.str();
   }
@@ -200,6 +234,10 @@ class TensorGroups {
   liveness_analysis::LivenessAnalyzer* analyzer_;
   /*! \brief Dummy vars that output tensors map to. */
   VSet dummy_out_vars_;
+  /*! \brief The map from dummy tensor vars to the group IDs they belong to. */
+  StdMap<int> member_group_ids_;
+  /*! \brief The map from storage vars to the group IDs. */
+  StdMap<int> storage_group_ids_;
 };
 
 /*! \brief A mutator to perform the following tasks:
@@ -210,11 +248,15 @@ class TensorGroups {
  *    the largest tensor in the group.
  * 4. Remove alloc_storages that do not be used by any group.
  * 5. Insert free(%x) to free tensor/storage %x at the end of its life-cycle.
+ * When arenas are enabled, the groups of intermediate tensors are further packed into one
+ * arena per device, and their alloc_tensors are mutated to use the arena storage with the
+ * offsets of their groups.
  */
 class MemoryPlanner : public ExprMutator {
  public:
-  MemoryPlanner(const Function& func, liveness_analysis::LivenessAnalyzer* analyzer)
-      : func_(func), analyzer_(analyzer), tensor_groups_(Group()) {
+  MemoryPlanner(const Function& func, liveness_analysis::LivenessAnalyzer* analyzer,
+                bool use_arena)
+      : func_(func), analyzer_(analyzer), use_arena_(use_arena), tensor_groups_(Group()) {
     scopes_.emplace_back(new LetList);
   }
 
@@ -222,10 +264,17 @@ class MemoryPlanner : public ExprMutator {
     DLOG(INFO) << "Tensor groups:";
     DLOG(INFO) << tensor_groups_.DebugDumpGroups();
 
-    // List storage vars that will be used by one or more tensors.
+    // List storage vars that will be used by one or more tensors. The storages of the groups
+    // packed into arenas are replaced by the arena storages.
+    arena_live_groups_.resize(tensor_groups_.arenas.size(), 0);
+    for (size_t j = 0; j < tensor_groups_.arenas.size(); ++j) {
+      arena_first_lets_[tensor_groups_.arenas[j].first_let].push_back(j);
+    }
     for (const auto& group : tensor_groups_.groups) {
-      if (group.members.size() > 0) {
+      if (group.members.size() > 0 && group.arena_id == -1) {
         used_storages_.insert(group.storage);
+      } else if (group.arena_id != -1) {
+        arena_live_groups_[group.arena_id]++;
       }
     }
 
@@ -241,6 +290,15 @@ class MemoryPlanner : public ExprMutator {
     do {
       curr_let_ = node->var;
 
+      // Allocate the arenas whose first groups are created here.
+      auto arena_it = arena_first_lets_.find(curr_let_);
+      if (arena_it != arena_first_lets_.end()) {
+        for (auto arena_id : arena_it->second) {
+          const auto& arena = tensor_groups_.arenas[arena_id];
+          scope->Push(arena.storage, MakeAllocArena(arena));
+        }
+      }
+
       // Free allocated tensors that will not be used anymore.
       auto live_in_vars = analyzer_->GetLiveVars(curr_let_);
       auto it = live_tensors_.begin();
@@ -256,10 +314,15 @@ class MemoryPlanner : public ExprMutator {
             // should hold the memory pointer.
             tensor_groups_.RemoveFromGroup(group_id, *it);
 
-            // Free allocated storages that will not be used anymore.
+            // Free allocated storages that will not be used anymore. An arena is freed
+            // when all its groups are dead.
             auto group = tensor_groups_.groups[group_id];
             if (group.members.size() == 0) {
-              scope->Push(MakeFreeMemory(group.storage));
+              if (group.arena_id == -1) {
+                scope->Push(MakeFreeMemory(group.storage));
+              } else if (--arena_live_groups_[group.arena_id] == 0) {
+                scope->Push(MakeFreeMemory(tensor_groups_.arenas[group.arena_id].storage));
+              }
             }
           }
           it = live_tensors_.erase(it);
@@ -335,11 +398,11 @@ class MemoryPlanner : public ExprMutator {
       CHECK_NE(group_id, -1) << "Internal error: output tensor of " << curr_let_->name_hint()
                              << " does not belong to any tensor group";
       auto storage_var = Downcast<Var>(call->args[0]);
-      if (tensor_groups_.groups[group_id].storage != storage_var) {
+      auto group_storage_var = tensor_groups_.GetStorageVar(group_id);
+      if (group_storage_var != storage_var) {
         DLOG(INFO) << "Assign " << curr_let_->name_hint() << " to "
-                   << tensor_groups_.groups[group_id].storage->name_hint() << " from "
-                   << storage_var->name_hint();
-        new_args.Set(0, tensor_groups_.groups[group_id].storage);
+                   << group_storage_var->name_hint() << " from " << storage_var->name_hint();
+        new_args.Set(0, group_storage_var);
       }
 
       // Override the own memory flag argument.
@@ -350,6 +413,17 @@ class MemoryPlanner : public ExprMutator {
         new_args.Set(4, own);
       }
 
+      // Specify the offset in the arena.
+      const auto& group = tensor_groups_.groups[group_id];
+      if (group.arena_id != -1) {
+        auto offset = MakeConstant(ScalarValue::make(group.offset));
+        if (new_args.size() == 5) {
+          new_args.push_back(offset);
+        } else {
+          new_args.Set(5, offset);
+        }
+      }
+
       return Call(alloc_tensor_op, new_args);
     } else if (op_node && GetRef<Op>(op_node) == reshape_tensor_op) {
       // Other ops that will also create a new tensor/view. We do not need to mutate them,
@@ -369,6 +443,21 @@ class MemoryPlanner : public ExprMutator {
     return Call(op, {memory_var});
   }
 
+  inline Expr MakeAllocArena(const Arena& arena) {
+    static const Op& op = Op::Get("raf.op.vm.alloc_storage");
+    Array<Expr> args = arena.storage_args;
+    args.Set(0, MakeConstant(ScalarValue::make(arena.size)));
+    args.Set(1, MakeConstant(ScalarValue::make(arena.alignment)));
+    // Arenas never hold output tensors so they can always be allocated asynchronously.
+    auto alloc_async = MakeConstant(BoolValue::make(true));
+    if (args.size() == 5) {
+      args.push_back(alloc_async);
+    } else {
+      args.Set(5, alloc_async);
+    }
+    return Call(op, args);
+  }
+
  private:
   /*! \brief The scope stack of the let list. */
   std::vector<std::unique_ptr<LetList>> scopes_;
@@ -380,12 +469,18 @@ class MemoryPlanner : public ExprMutator {
   std::unordered_map<Var, Expr, ObjectPtrHash, ObjectPtrEqual> expr_map_;
   /*! \brief The liveness analyzer, including liveness analysis results. */
   liveness_analysis::LivenessAnalyzer* analyzer_;
+  /*! \brief Whether to pack the tensor groups into arenas. */
+  bool use_arena_;
   /*! \brief A list of storage allocation groups. */
   TensorGroups tensor_groups_;
   /*! \brief Used storage vars. */
   VSet used_storages_;
   /*! \brief Current live tensor vars. */
   VSet live_tensors_;
+  /*! \brief The map from let vars to the arenas allocated right before them. */
+  StdMap<std::vector<int>> arena_first_lets_;
+  /*! \brief The number of groups in each arena that still have live tensors. */
+  std::vector<int> arena_live_groups_;
 };
 
 /*! \brief A visitor to group tensors generated by alloc_tensor according to
@@ -394,11 +489,15 @@ class MemoryPlanner : public ExprMutator {
  * 1) has no other tensors in the live-in set of the current tensor,
  * 2) has the same the alignment, and
  * 3) has the closest storage size as the current tensor.
+ * Optionally, the groups are then packed into arenas according to their lifetimes.
  */
 class MemoryPlanner::TensorGrouper : public ExprVisitor {
  public:
-  TensorGrouper(const Expr& body, liveness_analysis::LivenessAnalyzer* analyzer)
-      : analyzer_(analyzer), tensor_groups_(analyzer), ell_(ExplicitLetList::make(body)) {
+  TensorGrouper(const Expr& body, liveness_analysis::LivenessAnalyzer* analyzer, bool use_arena)
+      : analyzer_(analyzer),
+        use_arena_(use_arena),
+        tensor_groups_(analyzer),
+        ell_(ExplicitLetList::make(body)) {
     CHECK(analyzer_->IsSuccess());
   }
 
@@ -413,13 +512,220 @@ class MemoryPlanner::TensorGrouper : public ExprVisitor {
     }
 
     for (int i = 0; i < n; ++i) {
+      curr_idx_ = i;
       curr_let_ = vars[i];
       ExprVisitor::VisitExpr(exprs[i]);
     }
 
+    if (use_arena_) {
+      PackArenas();
+    }
     return tensor_groups_;
   }
 
+  /*!
+   * \brief Pack the tensor groups into one arena per device. A group only reserves its range
+   * of an arena while one of its tensors is alive, i.e., from the let index that creates the
+   * tensor to the last one that the tensor is alive. Groups are placed in descending order of
+   * their sizes, and each group is placed at the smallest gap between the placed groups whose
+   * lifetimes overlap with it (i.e., greedy by size with best fit). An arena is dropped if it is
+   * larger than the peak memory of its groups with their own storages. Output tensors and the
+   * tensors with dynamic shapes keep their own storages.
+   */
+  void PackArenas() {
+    static const Op& alloc_storage_op = Op::Get("raf.op.vm.alloc_storage");
+    const auto& vars = ell_->vars;
+    auto& groups = tensor_groups_.groups;
+    auto& arenas = tensor_groups_.arenas;
+    int n = vars.size();
+
+    // Find the last line that each tensor is alive, and extend the lifetime of its group.
+    StdMap<int> tensor_ends;
+    for (int i = 0; i < n; ++i) {
+      for (const auto& tensor_var : analyzer_->GetLiveVars(vars[i])) {
+        auto group_id = tensor_groups_.FindGroupIdByTensorVar(tensor_var);
+        if (group_id != -1) {
+          groups[group_id].end = std::max(groups[group_id].end, i);
+          tensor_ends[tensor_var] = i;
+        }
+      }
+    }
+    StdMap<int> let_ids;
+    for (int i = 0; i < n; ++i) {
+      let_ids[vars[i]] = i;
+    }
+
+    // Assign the groups to the arena of their devices, and collect the lifetime of each tensor
+    // in the groups as (start, end, group ID).
+    auto get_storage_device = [&](const TensorGroup& group) {
+      auto storage_node = expr_map_[group.storage].as<CallNode>();
+      CHECK(storage_node && Downcast<Op>(storage_node->op) == alloc_storage_op);
+      auto device_type_val = storage_node->args[2].as<ConstantNode>()->value;
+      auto device_id_val = storage_node->args[3].as<ConstantNode>()->value;
+      return std::make_pair(device_type_val.as<IntValueObj>()->value,
+                            device_id_val.as<IntValueObj>()->value);
+    };
+    std::map<std::pair<int64_t, int64_t>, int> device_arena_ids;
+    std::vector<int> cands;
+    std::vector<std::vector<std::tuple<int, int, int>>> arena_intervals;
+    for (size_t group_id = 0; group_id < groups.size(); ++group_id) {
+      auto& group = groups[group_id];
+      if (group.start == -1 || group.size <= 0 || tensor_groups_.HasOutputTensor(group_id)) {
+        continue;
+      }
+      auto storage_node = expr_map_[group.storage].as<CallNode>();
+      auto device = get_storage_device(group);
+      auto it = device_arena_ids.find(device);
+      if (it == device_arena_ids.end()) {
+        Arena arena;
+        arena.storage = MakeVar("arena" + std::to_string(arenas.size()), {});
+        arena.storage_args = storage_node->args;
+        it = device_arena_ids.emplace(device, arenas.size()).first;
+        arenas.push_back(arena);
+        arena_intervals.emplace_back();
+      }
+      group.arena_id = it->second;
+      cands.push_back(group_id);
+      for (const auto& member : group.members) {
+        auto let_it = let_ids.find(member.second.first);
+        int start = let_it != let_ids.end() ? let_it->second : group.start;
+        auto end_it = tensor_ends.find(member.first);
+        int end = std::max(start, end_it != tensor_ends.end() ? end_it->second : start);
+        arena_intervals[group.arena_id].emplace_back(start, end, group_id);
+      }
+    }
+
+    // Find the groups whose lifetimes overlap by sweeping the tensor lifetimes in each arena.
+    // When a tensor starts, it overlaps with all alive tensors in the same arena, so the cost is
+    // linear to the number of overlapped pairs.
+    std::vector<std::vector<int>> overlaps(groups.size());
+    for (auto& intervals : arena_intervals) {
+      std::sort(intervals.begin(), intervals.end());
+      std::multimap<int, int> alive;  // Map from the end of lifetimes to the group IDs.
+      for (const auto& interval : intervals) {
+        int start = std::get<0>(interval);
+        int group_id = std::get<2>(interval);
+        alive.erase(alive.begin(), alive.lower_bound(start));
+        for (const auto& other : alive) {
+          if (other.second != group_id) {
+            overlaps[group_id].push_back(other.second);
+            overlaps[other.second].push_back(group_id);
+          }
+        }
+        alive.emplace(std::get<1>(interval), group_id);
+      }
+    }
+
+    // Place the groups in descending order of their sizes.
+    std::stable_sort(cands.begin(), cands.end(),
+                     [&](int lhs, int rhs) { return groups[lhs].size > groups[rhs].size; });
+    std::vector<bool> placed(groups.size(), false);
+    for (auto group_id : cands) {
+      auto& group = groups[group_id];
+      auto& group_overlaps = overlaps[group_id];
+      std::sort(group_overlaps.begin(), group_overlaps.end());
+      group_overlaps.erase(std::unique(group_overlaps.begin(), group_overlaps.end()),
+                           group_overlaps.end());
+      std::vector<std::pair<int64_t, int64_t>> used_ranges;
+      for (auto other_id : group_overlaps) {
+        if (placed[other_id]) {
+          used_ranges.emplace_back(groups[other_id].offset,
+                                   groups[other_id].offset + groups[other_id].size);
+        }
+      }
+      std::sort(used_ranges.begin(), used_ranges.end());
+
+      // Find the smallest gap that fits this group, or place it after all overlapped groups.
+      int64_t best_offset = -1;
+      int64_t best_gap = std::numeric_limits<int64_t>::max();
+      int64_t prev_end = 0;
+      for (const auto& range : used_ranges) {
+        int64_t offset = AlignUp(prev_end, group.alignment);
+        int64_t gap = range.first - offset;
+        if (gap >= group.size && gap < best_gap) {
+          best_offset = offset;
+          best_gap = gap;
+        }
+        prev_end = std::max(prev_end, range.second);
+      }
+      if (best_offset == -1) {
+        best_offset = AlignUp(prev_end, group.alignment);
+      }
+      group.offset = best_offset;
+      placed[group_id] = true;
+
+      auto& arena = arenas[group.arena_id];
+      arena.size = std::max(arena.size, group.offset + group.size);
+      arena.alignment = std::max(arena.alignment, group.alignment);
+    }
+
+    // Without arenas, the storage of a group is allocated at its creation and freed after its
+    // last use. An arena is allocated at the creation of its first group and freed after all its
+    // groups are dead, so it may raise the peak memory of its device, e.g., when an output tensor
+    // is allocated while the arena is alive. Such arenas are dropped.
+    std::vector<int> arena_starts(arenas.size(), n), arena_ends(arenas.size(), -1);
+    for (auto group_id : cands) {
+      const auto& group = groups[group_id];
+      arena_starts[group.arena_id] = std::min(arena_starts[group.arena_id], group.start);
+      arena_ends[group.arena_id] = std::max(arena_ends[group.arena_id], group.end);
+    }
+    std::vector<std::vector<int64_t>> deltas_without(arenas.size(),
+                                                     std::vector<int64_t>(n + 1, 0));
+    auto deltas_with = deltas_without;
+    for (size_t group_id = 0; group_id < groups.size(); ++group_id) {
+      const auto& group = groups[group_id];
+      if (group.arena_id != -1) {
+        deltas_without[group.arena_id][group.start] += group.size;
+        deltas_without[group.arena_id][group.end + 1] -= group.size;
+      } else if (group.start != -1 && group.size > 0) {
+        auto it = device_arena_ids.find(get_storage_device(group));
+        if (it != device_arena_ids.end()) {
+          // Output tensors are alive until the end of the function.
+          int end = tensor_groups_.HasOutputTensor(group_id) ? n - 1 : group.end;
+          for (auto* deltas : {&deltas_without, &deltas_with}) {
+            (*deltas)[it->second][group.start] += group.size;
+            (*deltas)[it->second][end + 1] -= group.size;
+          }
+        }
+      }
+    }
+    auto get_peak = [](const std::vector<int64_t>& deltas) {
+      int64_t peak = 0, curr = 0;
+      for (auto delta : deltas) {
+        curr += delta;
+        peak = std::max(peak, curr);
+      }
+      return peak;
+    };
+    std::vector<int> new_arena_ids(arenas.size(), -1);
+    std::vector<Arena> kept_arenas;
+    for (size_t arena_id = 0; arena_id < arenas.size(); ++arena_id) {
+      auto& arena = arenas[arena_id];
+      deltas_with[arena_id][arena_starts[arena_id]] += arena.size;
+      deltas_with[arena_id][arena_ends[arena_id] + 1] -= arena.size;
+      int64_t peak_with = get_peak(deltas_with[arena_id]);
+      int64_t peak_without = get_peak(deltas_without[arena_id]);
+      if (peak_with <= peak_without) {
+        arena.first_let = vars[arena_starts[arena_id]];
+        new_arena_ids[arena_id] = kept_arenas.size();
+        kept_arenas.push_back(arena);
+      } else {
+        DLOG(INFO) << "Drop arena " << arena_id << " as it raises the peak memory from "
+                   << peak_without << " to " << peak_with;
+      }
+    }
+    for (auto group_id : cands) {
+      auto& group = groups[group_id];
+      group.arena_id = new_arena_ids[group.arena_id];
+      if (group.arena_id == -1) {
+        group.offset = 0;
+      }
+    }
+    arenas.swap(kept_arenas);
+    DLOG(INFO) << "Packed " << cands.size() << " tensor groups into " << arenas.size()
+               << " arenas";
+  }
+
   void VisitExpr_(const CallNode* node) override {
     static const Op& alloc_storage_op = Op::Get("raf.op.vm.alloc_storage");
     static const Op& alloc_tensor_op = Op::Get("raf.op.vm.alloc_tensor");
@@ -457,6 +763,11 @@ class MemoryPlanner::TensorGrouper : public ExprVisitor {
       auto cand_group_id = tensor_groups_.CreateGroup(storage_var, alignment);
       DLOG(INFO) << "Create a new group " << cand_group_id << " for " << storage_var->name_hint();
       tensor_groups_.JoinGroup(cand_group_id, curr_let_, storage_nbytes);
+      if (ell_->exprs[curr_idx_].get() == node) {
+        // Only the tensors allocated at the top level can be packed into arenas.
+        auto& group = tensor_groups_.groups[cand_group_id];
+        group.start = group.end = curr_idx_;
+      }
     } else if (GetRef<Op>(op_node) == reshape_tensor_op) {
       // set_shape creates a new tensor view so it has to be considered as a new tensor too.
       for (auto& arg : node->args) {
@@ -477,8 +788,17 @@ class MemoryPlanner::TensorGrouper : public ExprVisitor {
     }
   }
 
+  /*! \brief Align the offset up to the given alignment. */
+  static int64_t AlignUp(int64_t offset, int64_t alignment) {
+    return (offset + alignment - 1) / alignment * alignment;
+  }
+
   /*! \brief The current processing let var. */
   Var curr_let_;
+  /*! \brief The index of the current processing let var. */
+  int curr_idx_ = -1;
+  /*! \brief Whether to pack the tensor groups into arenas. */
+  bool use_arena_;
   /*! \brief The let list. */
   std::unique_ptr<ExplicitLetList> ell_{nullptr};
   /*! \brief A map from let varr to its expression. */
@@ -490,16 +810,18 @@ class MemoryPlanner::TensorGrouper : public ExprVisitor {
 };
 
 TensorGroups MemoryPlanner::Group() {
-  return TensorGrouper(func_, analyzer_).Run();
+  return TensorGrouper(func_, analyzer_, use_arena_).Run();
 }
 
 }  // namespace memory_plan
 
 TVM_REGISTER_PASS_CONFIG_OPTION("raf.memory_plan.dump_liveness_stat", Bool);
+TVM_REGISTER_PASS_CONFIG_OPTION("raf.memory_plan.use_arena", Bool);
 
 Pass MemoryPlan() {
   PassContext pass_ctx = PassContext::Current();
   Bool dump_stat = pass_ctx->GetConfig("raf.memory_plan.dump_liveness_stat", Bool(false)).value();
+  Bool use_arena = pass_ctx->GetConfig("raf.memory_plan.use_arena", Bool(false)).value();
   TypedPackedFunc<Function(Function, IRModule, PassContext)> pass_func = [=](Function f, IRModule m,
                                                                              PassContext pc) {
     auto func = f;
@@ -523,7 +845,7 @@ Pass MemoryPlan() {
       LOG(WARNING) << "Memory planning is disabled because liveness analysis was failed";
       return func;
     }
-    return Downcast<ir::Function>(memory_plan::MemoryPlanner(func, &analyzer).Run());
+    return Downcast<ir::Function>(memory_plan::MemoryPlanner(func, &analyzer, use_arena).Run());
   };
   return CreateRAFFunctionPass(pass_func, 2, "MemoryPlan", {});
 }
@@ -7,11 +7,22 @@
  * \file src/pass/pass_manager.cc
  * \brief Infrastructure for transformation passes.
  */
+#include <tvm/ir/instrument.h>
 #include <tvm/node/repr_printer.h>
+#include <tvm/node/structural_equal.h>
+#include <tvm/node/structural_hash.h>
 
+#include <deque>
+#include <fstream>
+#include <mutex>
+#include <unordered_map>
+#include <unordered_set>
+
+#include "raf/dialect.h"
 #include "raf/file.h"
 #include "raf/pass.h"
 #include "raf/pass_manager.h"
+#include "raf/profiler.h"
 #include "raf/registry.h"
 
 namespace raf {
@@ -19,8 +30,11 @@ namespace pass {
 
 using namespace raf::ir;
 using tvm::ReprPrinter;
+using tvm::instrument::PassInstrument;
+using tvm::instrument::PassInstrumentNode;
 using tvm::runtime::TVMArgs;
 using tvm::runtime::TVMRetValue;
+using profiler::ProfileStat;
 
 /*!
  * \brief The RAFSequentialNode contains a set of passes that transform RAF
@@ -67,6 +81,283 @@ class RAFSequentialNode : public PassNode {
   RAF_FINAL_OBJECT(RAFSequentialNode, PassNode);
 };
 
+/*! \brief Count the distinct expression nodes in all functions of a module. */
+class IRNodeCounter : public MixedModeVisitor {
+ public:
+  size_t Count(const IRModule& mod) {
+    for (const auto& it : mod->functions) {
+      if (it.second->IsInstance<FunctionNode>()) {
+        VisitExpr(Downcast<Function>(it.second));
+      }
+    }
+    return visit_counter_.size();
+  }
+
+  void VisitExpr_(const LetNode* let) final {
+    auto pre_visit = [this](const LetNode* op) {
+      this->VisitExpr(op->var);
+      this->VisitExpr(op->value);
+    };
+    auto post_visit = [this](const LetNode* op) {
+      this->VisitExpr(op->body);
+      this->visit_counter_[op] += 1;
+    };
+    ExpandANormalForm(let, pre_visit, post_visit);
+  }
+};
+
+/*! \brief Read a field of /proc/self/status in KBs. Return 0 if it is unavailable. */
+int64_t ReadProcStatusKB(const std::string& field) {
+  std::ifstream ifs("/proc/self/status");
+  std::string line;
+  while (std::getline(ifs, line)) {
+    if (line.compare(0, field.size(), field) == 0 && line[field.size()] == ':') {
+      return std::stoll(line.substr(field.size() + 1));
+    }
+  }
+  return 0;
+}
+
+/*!
+ * \brief Measure the wall time, the IR size and the peak resident memory of a pass. The peak
+ * memory is the increase of the resident set size over the one before the pass, which is known
+ * when the pass raises the high water mark of the process. Resetting the mark before each pass
+ * measures every pass, but it also resets the VmHWM of the whole process that other tools may
+ * read, so it is only done when RAF_PASS_PROBE_RESET_HWM=1. Both only work on Linux.
+ */
+class PassProbe {
+ public:
+  /*! \brief The measurement of a pass run. */
+  struct Record {
+    std::string name;
+    int depth;
+    uint64_t start_time;
+    uint64_t end_time;
+    int64_t nodes_before;
+    int64_t nodes_after;
+    int64_t peak_mem_kb;
+  };
+
+  void Begin(const IRModule& mod, const PassInfo& info) {
+    Frame frame;
+    frame.record.name = info->name;
+    frame.record.depth = frames_.size();
+    frame.record.nodes_before = IRNodeCounter().Count(mod);
+    if (ResetHWM()) {
+      std::ofstream("/proc/self/clear_refs") << "5";
+    }
+    frame.rss_before = ReadProcStatusKB("VmRSS");
+    frame.hwm_before = ReadProcStatusKB("VmHWM");
+    frame.record.start_time = ProfileStat::NowInMicrosec();
+    frames_.push_back(frame);
+  }
+
+  Record End(const IRModule& mod) {
+    CHECK(!frames_.empty()) << "The pass probe ends a pass that has not begun";
+    Frame frame = frames_.back();
+    frames_.pop_back();
+    frame.record.end_time = ProfileStat::NowInMicrosec();
+    int64_t hwm = std::max(ReadProcStatusKB("VmHWM"), frame.child_hwm);
+    // Without the reset, a pass that does not raise the mark has an unknown peak below it.
+    frame.record.peak_mem_kb =
+        ResetHWM() || hwm > frame.hwm_before ? std::max<int64_t>(hwm - frame.rss_before, 0) : 0;
+    frame.record.nodes_after = IRNodeCounter().Count(mod);
+    // The nested pass resets the high water mark, so propagate its peak to the enclosing pass.
+    if (!frames_.empty()) {
+      frames_.back().child_hwm = std::max(frames_.back().child_hwm, hwm);
+    }
+    return frame.record;
+  }
+
+ private:
+  struct Frame {
+    Record record;
+    int64_t rss_before = 0;
+    int64_t hwm_before = 0;
+    int64_t child_hwm = 0;
+  };
+
+  static bool ResetHWM() {
+    static const bool reset = [] {
+      const char* env = getenv("RAF_PASS_PROBE_RESET_HWM");
+      return env != nullptr && std::string(env) == "1";
+    }();
+    return reset;
+  }
+
+  std::vector<Frame> frames_;
+};
+
+/*!
+ * \brief A pass instrument that records the wall time, the IR node count before and after,
+ * and the peak memory of every pass run in the pass context, including the nested ones.
+ */
+class PassProfilerNode : public PassInstrumentNode {
+ public:
+  /*! \brief The records of the finished passes, in the order of their completion. */
+  mutable std::vector<PassProbe::Record> records;
+
+  void EnterPassContext() const final {
+  }
+
+  void ExitPassContext() const final {
+  }
+
+  bool ShouldRun(const IRModule& mod, const PassInfo& info) const final {
+    return true;
+  }
+
+  void RunBeforePass(const IRModule& mod, const PassInfo& info) const final {
+    std::lock_guard<std::mutex> lock(mu_);
+    probe_.Begin(mod, info);
+  }
+
+  void RunAfterPass(const IRModule& mod, const PassInfo& info) const final {
+    std::lock_guard<std::mutex> lock(mu_);
+    records.push_back(probe_.End(mod));
+  }
+
+  static constexpr const char* _type_key = "raf.pass_.PassProfiler";
+  RAF_FINAL_OBJECT(PassProfilerNode, PassInstrumentNode);
+
+ private:
+  mutable PassProbe probe_;
+  mutable std::mutex mu_;
+};
+
+class PassProfiler : public PassInstrument {
+ public:
+  explicit PassProfiler(String name) {
+    auto n = make_object<PassProfilerNode>();
+    n->name = std::move(name);
+    data_ = std::move(n);
+  }
+
+  RAF_OBJECT_REF(PassProfiler, PassInstrument, PassProfilerNode);
+};
+
+/*!
+ * \brief The memo of the passes that are deterministic functions of the input module, the
+ * pass context, the current device and its dialect settings. A pass is skipped when it has run
+ * on a structurally equal module under the same context before, and the output of that run is
+ * reused.
+ */
+class PassMemo {
+ public:
+  static PassMemo* Global() {
+    static PassMemo memo;
+    return &memo;
+  }
+
+  /*! \brief Whether the pass can be memoized. */
+  static bool IsMemoizable(const Pass& pass) {
+    // Passes that profile ops or read the distributed configuration.
+    static const std::unordered_set<std::string> non_deterministic = {
+        "IOSStreamSchedule", "Rematerialization", "AutoDataParallel", "DataParallelSchedule",
+        "AnnotateCollectiveOps", "EnforceSync", "GroupAllgather", "PartitionGradient"};
+    const std::string name = pass->Info()->name;
+    if (pass->IsInstance<RAFSequentialNode>() ||
+        pass->IsInstance<tvm::transform::SequentialNode>()) {
+      return false;
+    }
+    // Only the passes registered by RAF are known, because user passes may share the names.
+    return tvm::runtime::Registry::Get("raf.pass_." + name) != nullptr &&
+           !non_deterministic.count(name);
+  }
+
+  /*! \brief Get the key of the pass running on the module under the pass context. */
+  static size_t GetKey(const Pass& pass, const IRModule& mod, const PassContext& pass_ctx) {
+    // Passes that do not depend on the device share their results across devices.
+    static const std::unordered_set<std::string> device_agnostic = {
+        "InferType",         "EraseType",     "InlineLet", "DeadCodeElimination",
+        "ToGraphNormalForm", "ToANormalForm", "GradInputSelect", "LambdaLift"};
+    const PassInfo& info = pass->Info();
+    size_t key = tvm::StructuralHash()(mod);
+    key = dmlc::HashCombine(key, std::string(info->name));
+    key = dmlc::HashCombine(key, tvm::StructuralHash()(pass_ctx->config));
+    key = dmlc::HashCombine(key, pass_ctx->opt_level);
+    if (!device_agnostic.count(info->name)) {
+      Device device = Device::Current(true);
+      key = dmlc::HashCombine(key, static_cast<int>(device.device_type()));
+      key = dmlc::HashCombine(key, device.device_id());
+      // The dialect passes (e.g., FuseDialect and DispatchDialect) depend on the enabled
+      // dialects of the device and the thread local dialect preference.
+      for (const auto& dialect : op::Dialect::GetEnabledDialects(device.device_type())) {
+        key = dmlc::HashCombine(key, dialect);
+      }
+      if (const auto* pref = op::DialectPreference::Current()) {
+        key = dmlc::HashCombine(key, (*pref)->preferred_dialects.size());
+        for (const auto& dialect : (*pref)->preferred_dialects) {
+          key = dmlc::HashCombine(key, std::string(dialect));
+        }
+      }
+    }
+    return key;
+  }
+
+  /*! \brief Get the memoized output. Return an undefined module if it is not found. */
+  IRModule Lookup(size_t key, const IRModule& mod) {
+    std::lock_guard<std::mutex> lock(mu_);
+    auto range = entries_.equal_range(key);
+    for (auto it = range.first; it != range.second; ++it) {
+      // Double check the module in case of hash collisions.
+      if (tvm::StructuralEqual()(it->second.first, mod)) {
+        hits_++;
+        return CopyModule(it->second.second);
+      }
+    }
+    misses_++;
+    return IRModule();
+  }
+
+  void Insert(size_t key, const IRModule& mod, const IRModule& ret) {
+    std::lock_guard<std::mutex> lock(mu_);
+    if (order_.size() >= kMaxEntries) {
+      // Evict the oldest entry.
+      auto range = entries_.equal_range(order_.front());
+      if (range.first != range.second) {
+        entries_.erase(range.first);
+      }
+      order_.pop_front();
+    }
+    entries_.emplace(key, std::make_pair(CopyModule(mod), CopyModule(ret)));
+    order_.push_back(key);
+  }
+
+  void Clear() {
+    std::lock_guard<std::mutex> lock(mu_);
+    entries_.clear();
+    order_.clear();
+    hits_ = misses_ = 0;
+  }
+
+  Map<String, Integer> GetStats() {
+    std::lock_guard<std::mutex> lock(mu_);
+    Map<String, Integer> stats;
+    stats.Set("entries", Integer(IntImm(DataType::Int(64), entries_.size())));
+    stats.Set("hits", Integer(IntImm(DataType::Int(64), hits_)));
+    stats.Set("misses", Integer(IntImm(DataType::Int(64), misses_)));
+    return stats;
+  }
+
+ private:
+  /*! \brief Copy the function map, so that passes updating a module in place do not change the
+   * memoized one. */
+  static IRModule CopyModule(const IRModule& mod) {
+    return IRModule(mod->functions, mod->type_definitions, mod->Imports(), mod->source_map);
+  }
+
+  /*! \brief The maximum number of memoized pass runs. */
+  static constexpr size_t kMaxEntries = 1024;
+  /*! \brief Map from the key to the input and output modules. */
+  std::unordered_multimap<size_t, std::pair<IRModule, IRModule>> entries_;
+  /*! \brief The keys in the insertion order. */
+  std::deque<size_t> order_;
+  int64_t hits_ = 0;
+  int64_t misses_ = 0;
+  std::mutex mu_;
+};
+
 RAFSequential::RAFSequential(tvm::Array<Pass> passes, PassInfo pass_info) {
   auto n = make_object<RAFSequentialNode>();
   n->passes = std::move(passes);
@@ -108,6 +399,51 @@ std::string DumpAfterPassIRToFile(std::string dump_ir_path, const IRModule& mod,
   return dump_ir_path;
 }
 
+/*!
+ * \brief Run a pass. The pass is skipped if its output is found in the memo. The pass is also
+ * recorded with the category "Pass" when the profiler is enabled.
+ */
+IRModule RunPass(const Pass& pass, IRModule mod, const PassContext& pass_ctx, bool use_memo) {
+  bool memoizable = use_memo && PassMemo::IsMemoizable(pass);
+  size_t key = 0;
+  IRModule input;
+  if (memoizable) {
+    key = PassMemo::GetKey(pass, mod, pass_ctx);
+    IRModule ret = PassMemo::Global()->Lookup(key, mod);
+    if (ret.defined()) {
+      return ret;
+    }
+    input = mod;
+  }
+
+  auto* prof = profiler::Profiler::Get();
+  if (prof->IsProfiling(1) || prof->IsLightProfiling()) {
+    thread_local PassProbe probe;
+    const std::string name = pass->Info()->name;
+    probe.Begin(mod, pass->Info());
+    mod = pass(std::move(mod), pass_ctx);
+    PassProbe::Record record = probe.End(mod);
+    if (prof->IsProfiling(1)) {
+      prof->AddNewProfileStat("Pass", name, record.start_time, record.end_time,
+                              {"Depth: " + std::to_string(record.depth),
+                               "NodesBefore: " + std::to_string(record.nodes_before),
+                               "NodesAfter: " + std::to_string(record.nodes_after),
+                               "PeakMemoryKB: " + std::to_string(record.peak_mem_kb)});
+    }
+    if (prof->IsLightProfiling()) {
+      prof->AddLightEvent(prof->Intern(name), prof->Intern("Pass"), record.start_time,
+                          record.end_time);
+    }
+  } else {
+    mod = pass(std::move(mod), pass_ctx);
+  }
+
+  if (memoizable) {
+    PassMemo::Global()->Insert(key, input, mod);
+  }
+  return mod;
+}
+
 // TODO(zhiics): we currenlty only sequentially execute each pass in
 // a RAFSequential without the consideration of their orders. The phase
 // ordering problem needs to be handled in the future.
@@ -128,6 +464,7 @@ IRModule RAFSequentialNode::operator()(IRModule mod, const PassContext& pass_ctx
     DumpAfterPassIRToFile(dump_ir_path, mod, 0, "init");
   }
 
+  bool use_memo = pass_ctx->GetConfig("raf.pass_manager.memo", Bool(false)).value();
   size_t pass_cnt = 1;
   for (const Pass& pass : passes) {
     ICHECK(pass.defined()) << "Found undefined pass for optimization.";
@@ -135,15 +472,49 @@ IRModule RAFSequentialNode::operator()(IRModule mod, const PassContext& pass_ctx
     if (!pass_ctx.PassEnabled(pass_info)) continue;
     // resolve dependencies
     for (const auto& it : pass_info->required) {
-      mod = GetPass(it)(std::move(mod), pass_ctx);
+      mod = RunPass(GetPass(it), std::move(mod), pass_ctx, use_memo);
     }
-    mod = pass(std::move(mod), pass_ctx);
+    mod = RunPass(pass, std::move(mod), pass_ctx, use_memo);
     DumpAfterPassIRToFile(dump_ir_path, mod, pass_cnt++, pass_info->name);
   }
   return mod;
 }
 
 RAF_REGISTER_OBJECT_REFLECT(RAFSequentialNode);
+RAF_REGISTER_OBJECT_REFLECT(PassProfilerNode);
+
+TVM_REGISTER_PASS_CONFIG_OPTION("raf.pass_manager.memo", Bool);
+
+RAF_REGISTER_GLOBAL("raf.pass_.PassProfiler").set_body_typed([](String name) {
+  return PassProfiler(name);
+});
+
+RAF_REGISTER_GLOBAL("raf.pass_.PassProfilerGetRecords").set_body_typed([](PassProfiler prof) {
+  Array<Map<String, ObjectRef>> ret;
+  for (const auto& record : prof->records) {
+    Map<String, ObjectRef> item;
+    item.Set("name", String(record.name));
+    item.Set("depth", Integer(record.depth));
+    item.Set("time_ms", FloatImm(DataType::Float(64), (record.end_time - record.start_time) / 1e3));
+    item.Set("nodes_before", Integer(IntImm(DataType::Int(64), record.nodes_before)));
+    item.Set("nodes_after", Integer(IntImm(DataType::Int(64), record.nodes_after)));
+    item.Set("peak_mem_mb", FloatImm(DataType::Float(64), record.peak_mem_kb / 1024.0));
+    ret.push_back(item);
+  }
+  return ret;
+});
+
+RAF_REGISTER_GLOBAL("raf.pass_.PassProfilerClear").set_body_typed([](PassProfiler prof) {
+  prof->records.clear();
+});
+
+RAF_REGISTER_GLOBAL("raf.pass_.ClearPassMemo").set_body_typed([]() {
+  PassMemo::Global()->Clear();
+});
+
+RAF_REGISTER_GLOBAL("raf.pass_.GetPassMemoStats").set_body_typed([]() {
+  return PassMemo::Global()->GetStats();
+});
 
 class RAFFunctionPass;
 
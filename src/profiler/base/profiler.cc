@@ -7,13 +7,21 @@
  * \file src/profiler/base/profiler.cc
  * \brief RAF profiler, a simple implementation
  */
+#include <algorithm>
+#include <cmath>
+#include "raf/ir.h"
 #include "raf/registry.h"
 #include "raf/profiler.h"
 
 namespace raf {
 namespace profiler {
 
+using namespace raf::ir;
+
 Profiler::Profiler() {
+  const char* capacity = getenv("RAF_PROFILER_RING_SIZE");
+  light_ring_capacity_ = capacity != nullptr ? std::stoul(capacity) : 16384;
+  CHECK_GT(light_ring_capacity_, 0) << "RAF_PROFILER_RING_SIZE must be positive";
 }
 
 Profiler::~Profiler() {
@@ -79,6 +87,162 @@ void Profiler::ClearProfile() {
   helpers_.clear();
 }
 
+uint32_t Profiler::Intern(const std::string& str) {
+  thread_local std::unordered_map<std::string, uint32_t> cache;
+  auto it = cache.find(str);
+  if (it != cache.end()) {
+    return it->second;
+  }
+  std::lock_guard<std::mutex> lock(light_mu_);
+  auto res = intern_ids_.emplace(str, static_cast<uint32_t>(interned_.size()));
+  if (res.second) {
+    interned_.push_back(str);
+  }
+  cache.emplace(str, res.first->second);
+  return res.first->second;
+}
+
+LightEventRing* Profiler::GetLightEventRing() {
+  thread_local LightEventRing* ring = nullptr;
+  if (ring == nullptr) {
+    auto new_ring = std::make_shared<LightEventRing>(light_ring_capacity_);
+    std::lock_guard<std::mutex> lock(light_mu_);
+    light_rings_.push_back(new_ring);
+    ring = new_ring.get();
+  }
+  return ring;
+}
+
+void* Profiler::AcquireLightDeviceEvent(const Device& device) {
+  {
+    std::lock_guard<std::mutex> lock(light_device_mu_);
+    auto& events = free_device_events_[{device.device_type(), device.device_id()}];
+    if (!events.empty()) {
+      void* event = events.back();
+      events.pop_back();
+      return event;
+    }
+  }
+  return device_api::DeviceAPI::Get(device.device_type())->CreateEvent(device);
+}
+
+void Profiler::AddLightDeviceEvent(const LightDeviceEvent& event) {
+  bool full;
+  {
+    std::lock_guard<std::mutex> lock(light_device_mu_);
+    pending_device_events_.push_back(event);
+    full = pending_device_events_.size() >= light_ring_capacity_;
+  }
+  // Bound the number of live device events if the events are not read for a long time
+  if (full) {
+    ResolveLightDeviceEvents();
+  }
+}
+
+void Profiler::ResolveLightDeviceEvents() {
+  std::vector<LightDeviceEvent> pending;
+  {
+    std::lock_guard<std::mutex> lock(light_device_mu_);
+    pending.swap(pending_device_events_);
+  }
+  for (const auto& event : pending) {
+    auto dev_api = device_api::DeviceAPI::Get(event.device.device_type());
+    dev_api->WaitEvent(event.end_event);
+    float elapsed_ms = dev_api->EventElapsedTimeInMilliSeconds(event.start_event, event.end_event);
+    AddLightEvent(event.name, event.category, event.start_time,
+                  event.start_time + static_cast<uint64_t>(elapsed_ms * 1000));
+  }
+  std::lock_guard<std::mutex> lock(light_device_mu_);
+  for (const auto& event : pending) {
+    auto& events = free_device_events_[{event.device.device_type(), event.device.device_id()}];
+    events.push_back(event.start_event);
+    events.push_back(event.end_event);
+  }
+}
+
+std::vector<LightEventSummary> Profiler::GetLightEventSummary(const std::string& category,
+                                                              uint64_t* num_dropped) {
+  ResolveLightDeviceEvents();
+  std::vector<std::shared_ptr<LightEventRing>> rings;
+  std::vector<std::string> interned;
+  {
+    std::lock_guard<std::mutex> lock(light_mu_);
+    rings = light_rings_;
+    interned = interned_;
+  }
+  std::unordered_map<uint32_t, std::vector<uint64_t>> durations;
+  uint64_t dropped = 0;
+  for (const auto& ring : rings) {
+    for (const auto& event : ring->Snapshot()) {
+      if (category.empty() || interned[event.category] == category) {
+        durations[event.name].push_back(event.end_time - event.start_time);
+      }
+    }
+    dropped += ring->NumDropped();
+  }
+  if (num_dropped != nullptr) {
+    *num_dropped = dropped;
+  }
+
+  auto percentile = [](const std::vector<uint64_t>& sorted, double p) {
+    // Nearest-rank percentile
+    size_t rank = static_cast<size_t>(std::ceil(p / 100.0 * sorted.size()));
+    return static_cast<double>(sorted[std::max<size_t>(rank, 1) - 1]);
+  };
+  std::vector<LightEventSummary> results;
+  for (auto& kv : durations) {
+    auto& durs = kv.second;
+    std::sort(durs.begin(), durs.end());
+    LightEventSummary summary;
+    summary.name = interned[kv.first];
+    summary.count = durs.size();
+    summary.total = 0;
+    for (auto dur : durs) {
+      summary.total += dur;
+    }
+    summary.mean = summary.total / durs.size();
+    summary.p50 = percentile(durs, 50);
+    summary.p99 = percentile(durs, 99);
+    results.push_back(std::move(summary));
+  }
+  std::sort(results.begin(), results.end(),
+            [](const LightEventSummary& a, const LightEventSummary& b) {
+              return a.total > b.total;
+            });
+  return results;
+}
+
+void Profiler::ClearLightEvents() {
+  // Resolve the pending device events first so that they are recycled and then dropped
+  ResolveLightDeviceEvents();
+  std::lock_guard<std::mutex> lock(light_mu_);
+  for (auto& ring : light_rings_) {
+    ring->Clear();
+  }
+}
+
+std::vector<LightEvent> LightEventRing::Snapshot() const {
+  uint64_t head = head_.load(std::memory_order_acquire);
+  uint64_t begin = std::max<uint64_t>(begin_.load(std::memory_order_acquire),
+                                      head > events_.size() ? head - events_.size() : 0);
+  std::vector<LightEvent> results;
+  results.reserve(head - begin);
+  for (uint64_t i = begin; i < head; ++i) {
+    results.push_back(events_[i % events_.size()]);
+  }
+  return results;
+}
+
+void LightEventRing::Clear() {
+  begin_.store(head_.load(std::memory_order_acquire), std::memory_order_release);
+}
+
+uint64_t LightEventRing::NumDropped() const {
+  uint64_t head = head_.load(std::memory_order_acquire);
+  uint64_t begin = begin_.load(std::memory_order_acquire);
+  return head - begin > events_.size() ? head - begin - events_.size() : 0;
+}
+
 DeviceStats::~DeviceStats() {
   std::shared_ptr<TQueue> es = opr_exec_stats_;
   if (es) {
@@ -139,6 +303,36 @@ void EnableProfiler(int profile_level) {
 
 void DisableProfiler() {
   Profiler::Get()->set_profile_level(0);
+  Profiler::Get()->set_light_profiling(false);
+}
+
+void EnableLightProfiler() {
+  Profiler::Get()->set_light_profiling(true);
+}
+
+void ClearLightProfile() {
+  Profiler::Get()->ClearLightEvents();
+}
+
+Map<String, Map<String, FloatImm>> GetLightProfileSummary(std::string category) {
+  uint64_t num_dropped = 0;
+  auto summaries = Profiler::Get()->GetLightEventSummary(category, &num_dropped);
+  auto make_float = [](double v) { return FloatImm(DataType::Float(64), v); };
+  Map<String, Map<String, FloatImm>> results;
+  for (const auto& summary : summaries) {
+    Map<String, FloatImm> stats;
+    stats.Set("count", make_float(summary.count));
+    stats.Set("total", make_float(summary.total));
+    stats.Set("mean", make_float(summary.mean));
+    stats.Set("p50", make_float(summary.p50));
+    stats.Set("p99", make_float(summary.p99));
+    results.Set(summary.name, stats);
+  }
+  if (num_dropped > 0) {
+    LOG(WARNING) << num_dropped << " profiling events were overwritten. "
+                 << "Consider increasing RAF_PROFILER_RING_SIZE.";
+  }
+  return results;
 }
 
 void CollectBaseProfile() {
@@ -158,6 +352,9 @@ RAF_REGISTER_GLOBAL("raf.profiler.DisableProfiler").set_body_typed(DisableProfil
 RAF_REGISTER_GLOBAL("raf.profiler.CollectBaseProfile").set_body_typed(CollectBaseProfile);
 RAF_REGISTER_GLOBAL("raf.profiler.GetProfile").set_body_typed(GetProfile);
 RAF_REGISTER_GLOBAL("raf.profiler.ClearProfile").set_body_typed(ClearProfile);
+RAF_REGISTER_GLOBAL("raf.profiler.EnableLightProfiler").set_body_typed(EnableLightProfiler);
+RAF_REGISTER_GLOBAL("raf.profiler.ClearLightProfile").set_body_typed(ClearLightProfile);
+RAF_REGISTER_GLOBAL("raf.profiler.GetLightProfileSummary").set_body_typed(GetLightProfileSummary);
 
 }  // namespace profiler
 }  // namespace raf
@@ -8,11 +8,21 @@
  * \brief A simple profiler with caching to profile ops during compilation
  */
 
+#include <fcntl.h>
+#include <unistd.h>
+#include <chrono>
+#include <cmath>
+#include <cstdio>
+#include <cstring>
+#include <fstream>
+#include <sstream>
+#include <tvm/runtime/device_api.h>
 #include "raf/op_profiler.h"
 #include "raf/ir.h"
+#include "raf/dialect.h"
 #include "../op/dialect/tvm/tvm_utils.h"
+#include "../pass/common.h"
 #include "../requests.h"
-#include <chrono>
 
 namespace raf {
 namespace op_profiler {
@@ -20,6 +30,388 @@ namespace op_profiler {
 using namespace raf::op;
 using namespace raf::value;
 
+namespace {
+
+constexpr const char* kHexDigits = "0123456789abcdef";
+
+std::string HexEncode(const std::string& bytes) {
+  std::string ret;
+  ret.reserve(bytes.size() * 2);
+  for (unsigned char c : bytes) {
+    ret.push_back(kHexDigits[c >> 4]);
+    ret.push_back(kHexDigits[c & 0xf]);
+  }
+  return ret;
+}
+
+bool HexDecode(const std::string& hex, std::string* bytes) {
+  auto value = [](char c) -> int {
+    if (c >= '0' && c <= '9') return c - '0';
+    if (c >= 'a' && c <= 'f') return c - 'a' + 10;
+    return -1;
+  };
+  if (hex.size() % 2 != 0) {
+    return false;
+  }
+  bytes->clear();
+  for (size_t i = 0; i < hex.size(); i += 2) {
+    int hi = value(hex[i]), lo = value(hex[i + 1]);
+    if (hi < 0 || lo < 0) {
+      return false;
+    }
+    bytes->push_back(static_cast<char>((hi << 4) | lo));
+  }
+  return true;
+}
+
+/*! \brief Serialize a record to a line: "<hex key> <workspace size> <repeat> <latency>...". */
+std::string RecordToLine(const std::string& key, const LatencyRecord& record) {
+  std::ostringstream os;
+  os.precision(9);
+  os << HexEncode(key) << " " << record.workspace_size << " " << record.latency.size();
+  for (float lat : record.latency) {
+    os << " " << lat;
+  }
+  os << "\n";
+  return os.str();
+}
+
+bool LineToRecord(const std::string& line, std::string* key, LatencyRecord* record) {
+  std::istringstream is(line);
+  std::string hex_key;
+  size_t repeat;
+  if (!(is >> hex_key >> record->workspace_size >> repeat) || !HexDecode(hex_key, key)) {
+    return false;
+  }
+  record->latency.resize(repeat);
+  for (size_t i = 0; i < repeat; ++i) {
+    if (!(is >> record->latency[i])) {
+      return false;
+    }
+  }
+  return true;
+}
+
+bool& NoProfileFlag() {
+  static bool no_profile = []() {
+    const char* val = getenv("RAF_OP_PROFILER_NO_PROFILE");
+    return val != nullptr && strcmp(val, "1") == 0;
+  }();
+  return no_profile;
+}
+
+/*!
+ * \brief Append a constant value to the key by its type and content. TensorValues are hashed by
+ * their pointers in StructuralHash, which differ across processes.
+ */
+void HashConstantValue(HashKey* key, const ObjectRef& value) {
+  if (!value.defined()) {
+    *key << "null";
+  } else if (const auto* tv = value.as<TensorValueObj>()) {
+    const DLTensor* t = tv->tensor.operator->();
+    *key << *t;
+    tvm::runtime::NDArray host = tv->tensor;
+    if (t->device.device_type != kDLCPU) {
+      host = tv->tensor.CopyTo(DLDevice{kDLCPU, 0});
+    }
+    const uint8_t* data = static_cast<const uint8_t*>(host->data) + host->byte_offset;
+    size_t nbytes = tvm::runtime::GetDataSize(*host.operator->());
+    key->byte_vector.insert(key->byte_vector.end(), data, data + nbytes);
+  } else if (const auto* iv = value.as<IntValueObj>()) {
+    *key << iv->value;
+  } else if (const auto* fv = value.as<FloatValueObj>()) {
+    *key << fv->value;
+  } else if (const auto* bv = value.as<BoolValueObj>()) {
+    *key << bv->value;
+  } else if (const auto* sv = value.as<StringValueObj>()) {
+    *key << sv->value;
+  } else if (const auto* tup = value.as<TupleValueObj>()) {
+    *key << static_cast<int64_t>(tup->fields.size());
+    for (const auto& field : tup->fields) {
+      HashConstantValue(key, field);
+    }
+  } else {
+    *key << uint64_t(tvm::StructuralHash()(value));
+  }
+}
+
+/*!
+ * \brief Replace the constants in a function with null constants and collect their values in
+ * visiting order, so that the function can be hashed structurally without the constant values.
+ */
+class ConstantStripper : public ExprMutator {
+ public:
+  Expr VisitExpr_(const RelayConstantNode* op) final {
+    values.push_back(static_cast<const ConstantNode*>(op)->value);
+    return MakeNull();
+  }
+
+  /*! \brief The values of the stripped constants. */
+  std::vector<ObjectRef> values;
+};
+
+}  // namespace
+
+HashKey OpProfiler::HashCall(const Call& call) {
+  HashKey key;
+
+  // Hash op name.
+  if (auto op_node = call->op.as<OpNode>()) {
+    key << op_node->name;
+  } else if (auto fn_node = call->op.as<FunctionNode>()) {
+    // All fused op closures have the same name at this stage, so we hash their structure and the
+    // values of their constants.
+    ConstantStripper stripper;
+    auto func = stripper.Mutate(GetRef<Function>(fn_node));
+    key << uint64_t(tvm::StructuralHash()(func));
+    for (const auto& value : stripper.values) {
+      HashConstantValue(&key, value);
+    }
+  } else {
+    LOG(FATAL) << "OpProfiler does not deal with " << call->op->GetTypeKey();
+    throw;
+  }
+
+  // Hash argument and return types, as well as the values of constant arguments, which are
+  // the attributes of the op.
+  for (auto arg : call->args) {
+    key << raf::ir::AsText(arg->checked_type(), false);
+    if (arg->IsInstance<RelayConstantNode>()) {
+      HashConstantValue(&key, static_cast<const ConstantNode*>(arg.get())->value);
+    }
+  }
+  key << raf::ir::AsText(call->checked_type(), false);
+  return key;
+}
+
+OpLatencyDB::OpLatencyDB(const std::string& path) : path_(path) {
+  if (!path_.empty()) {
+    std::lock_guard<std::mutex> lock(mu_);
+    // Records are appended, so the last record of a key is the latest one, e.g., an overwrite.
+    LoadFile(path_, true, false);
+  }
+}
+
+OpLatencyDB* OpLatencyDB::Global() {
+  static OpLatencyDB* db = []() {
+    std::string path;
+    const char* env = getenv("RAF_OP_LATENCY_DB");
+    if (env != nullptr) {
+      path = env;
+    } else {
+      auto config = PersistCacheConfig::FromEnv();
+      if (config.persist) {
+        CreateDir(config.root_path);
+        path = config.root_path + "/op_latency.db";
+      }
+    }
+    return new OpLatencyDB(path);
+  }();
+  return db;
+}
+
+bool OpLatencyDB::Lookup(const std::string& key, LatencyRecord* record) {
+  std::lock_guard<std::mutex> lock(mu_);
+  metrics_["Lookup"]++;
+  auto iter = records_.find(key);
+  if (iter == records_.end()) {
+    metrics_["Miss"]++;
+    return false;
+  }
+  metrics_["Hit"]++;
+  *record = iter->second;
+  return true;
+}
+
+bool OpLatencyDB::Add(const std::string& key, const LatencyRecord& record, bool overwrite) {
+  std::lock_guard<std::mutex> lock(mu_);
+  if (!overwrite && records_.count(key)) {
+    return false;
+  }
+  records_[key] = record;
+  Append(key, record);
+  return true;
+}
+
+int64_t OpLatencyDB::Import(const std::string& path, bool overwrite) {
+  std::lock_guard<std::mutex> lock(mu_);
+  return LoadFile(path, overwrite, true);
+}
+
+int64_t OpLatencyDB::Export(const std::string& path) {
+  std::lock_guard<std::mutex> lock(mu_);
+  std::string tmp_path = path + ".tmp." + std::to_string(getpid());
+  {
+    std::ofstream ofs(tmp_path, std::ios::out | std::ios::trunc);
+    CHECK(ofs.is_open()) << "Failed to open " << tmp_path << ": " << strerror(errno);
+    for (const auto& kv : records_) {
+      ofs << RecordToLine(kv.first, kv.second);
+    }
+  }
+  CHECK_EQ(rename(tmp_path.c_str(), path.c_str()), 0)
+      << "Failed to write " << path << ": " << strerror(errno);
+  return records_.size();
+}
+
+void OpLatencyDB::Clear() {
+  std::lock_guard<std::mutex> lock(mu_);
+  records_.clear();
+}
+
+std::unordered_map<std::string, int64_t> OpLatencyDB::GetMetric() {
+  std::lock_guard<std::mutex> lock(mu_);
+  auto ret = metrics_;
+  ret["Entries"] = records_.size();
+  return ret;
+}
+
+int64_t OpLatencyDB::LoadFile(const std::string& path, bool overwrite, bool persist) {
+  std::ifstream ifs(path);
+  if (!ifs.is_open()) {
+    return 0;
+  }
+  int64_t added = 0;
+  std::string line, key;
+  while (std::getline(ifs, line)) {
+    LatencyRecord record;
+    if (!LineToRecord(line, &key, &record)) {
+      // A partially written line from a crashed process.
+      metrics_["Corrupted"]++;
+      continue;
+    }
+    if (!overwrite && records_.count(key)) {
+      continue;
+    }
+    records_[key] = record;
+    if (persist) {
+      Append(key, record);
+    }
+    added++;
+  }
+  return added;
+}
+
+void OpLatencyDB::Append(const std::string& key, const LatencyRecord& record) {
+  if (path_.empty()) {
+    return;
+  }
+  // A single write to a file opened with O_APPEND does not interleave with the writes of other
+  // processes sharing the file.
+  std::string line = RecordToLine(key, record);
+  int fd = open(path_.c_str(), O_WRONLY | O_CREAT | O_APPEND, 0644);
+  if (fd < 0 || write(fd, line.data(), line.size()) != static_cast<ssize_t>(line.size())) {
+    metrics_["AppendFailure"]++;
+    LOG(WARNING) << "Failed to append to the op latency database " << path_ << ": "
+                 << strerror(errno);
+  }
+  if (fd >= 0) {
+    close(fd);
+  }
+}
+
+void OpProfiler::SetNoProfile(bool no_profile) {
+  NoProfileFlag() = no_profile;
+}
+
+bool OpProfiler::IsNoProfile() {
+  return NoProfileFlag();
+}
+
+std::string OpProfiler::DeviceTag() const {
+  std::string tag = device_.device_type().c_str();
+  tvm::runtime::TVMRetValue name;
+  tvm::runtime::DeviceAPI::Get(device_)->GetAttr(device_, tvm::runtime::kDeviceName, &name);
+  if (name.type_code() == kTVMStr) {
+    tag += ":" + name.operator std::string();
+  }
+  return tag;
+}
+
+std::pair<std::vector<float>, int64_t> OpProfiler::LookupOrProfile(
+    const std::string& db_key, const std::vector<Expr>& ops, int32_t repeat,
+    const std::function<std::pair<std::vector<float>, int64_t>()>& f_profile) {
+  auto db = OpLatencyDB::Global();
+  LatencyRecord record;
+  if (db->Lookup(db_key, &record)) {
+    return std::make_pair(std::move(record.latency), record.workspace_size);
+  }
+  if (IsNoProfile()) {
+    // Estimated latencies are not added to the database, so that they never shadow the
+    // profiled ones of other processes.
+    return std::make_pair(std::vector<float>(repeat, EstimateLatency(ops)), int64_t(0));
+  }
+  auto ret = f_profile();
+  record.latency = ret.first;
+  record.workspace_size = ret.second;
+  db->Add(db_key, record);
+  return ret;
+}
+
+/*!
+ * \brief Estimate the GFLOPS of a call. Returns a negative value if the GFLOPS is unknown, e.g.,
+ * the op does not have a TVM dialect.
+ */
+static float EstimateCallGFLOPS(const Call& call, const Device& device) {
+  Array<Type> param_types;
+  Array<Value> arg_values;
+  for (const auto& arg : call->args) {
+    param_types.push_back(arg->checked_type());
+    arg_values.push_back(pass::GetValue(arg));
+  }
+  auto ret_type = call->checked_type();
+
+  Function func;
+  if (auto op_node = call->op.as<OpNode>()) {
+    auto op = GetRef<Op>(op_node);
+    auto base_op = IsDialectOp(op) ? GetBaseOp(op) : op;
+    if (!OpDialect::Lower(base_op, "tvm").defined()) {
+      return -1;
+    }
+    // Wrap a single op to a Relay function.
+    std::vector<Var> params;
+    for (const auto& type : param_types) {
+      auto var = raf::ir::MakeVar("", type);
+      var->checked_type_ = type;
+      params.push_back(var);
+    }
+    func = Function(params, Call(call->op, {params.begin(), params.end()}, call->attrs), ret_type,
+                    {});
+    func->body->checked_type_ = ret_type;
+    func->checked_type_ = FuncType(param_types, ret_type, {}, {});
+  } else if (auto fn_node = call->op.as<FunctionNode>()) {
+    func = GetRef<Function>(fn_node);
+  } else {
+    return -1;
+  }
+  CallValues call_values = CallValues::make();
+  call_values->args = MakeListArgs(arg_values);
+  call_values->callee = ClosureValue::make({}, func);
+  return tvm_dialect::CalcFuncGFLOPS(call_values, param_types, ret_type, device);
+}
+
+float OpProfiler::EstimateLatency(const std::vector<Expr>& ops) {
+  // A rough per-kernel launch overhead in microseconds, which dominates small ops.
+  constexpr float kLaunchOverheadUs = 5;
+  float peak_gflops = PeakGFLOPS();
+  const char* env = getenv("RAF_OP_PROFILER_PEAK_GFLOPS");
+  if (env != nullptr) {
+    peak_gflops = std::stof(env);
+  }
+  float latency = 0;
+  for (const auto& op : ops) {
+    auto call_node = op.as<CallNode>();
+    if (call_node == nullptr) {
+      continue;
+    }
+    float gflops = EstimateCallGFLOPS(GetRef<Call>(call_node), device_);
+    latency += kLaunchOverheadUs;
+    if (gflops > 0 && std::isfinite(gflops)) {
+      latency += gflops / peak_gflops * 1e6;
+    }
+  }
+  return latency;
+}
+
 OpProfiler* OpProfiler::Get(const Device& device) {
   CHECK_EQ(device.device_id(), 0) << "Multi-device profiling is not supported yet";
   if (device.device_type() == DevType::kCPU()) {
@@ -114,32 +506,37 @@ std::pair<std::vector<float>, float> OpProfiler::ProfileOpGroup(const std::vecto
                                                                 int32_t warmup, int32_t exec_number,
                                                                 int32_t repeat) {
   // Check cache and skip profiling if hit.
-  auto key = HashKeyToStr(HashGroup(ops, stream_ids) << warmup << exec_number << repeat);
+  HashKey group_key = HashGroup(ops, stream_ids);
+  auto db_key = DeviceTag() + "/group/" + HashKeyToStr(HashKey(group_key) << repeat);
+  auto key = HashKeyToStr(group_key << warmup << exec_number << repeat);
 
   // Directly return the profiled latency if cache hit.
   if (latency_and_workspace_size_cache_.count(key) > 0) {
     return latency_and_workspace_size_cache_[key];
   }
 
-  // Prepare ops for profiling.
-  std::vector<OpWithDataPtr> ops_with_data;
-  int64_t total_workspace_size = 0;
-  for (size_t i = 0; i < ops.size(); ++i) {
-    auto op = ops[i];
-    auto stream_id = stream_ids.empty() ? -1 : stream_ids[i];
-    auto single_op_with_data = std::make_shared<OpWithData>(device_, op, stream_id);
-    ops_with_data.push_back(single_op_with_data);
-    // Currently using the sum of the workspace sizes of all ops as workspace size
-    // Might need refactoring
-    total_workspace_size += single_op_with_data->workspace_size;
-  }
+  auto profile = [&]() {
+    // Prepare ops for profiling.
+    std::vector<OpWithDataPtr> ops_with_data;
+    int64_t total_workspace_size = 0;
+    for (size_t i = 0; i < ops.size(); ++i) {
+      auto op = ops[i];
+      auto stream_id = stream_ids.empty() ? -1 : stream_ids[i];
+      auto single_op_with_data = std::make_shared<OpWithData>(device_, op, stream_id);
+      ops_with_data.push_back(single_op_with_data);
+      // Currently using the sum of the workspace sizes of all ops as workspace size
+      // Might need refactoring
+      total_workspace_size += single_op_with_data->workspace_size;
+    }
 
-  // Profiling.
-  std::vector<float> cost = RunOpGroup(ops_with_data, warmup, exec_number, repeat);
+    // Profiling.
+    std::vector<float> cost = RunOpGroup(ops_with_data, warmup, exec_number, repeat);
+    return std::make_pair(std::move(cost), total_workspace_size);
+  };
 
   // Add the result to the cache.
   latency_and_workspace_size_cache_[key] =
-      std::move(std::make_pair(std::move(cost), total_workspace_size));
+      (repeat > 0 && exec_number > 0) ? LookupOrProfile(db_key, ops, repeat, profile) : profile();
   return latency_and_workspace_size_cache_[key];
 }
 
@@ -150,6 +547,7 @@ std::pair<std::vector<float>, float> OpProfiler::ProfileOp(const Expr& op, int32
     auto call = GetRef<Call>(call_node);
     auto call_hash_key = HashCall(call);
     auto call_key_str = HashKeyToStr(call_hash_key);
+    auto db_key = DeviceTag() + "/op/" + HashKeyToStr(HashKey(call_hash_key) << repeat);
     auto key = HashKeyToStr(call_hash_key << warmup << exec_number << repeat);
 
     // Directly return the profiled latency if cache hit.
@@ -157,20 +555,24 @@ std::pair<std::vector<float>, float> OpProfiler::ProfileOp(const Expr& op, int32
       return latency_and_workspace_size_cache_[key];
     }
 
-    // Build the op and generate dummy input data for profiling.
-    OpWithDataPtr op_with_data = std::make_shared<OpWithData>(device_, op);
+    auto profile = [&]() {
+      // Build the op and generate dummy input data for profiling.
+      OpWithDataPtr op_with_data = std::make_shared<OpWithData>(device_, op);
 
-    // Only catch the built OpEnv for other use cases. Note that op_with_data cannot be cached
-    // and must be released in this function; otherwise we may encounter OOM during profiling.
-    op_env_cache_[call_key_str] = op_with_data->op_env;
+      // Only catch the built OpEnv for other use cases. Note that op_with_data cannot be cached
+      // and must be released in this function; otherwise we may encounter OOM during profiling.
+      op_env_cache_[call_key_str] = op_with_data->op_env;
 
-    // Profile the op.
-    std::vector<float> cost = RunOp(op_with_data, warmup, exec_number, repeat);
-    int64_t workspace_size = op_with_data->workspace_size;
+      // Profile the op.
+      std::vector<float> cost = RunOp(op_with_data, warmup, exec_number, repeat);
+      return std::make_pair(std::move(cost), op_with_data->workspace_size);
+    };
 
-    // Add the profiled cost to the cache.
-    latency_and_workspace_size_cache_[key] =
-        std::move(std::make_pair(std::move(cost), workspace_size));
+    // Add the profiled cost to the cache. Nothing is measured without iterations, in which case
+    // the caller only wants the built OpEnv, so the latency database is bypassed.
+    latency_and_workspace_size_cache_[key] = (repeat > 0 && exec_number > 0)
+                                                 ? LookupOrProfile(db_key, {op}, repeat, profile)
+                                                 : profile();
     return latency_and_workspace_size_cache_[key];
   }
 
@@ -399,5 +801,37 @@ RAF_REGISTER_GLOBAL("raf.op_profiler.GetCacheSize").set_body_typed([](const Devi
   return profiler->GetLatencyCacheSize();
 });
 
+RAF_REGISTER_GLOBAL("raf.op_profiler.SetNoProfile").set_body_typed(OpProfiler::SetNoProfile);
+
+RAF_REGISTER_GLOBAL("raf.op_profiler.ExportLatencyDB").set_body_typed([](String path) {
+  return OpLatencyDB::Global()->Export(path);
+});
+
+RAF_REGISTER_GLOBAL("raf.op_profiler.ImportLatencyDB")
+    .set_body_typed([](String path, bool overwrite) {
+      return OpLatencyDB::Global()->Import(path, overwrite);
+    });
+
+RAF_REGISTER_GLOBAL("raf.op_profiler.MergeLatencyDB")
+    .set_body_typed([](Array<String> inputs, String output, bool overwrite) {
+      OpLatencyDB db;
+      for (const auto& path : inputs) {
+        db.Import(path, overwrite);
+      }
+      return db.Export(output);
+    });
+
+RAF_REGISTER_GLOBAL("raf.op_profiler.ClearLatencyDB").set_body_typed([]() {
+  OpLatencyDB::Global()->Clear();
+});
+
+RAF_REGISTER_GLOBAL("raf.op_profiler.GetLatencyDBStats").set_body_typed([]() {
+  Map<String, Integer> stats;
+  for (const auto& kv : OpLatencyDB::Global()->GetMetric()) {
+    stats.Set(kv.first, Integer(IntImm(DataType::Int(64), kv.second)));
+  }
+  return stats;
+});
+
 }  // namespace op_profiler
 }  // namespace raf
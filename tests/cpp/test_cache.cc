@@ -0,0 +1,152 @@
+/*
+ * Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ * SPDX-License-Identifier: Apache-2.0
+ */
+
+#include <gtest/gtest.h>
+
+#include <stdlib.h>
+#include <fstream>
+
+#include <raf/cache.h>
+#include <raf/file.h>
+
+using raf::RemoveDir;
+using raf::op::MetaPersistCache;
+using raf::op::PersistCacheConfig;
+using raf::op::PersistEntry;
+
+class StringCacheEntry {
+ public:
+  explicit StringCacheEntry(std::string value) : value_(value) {
+  }
+
+  static StringCacheEntry Load(PersistEntry* entry) {
+    std::string value;
+    EXPECT_TRUE(entry->ReadFile("value.txt", &value));
+    return StringCacheEntry(value);
+  }
+
+  bool Save(const std::string& path) {
+    std::ofstream ofs(path + "/value.txt");
+    ofs << value_;
+    return true;
+  }
+
+  std::string value_;
+};
+
+PersistCacheConfig MakeConfig(const std::string& root_path, bool packed) {
+  PersistCacheConfig config;
+  config.persist = true;
+  config.root_path = root_path;
+  config.max_entries = 2;
+  config.max_persist_entries = 3;
+  config.packed = packed;
+  return config;
+}
+
+std::string MakeTempDir() {
+  std::string path = "/tmp/raf_cpptest_cache.XXXXXX";
+  EXPECT_NE(mkdtemp(&path[0]), nullptr);
+  return path;
+}
+
+void TestPersistCache(bool packed) {
+  std::string root_path = MakeTempDir();
+  {
+    MetaPersistCache<StringCacheEntry> cache("test", MakeConfig(root_path, packed));
+    for (std::string key : {"a", "b", "c", "d"}) {
+      cache.Set(key, StringCacheEntry(key + "_value"));
+    }
+    auto metrics = cache.GetMetric();
+    ASSERT_EQ(metrics["CacheEntries"], 2);
+    ASSERT_EQ(metrics["CacheEvict"], 2);
+    ASSERT_EQ(metrics["PersistCacheEntries"], 3);
+    ASSERT_EQ(metrics["PersistCacheEvict"], 1);
+
+    // "b" is evicted from memory but loaded from disk.
+    auto val = cache.Get("b");
+    ASSERT_NE(val, nullptr);
+    ASSERT_EQ(val->value_, "b_value");
+    ASSERT_EQ(cache.GetMetric()["PersistCacheHit"], 1);
+
+    // "a" is evicted from both memory and disk.
+    ASSERT_EQ(cache.Get("a"), nullptr);
+    ASSERT_EQ(cache.GetMetric()["PersistCacheMiss"], 1);
+  }
+  {
+    // The entries on disk are visible to a new cache.
+    MetaPersistCache<StringCacheEntry> cache("test", MakeConfig(root_path, packed));
+    ASSERT_EQ(cache.GetMetric()["PersistCacheEntries"], 3);
+    for (std::string key : {"b", "c", "d"}) {
+      auto val = cache.Get(key);
+      ASSERT_NE(val, nullptr);
+      ASSERT_EQ(val->value_, key + "_value");
+    }
+    ASSERT_EQ(cache.Get("a"), nullptr);
+  }
+  RemoveDir(root_path);
+}
+
+TEST(MetaPersistCache, DirStore) {
+  TestPersistCache(false);
+}
+
+TEST(MetaPersistCache, PackedStore) {
+  TestPersistCache(true);
+}
+
+TEST(MetaPersistCache, KeyMismatch) {
+  std::string root_path = MakeTempDir();
+  auto config = MakeConfig(root_path, false);
+  {
+    MetaPersistCache<StringCacheEntry> cache("test", config);
+    cache.Set("a", StringCacheEntry("a_value"));
+  }
+  // Simulate a hash collision by overwriting the stored key.
+  std::string entry_path = root_path + "/test/" + std::to_string(std::hash<std::string>{}("a"));
+  std::ofstream ofs(entry_path + "/key.bin");
+  ofs << "b";
+  ofs.close();
+  {
+    MetaPersistCache<StringCacheEntry> cache("test", config);
+    ASSERT_EQ(cache.Get("a"), nullptr);
+    ASSERT_EQ(cache.GetMetric()["PersistCacheKeyMismatch"], 1);
+  }
+  RemoveDir(root_path);
+}
+
+TEST(MetaPersistCache, PackedStoreShared) {
+  std::string root_path = MakeTempDir();
+  auto config = MakeConfig(root_path, true);
+  config.max_persist_entries = 1;
+  // Values large enough to trigger a compaction after two evictions.
+  auto make_value = [](const std::string& key) { return key + std::string(700 << 10, 'x'); };
+  MetaPersistCache<StringCacheEntry> cache_a("test", config);
+  MetaPersistCache<StringCacheEntry> cache_b("test", config);
+
+  // The entries saved by one store are visible to the other one.
+  cache_a.Set("a", StringCacheEntry(make_value("a")));
+  auto val = cache_b.Get("a");
+  ASSERT_NE(val, nullptr);
+  ASSERT_EQ(val->value_, make_value("a"));
+
+  // cache_a compacts the file, and cache_b follows the new file.
+  cache_a.Set("b", StringCacheEntry(make_value("b")));
+  cache_a.Set("c", StringCacheEntry(make_value("c")));
+  ASSERT_EQ(cache_a.GetMetric()["PersistCacheCompact"], 1);
+  val = cache_b.Get("c");
+  ASSERT_NE(val, nullptr);
+  ASSERT_EQ(val->value_, make_value("c"));
+  cache_b.Set("d", StringCacheEntry(make_value("d")));
+  val = cache_a.Get("d");
+  ASSERT_NE(val, nullptr);
+  ASSERT_EQ(val->value_, make_value("d"));
+  RemoveDir(root_path);
+}
+
+int main(int argc, char** argv) {
+  ::testing::InitGoogleTest(&argc, argv);
+  return RUN_ALL_TESTS();
+}
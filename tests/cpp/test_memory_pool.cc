@@ -63,6 +63,66 @@ TEST(PageUnitPool, CPU) {
   Memory::RemovePool(dev);
 }
 
+TEST(ArenaPool, CPU) {
+  Device dev{DevType::kCPU(), 0};
+  Memory::InitPool(dev, "arena_pool");
+  {
+    std::shared_ptr<Memory> result = Memory::Alloc(dev, 0);
+    ASSERT_EQ(result.use_count(), 1);
+    ASSERT_EQ(result->data, nullptr);
+  }
+  for (int memory : {11, 19, 2019, 1024124, 4194304, 16777216}) {
+    for (int align : {(int)kDefaultMemoryAlignment, 512, 1024, 4096}) {
+      std::shared_ptr<Memory> result = Memory::Alloc(dev, memory, align);
+      ASSERT_EQ(result.use_count(), 1);
+      int64_t address = (int64_t)result->data;
+      ASSERT_EQ(address % align, 0);
+    }
+  }
+  auto pool_size = Memory::GetPoolSize(dev);
+  ASSERT_EQ(pool_size.first, 0);  // No chunk is used.
+  ASSERT_GT(pool_size.second, 0);
+  auto stats = Memory::GetPoolStats(dev);
+  ASSERT_GE(stats["peak_used"] * 1048576.0, 16777216);
+  Memory::RemovePool(dev);
+}
+
+TEST(ArenaPool, SplitAndCoalesce) {
+  Device dev{DevType::kCPU(), 0};
+  Memory::InitPool(dev, "arena_pool");
+  // Both chunks are carved out of the same segment.
+  std::shared_ptr<Memory> a = Memory::Alloc(dev, 4096);
+  std::shared_ptr<Memory> b = Memory::Alloc(dev, 4096);
+  char* base = static_cast<char*>(a->data);
+  ASSERT_EQ(static_cast<char*>(b->data), base + 4096);
+  auto stats = Memory::GetPoolStats(dev);
+  ASSERT_EQ(stats["num_segments"], 1);
+  ASSERT_EQ(stats["num_free_blocks"], 1);
+
+  // Freeing "a" leaves a hole in front of "b" that can be reused by a smaller chunk.
+  a.reset();
+  stats = Memory::GetPoolStats(dev);
+  ASSERT_EQ(stats["num_free_blocks"], 2);
+  ASSERT_GT(stats["fragmentation"], 0);
+  std::shared_ptr<Memory> c = Memory::Alloc(dev, 2048);
+  ASSERT_EQ(static_cast<char*>(c->data), base);
+
+  // Freeing all chunks coalesces the segment back to a single block.
+  b.reset();
+  c.reset();
+  stats = Memory::GetPoolStats(dev);
+  ASSERT_EQ(stats["num_free_blocks"], 1);
+  ASSERT_EQ(stats["fragmentation"], 0);
+  ASSERT_EQ(stats["used"], 0);
+  std::shared_ptr<Memory> d = Memory::Alloc(dev, 8192);
+  ASSERT_EQ(static_cast<char*>(d->data), base);
+  ASSERT_EQ(Memory::GetPoolStats(dev)["num_segments"], 1);
+
+  // The chunk is still valid after the pool is removed.
+  Memory::RemovePool(dev);
+  static_cast<char*>(d->data)[8191] = 1;
+}
+
 int main(int argc, char** argv) {
   ::testing::InitGoogleTest(&argc, argv);
   return RUN_ALL_TESTS();
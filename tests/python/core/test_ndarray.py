@@ -37,6 +37,64 @@ def test_move_device():
     np.testing.assert_allclose(np.array([1, 2, 3], dtype="float32"), a.numpy())
 
 
+@pytest.mark.parametrize("device", ["cpu", "cuda"])
+@pytest.mark.parametrize("dtype", [None, "float32", "float16"])
+def test_to(device, dtype):
+    if device == "cuda" and not raf.build.with_cuda():
+        pytest.skip("CUDA is not enabled")
+    n_ref = np.random.randn(3, 4).astype("float32")
+    # The source shares the buffer of n_x, so it can be mutated in place.
+    n_x = n_ref.copy()
+    m_x = raf.array(n_x, copy=False)
+    m_x.requires_grad = True
+    m_y = m_x.to(device=device, dtype=dtype)
+    assert m_y.device.startswith(device)
+    assert m_y.dtype == (dtype or "float32")
+    assert m_y.requires_grad
+    np.testing.assert_allclose(m_y.numpy(), n_ref.astype(m_y.dtype), rtol=1e-3)
+    # The result owns its buffer, so mutating the source does not change it.
+    n_x[:] = 0
+    np.testing.assert_equal(m_x.numpy(), n_x)
+    np.testing.assert_allclose(m_y.numpy(), n_ref.astype(m_y.dtype), rtol=1e-3)
+
+
+def test_array_no_copy():
+    n_x = np.arange(6, dtype="float32").reshape(2, 3)
+    m_x = raf.array(n_x, copy=False)
+    n_x[0, 0] = 10
+    assert m_x.numpy()[0, 0] == 10
+    del n_x
+    np.testing.assert_equal(m_x.numpy()[1], [3, 4, 5])
+
+
+def test_dlpack_numpy():
+    n_x = np.arange(6, dtype="float32").reshape(2, 3)
+    if not hasattr(n_x, "__dlpack__"):
+        pytest.skip("numpy does not support DLPack")
+    m_x = raf.from_dlpack(n_x)
+    assert m_x.shape == (2, 3)
+    assert m_x.dtype == "float32"
+    n_x[1, 2] = -1
+    assert m_x.numpy()[1, 2] == -1
+
+    n_y = np.from_dlpack(m_x)
+    np.testing.assert_equal(n_y, n_x)
+    assert m_x.__dlpack_device__() == (1, 0)
+
+
+def test_dlpack_torch():
+    torch = pytest.importorskip("torch")
+    t_x = torch.arange(6, dtype=torch.float32).reshape(2, 3)
+    m_x = raf.from_dlpack(t_x)
+    t_x[0, 1] = 42
+    assert m_x.numpy()[0, 1] == 42
+
+    t_y = torch.utils.dlpack.from_dlpack(m_x)
+    t_y[1, 1] = -42
+    assert m_x.numpy()[1, 1] == -42
+    assert t_x[1, 1] == -42
+
+
 def test_bf16_ndarray():
     def np_float2np_bf16(arr):
         """Convert a numpy array of float to a numpy array
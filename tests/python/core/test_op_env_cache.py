@@ -0,0 +1,69 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import numpy as np
+import pytest
+
+import raf
+from raf._core.executor import (
+    clear_op_env_cache,
+    get_op_env_cache_stats,
+    set_op_env_cache_capacity,
+)
+from raf.testing import randn, check
+
+
+@pytest.fixture
+def op_env_cache():
+    clear_op_env_cache()
+    capacity = get_op_env_cache_stats()["Capacity"]
+    yield
+    set_op_env_cache_capacity(capacity)
+    clear_op_env_cache()
+
+
+# pylint: disable=redefined-outer-name,unused-argument
+def test_hit_and_clear(op_env_cache):
+    m_x, n_x = randn((4, 5))
+    m_y, n_y = randn((4, 5))
+    check(raf.add(m_x, m_y), n_x + n_y)
+    stats = get_op_env_cache_stats()
+    assert stats["Hit"] == 0
+    assert stats["Size"] == 1
+
+    # The cached OpEnv must run with the new inputs.
+    m_z, n_z = randn((4, 5))
+    check(raf.add(m_x, m_z), n_x + n_z)
+    assert get_op_env_cache_stats()["Hit"] == 1
+
+    # Different shapes do not share the OpEnv.
+    m_w, n_w = randn((3, 5))
+    check(raf.add(m_w, m_w), n_w + n_w)
+    stats = get_op_env_cache_stats()
+    assert stats["Hit"] == 1
+    assert stats["Size"] == 2
+
+    clear_op_env_cache()
+    stats = get_op_env_cache_stats()
+    assert stats["Size"] == 0
+    assert stats["Hit"] == 0
+
+
+def test_eviction(op_env_cache):
+    set_op_env_cache_capacity(1)
+    m_x, n_x = randn((4, 5))
+    check(raf.relu(m_x), np.maximum(n_x, 0))
+    check(raf.add(m_x, m_x), n_x + n_x)
+    stats = get_op_env_cache_stats()
+    assert stats["Size"] == 1
+    assert stats["Evict"] == 1
+
+    set_op_env_cache_capacity(0)
+    check(raf.add(m_x, m_x), n_x + n_x)
+    stats = get_op_env_cache_stats()
+    assert stats["Size"] == 0
+    assert stats["Hit"] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -10,7 +10,8 @@ from raf.testing import randn, get_testable_devices, check, run_vm_model
 from raf._core.ndarray import ndarray
 from raf._core.core_utils import get_chained_attr
 from raf._op import sym
-from raf.model.trace import trace_mutate_attr
+from raf.model.trace import trace_mutate_attr, set_trace_cache_options, get_trace_cache_stats
+from raf.model.trace import clear_run_model_cache, get_run_model_cache_stats, set_run_model_options
 from tvm import relay
 
 
@@ -202,5 +203,114 @@ def test_mutate_grad():
     assert len(ret_type.fields) == 2
 
 
+class ReluModel(raf.Model):
+    def build(self):
+        pass
+
+    @raf.model.trace
+    def forward(self, x):
+        return raf.relu(x)
+
+
+def test_trace_cache_lru():
+    model = ReluModel()
+    set_trace_cache_options(model, max_entries=2)
+    shapes = [(2, 3), (4, 3), (2, 3), (8, 3), (4, 3)]
+    for shape in shapes:
+        m_x, n_x = randn(shape)
+        check(model(m_x), np.maximum(n_x, 0))
+    (stats,) = get_trace_cache_stats(model).values()
+    # (2, 3) hits once; (8, 3) evicts (4, 3), which is traced again and evicts (2, 3).
+    assert stats == {"hit": 1, "miss": 4, "evict": 2, "entries": 2}
+
+
+def test_trace_cache_buckets():
+    model = ReluModel()
+    set_trace_cache_options(model, buckets={"x": {1: [4, 8]}})
+    for length in [1, 3, 4, 6, 8]:
+        m_x, n_x = randn((2, length))
+        m_y = model(m_x)
+        n_y = np.maximum(n_x, 0)
+        size = 4 if length <= 4 else 8
+        assert m_y.shape == (2, size)
+        check(m_y.numpy()[:, :length], n_y)
+        np.testing.assert_equal(m_y.numpy()[:, length:], 0)
+    (stats,) = get_trace_cache_stats(model).values()
+    assert stats["miss"] == 2
+    assert stats["hit"] == 3
+    # Larger than all buckets: not padded.
+    m_x, _ = randn((2, 9))
+    assert model(m_x).shape == (2, 9)
+
+
+@pytest.mark.parametrize("use_vm", [False, True])
+def test_run_model_cache(use_vm):
+    class MulModel(raf.Model):
+        def build(self, shape):
+            self.w = raf.array(np.ones(shape, dtype="float32"))
+
+        @raf.model.trace
+        def forward(self, x):
+            return raf.multiply(x, self.w)
+
+    shape = (2, 3)
+    model = MulModel(shape)
+    model.infer_mode()
+    clear_run_model_cache()
+    set_run_model_options(use_vm=use_vm)
+    try:
+        for _ in range(3):
+            m_x, n_x = randn(shape)
+            check(model(m_x), n_x)
+        stats = get_run_model_cache_stats()
+        assert stats["Miss"] == 1
+        assert stats["Hit"] == 2
+        # The parameters are not folded into the cached module.
+        model.w[:] = np.full(shape, 2, dtype="float32")
+        m_x, n_x = randn(shape)
+        check(model(m_x), n_x * 2)
+        assert get_run_model_cache_stats()["Hit"] == 3
+    finally:
+        set_run_model_options(use_vm=False)
+        clear_run_model_cache()
+
+
+@pytest.mark.parametrize("use_vm", [False, True])
+def test_run_model_cache_key(use_vm):
+    class AddModel(raf.Model):
+        def build(self, shape):
+            self.w = raf.array(np.ones(shape, dtype="float32"))
+
+        @raf.model.trace
+        def forward(self, x):
+            return raf.add(x, self.w)
+
+    shape = (2, 3)
+    model = AddModel(shape)
+    model.infer_mode()
+    clear_run_model_cache()
+    set_run_model_options(use_vm=use_vm)
+    try:
+        devices = get_testable_devices()
+        # The modules compiled for different devices are not shared.
+        for device in devices:
+            model.to(device=device)
+            for _ in range(2):
+                m_x, n_x = randn(shape, device=device)
+                check(model(m_x), n_x + 1)
+        stats = get_run_model_cache_stats()
+        assert stats["Miss"] == len(devices)
+        assert stats["Hit"] == len(devices)
+
+        # Neither are the modules optimized under different pass contexts.
+        with raf.ir.PassContext(opt_level=3, disabled_pass=["FoldConstant"]):
+            m_x, n_x = randn(shape, device=devices[-1])
+            check(model(m_x), n_x + 1)
+        assert get_run_model_cache_stats()["Miss"] == len(devices) + 1
+    finally:
+        set_run_model_options(use_vm=False)
+        clear_run_model_cache()
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -42,6 +42,162 @@ def test_vm(device, shape):
     np.testing.assert_allclose(m_z, ref_z, rtol=1e-5, atol=1e-5)
 
 
+@pytest.mark.parametrize("device", get_testable_devices())
+def test_vm_op_env_cache(device):
+    # pylint: disable=protected-access
+    class Model(raf.Model):
+        # pylint: disable=attribute-defined-outside-init
+        def build(self):
+            pass
+
+        @raf.model.trace
+        def forward(self, x):  # pylint: disable=no-self-use
+            y = raf.add(x, x)
+            z = raf.multiply(x, y)
+            return z
+
+    model = Model()
+    model.infer_mode()
+    m_x, _ = randn((3, 3), device=device)
+    mod = model._internal(m_x).mod
+    with raf.ir.PassContext(disabled_pass=["FuseTVM", "FuseDialect"]):
+        executor = VMExecutor(mod, device)
+    ref_z = model(m_x).numpy()
+
+    # The first run creates the OpEnvs.
+    m_z = executor.vm.run(m_x).numpy()
+    np.testing.assert_allclose(m_z, ref_z, rtol=1e-5, atol=1e-5)
+    stats = executor.vm.stats
+    assert stats["OpEnvCacheMiss"] == 2
+    assert stats["OpEnvFastPathHit"] == 0
+
+    # The following runs hit the per-instruction fast path.
+    for _ in range(3):
+        m_z = executor.vm.run(m_x).numpy()
+        np.testing.assert_allclose(m_z, ref_z, rtol=1e-5, atol=1e-5)
+    stats = executor.vm.stats
+    assert stats["OpEnvCacheMiss"] == 2
+    assert stats["OpEnvCacheHit"] == 0
+    assert stats["OpEnvFastPathHit"] == 6
+
+
+@pytest.mark.parametrize("device", get_testable_devices())
+def test_vm_infer_type_cache(device):
+    # pylint: disable=protected-access
+    class Model(raf.Model):
+        # pylint: disable=attribute-defined-outside-init
+        def build(self):
+            pass
+
+        @raf.model.trace
+        def forward(self, x):  # pylint: disable=no-self-use
+            y = raf.argwhere(x)
+            y = raf.abs(y)
+            return raf.add(y, y)
+
+    model = Model()
+    model.infer_mode()
+    n_x = np.array([[1, 0], [1, 1]], dtype="float32")
+    m_x = raf.array(n_x, device=device)
+    mod = model._internal(m_x).mod
+    executor = VMExecutor(mod, device)
+
+    def run(n_x):
+        m_x = raf.array(n_x, device=device)
+        m_z = executor.vm.run(m_x).numpy()
+        np.testing.assert_equal(m_z, 2 * np.argwhere(n_x))
+
+    run(n_x)
+    stats = executor.vm.stats
+    num_infer_type = stats["InferTypeCacheMiss"]
+    assert num_infer_type > 0
+    assert stats["InferTypeCacheHit"] == 0
+    assert stats["InferTypeCacheSize"] == num_infer_type
+
+    # The same shapes hit the memo table.
+    for _ in range(3):
+        run(n_x)
+    stats = executor.vm.stats
+    assert stats["InferTypeCacheMiss"] == num_infer_type
+    assert stats["InferTypeCacheHit"] == 3 * num_infer_type
+
+    # A different number of non-zeros changes the shapes.
+    run(np.ones((2, 2), dtype="float32"))
+    stats = executor.vm.stats
+    assert stats["InferTypeCacheMiss"] > num_infer_type
+    assert stats["InferTypeCacheSize"] == stats["InferTypeCacheMiss"]
+
+
+@pytest.mark.parametrize("device", get_testable_devices())
+def test_vm_infer_type_cache_values(device):
+    # pylint: disable=protected-access
+    class Model(raf.Model):
+        # pylint: disable=attribute-defined-outside-init
+        def build(self):
+            pass
+
+        @raf.model.trace
+        def forward(self, start, stop, step):  # pylint: disable=no-self-use
+            return raf.arange(start, stop, step, dtype="float32", device=device)
+
+    def make_args(start, stop, step):
+        return [raf.array(x, dtype="float32", device=device) for x in [start, stop, step]]
+
+    model = Model()
+    model.infer_mode()
+    mod = model._internal(*make_args(1, 10, 2)).mod
+    executor = VMExecutor(mod, device)
+
+    # The float values on any device are part of the key, so the output shapes are not stale.
+    misses = []
+    for start, stop, step in [(1, 10, 2), (1, 10, 1), (0.5, 3, 0.5), (1, 10, 2)]:
+        m_y = executor.vm.run(*make_args(start, stop, step))
+        check(m_y, np.arange(start, stop, step).astype("float32"))
+        misses.append(executor.vm.stats["InferTypeCacheMiss"])
+    assert misses[0] < misses[1] < misses[2] == misses[3]
+    assert executor.vm.stats["InferTypeCacheHit"] > 0
+
+
+@pytest.mark.parametrize("device", get_testable_devices())
+@pytest.mark.parametrize("num_workers", [1, 4])
+def test_vm_warmup(device, num_workers):
+    # pylint: disable=protected-access
+    class Model(raf.Model):
+        # pylint: disable=attribute-defined-outside-init
+        def build(self):
+            pass
+
+        @raf.model.trace
+        def forward(self, x):  # pylint: disable=no-self-use
+            y = raf.relu(x)
+            z = raf.add(x, y)
+            z = raf.relu(z)
+            return raf.multiply(z, x)
+
+    model = Model()
+    model.infer_mode()
+    m_x, _ = randn((5, 7), device=device)
+    mod = model._internal(m_x).mod
+    with raf.ir.PassContext(disabled_pass=["FuseTVM", "FuseDialect"]):
+        executor = VMExecutor(mod, device)
+    ref_z = model(m_x).numpy()
+
+    # Both relu share a kernel, but each op instance has its own OpEnv.
+    ret = executor.vm.warmup(m_x, num_workers=num_workers)
+    assert ret["num_op_envs"] == 4
+    assert ret["elapsed_ms"] > 0
+
+    # The run does not create any OpEnv after the warmup.
+    m_z = executor.vm.run(m_x).numpy()
+    np.testing.assert_allclose(m_z, ref_z, rtol=1e-5, atol=1e-5)
+    stats = executor.vm.stats
+    assert stats["OpEnvCacheMiss"] == 4
+    assert stats["OpEnvFastPathHit"] == 4
+
+    # Warming up again has nothing to compile.
+    assert executor.vm.warmup(m_x)["num_op_envs"] == 0
+
+
 @pytest.mark.skipif(not raf.build.with_cuda(), reason="CUDA is not enabled")
 @pytest.mark.parametrize("shape", [[3, 3], [4, 4]])
 def test_cuda_graph(shape):
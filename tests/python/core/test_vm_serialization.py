@@ -19,7 +19,13 @@ def run_exec(exe, inputs):
     return out
 
 
-def serialize_and_load(exe):
+def serialize_and_load(exe, artifact=False):
+    if artifact:
+        tmp = tvm.contrib.utils.tempdir()
+        path = tmp.relpath("model.rafx")
+        exe.save_artifact(path)
+        return Executable.load_artifact(path)
+
     code, lib = exe.save()
     tmp = tvm.contrib.utils.tempdir()
     if lib is not None:
@@ -66,7 +72,8 @@ def test_simple(fuse):
 
 
 @pytest.mark.parametrize("fuse", [True, False])
-def test_constant(fuse):
+@pytest.mark.parametrize("artifact", [True, False])
+def test_constant(fuse, artifact):
     shape = (3, 5)
     konst1 = raf.ir.const(np.random.randn(1, 5).astype("float32"))
     x = raf.ir.var("x", shape=shape)
@@ -82,13 +89,14 @@ def test_constant(fuse):
     m_x, _ = randn(shape)
     ref_y = executor.make_executor()(m_x)
 
-    loaded_exe = serialize_and_load(executor.executable)
+    loaded_exe = serialize_and_load(executor.executable, artifact)
     m_y = run_exec(loaded_exe, [m_x])
     check(m_y, ref_y)
 
 
 @pytest.mark.parametrize("fuse", [True, False])
-def test_tuple(fuse):
+@pytest.mark.parametrize("artifact", [True, False])
+def test_tuple(fuse, artifact):
     rand, _ = randn((1,), device="cpu")
 
     class Model(raf.Model):
@@ -108,12 +116,44 @@ def test_tuple(fuse):
         executor = VMExecutor(mod, "cpu")
     ref_out = executor.make_executor()(m_x, rand)
 
-    loaded_exe = serialize_and_load(executor.executable)
+    loaded_exe = serialize_and_load(executor.executable, artifact)
     out = run_exec(loaded_exe, [m_x, rand])
     assert len(out) == len(ref_out)
     for t, ref_t in zip(out, ref_out):
         check(t, ref_t)
 
 
+def test_artifact_multiple_constants():
+    shape = (4, 5)
+    konsts = [np.random.randn(*shape).astype(dtype) for dtype in ["float32", "float64", "int8"]]
+    x = raf.ir.var("x", shape=shape)
+    y = raf.ir.op.add(x, raf.ir.const(konsts[0]))
+    y = raf.ir.op.add(y, raf.ir.op.cast(raf.ir.const(konsts[1]), "float32"))
+    y = raf.ir.op.add(y, raf.ir.op.cast(raf.ir.const(konsts[2]), "float32"))
+    mod = raf.ir.IRModule()
+    mod["main"] = relay.Function([x], y)
+    mod = raf._ffi.pass_.ToANormalForm()(mod)
+
+    with raf.ir.PassContext(opt_level=1):
+        executor = VMExecutor(mod, "cpu")
+    m_x, _ = randn(shape)
+    ref_y = executor.make_executor()(m_x)
+
+    loaded_exe = serialize_and_load(executor.executable, artifact=True)
+    # Run it twice and load the artifact again to make sure the mapped constants are intact.
+    for _ in range(2):
+        check(run_exec(loaded_exe, [m_x]), ref_y)
+    check(run_exec(serialize_and_load(executor.executable, artifact=True), [m_x]), ref_y)
+
+
+def test_artifact_invalid():
+    tmp = tvm.contrib.utils.tempdir()
+    path = tmp.relpath("invalid.rafx")
+    with open(path, "wb") as filep:
+        filep.write(b"\0" * 4096)
+    with pytest.raises(tvm.TVMError):
+        Executable.load_artifact(path)
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
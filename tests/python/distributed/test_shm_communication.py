@@ -0,0 +1,198 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+# pylint: disable=invalid-name, protected-access, import-outside-toplevel, broad-except
+"""Test the collective communication operators on CPU with the shared-memory communicator.
+Unlike the NCCL tests, the ranks are forked by the test itself, so no mpirun is needed.
+"""
+import multiprocessing as mp
+import os
+import traceback
+import uuid
+
+import numpy as np
+import pytest
+
+import raf
+
+NUM_RANKS = 3
+TIMEOUT = 300
+
+
+def _input(rank, shape):
+    return np.arange(np.prod(shape), dtype="float32").reshape(shape) + rank
+
+
+def _run_allreduce(rank, size, computation):
+    from raf.testing import check
+
+    class TestModel(raf.Model):
+        def build(self):
+            pass
+
+        @raf.model.trace
+        def forward(self, x, y):
+            return raf.allreduce([x, y], computation=computation)
+
+    xs = [_input(r, (37, 5)) for r in range(size)]
+    ys = [_input(r, (3,)) * 2 for r in range(size)]
+    out = TestModel()(raf.array(xs[rank]), raf.array(ys[rank]))
+    reduce = {"sum": np.sum, "max": np.max, "min": np.min, "avg": np.mean}[computation]
+    check(out[0], reduce(np.stack(xs), axis=0), rtol=1e-5, atol=1e-5)
+    check(out[1], reduce(np.stack(ys), axis=0), rtol=1e-5, atol=1e-5)
+
+
+def _run_allgather(rank, size):
+    from raf.testing import check
+
+    class TestModel(raf.Model):
+        def build(self):
+            pass
+
+        @raf.model.trace
+        def forward(self, x):
+            return raf.allgather(x, axis=0)
+
+    xs = [_input(r, (11, 4)) for r in range(size)]
+    out = TestModel()(raf.array(xs[rank]))
+    check(out, np.concatenate(xs, axis=0))
+
+
+def _run_reduce_scatter(rank, size):
+    from raf.testing import check
+
+    class TestModel(raf.Model):
+        def build(self):
+            pass
+
+        @raf.model.trace
+        def forward(self, x):
+            return raf.reduce_scatter(x, computation="sum")
+
+    xs = [_input(r, (size * 7, 3)) for r in range(size)]
+    out = TestModel()(raf.array(xs[rank]))
+    target = np.split(np.sum(np.stack(xs), axis=0), size, axis=0)[rank]
+    check(out, target, rtol=1e-5, atol=1e-5)
+
+
+def _run_rank_list(rank, size):
+    from raf.testing import check
+
+    rank_list = [[0, 2]]
+
+    class TestModel(raf.Model):
+        def build(self):
+            pass
+
+        @raf.model.trace
+        def forward(self, x):
+            return raf.allreduce(x, computation="sum", rank_list=rank_list)
+
+    xs = [_input(r, (4,)) for r in range(size)]
+    out = TestModel()(raf.array(xs[rank]))
+    if rank in rank_list[0]:
+        target = sum(xs[r] for r in rank_list[0])
+    else:
+        target = xs[rank]
+    check(out, target)
+
+
+def _run_zero2_training(rank, size):
+    # pylint: disable=attribute-defined-outside-init
+    from raf import distributed as dist
+    from raf.testing import check, run_vm_model
+
+    class TestModel(raf.Model):
+        def build(self, n_w):
+            self.w = raf.array(n_w)
+            self.w.requires_grad = True
+
+        @raf.model.trace
+        def forward(self, x):
+            return raf.relu(raf.matmul(x, self.w))
+
+    # Every rank trains on the same data, so the data parallel training with the ZeRO-2
+    # (PartitionGradient + GroupAllgather) matches the single process training.
+    n_w = _input(0, (size * 2, 5)) / 10
+    n_xs = [_input(step, (4, size * 2)) / 10 for step in range(3)]
+    n_dy = np.ones((4, 5), dtype="float32")
+
+    def train(enable_data_parallel):
+        dcfg = dist.get_config()
+        dcfg.enable_data_parallel = enable_data_parallel
+        dcfg.zero_opt_level = 2 if enable_data_parallel else 0
+        model = TestModel(n_w)
+        model.train_mode()
+        trainer = raf.optim.sgd.with_sgd(learning_rate=0.1, momentum=0.01)(model)
+        outs = [run_vm_model(trainer, "cpu", [raf.array(n_dy), raf.array(n_x)]) for n_x in n_xs]
+        dcfg.enable_data_parallel = False
+        dcfg.zero_opt_level = 0
+        return [out[0] if isinstance(out, (tuple, list)) else out for out in outs]
+
+    expected = train(False)
+    for out, target in zip(train(True), expected):
+        check(out, target, rtol=1e-5, atol=1e-5)
+
+
+def _worker(rank, size, session, slot_bytes, func, args, queue):
+    os.environ["RAF_SHM_SESSION"] = session
+    os.environ["RAF_SHM_SLOT_BYTES"] = str(slot_bytes)
+    try:
+        from raf import distributed as dist
+
+        comm = dist.get_communicator()
+        comm.size = size
+        comm.rank = rank
+        comm.local_size = size
+        comm.local_rank = rank
+        func(rank, size, *args)
+        queue.put((rank, None))
+    except Exception:
+        queue.put((rank, traceback.format_exc()))
+
+
+def _launch(func, *args, slot_bytes=256, size=NUM_RANKS):
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    session = uuid.uuid4().hex[:8]
+    procs = [
+        ctx.Process(target=_worker, args=(r, size, session, slot_bytes, func, args, queue))
+        for r in range(size)
+    ]
+    for proc in procs:
+        proc.start()
+    errors = []
+    for _ in range(size):
+        rank, err = queue.get(timeout=TIMEOUT)
+        if err is not None:
+            errors.append(f"rank {rank}:\n{err}")
+    for proc in procs:
+        proc.join(timeout=TIMEOUT)
+    assert not errors, "\n".join(errors)
+
+
+@pytest.mark.parametrize("computation", ["sum", "max", "min", "avg"])
+def test_shm_allreduce(computation):
+    # The small slot size splits the tensors into multiple chunks.
+    _launch(_run_allreduce, computation)
+
+
+def test_shm_allgather():
+    _launch(_run_allgather)
+
+
+@pytest.mark.parametrize("slot_bytes", [96, 1 << 20])
+def test_shm_reduce_scatter(slot_bytes):
+    _launch(_run_reduce_scatter, slot_bytes=slot_bytes)
+
+
+def test_shm_rank_list():
+    _launch(_run_rank_list)
+
+
+def test_shm_zero2_training():
+    _launch(_run_zero2_training, slot_bytes=1 << 20)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
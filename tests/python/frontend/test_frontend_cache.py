@@ -0,0 +1,99 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+# pylint:disable=missing-module-docstring,missing-function-docstring,missing-class-docstring
+# pylint:disable=abstract-method,invalid-name,protected-access
+import os
+import tempfile
+
+import numpy as np
+import pytest
+import torch
+import torch.nn as nn
+
+import raf
+from raf._lib import relay
+from raf.frontend import cache, from_pytorch, load_model, save_model
+from raf.testing import check, randn_torch
+
+
+class TorchModel(nn.Module):
+    def __init__(self):
+        super(TorchModel, self).__init__()
+        self.linear = nn.Linear(16, 8)
+        self.B = torch.nn.Parameter(torch.randn(4, 8), requires_grad=False)
+        self.register_buffer("buffer", torch.ones(4, 8))
+
+    def forward(self, x):
+        return torch.relu(self.linear(x)) + self.B * self.buffer
+
+
+def test_params_file():
+    arg_params = {
+        "w": raf.array(np.random.randn(3, 5).astype("float32")),
+        "idx": raf.array(np.arange(7, dtype="int64")),
+    }
+    aux_params = {"idx": arg_params["idx"], "mean": raf.array(np.ones((2,), dtype="float16"))}
+    with tempfile.TemporaryDirectory(prefix="raf_test_") as temp_dir:
+        path = os.path.join(temp_dir, "params.bin")
+        cache.save_params(path, arg_params, aux_params)
+        for mmap in [True, False]:
+            loaded_arg, loaded_aux = cache.load_params(path, mmap)
+            assert list(loaded_arg) == ["w", "idx"] and list(loaded_aux) == ["idx", "mean"]
+            assert loaded_arg["idx"] is loaded_aux["idx"]
+            for name, param in list(arg_params.items()) + list(aux_params.items()):
+                loaded = loaded_arg[name] if name in loaded_arg else loaded_aux[name]
+                assert loaded.dtype == param.dtype
+                np.testing.assert_equal(loaded.numpy(), param.numpy())
+
+
+def test_from_pytorch_cache(monkeypatch):
+    shape_dict = {"input0": ((4, 16), "float32")}
+    t_model = TorchModel()
+    m_x, t_x = randn_torch((4, 16))
+    t_y = t_model(t_x)
+
+    with tempfile.TemporaryDirectory(prefix="raf_test_") as temp_dir:
+        m_model = from_pytorch(t_model, shape_dict, cache_dir=temp_dir)
+        key = os.listdir(temp_dir)
+        assert len(key) == 1
+
+        # The second conversion must be loaded from the cache.
+        def _fail(*args, **kwargs):
+            raise RuntimeError("The model should be loaded from the cache")
+
+        monkeypatch.setattr(relay.frontend, "from_pytorch", _fail)
+        cached = from_pytorch(t_model, shape_dict, cache_dir=temp_dir)
+        assert os.listdir(temp_dir) == key
+        for model in [m_model, cached]:
+            model.infer_mode()
+            check(model(m_x), t_y, rtol=1e-5, atol=1e-5)
+
+        cached.train_mode()
+        params = cached.state()
+        assert params["model_linear_weight"].requires_grad
+        assert not params["model_B"].requires_grad
+        assert not params["model_buffer"].requires_grad
+
+        # A different input shape misses the cache.
+        with pytest.raises(RuntimeError):
+            from_pytorch(t_model, {"input0": ((2, 16), "float32")}, cache_dir=temp_dir)
+
+
+def test_save_and_load_model():
+    shape_dict = {"input0": ((4, 16), "float32")}
+    t_model = TorchModel()
+    m_x, t_x = randn_torch((4, 16))
+    m_model = from_pytorch(t_model, shape_dict)
+
+    with tempfile.TemporaryDirectory(prefix="raf_test_") as temp_dir:
+        path = os.path.join(temp_dir, "model")
+        save_model(m_model, path, key="torch_model")
+        assert load_model(path, key="other_model") is None
+        loaded = load_model(path, key="torch_model", mmap=False)
+        loaded.infer_mode()
+        check(loaded(m_x), t_model(t_x), rtol=1e-5, atol=1e-5)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
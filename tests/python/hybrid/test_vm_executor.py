@@ -0,0 +1,132 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+# pylint: disable=invalid-name
+import importlib
+
+import numpy as np
+import pytest
+
+import raf
+from raf import hybrid
+from raf.testing import get_testable_devices
+
+# The module, which is shadowed by the decorator of the same name in raf.hybrid.
+hybrid_impl = importlib.import_module("raf.hybrid.hybrid")
+
+
+@pytest.fixture(autouse=True)
+def fresh_func_tab(monkeypatch):
+    """Compile the functions from scratch in every test, so that the executors created by the
+    other tests are not reused."""
+    monkeypatch.setattr(hybrid_impl, "FUNC_TAB", {})
+
+
+def nested_loop(n, m):
+    s = 0
+    i = 0
+    while i < n:
+        j = 0
+        while j < m:
+            if (i + j) % 3 == 0:
+                s = s + i * j
+            else:
+                s = s - 1
+            j = j + 1
+        i = i + 1
+    return s
+
+
+def early_return(x):
+    i = 0
+    while i < 100:
+        if i * i > x:
+            return i
+        i = i + 1
+    return -1
+
+
+def swap(a, b):
+    t = (b, a)
+    c, d = t
+    return c * 10 + d
+
+
+def step_sum(n, step):
+    s = step - step
+    i = 0
+    while i < n:
+        s = s + step
+        i = i + 1
+    return s
+
+
+@pytest.mark.parametrize(
+    "pyfunc, args",
+    [
+        (nested_loop, (7, 5)),
+        (nested_loop, (0, 3)),
+        (early_return, (50,)),
+        (early_return, (100000,)),
+        (swap, (3, 8)),
+    ],
+)
+def test_vm_executor(pyfunc, args):
+    expected = pyfunc(*args)
+    assert hybrid(executor="interpreter")(pyfunc)(*args) == expected
+    assert hybrid(executor="vm")(pyfunc)(*args) == expected
+
+
+def test_vm_cache(monkeypatch):
+    compiled = []
+
+    class CountingVMExecutor(hybrid_impl.VMExecutor):
+        def __init__(self, mod, device):
+            compiled.append(mod)
+            super().__init__(mod, device)
+
+    monkeypatch.setattr(hybrid_impl, "VMExecutor", CountingVMExecutor)
+
+    func = hybrid(executor="vm")(step_sum)
+    assert func(10, 2) == 20
+    assert func(5, 3) == 15
+    assert len(compiled) == 1
+    # A new signature of the arguments compiles a new executable.
+    assert func(4, 1.5) == 6.0
+    assert len(compiled) == 2
+
+
+@pytest.mark.parametrize("device", get_testable_devices())
+def test_vm_device(monkeypatch, device):
+    devices = []
+
+    class RecordingVMExecutor(hybrid_impl.VMExecutor):
+        def __init__(self, mod, device):
+            devices.append(device)
+            super().__init__(mod, device)
+
+    monkeypatch.setattr(hybrid_impl, "VMExecutor", RecordingVMExecutor)
+
+    func = hybrid(executor="vm")(step_sum)
+    # The function runs on the device of the tensor arguments, and the scalars are copied there.
+    step = raf.array(np.array(3, dtype="int64"), device=device)
+    assert func(4, step) == 12
+    assert devices == [step.device]
+    # The device is part of the signature.
+    assert func(4, 3) == 12
+    assert len(devices) == (1 if step.device == "cpu" else 2)
+
+
+def test_vm_invalid_argument():
+    func = hybrid(executor="vm")(step_sum)
+    with pytest.raises(TypeError, match="str"):
+        func(4, "3")
+
+
+def test_invalid_executor():
+    with pytest.raises(ValueError):
+        hybrid(executor="graph")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
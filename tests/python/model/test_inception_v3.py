@@ -4,6 +4,7 @@
 # pylint: disable=protected-access
 import pytest
 import raf
+from raf._core.device import configure_cpu_stream_workers
 from raf.testing import check, run_vm_model, get_testable_devices, inception
 
 
@@ -79,6 +80,21 @@ def test_block_vm_multi_stream(block_name, policy, fuse):
     check(y_1, y_2, rtol=1e-5, atol=1e-5)
 
 
+@pytest.mark.parametrize("num_threads", [1, 4])
+@pytest.mark.parametrize("policy", ["wavefront", "asap"])
+def test_block_vm_multi_stream_cpu(policy, num_threads):
+    device = "cpu"
+    (model, x, _), _ = inception.get_block_and_input(block_name="c", device=device)
+    model.infer_mode()
+    configure_cpu_stream_workers(num_threads)
+    try:
+        y_1 = run_vm_model(model, device, [x], stream_schedule_policy="sequential")
+        y_2 = run_vm_model(model, device, [x], stream_schedule_policy=policy)
+        check(y_1, y_2, rtol=1e-5, atol=1e-5)
+    finally:
+        configure_cpu_stream_workers()
+
+
 @pytest.mark.skipif(True, reason="Skip to save the CI time")
 @pytest.mark.skipif(
     raf.build.with_cuda() and float(raf.build.with_cuda()) <= 11.2,
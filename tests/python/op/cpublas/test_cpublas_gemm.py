@@ -0,0 +1,136 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+# pylint: disable=too-many-locals,too-many-arguments,protected-access,no-self-use,invalid-name
+import numpy as np
+import pytest
+import raf
+from raf.testing import check, randn, run_vm_model, with_dialect, with_seed, DialectChecker
+
+
+def np_matmul(a, b, transpose_a, transpose_b):
+    a = np.swapaxes(a, -1, -2) if transpose_a else a
+    b = np.swapaxes(b, -1, -2) if transpose_b else b
+    return np.matmul(a.astype("float64"), b.astype("float64"))
+
+
+@pytest.mark.parametrize("shape", [(1, 1, 1), (4, 3, 5), (130, 300, 17), (5, 9, 600)])
+@pytest.mark.parametrize("transpose_a", [True, False])
+@pytest.mark.parametrize("transpose_b", [True, False])
+@pytest.mark.parametrize("dtype", ["float32", "float64"])
+@with_seed(0)
+def test_matmul(shape, transpose_a, transpose_b, dtype):
+    n, k, m = shape
+
+    class TestModel(raf.Model):
+        def build(self):
+            pass
+
+        @raf.model.trace
+        def forward(self, m_a, m_b):
+            raf_op = [[raf.matmul, raf.matmul_nt], [raf.matmul_tn, raf.matmul_tt]]
+            raf_op = raf_op[transpose_a][transpose_b]
+            return raf_op(m_a, m_b)
+
+    model = TestModel()
+    m_a, n_a = randn((k, n) if transpose_a else (n, k), dtype=dtype, requires_grad=True)
+    m_b, n_b = randn((m, k) if transpose_b else (k, m), dtype=dtype, requires_grad=True)
+    n_c = np_matmul(n_a, n_b, transpose_a, transpose_b)
+    tol = 1e-4 if dtype == "float32" else 1e-8
+
+    m_c = with_dialect(["cpublas", "tvm"])(model)(m_a, m_b)
+    check(m_c, n_c, rtol=tol, atol=tol)
+    v_c = run_vm_model(model, "cpu", [m_a, m_b])
+    check(v_c, n_c, rtol=tol, atol=tol)
+
+    # The gradients are also computed by matmul ops.
+    m_dc, n_dc = randn(m_c.shape, dtype=dtype)
+    with_dialect(["cpublas", "tvm"])(m_c.backward)(m_dc)
+    n_da = np_matmul(n_dc, n_b, False, not transpose_b)
+    n_db = np_matmul(n_a, n_dc, not transpose_a, False)
+    check(m_a.grad, n_da.T if transpose_a else n_da, rtol=tol, atol=tol)
+    check(m_b.grad, n_db.T if transpose_b else n_db, rtol=tol, atol=tol)
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float64"])
+@with_seed(0)
+def test_dense(dtype):
+    m_x, n_x = randn((7, 33), dtype=dtype)
+    m_w, n_w = randn((65, 33), dtype=dtype)
+
+    @with_dialect(["cpublas", "tvm"])
+    def run():
+        return raf.dense(m_x, m_w)
+
+    check(run(), np.matmul(n_x, n_w.T), rtol=1e-4, atol=1e-4)
+
+
+@pytest.mark.parametrize("broadcast", ["none", "a", "b"])
+@pytest.mark.parametrize("transpose_a", [True, False])
+@pytest.mark.parametrize("transpose_b", [True, False])
+@pytest.mark.parametrize("dtype", ["float32", "float64"])
+@with_seed(0)
+def test_batch_matmul(broadcast, transpose_a, transpose_b, dtype):
+    b, n, k, m = 3, 20, 140, 36
+    b1 = 1 if broadcast == "a" else b
+    b2 = 1 if broadcast == "b" else b
+
+    class TestModel(raf.Model):
+        def build(self):
+            pass
+
+        @raf.model.trace
+        def forward(self, m_a, m_b):
+            raf_op = [
+                [raf.batch_matmul, raf.batch_matmul_nt],
+                [raf.batch_matmul_tn, raf.batch_matmul_tt],
+            ]
+            raf_op = raf_op[transpose_a][transpose_b]
+            return raf_op(m_a, m_b)
+
+    model = TestModel()
+    m_a, n_a = randn((b1, k, n) if transpose_a else (b1, n, k), dtype=dtype)
+    m_b, n_b = randn((b2, m, k) if transpose_b else (b2, k, m), dtype=dtype)
+    n_c = np_matmul(n_a, n_b, transpose_a, transpose_b)
+
+    m_c = with_dialect(["cpublas", "tvm"])(model)(m_a, m_b)
+    check(m_c, n_c, rtol=1e-4, atol=1e-4)
+    v_c = run_vm_model(model, "cpu", [m_a, m_b])
+    check(v_c, n_c, rtol=1e-4, atol=1e-4)
+
+
+def test_fallback():
+    # float16 is not supported by cpublas, so it falls back to TVM.
+    m_a, n_a = randn((4, 8), dtype="float16")
+    m_b, n_b = randn((8, 6), dtype="float16")
+
+    @with_dialect(["cpublas", "tvm"])
+    def run():
+        return raf.matmul(m_a, m_b)
+
+    check(run(), np.matmul(n_a, n_b), rtol=1e-2, atol=1e-2)
+
+
+def test_fuse_dialect():
+    class TestModel(raf.Model):
+        def build(self):
+            pass
+
+        @raf.model.trace
+        def forward(self, x, w, y):
+            return raf.matmul_nt(x, w), raf.batch_matmul(y, y)
+
+    m_x, _ = randn((4, 8))
+    m_w, _ = randn((6, 8))
+    m_y, _ = randn((2, 5, 5), dtype="float64")
+    mod = TestModel()._internal(m_x, m_w, m_y).mod
+    with raf.device("cpu"):
+        mod = raf._ffi.pass_.ToGraphNormalForm()(mod)
+        mod = raf._ffi.pass_.ToBasicBlockNormalForm()(mod)
+        mod = raf._ffi.pass_.InferType()(mod)
+        mod = raf._ffi.pass_.FuseDialect()(mod)
+    DialectChecker("cpublas").visit(mod["main"])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -151,5 +151,29 @@ def test_async_device_copy():
     check(out, ref_out)
 
 
+def test_cpu_stream_to_default_stream():
+    shape = (64, 64)
+
+    class Model(raf.model.Model):
+        def build(self):
+            pass
+
+        @raf.model.trace
+        def forward(self, data):
+            raf.set_stream(0, 1)
+            a_1 = raf.exp(data)
+            a_2 = raf.exp(a_1)
+            # Read the results of the CPU stream on the default stream without an event.
+            raf.set_stream(0, 0)
+            return raf.add(a_2, data)
+
+    data, data_np = randn(shape, device="cpu", positive=True)
+
+    model = Model()
+    out = run_vm_model(model, "cpu", [data], opt_level=3, anf_only=True)
+    ref_out = np.exp(np.exp(data_np)) + data_np
+    check(out, ref_out)
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -5,7 +5,8 @@ import numpy as np
 import pytest
 
 import raf
-from raf.testing import get_testable_devices, run_vm_model
+from raf._core.executor import VMExecutor
+from raf.testing import get_testable_devices, run_vm_model, with_dialect
 
 
 @pytest.mark.parametrize("device", get_testable_devices())
@@ -46,5 +47,35 @@ def test_avg_pool2d_dx_fuse_relu_dx(device):
     run_vm_model(model, device, [x])
 
 
+@with_dialect("tvm")
+@pytest.mark.parametrize("batch", [None, 3])
+def test_matmul_fuse_epilogue(batch):
+    # The elementwise epilogue is computed on the tiles of the CPU matmul schedule.
+    class MatmulBiasReLU(raf.Model):
+        def build(self):
+            pass
+
+        @raf.model.trace
+        def forward(self, x, w, bias):
+            if len(x.shape) == 2:
+                out = raf.matmul_nt(x, w)
+            else:
+                out = raf.batch_matmul(x, w)
+            return raf.relu(raf.add(out, bias))
+
+    batch = () if batch is None else (batch,)
+    n_x = np.random.randn(*batch, 100, 72).astype("float32")
+    n_w = np.random.randn(*(batch + (72, 70) if batch else (70, 72))).astype("float32")
+    n_bias = np.random.randn(70).astype("float32")
+    args = [raf.array(arr, device="cpu") for arr in (n_x, n_w, n_bias)]
+    mod = MatmulBiasReLU()._internal(*args).mod
+    # Skip the dialect patterns, which would offload the matmul to cpublas.
+    with raf.ir.PassContext(disabled_pass=["FuseDialect"]):
+        executor = VMExecutor(mod, "cpu")
+    out = executor.make_executor()(*args)
+    expected = np.matmul(n_x, n_w if batch else n_w.T) + n_bias
+    np.testing.assert_allclose(out.numpy(), np.maximum(expected, 0), rtol=1e-4, atol=1e-4)
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
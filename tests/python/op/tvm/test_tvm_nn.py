@@ -628,6 +628,39 @@ def test_matmul(device, dtype, n, k, m, transpose_a, transpose_b):
     check(m_b.grad, t_b.grad, rtol=1e-4, atol=1e-4)
 
 
+@with_dialect("tvm")
+@pytest.mark.parametrize("shape", [[1, 70, 300, 33], [2, 64, 257, 129], [3, 130, 64, 512]])
+@pytest.mark.parametrize("transpose_a", [True, False])
+@pytest.mark.parametrize("transpose_b", [True, False])
+def test_matmul_cpu_tiles(shape, transpose_a, transpose_b):
+    # The shapes are not multiples of the tiles of the CPU schedule.
+    # pylint: disable=invalid-name
+    b, n, k, m = shape
+    raf_op = [
+        [raf.batch_matmul, raf.batch_matmul_nt],
+        [raf.batch_matmul_tn, raf.batch_matmul_tt],
+    ]
+    if b == 1:
+        raf_op = [[raf.matmul, raf.matmul_nt], [raf.matmul_tn, raf.matmul_tt]]
+    raf_op = raf_op[transpose_a][transpose_b]
+
+    class TestModel(raf.Model):
+        def build(self):
+            pass
+
+        @raf.model.trace
+        def forward(self, m_a, m_b):
+            return raf_op(m_a, m_b)
+
+    batch = () if b == 1 else (b,)
+    m_a, n_a = randn(batch + ((k, n) if transpose_a else (n, k)))
+    m_b, n_b = randn(batch + ((m, k) if transpose_b else (k, m)))
+    n_a = np.swapaxes(n_a, -1, -2) if transpose_a else n_a
+    n_b = np.swapaxes(n_b, -1, -2) if transpose_b else n_b
+    v_c = run_vm_model(TestModel(), "cpu", [m_a, m_b], disable_fusion=True)
+    check(v_c, np.matmul(n_a, n_b), rtol=1e-4, atol=1e-4)
+
+
 @with_dialect("tvm")
 @pytest.mark.parametrize("device", get_testable_devices())
 @pytest.mark.parametrize("shape", [[8, 8, 8, 8], [8, 8, 8, 8, 8]])
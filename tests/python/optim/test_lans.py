@@ -13,7 +13,15 @@ import torch.nn.functional as F
 
 import raf
 from raf.model import Conv2d, Linear, BatchNorm
-from raf.testing import run_vm_model, one_hot_torch, randn_torch, t2m_param, check, with_seed
+from raf.testing import (
+    run_vm_model,
+    one_hot_torch,
+    randn_torch,
+    t2m_param,
+    check,
+    with_seed,
+    get_testable_devices,
+)
 
 try:
     from apex.optimizers import FusedLANS as LANS
@@ -91,6 +99,55 @@ class RAFSimpleTest(raf.Model):
         return y
 
 
+def lans_ref(g, p, m, v, step, lr, beta1, beta2, eps, weight_decay, mode):
+    """The numpy reference of a LANS step with bias correction, gradient averaging and
+    normalization."""
+    beta3 = 1 - beta1
+    grad_norm = np.linalg.norm(g)
+    scaled_grad = g / (grad_norm + eps) if grad_norm != 0 else g
+    if mode == 0:
+        scaled_grad = scaled_grad + weight_decay * p
+    m = m * beta1 + beta3 * scaled_grad
+    v = v * beta2 + (1 - beta2) * scaled_grad * scaled_grad
+    denom = np.sqrt(v / (1 - beta2**step)) + eps
+    update_m = m / (1 - beta1**step) / denom
+    update_g = scaled_grad / denom
+    if mode == 1:
+        update_m = update_m + weight_decay * p
+        update_g = update_g + weight_decay * p
+    p_norm = np.linalg.norm(p)
+
+    def ratio(update):
+        u_norm = np.linalg.norm(update)
+        return lr * p_norm / u_norm if u_norm != 0 and p_norm != 0 else lr
+
+    p = p - beta1 * ratio(update_m) * update_m - beta3 * ratio(update_g) * update_g
+    return p, m, v
+
+
+@pytest.mark.parametrize("device", get_testable_devices())
+@pytest.mark.parametrize("mode", [0, 1])
+def test_lans_op(device, mode):
+    shapes = [(4, 5), (1,), (70000,), (2, 3, 4)]
+    lr, beta1, beta2, eps, weight_decay = 1e-3, 0.9, 0.999, 1e-6, 0.01
+    n = len(shapes)
+    n_g = [np.random.randn(*shape).astype("float32") for shape in shapes]
+    n_p = [np.random.randn(*shape).astype("float32") for shape in shapes]
+    n_m = [np.random.randn(*shape).astype("float32") for shape in shapes]
+    n_v = [np.random.uniform(size=shape).astype("float32") for shape in shapes]
+    m_tensors = [raf.array(arr, device=device) for arr in n_g + n_p + n_m + n_v]
+    step = raf.array(3.0, dtype="float32", device=device)
+    raf.lans(m_tensors, step, lr, beta1, beta2, eps, 1, weight_decay, 1, mode, True)
+    for i in range(n):
+        ref_p, ref_m, ref_v = lans_ref(
+            n_g[i], n_p[i], n_m[i], n_v[i], 3, lr, beta1, beta2, eps, weight_decay, mode
+        )
+        # The weights and moments are updated in place.
+        check(m_tensors[n + i], ref_p, rtol=1e-4, atol=1e-4)
+        check(m_tensors[2 * n + i], ref_m, rtol=1e-4, atol=1e-4)
+        check(m_tensors[3 * n + i], ref_v, rtol=1e-4, atol=1e-4)
+
+
 @with_seed(0)
 @pytest.mark.skipif(not raf.build.with_cuda(), reason="CUDA is not enabled")
 @pytest.mark.parametrize("config", [(2, 32, 10)])
@@ -147,6 +147,49 @@ class RAFSimpleTest(raf.Model):
         return y
 
 
+@pytest.mark.parametrize("device", get_testable_devices())
+@pytest.mark.parametrize("shapes", [[(3,)], [(4, 5), (1,), (70000,), (2, 3, 4)]])
+def test_multi_tensor_sgd(device, shapes):
+    learning_rate, mu = 0.1, 0.9
+    n_dx = [np.random.randn(*shape).astype("float32") for shape in shapes]
+    n_x = [np.random.randn(*shape).astype("float32") for shape in shapes]
+    n_v = [np.random.randn(*shape).astype("float32") for shape in shapes]
+    m_tensors = [raf.array(arr, device=device) for arr in n_dx + n_x + n_v]
+    m_x = m_tensors[len(shapes) : 2 * len(shapes)]
+    m_v = m_tensors[2 * len(shapes) :]
+    out = raf.multi_tensor_sgd(m_tensors, learning_rate, mu)
+    assert len(out) == 3 * len(shapes)
+    for i, shape in enumerate(shapes):
+        ref_v = mu * n_v[i] + n_dx[i]
+        ref_x = n_x[i] - learning_rate * ref_v
+        # Weights and momentums are updated in place.
+        check(m_x[i], ref_x, rtol=1e-5, atol=1e-5)
+        check(m_v[i], ref_v, rtol=1e-5, atol=1e-5)
+        check(out[len(shapes) + i], ref_x, rtol=1e-5, atol=1e-5)
+
+
+@pytest.mark.parametrize("device", get_testable_devices())
+def test_sgd_simple(device):
+    shape = (2, 2)
+    t_model = TorchSimpleTest(shape)
+    t_model.to(device)
+    m_model = RAFSimpleTest(shape)
+    m_model.x = t2m_param(t_model.x, device=device)
+    m_model.x.requires_grad = True
+    m_model.train_mode()
+    t_model.train()
+    m_optimizer = raf.optim.SGD(m_model.state().values(), 0.1, 0.01)
+    t_optimizer = torch.optim.SGD(t_model.parameters(), lr=0.1, momentum=0.01)
+    for i in range(4):
+        m_dy, t_dy = randn_torch(shape, device=device, requires_grad=False)
+        m_model().backward(m_dy)
+        t_optimizer.zero_grad()
+        t_model().backward(t_dy)
+        m_optimizer.step()
+        t_optimizer.step()
+        check(m_model.x, t_model.x, rtol=1e-4, atol=1e-4)
+
+
 @pytest.mark.parametrize("device", get_testable_devices())
 def test_traced_sgd_simple(device):
     # pylint: disable=attribute-defined-outside-init
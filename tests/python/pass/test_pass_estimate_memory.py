@@ -8,7 +8,7 @@ from tvm import relay
 
 from raf._core.device import Device
 from raf._core.vm import VMCompiler
-from raf._ffi.pass_ import EstimateMemory, InferType
+from raf._ffi.pass_ import EstimateMemory, EstimateMemoryFootprint, InferType
 from raf.ir import ScopeBuilder
 from raf.testing import check
 
@@ -74,5 +74,37 @@ def test_workspace():
     verify_memory(get_mod(), "cuda", [(1, float("inf")), 2, 1], True)
 
 
+def test_arena():
+    shape = (512, 512)  # 1 MB
+    device = "cpu"
+
+    def get_footprint(fork):
+        data = raf.ir.var("x", shape=shape)
+        sb = ScopeBuilder()
+        a_1 = sb.let("a1", raf.ir.op.relu(data))
+        a_2 = sb.let("a2", raf.ir.op.relu(data if fork else a_1))
+        a_3 = sb.let("a3", raf.ir.op.add(a_1, a_2) if fork else raf.ir.op.relu(a_2))
+        sb.ret(a_3)
+        mod = tvm.IRModule.from_expr(relay.Function([data], sb.get()))
+
+        config = {"raf.memory_plan.use_arena": True}
+        disabled_pass = ["FuseDialect", "FuseTVM"]
+        with tvm.transform.PassContext(opt_level=3, config=config, disabled_pass=disabled_pass):
+            mod, _ = VMCompiler().optimize(mod, device)
+        mod = InferType()(mod)
+        return EstimateMemoryFootprint(mod, Device(device), False)
+
+    # a1 and a2 are packed into a 2 MB arena, which is alive until a3 is computed from both.
+    footprint = get_footprint(fork=True)
+    check(footprint["peak"].value, 3)
+    check(footprint["peak_without_arena"].value, 3)
+
+    # An arena of a1 and a2 would be alive until a3 is computed, while a1 can be released
+    # before a3 with its own storage, so the arena is dropped.
+    footprint = get_footprint(fork=False)
+    check(footprint["peak"].value, 2)
+    check(footprint["peak_without_arena"].value, 2)
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -8,13 +8,19 @@
 import pytest
 
 import tvm
+import tvm.testing
 from tvm import relay
 from tvm.ir.transform import ModulePass, PassContext
 from tvm.ir.transform import module_pass
 from tvm.relay.transform import function_pass, FunctionPass
+import raf
+from raf._core.executor import VMExecutor
 from raf._ffi import pass_
 from raf._ffi.pass_ import FromRelay
-from raf.ir import RAFSequential
+from raf._op.dialect import DialectPreference
+from raf.ir import RAFSequential, PassProfiler
+from raf.testing import randn
+from raf.utils import profiler
 
 
 def get_var_func():
@@ -156,5 +162,96 @@ def test_sequential_pass():
     assert isinstance(ret_mod["mySub"].body.checked_type, tvm.ir.TensorType)
 
 
+def get_model_mod():
+    class Model(raf.Model):
+        def build(self):
+            pass
+
+        @raf.model.trace
+        def forward(self, x, y):
+            z = raf.matmul(x, y)
+            return raf.relu(raf.add(z, z))
+
+    m_x, _ = randn((4, 4))
+    m_y, _ = randn((4, 4))
+    return Model()._internal(m_x, m_y).mod, [m_x, m_y]
+
+
+def test_pass_profiler():
+    mod, _ = get_model_mod()
+    prof = PassProfiler()
+    with raf.ir.PassContext(opt_level=3, instruments=[prof]):
+        VMExecutor(mod, "cpu")
+    records = prof.get_records()
+    names = [record["name"] for record in records]
+    assert "vm_compiler_optimize" in names
+    assert "ManifestAlloc" in names and "MemoryPlan" in names
+    for record in records:
+        assert record["time_ms"] >= 0 and record["peak_mem_mb"] >= 0
+        assert record["nodes_before"] > 0 and record["nodes_after"] > 0
+    # The passes of the compiler are nested in its sequential pass, which completes last.
+    top = [record for record in records if record["name"] == "vm_compiler_optimize"][0]
+    assert top["depth"] < min(r["depth"] for r in records if r["name"] == "ManifestAlloc")
+    rendered = prof.render().split("\n")
+    assert len(rendered) == len(records) + 1
+    assert rendered[1].startswith("vm_compiler_optimize")
+
+    prof.clear()
+    assert not prof.get_records()
+
+
+def test_pass_profiler_category():
+    mod, _ = get_model_mod()
+    profiler.clear()
+    profiler.start(light=True)
+    with raf.ir.PassContext(opt_level=3):
+        VMExecutor(mod, "cpu")
+    profiler.stop()
+    stats = profiler.summary(category="Pass")
+    assert "InferType" in stats and stats["InferType"]["count"] > 1
+    profiler.clear()
+
+
+def test_pass_memo():
+    mod, args = get_model_mod()
+    raf.ir.clear_pass_memo()
+    config = {"raf.pass_manager.memo": True}
+    outs = []
+    for i in range(2):
+        with raf.ir.PassContext(opt_level=3, config=config):
+            executor = VMExecutor(mod, "cpu")
+        outs.append(executor.make_executor()(*args).numpy())
+        stats = raf.ir.get_pass_memo_stats()
+        if i == 0:
+            assert stats["hits"] == 0 and stats["entries"] > 0
+        else:
+            assert stats["hits"] > 0
+    tvm.testing.assert_allclose(outs[0], outs[1])
+
+    # The memo is disabled by default.
+    with raf.ir.PassContext(opt_level=3):
+        VMExecutor(mod, "cpu")
+    assert raf.ir.get_pass_memo_stats()["hits"] == stats["hits"]
+    raf.ir.clear_pass_memo()
+    assert raf.ir.get_pass_memo_stats()["entries"] == 0
+
+
+def test_pass_memo_dialect_preference():
+    mod, args = get_model_mod()
+    raf.ir.clear_pass_memo()
+    config = {"raf.pass_manager.memo": True}
+    with raf.ir.PassContext(opt_level=3, config=config):
+        VMExecutor(mod, "cpu")
+    stats = raf.ir.get_pass_memo_stats()
+
+    # The dialect passes depend on the preference, so they are not reused across preferences.
+    with DialectPreference(["tvm"]):
+        with raf.ir.PassContext(opt_level=3, config=config):
+            executor = VMExecutor(mod, "cpu")
+    assert raf.ir.get_pass_memo_stats()["entries"] > stats["entries"]
+    executor.make_executor()(*args)
+    raf.ir.clear_pass_memo()
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -9,12 +9,13 @@ from raf._lib import tvm
 from raf.testing import get_testable_devices, randn, check, run_vm_model
 
 
-def optimize(mod, device, fusion=False):
+def optimize(mod, device, fusion=False, use_arena=False):
     device_name = device if device != "cpu" else "llvm"
     disabled_pass = []
     if not fusion:
         disabled_pass = ["FuseDialect", "FuseTVM"]
-    with tvm.transform.PassContext(opt_level=3, disabled_pass=disabled_pass):
+    config = {"raf.memory_plan.use_arena": use_arena}
+    with tvm.transform.PassContext(opt_level=3, config=config, disabled_pass=disabled_pass):
         opt_mod, _ = raf._core.vm.VMCompiler().optimize(mod, device=device_name, params={})
     return opt_mod
 
@@ -56,9 +57,9 @@ def verify_alloc_num(
     )
 
 
-def verify_correctness(model, device, args, fusion):
+def verify_correctness(model, device, args, fusion, use_arena=False):
     # A helper function to verify the correctness
-    outs = run_vm_model(model, device, args, disable_fusion=not fusion)
+    outs = run_vm_model(model, device, args, disable_fusion=not fusion, use_arena=use_arena)
     outs = outs if isinstance(outs, (tuple, list)) else (outs,)
 
     ref_outs = model(*args)
@@ -167,5 +168,73 @@ def test_set_shape():
     verify_correctness(model, "cpu", args, fusion=False)
 
 
+@pytest.mark.parametrize("device", get_testable_devices())
+def test_memory_plan_arena(device):
+    class Model(raf.Model):
+        def build(self):
+            pass
+
+        @raf.model.trace
+        def forward(self, a, b):
+            t0 = raf.add(a, a)
+            t1 = raf.add(b, b)
+            t2 = raf.add(t0, t1)
+            return t2
+
+    shape = (4, 16)  # 256 bytes, so the tensors are packed without padding
+    model = Model()
+    model.infer_mode()
+    args = [randn(shape, device=device)[0] for _ in range(2)]
+    mod = model._internal(*args).mod
+    mod = optimize(mod, device, use_arena=True)
+
+    # The 2 intermediate tensors are packed into one arena, and only the output tensor
+    # has its own storage.
+    alloc_storage, arena_tensor, total_size = 0, 0, 0
+    for line in raf.ir.AsText(mod["main"]).split("\n"):
+        if line.find("raf.op.vm.alloc_storage") != -1:
+            alloc_storage += 1
+            total_size += int(line[line.find("int64(") + 6 : line.find(")")])
+        elif line.find("raf.op.vm.alloc_tensor(%arena") != -1:
+            arena_tensor += 1
+    assert alloc_storage == 2, "#storage %d" % alloc_storage
+    assert arena_tensor == 2, "#arena tensor %d" % arena_tensor
+    assert total_size == 768, "Total size %d" % total_size
+
+    verify_correctness(model, device, args, fusion=False, use_arena=True)
+
+
+@pytest.mark.parametrize("device", get_testable_devices())
+def test_memory_plan_arena_fallback(device):
+    class Model(raf.Model):
+        def build(self):
+            pass
+
+        @raf.model.trace
+        def forward(self, a, b, c, d):
+            t0 = raf.add(a, a)
+            t1 = raf.add(t0, b)
+            t2 = raf.add(t1, c)
+            t3 = raf.add(t2, t0)
+            t3 = raf.reshape(t3, (25,))
+            t4 = raf.add(t3, raf.reshape(d, (25,)))
+            return t4
+
+    shape = (5, 5)
+    model = Model()
+    model.infer_mode()
+    args = [randn(shape, device=device)[0] for _ in range(4)]
+    mod = model._internal(*args).mod
+    mod = optimize(mod, device, use_arena=True)
+
+    # An arena of the 4 intermediate tensors would still be alive when the output tensor is
+    # allocated, which raises the peak memory, so every tensor keeps its own storage.
+    text = raf.ir.AsText(mod["main"])
+    assert text.count("raf.op.vm.alloc_storage") == 5, text
+    assert text.find("%arena") == -1, text
+
+    verify_correctness(model, device, args, fusion=False, use_arena=True)
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
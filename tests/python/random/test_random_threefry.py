@@ -0,0 +1,121 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+# pylint: disable=attribute-defined-outside-init
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+import raf
+from raf.random import threefry
+from raf.testing import get_testable_devices
+
+
+@pytest.mark.parametrize("device", get_testable_devices())
+@pytest.mark.parametrize("dtype", ["float16", "float32", "float64"])
+def test_uniform(device, dtype):
+    out = threefry.uniform(-2.0, 3.0, shape=(64, 128), device=device, dtype=dtype, seed=0)
+    assert out.shape == (64, 128)
+    assert out.dtype == dtype
+    out = out.numpy().astype("float64")
+    assert out.min() >= -2.0 and out.max() <= 3.0
+    np.testing.assert_allclose(out.mean(), 0.5, atol=0.05)
+    np.testing.assert_allclose(out.std(), 5.0 / np.sqrt(12.0), atol=0.05)
+
+
+@pytest.mark.parametrize("device", get_testable_devices())
+@pytest.mark.parametrize("shape", [(), (1,), (3, 5), (32, 16, 8)])
+def test_normal(device, shape):
+    out = threefry.normal(1.0, 2.0, shape=shape, device=device, seed=0)
+    assert out.shape == shape
+    out = out.numpy()
+    assert np.all(np.isfinite(out))
+    if out.size >= 1024:
+        np.testing.assert_allclose(out.mean(), 1.0, atol=0.1)
+        np.testing.assert_allclose(out.std(), 2.0, atol=0.1)
+
+
+def test_reproducible():
+    shape = (16, 16)
+    specs = OrderedDict(
+        [
+            ("a", (threefry.Uniform(0.0, 1.0), shape, "float32")),
+            ("b", (threefry.Normal(0.0, 1.0), shape, "float32")),
+            ("c", (threefry.Uniform(0.0, 1.0), shape, "float32")),
+        ]
+    )
+    batch = {name: arr.numpy() for name, arr in threefry.sample(specs, seed=7).items()}
+    # A tensor only depends on the seed and its name, but not on the other tensors in the batch.
+    single = threefry.uniform(shape=shape, name="c", seed=7).numpy()
+    np.testing.assert_equal(batch["c"], single)
+    reordered = OrderedDict(reversed(list(specs.items())))
+    for name, arr in threefry.sample(reordered, seed=7).items():
+        np.testing.assert_equal(batch[name], arr.numpy())
+    # Different names or seeds lead to different streams.
+    assert not np.array_equal(batch["a"], batch["c"])
+    assert not np.array_equal(single, threefry.uniform(shape=shape, name="c", seed=8).numpy())
+
+
+def test_executor_cache():
+    shape = (4, 8)
+    threefry.uniform(shape=shape, name="a", seed=0)
+    hits = threefry._get_executor.cache_info().hits
+    # The same distribution, shape and dtype reuse the compiled function regardless of the
+    # name and seed.
+    out = threefry.uniform(shape=shape, name="b", seed=1)
+    assert threefry._get_executor.cache_info().hits == hits + 1
+    np.testing.assert_equal(out.numpy(), threefry.uniform(shape=shape, name="b", seed=1).numpy())
+    # A different distribution compiles a new function.
+    threefry.uniform(0.0, 2.0, shape=shape, name="b", seed=1)
+    assert threefry._get_executor.cache_info().hits == hits + 2
+
+
+@pytest.mark.parametrize("method", ["xavier_uniform", "xavier_normal", "kaiming_uniform"])
+def test_nn(method):
+    shape = (64, 32, 3, 3)
+    out = getattr(raf.random.nn, method)(shape, rng="threefry", seed=0)
+    assert out.shape == shape
+    dist = raf.random.nn.distribution(method, shape)
+    std = dist.std if isinstance(dist, threefry.Normal) else dist.high / np.sqrt(3.0)
+    np.testing.assert_allclose(out.numpy().std(), std, rtol=0.05)
+
+
+@pytest.mark.parametrize("device", get_testable_devices())
+def test_init_model(device):
+    class Model(raf.Model):
+        def build(self):
+            self.w_0 = raf.array(np.zeros((32, 16), dtype="float32"), device=device)
+            self.w_1 = raf.array(np.zeros((8, 32), dtype="float32"), device=device)
+            self.b_1 = raf.array(np.zeros((8,), dtype="float32"), device=device)
+
+        @raf.model.trace
+        def forward(self, x):
+            x = raf.matmul_nt(x, self.w_0)
+            return raf.add(raf.matmul_nt(x, self.w_1), self.b_1)
+
+    def initializer(name, param):
+        if name.startswith("b"):
+            return None
+        return raf.random.nn.distribution("xavier_uniform", param.shape)
+
+    model = Model()
+    w_0 = model.w_0
+    inited = raf.random.init_model(model, initializer, seed=0)
+    assert sorted(inited) == ["w_0", "w_1"]
+    # Parameters are updated in place.
+    assert model.w_0 is w_0
+    assert model.w_0.device == w_0.device
+    assert np.any(model.w_0.numpy() != 0) and np.any(model.w_1.numpy() != 0)
+    np.testing.assert_equal(model.b_1.numpy(), 0)
+    bound = np.sqrt(6.0 / (32 + 16))
+    assert np.abs(model.w_0.numpy()).max() <= bound
+
+    # The same seed reproduces the same parameters.
+    w_1 = model.w_1.numpy()
+    raf.random.init_model(model, initializer, seed=0)
+    np.testing.assert_equal(model.w_1.numpy(), w_1)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
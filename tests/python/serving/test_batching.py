@@ -0,0 +1,137 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+# pylint: disable=protected-access
+import threading
+
+import numpy as np
+import pytest
+
+import raf
+from raf.serving import BatchingExecutor
+from raf.testing import check, mlp, run_vm_model
+
+
+def get_mlp(batch_size):
+    config = (16, 4, 32, 8)
+    model, _ = mlp.get_model(config, train=False)
+    (m_x,), _ = mlp.get_input(config, batch_size, train=False)
+    return model, m_x
+
+
+@pytest.mark.parametrize("num_workers", [1, 3])
+def test_concurrent_requests(num_workers):
+    model, m_x = get_mlp(8)
+    sizes = [1, 3, 2, 8, 1, 5, 4, 2, 7, 1, 6, 3]
+    inputs = [np.random.randn(size, 16).astype("float32") for size in sizes]
+    expected = [run_vm_model(model, "cpu", [raf.array(x)]).numpy() for x in inputs]
+
+    outputs = [None] * len(inputs)
+
+    def client(idx, executor):
+        outputs[idx] = executor(inputs[idx])
+
+    with BatchingExecutor.from_model(
+        model, [m_x], "cpu", max_latency_ms=20, num_workers=num_workers
+    ) as executor:
+        assert executor.max_batch_size == 8
+        threads = [threading.Thread(target=client, args=(i, executor)) for i in range(len(sizes))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = executor.get_stats()
+
+    for out, ref in zip(outputs, expected):
+        check(out, ref, rtol=1e-5, atol=1e-5)
+    assert stats["num_requests"] == len(sizes)
+    assert stats["queue_depth"] == 0
+    assert all(0 < size <= 8 for size in stats["batch_sizes"])
+    assert sum(size * num for size, num in stats["batch_sizes"].items()) >= sum(sizes)
+    # Requests are coalesced into fewer batches.
+    assert sum(stats["batch_sizes"].values()) < len(sizes)
+    assert 0 < stats["p50"] <= stats["p99"]
+
+
+def test_deadline_and_close():
+    model, m_x = get_mlp(4)
+    executor = BatchingExecutor.from_model(model, [m_x], "cpu", max_latency_ms=1)
+    # A single request is served after the deadline even though the batch is not full.
+    x = np.random.randn(1, 16).astype("float32")
+    check(executor(x), run_vm_model(model, "cpu", [raf.array(x)]))
+    assert executor.get_stats(reset=True)["batch_sizes"] == {1: 1}
+    assert executor.get_stats()["num_requests"] == 0
+
+    # Queued requests are served before closing.
+    futures = [executor.submit(np.random.randn(2, 16).astype("float32")) for _ in range(5)]
+    executor.close()
+    assert all(future.done() and future.result().shape == (2, 4) for future in futures)
+    with pytest.raises(RuntimeError):
+        executor.submit(x)
+
+
+def test_invalid_request():
+    model, m_x = get_mlp(4)
+    with BatchingExecutor.from_model(model, [m_x], "cpu") as executor:
+        with pytest.raises(ValueError):
+            executor.submit(np.random.randn(5, 16).astype("float32"))
+        # The non-batch dims and the dtype are checked on submission, so a bad request is
+        # rejected alone instead of failing the whole batch.
+        with pytest.raises(ValueError):
+            executor.submit(np.random.randn(2, 15).astype("float32"))
+        with pytest.raises(ValueError):
+            executor.submit(np.random.randn(2, 16).astype("float64"))
+        with pytest.raises(ValueError):
+            executor.submit(np.random.randn(16).astype("float32"))
+        assert executor(np.random.randn(2, 16).astype("float32")).shape == (2, 4)
+
+
+def test_tuple_outputs():
+    class Model(raf.Model):
+        def build(self):
+            pass
+
+        @raf.model.trace
+        def forward(self, x):  # pylint: disable=no-self-use
+            y = raf.relu(x)
+            return y, raf.sum(y, axis=1)
+
+    model = Model()
+    model.infer_mode()
+    m_x = raf.array(np.random.randn(4, 3).astype("float32"))
+    inputs = [np.random.randn(size, 3).astype("float32") for size in [1, 3, 2]]
+    with BatchingExecutor.from_model(model, [m_x], "cpu", max_latency_ms=20) as executor:
+        futures = [executor.submit(x) for x in inputs]
+        # The outputs of different ranks are split along the batch axis separately.
+        for future, x in zip(futures, inputs):
+            out_y, out_sum = future.result()
+            check(out_y, np.maximum(x, 0), rtol=1e-5, atol=1e-5)
+            check(out_sum, np.maximum(x, 0).sum(axis=1), rtol=1e-5, atol=1e-5)
+
+
+def test_negative_batch_axis():
+    class Model(raf.Model):
+        def build(self):
+            pass
+
+        @raf.model.trace
+        def forward(self, x):  # pylint: disable=no-self-use
+            return raf.relu(x)
+
+    model = Model()
+    model.infer_mode()
+    m_x = raf.array(np.random.randn(3, 4).astype("float32"))
+    with BatchingExecutor.from_model(
+        model, [m_x], "cpu", batch_axis=-1, max_latency_ms=20, num_workers=2
+    ) as executor:
+        assert executor.max_batch_size == 4
+        # Each worker owns its VM.
+        assert len(executor._vms) == 2
+        x = np.random.randn(3, 2).astype("float32")
+        check(executor(x), np.maximum(x, 0), rtol=1e-5, atol=1e-5)
+        with pytest.raises(ValueError):
+            executor.submit(np.random.randn(2, 2).astype("float32"))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,136 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import copy
+import json
+
+import pytest
+
+from raf import benchmark
+from raf._core.device import Device
+from raf._ffi.memory_pool import GetPoolName, InitPool, RemovePool
+from raf.benchmark import runner
+from raf.benchmark.__main__ import main
+
+
+def test_matrix():
+    configs = benchmark.make_matrix(
+        ["mlp"], [1, 4], ["vm", "interpreter"], [True, False], ["page_unit_pool"], ["infer"], "cpu"
+    )
+    # The fusion axis is collapsed for the interpreter.
+    assert len(configs) == 6
+    keys = [benchmark.config_key(config) for config in configs]
+    assert len(set(keys)) == len(keys)
+    assert "mlp/bs1/interpreter/-/page_unit_pool/infer/cpu" in keys
+    assert "mlp/bs4/vm/nofusion/page_unit_pool/infer/cpu" in keys
+
+
+@pytest.mark.parametrize("executor", ["vm", "interpreter"])
+@pytest.mark.parametrize("mode", ["infer", "train"])
+def test_run_config(executor, mode):
+    config = benchmark.BenchConfig("mlp", 2, executor, True, "page_unit_pool", mode, "cpu")
+    result = benchmark.run_config(config, warmup=1, repeat=3)
+    assert "error" not in result, result["error"]
+    metrics = result["metrics"]
+    assert metrics["compile_ms"] > 0 and metrics["first_run_ms"] > 0
+    assert 0 < metrics["latency_p50_ms"] <= metrics["latency_p99_ms"]
+    assert metrics["peak_used_mb"] > 0
+    hit_rate = metrics["kernel_cache_hit_rate"]
+    if executor == "vm":
+        # All kernels are compiled in the first run.
+        assert hit_rate == 1.0
+    else:
+        assert hit_rate is None or 0 <= hit_rate <= 1
+    json.dumps(result)
+
+
+def test_restore_pool(monkeypatch):
+    device = Device("cpu")
+    pools = []
+    get_model = runner.get_model
+
+    def get_model_in_pool(*args):
+        # The model and inputs are created in the pool of the configuration.
+        pools.append(GetPoolName(device))
+        return get_model(*args)
+
+    monkeypatch.setattr(runner, "get_model", get_model_in_pool)
+    RemovePool(device)
+    InitPool(device, "no_pool")
+    try:
+        assert GetPoolName(device) == "no_pool"
+        config = benchmark.BenchConfig("mlp", 1, "vm", True, "page_unit_pool", "infer", "cpu")
+        result = benchmark.run_config(config, warmup=0, repeat=1)
+        assert "error" not in result, result["error"]
+        assert pools == ["page_unit_pool"]
+        assert GetPoolName(device) == "no_pool"
+    finally:
+        RemovePool(device)
+        InitPool(device, "page_unit_pool")
+
+
+def test_unknown_model():
+    config = benchmark.BenchConfig("unknown", 1, "vm", True, "page_unit_pool", "infer", "cpu")
+    result = benchmark.run_config(config)
+    assert "metrics" not in result and "Unknown model" in result["error"]
+
+
+def test_compare():
+    metrics = {
+        "latency_p50_ms": 10.0,
+        "latency_p99_ms": 12.0,
+        "compile_ms": 100.0,
+        "peak_used_mb": 50.0,
+        "peak_allocated_mb": 60.0,
+        "kernel_cache_hit_rate": 1.0,
+    }
+    baseline = {
+        "results": [
+            {"key": "a", "metrics": metrics},
+            {"key": "b", "metrics": metrics},
+            {"key": "c", "error": "failed"},
+        ]
+    }
+    current = copy.deepcopy(baseline)
+    assert not benchmark.compare(current, baseline)
+
+    current["results"][0]["metrics"]["latency_p50_ms"] = 10.5
+    current["results"][0]["metrics"]["peak_used_mb"] = 60.0
+    current["results"][1] = {"key": "b", "error": "failed"}
+    current["results"].append({"key": "d", "metrics": metrics})
+    regressions = benchmark.compare(current, baseline)
+    assert sorted((reg["key"], reg["metric"]) for reg in regressions) == [
+        ("a", "peak_used_mb"),
+        ("b", "error"),
+    ]
+
+    current["results"][0]["metrics"]["kernel_cache_hit_rate"] = 0.5
+    regressions = benchmark.compare(current, baseline, {"latency_p50_ms": 0.01})
+    assert sorted(reg["metric"] for reg in regressions if reg["key"] == "a") == [
+        "kernel_cache_hit_rate",
+        "latency_p50_ms",
+        "peak_used_mb",
+    ]
+
+
+def test_cli(tmp_path):
+    output = str(tmp_path / "results.json")
+    argv = ["run", "--models", "mlp", "--batch-sizes", "1", "--executors", "vm"]
+    argv += ["--fusion", "on", "--modes", "infer", "--warmup", "1", "--repeat", "2"]
+    assert main(argv + ["--output", output]) == 0
+    results = benchmark.load_results(output)
+    assert len(results["results"]) == 1 and "metrics" in results["results"][0]
+
+    # Compare against a much faster baseline.
+    baseline = copy.deepcopy(results)
+    baseline["results"][0]["metrics"]["latency_p50_ms"] /= 100
+    baseline_path = str(tmp_path / "baseline.json")
+    benchmark.save_results(baseline, baseline_path)
+    assert main(["compare", output, "--baseline", baseline_path]) == 1
+    assert main(["compare", output, "--baseline", output]) == 0
+    argv = ["compare", output, "--baseline", baseline_path, "--threshold", "latency_p50_ms=1000"]
+    assert main(argv) == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -2,11 +2,15 @@
 # SPDX-License-Identifier: Apache-2.0
 
 # pylint: disable=no-self-use,protected-access
+import os
+import tempfile
+
 import pytest
 
 import raf
 from raf._ffi.op_profiler import Profile, ProfileGroup, ResetCache, GetCacheSize
 from raf.testing import get_testable_devices, run_infer_type, randn
+from raf.utils import op_profiler
 
 
 @pytest.mark.parametrize("device_str", get_testable_devices())
@@ -152,5 +156,64 @@ def test_default_stream():
     assert GetCacheSize(device) == 1
 
 
+def test_latency_db():
+    device = raf.Device("cpu")
+    data = raf.ir.var("x", shape=(7, 9))
+    expr = raf.ir.op.softmax(data)
+    expr = run_infer_type(expr).body
+
+    op_profiler.clear_db()
+    ResetCache(device)
+    lat = Profile(expr, device, 1, 1, 2)["latency"]
+    assert op_profiler.get_db_stats()["Entries"] == 1
+
+    # A new cache (e.g., in another process) hits the database and does not profile again.
+    ResetCache(device)
+    hits = op_profiler.get_db_stats().get("Hit", 0)
+    new_lat = Profile(expr, device, 1, 1, 2)["latency"]
+    assert [l.value for l in new_lat] == [l.value for l in lat]
+    assert op_profiler.get_db_stats()["Hit"] == hits + 1
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path_a = os.path.join(temp_dir, "a.db")
+        path_b = os.path.join(temp_dir, "b.db")
+        merged = os.path.join(temp_dir, "merged.db")
+        assert op_profiler.export_db(path_a) == 1
+
+        # Profile another op and export the database as if it came from another machine.
+        op_profiler.clear_db()
+        expr2 = run_infer_type(raf.ir.op.relu(data)).body
+        Profile(expr2, device, 1, 1, 2)
+        assert op_profiler.export_db(path_b) == 1
+        assert op_profiler.merge_db([path_a, path_b], merged) == 2
+
+        op_profiler.clear_db()
+        assert op_profiler.import_db(merged) == 2
+        # Importing again adds nothing.
+        assert op_profiler.import_db(merged) == 0
+        ResetCache(device)
+        new_lat = Profile(expr, device, 1, 1, 2)["latency"]
+        assert [l.value for l in new_lat] == [l.value for l in lat]
+    op_profiler.clear_db()
+
+
+def test_no_profile():
+    device = raf.Device("cpu")
+    x = raf.ir.var("x", shape=(64, 128))
+    w = raf.ir.var("w", shape=(128, 32))
+    expr = run_infer_type(raf.ir.op.matmul(x, w)).body
+
+    op_profiler.clear_db()
+    ResetCache(device)
+    op_profiler.set_no_profile(True)
+    try:
+        lat = Profile(expr, device, 1, 1, 2)["latency"]
+    finally:
+        op_profiler.set_no_profile(False)
+    # The estimated latency is not recorded in the database.
+    assert len(lat) == 2 and lat[0].value > 0 and lat[0].value == lat[1].value
+    assert op_profiler.get_db_stats()["Entries"] == 0
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -105,5 +105,32 @@ def test_profiler_without_cuda(i):
     assert len(data["traceEvents"]) == 0
 
 
+def test_light_profiler():
+    profiler.clear()
+    profiler.start(light=True)
+    m_x, _ = randn((4, 4))
+    for _ in range(10):
+        m_x = raf.add(m_x, m_x)
+    for _ in range(3):
+        raf.relu(m_x)
+    profiler.stop()
+    raf.add(m_x, m_x)
+
+    stats = profiler.summary()
+    assert stats["raf.op.add"]["count"] == 10
+    assert stats["raf.op.relu"]["count"] == 3
+    for stat in stats.values():
+        assert stat["total"] >= 0
+        assert stat["p50"] <= stat["p99"]
+        np.testing.assert_allclose(stat["mean"] * stat["count"], stat["total"], rtol=1e-6)
+    assert profiler.summary(category="Operator").keys() == stats.keys()
+    assert not profiler.summary(category="NotExist")
+    # The light profiler does not produce trace events
+    assert not [e for e in profiler.get()["traceEvents"] if e["name"] == "raf.op.add"]
+
+    profiler.clear()
+    assert not profiler.summary()
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,60 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+# pylint: disable=protected-access
+import os
+
+import pytest
+import raf
+from raf.testing import randn
+from raf.utils import tuner
+
+
+def test_cpu_target(monkeypatch):
+    # The tuning target is the one RAF compiles the CPU kernels with.
+    monkeypatch.setenv("RAF_CPU_TARGET", "")
+    target = tuner.get_tuning_target("cpu")
+    assert target.kind.name == "llvm"
+    assert "cpu" in target.keys
+    # Getting the target does not change the environment.
+    assert os.environ["RAF_CPU_TARGET"] == ""
+    assert str(raf.Device("cpu").tvm_target()) == str(target)
+
+    target = tuner.set_cpu_target()
+    assert str(target) == str(tuner.get_host_cpu_target())
+    assert os.environ["RAF_CPU_TARGET"] == str(target)
+    assert str(tuner.get_tuning_target("cpu")) == str(raf.Device("cpu").tvm_target())
+    tuner.set_cpu_target("llvm")
+    assert str(tuner.get_tuning_target("cpu")) == str(raf.Device("cpu").tvm_target())
+
+    monkeypatch.setattr(tuner.platform, "machine", lambda: "x86_64")
+    monkeypatch.setattr(tuner, "_read_cpu_flags", lambda: {"sse4_2", "avx2", "fma"})
+    assert str(tuner.get_host_cpu_target().attrs["mcpu"]) == "core-avx2"
+    monkeypatch.setattr(tuner, "_read_cpu_flags", lambda: {"sse4_2"})
+    assert "mcpu" not in tuner.get_host_cpu_target().attrs
+
+
+def test_extract_cpu_tasks(monkeypatch):
+    monkeypatch.setenv("RAF_CPU_TARGET", "llvm")
+
+    class LayerNormModel(raf.Model):
+        def build(self):
+            pass
+
+        @raf.model.trace
+        def forward(self, x, scale, bias):
+            return raf.layer_norm(x, scale, bias, eps=1e-5)
+
+    m_x, _ = randn((4, 16, 32))
+    m_scale, _ = randn((32,))
+    m_bias, _ = randn((32,))
+    model = LayerNormModel()
+    model.infer_mode()
+    tasks, weights = tuner.extract_tuning_tasks(model, [m_x, m_scale, m_bias], "cpu")
+    assert len(tasks) == 1 and weights == [1]
+    assert tasks[0].target.kind.name == "llvm"
+    assert "layer_norm" in tasks[0].desc
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])